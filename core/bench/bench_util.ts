@@ -0,0 +1,112 @@
+// Helpers of the benchmarks, which run under Node.js (see run_benchmarks.py).
+//
+// core does not depend on @types/node: the few Node.js APIs the benchmarks
+// use are declared here.
+
+declare const require: (id: string) => unknown;
+declare const process: {
+  argv: string[];
+  memoryUsage(): {heapUsed: number};
+  stdout: {write(s: string): void};
+};
+
+interface NodeFs {
+  readFileSync(path: string, encoding: "utf8"): string;
+  readdirSync(path: string): string[];
+}
+
+interface NodeVm {
+  Script: new (source: string) => unknown;
+}
+
+const fs = require("fs") as NodeFs;
+const vm = require("vm") as NodeVm;
+
+// Command line arguments of the benchmark, after the script name.
+export function benchArgs(): string[] {
+  return process.argv.slice(2);
+}
+
+export function readText(path: string): string {
+  return fs.readFileSync(path, "utf8");
+}
+
+// Returns the names of the files of a directory.
+export function listDir(path: string): string[] {
+  return fs.readdirSync(path);
+}
+
+// Returns the base name of a path, without extension.
+export function corpusName(path: string): string {
+  const base = path.substring(path.lastIndexOf("/") + 1);
+  const dot = base.lastIndexOf(".");
+  return dot > 0 ? base.substring(0, dot) : base;
+}
+
+// Returns the lines of a group log, without comments (lines starting with %)
+// and blank lines.
+export function logLines(text: string): string[] {
+  return text.split("\n").map((l) => l.trim()).filter((l) => l.length > 0 && !l.startsWith("%"));
+}
+
+export interface Timing {
+  // Number of runs and their total duration, in seconds.
+  runs: number;
+  seconds: number;
+}
+
+// Runs `run` repeatedly for at least `minSeconds`, after a warm-up run.
+export function measure(run: () => void, minSeconds: number): Timing {
+  run();
+  let runs = 0;
+  const start = performance.now();
+  let elapsed = 0;
+  do {
+    run();
+    runs++;
+    elapsed = (performance.now() - start) / 1000;
+  } while (elapsed < minSeconds);
+  return {runs, seconds: elapsed};
+}
+
+// Returns the time, in seconds, V8 takes to parse and compile `sources`, as
+// when loading them as scripts. V8 compiles function bodies lazily, on their
+// first call: this is the cost of loading the code, not of warming it up.
+export function compileSeconds(sources: string[], minSeconds: number): number {
+  // V8 caches the compilation of a source it has seen: each run compiles
+  // sources differing by a trailing comment.
+  let run = 0;
+  const timing = measure(() => {
+    run++;
+    for (const source of sources) {
+      new vm.Script(`${source}\n// ${run}`);
+    }
+  }, minSeconds);
+  return timing.seconds / timing.runs;
+}
+
+// Returns the heap growth, in bytes, caused by running `run` once, or null if
+// unknown. It only approximates allocations: the heap is collected
+// beforehand, which requires node --expose-gc, and a scavenge during `run`
+// hides what it collects.
+export function heapGrowth(run: () => void): number | null {
+  const gc = (globalThis as {gc?: () => void}).gc;
+  if (gc == undefined) {
+    return null;
+  }
+  gc();
+  const before = process.memoryUsage().heapUsed;
+  run();
+  return Math.max(0, process.memoryUsage().heapUsed - before);
+}
+
+// Drops console.log output, such as the synchronization messages of
+// BitStreamSynchronizer, so that stdout only holds the results.
+export function silenceConsole() {
+  console.log = () => undefined;
+}
+
+// Prints benchmark results, for run_benchmarks.py.
+export function printResults(results: unknown) {
+  process.stdout.write(JSON.stringify(results, null, 2) + "\n");
+}
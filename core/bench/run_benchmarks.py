@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+"""Runs the benchmark suite, and checks the results against thresholds.
+
+The suite measures:
+- compiler.py: end to end on base.p, in a new process, and in process per
+  backend, from scratch or after an edit of one file;
+- the Python decoders (base_py.py and parse_program.py) on the group logs of
+  corpora/groups: groups per second, and the share of log formatting;
+- if given, the TypeScript benchmarks, which run under Node.js:
+  decoder_bench.ts (groups per second, log formatting share and allocations
+  per group of parse_group, and of the parse program interpreter, and the
+  time to load each: compiling base*.js, or parsing and linking the program)
+  and
+  bitstream_bench.ts (bits per second of BitStreamSynchronizer).
+
+Results are a JSON object of metrics with flat names, e.g.
+"ts.generated.groups_per_second", plus per-corpus details. A run fails, with
+exit status 1, if a metric crosses its limit in thresholds.json, or if it
+regressed by more than --tolerance from a --baseline results file (in points
+for shares). Metrics in seconds, bytes or shares must not grow; the others
+must not drop.
+
+    bazel build //core/protocol:decoder_bench //core/signals:bitstream_bench
+    python3 core/bench/run_benchmarks.py --out results.json \\
+        --decoder-bench=bazel-bin/core/protocol/decoder_bench_/decoder_bench \\
+        --bitstream-bench=bazel-bin/core/signals/bitstream_bench_/bitstream_bench
+
+Thresholds are deliberately loose, so that they hold on slow CI machines:
+they catch order-of-magnitude regressions. Compare with a baseline recorded
+on the same machine to judge smaller changes.
+"""
+
+import argparse
+import glob
+import importlib.util
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROTOCOL = os.path.join(os.path.dirname(HERE), 'protocol')
+sys.path.insert(0, PROTOCOL)
+
+import parse_program  # noqa: E402
+import rds_stream  # noqa: E402
+
+RESULTS_FORMAT = 'rds-bench/1'
+
+# Backends timed in process, with their compiler options.
+COMPILER_BACKENDS = {
+    'typescript': dict(backend='typescript', log_mode='deferred'),
+    'python': dict(backend='python'),
+    'program': dict(backend='program'),
+    'numpy': dict(backend='numpy'),
+}
+
+# Durations, in seconds, differing by less than that from the baseline are
+# not regressions: short timings vary more than --tolerance between runs.
+TIMING_RESOLUTION = 0.05
+
+
+def lower_is_better(metric):
+    return metric.endswith(('.seconds', '.bytes', '_bytes_per_group', '_share'))
+
+
+def best_time(run, repeat):
+    """Returns the shortest duration of `repeat` calls of `run`, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_compiler(repeat):
+    compiler = load_module('compiler', os.path.join(PROTOCOL, 'compiler.py'))
+    main = os.path.join(PROTOCOL, 'base.p')
+    sources = compiler.read_sources(main)
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        command = [sys.executable, os.path.join(PROTOCOL, 'compiler.py'), '--log=deferred', '--split',
+                   main, os.path.join(tmp, 'base.ts')]
+        # The first run fills the parser cache if needed.
+        subprocess.run(command, check=True)
+        metrics['compiler.end_to_end.seconds'] = best_time(lambda: subprocess.run(command, check=True), repeat)
+    for (name, options) in COMPILER_BACKENDS.items():
+        metrics[f'compiler.{name}.seconds'] = best_time(
+            lambda: compiler.Compiler().compile(sources, main, **options), repeat)
+
+    # Recompilation after an edit only parses the edited file.
+    c = compiler.Compiler()
+    c.compile(sources, main)
+    edited = dict(sources)
+    eon = os.path.join(PROTOCOL, 'eon.p')
+
+    def recompile():
+        edited[eon] += '\n'
+        c.compile(edited, main)
+    metrics['compiler.incremental.seconds'] = best_time(recompile, repeat)
+    return metrics
+
+
+def read_corpus(path):
+    """Returns the (stream, blocks, ok) groups of a group log."""
+    with open(path, encoding='utf8') as f:
+        groups = []
+        for line in f:
+            group = rds_stream.parse_hex_line(line)
+            if group is not None:
+                (stream, blocks, errors) = group
+                groups.append((stream, blocks, rds_stream.validity_mask(errors, 0)))
+        return groups
+
+
+def groups_per_second(groups, parsers, min_seconds):
+    """Decodes `groups` repeatedly into one station, for at least `min_seconds`."""
+    station = rds_stream.new_station()
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for (stream, blocks, ok) in groups:
+            rds_stream.decode_group(station, stream, blocks, ok, parsers)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return len(groups) * runs / elapsed
+
+
+def bench_python_decoders(corpora, min_seconds):
+    # The decoder without logs gives the share of log formatting.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'base_py_nolog.py')
+        subprocess.run([sys.executable, os.path.join(PROTOCOL, 'compiler.py'), '--backend=python', '--log=none',
+                        os.path.join(PROTOCOL, 'base.p'), path], check=True)
+        nolog = load_module('base_py_nolog', path)
+    program = parse_program.load()
+    decoders = {
+        'base_py': rds_stream.PARSERS,
+        'base_py_nolog': (nolog.parse_group_ab, nolog.parse_group_c),
+        'program': program.parsers,
+    }
+    details = {name: {} for name in decoders}
+    for (corpus, groups) in corpora.items():
+        for (name, parsers) in decoders.items():
+            details[name][corpus] = {
+                'groups': len(groups),
+                'groups_per_second': groups_per_second(groups, parsers, min_seconds),
+            }
+    metrics = {}
+    for (name, by_corpus) in details.items():
+        # Corpora are weighted by their number of groups.
+        groups = sum(r['groups'] for r in by_corpus.values())
+        seconds = sum(r['groups'] / r['groups_per_second'] for r in by_corpus.values())
+        metrics[f'python.{name}.groups_per_second'] = groups / seconds
+    metrics['python.base_py.log_format_share'] = max(
+        0.0, 1 - metrics['python.base_py.groups_per_second'] / metrics.pop('python.base_py_nolog.groups_per_second'))
+    return (metrics, details)
+
+
+def run_node_bench(command, args):
+    """Runs a TypeScript benchmark, and returns its JSON output."""
+    result = subprocess.run(shlex.split(command) + args, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def bench_typescript(args, corpus_paths):
+    metrics = {}
+    details = {}
+    if args.decoder_bench:
+        output = run_node_bench(args.decoder_bench, [
+            f'--program={parse_program.DEFAULT_PATH}', f'--min-seconds={args.min_seconds}', *corpus_paths])
+        for (decoder, r) in output['decoders'].items():
+            for key in ('groups_per_second', 'log_format_share', 'allocated_bytes_per_group'):
+                if r[key] is not None:
+                    metrics[f'ts.{decoder}.{key}'] = r[key]
+            details[f'ts.{decoder}'] = r['corpora']
+        for (decoder, r) in output['load'].items():
+            metrics[f'ts.{decoder}.load.seconds'] = r['seconds']
+            metrics[f'ts.{decoder}.load.bytes'] = r['bytes']
+    if args.bitstream_bench:
+        output = run_node_bench(args.bitstream_bench, [f'--min-seconds={args.min_seconds}', *corpus_paths])
+        for (stream, r) in output['bitstream'].items():
+            metrics[f'ts.bitstream.{stream}.bits_per_second'] = r['bits_per_second']
+            details[f'ts.bitstream.{stream}'] = r
+    return (metrics, details)
+
+
+def check(metrics, thresholds, baseline, tolerance):
+    """Returns the list of failures, as messages."""
+    failures = []
+    for (metric, limits) in thresholds.items():
+        if metric not in metrics:
+            continue
+        value = metrics[metric]
+        if 'max' in limits and value > limits['max']:
+            failures.append(f'{metric} = {value:.4g}, above the threshold of {limits["max"]:.4g}')
+        if 'min' in limits and value < limits['min']:
+            failures.append(f'{metric} = {value:.4g}, below the threshold of {limits["min"]:.4g}')
+    for (metric, previous) in baseline.items():
+        if metric not in metrics or previous == 0:
+            continue
+        value = metrics[metric]
+        # Shares are fractions already: their change is absolute.
+        change = value - previous if metric.endswith('_share') else (value - previous) / previous
+        worse = change if lower_is_better(metric) else -change
+        if metric.endswith('.seconds') and abs(value - previous) < TIMING_RESOLUTION:
+            continue
+        if worse > tolerance:
+            failures.append(f'{metric} = {value:.4g}, {worse:.0%} worse than the baseline {previous:.4g}')
+    return failures
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Runs the decoder and compiler benchmarks.')
+    argparser.add_argument('--out', help='Results file. Not written if omitted.')
+    argparser.add_argument('--corpora', default=os.path.join(HERE, 'corpora', 'groups'),
+                           help='Directory of the group logs (RDS Spy hex format).')
+    argparser.add_argument('--thresholds', default=os.path.join(HERE, 'thresholds.json'))
+    argparser.add_argument('--baseline', help='Results file of a previous run, to compare with.')
+    argparser.add_argument('--tolerance', type=float, default=0.2,
+                           help='Largest regression from the baseline, as a fraction (default 0.2).')
+    argparser.add_argument('--decoder-bench', help='Command running decoder_bench.ts under Node.js.')
+    argparser.add_argument('--bitstream-bench', help='Command running bitstream_bench.ts under Node.js.')
+    argparser.add_argument('--min-seconds', type=float, default=0.5,
+                           help='Minimum duration of each decoding measurement.')
+    argparser.add_argument('--repeat', type=int, default=3, help='Runs per compiler measurement; the best is kept.')
+    args = argparser.parse_args()
+
+    corpus_paths = sorted(glob.glob(os.path.join(args.corpora, '*.spy')))
+    corpora = {os.path.splitext(os.path.basename(p))[0]: read_corpus(p) for p in corpus_paths}
+    metrics = bench_compiler(args.repeat)
+    (python_metrics, python_details) = bench_python_decoders(corpora, args.min_seconds)
+    metrics.update(python_metrics)
+    (ts_metrics, ts_details) = bench_typescript(args, corpus_paths)
+    metrics.update(ts_metrics)
+    results = {
+        'format': RESULTS_FORMAT,
+        'environment': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'corpora': sorted(corpora),
+        },
+        'metrics': metrics,
+        'details': {**{f'python.{k}': v for (k, v) in python_details.items()}, **ts_details},
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+    for (metric, value) in metrics.items():
+        print(f'{metric:<48}{value:>14.4g}')
+    if not ts_metrics:
+        print('TypeScript benchmarks skipped: see --decoder-bench and --bitstream-bench.')
+
+    with open(args.thresholds, encoding='utf8') as f:
+        thresholds = json.load(f)['metrics']
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf8') as f:
+            baseline = json.load(f)['metrics']
+    failures = check(metrics, thresholds, baseline, args.tolerance)
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
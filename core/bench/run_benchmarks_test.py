@@ -0,0 +1,34 @@
+"""Tests for the regression checks of the benchmark runner."""
+
+import unittest
+
+import run_benchmarks as r
+
+
+class CheckTest(unittest.TestCase):
+    def test_thresholds(self):
+        thresholds = {'a.seconds': {'max': 1.0}, 'b.groups_per_second': {'min': 100}, 'c.seconds': {'max': 1.0}}
+        metrics = {'a.seconds': 2.0, 'b.groups_per_second': 50}
+        failures = r.check(metrics, thresholds, {}, 0.2)
+        self.assertEqual(len(failures), 2)
+        self.assertIn('above', failures[0])
+        self.assertIn('below', failures[1])
+        self.assertEqual(r.check({'a.seconds': 0.5, 'b.groups_per_second': 150}, thresholds, {}, 0.2), [])
+
+    def test_baseline(self):
+        baseline = {'x.groups_per_second': 1000, 'y.allocated_bytes_per_group': 100, 'z.seconds': 1.0}
+        # Faster and smaller is fine, within tolerance too.
+        metrics = {'x.groups_per_second': 2000, 'y.allocated_bytes_per_group': 50, 'z.seconds': 1.1}
+        self.assertEqual(r.check(metrics, {}, baseline, 0.2), [])
+        metrics = {'x.groups_per_second': 700, 'y.allocated_bytes_per_group': 130, 'z.seconds': 1.5}
+        self.assertEqual(len(r.check(metrics, {}, baseline, 0.2)), 3)
+
+    def test_short_timings(self):
+        # Below the timing resolution, relative changes are noise.
+        baseline = {'a.seconds': 0.01, 'b.seconds': 0.2}
+        self.assertEqual(r.check({'a.seconds': 0.03, 'b.seconds': 0.24}, {}, baseline, 0.1), [])
+        self.assertEqual(len(r.check({'a.seconds': 0.03, 'b.seconds': 0.3}, {}, baseline, 0.1)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+// Reads a Blob (e.g. a file) sequentially through Blob.stream(), so that only
+// one chunk of it is in memory at a time, whatever its size.
+//
+// Reads return views into the chunks of the stream when possible, and only
+// copy the records that straddle two chunks. Views are only valid until the
+// next read.
+export class BlobReader {
+  readonly size: number;
+  // Number of bytes returned so far.
+  bytesRead = 0;
+  private reader: ReadableStreamDefaultReader<Uint8Array>;
+  private chunk = new Uint8Array(0);
+  private pos = 0;
+  private done = false;
+  // Holds records that straddle two chunks.
+  private scratch = new Uint8Array(0);
+
+  public constructor(blob: Blob) {
+    this.size = blob.size;
+    this.reader = blob.stream().getReader();
+  }
+
+  // Fraction of the blob read so far, between 0 and 1.
+  public get progress(): number {
+    return this.size > 0 ? this.bytesRead / this.size : 1;
+  }
+
+  // Returns whole `recordSize`-byte records, at most `maxLength` bytes, and at
+  // least one record unless the end of the blob is reached. A truncated last
+  // record is returned as is. An empty array marks the end of the blob.
+  public async readRecords(recordSize: number, maxLength = Infinity): Promise<Uint8Array> {
+    if (this.chunk.length - this.pos < recordSize && !(await this.fill(recordSize))) {
+      // Partial record, from several chunks.
+      return this.readExactly(recordSize);
+    }
+    const available = this.chunk.length - this.pos;
+    const limit = Math.max(recordSize, Math.floor(maxLength / recordSize) * recordSize);
+    return this.take(Math.min(available - available % recordSize, limit));
+  }
+
+  // Returns the next `length` bytes, or fewer at the end of the blob.
+  public async readExactly(length: number): Promise<Uint8Array> {
+    if (this.chunk.length - this.pos >= length) {
+      return this.take(length);
+    }
+    if (this.scratch.length < length) {
+      this.scratch = new Uint8Array(length);
+    }
+    let filled = 0;
+    while (filled < length) {
+      if (this.pos == this.chunk.length && !(await this.next())) {
+        break;
+      }
+      const part = this.take(Math.min(length - filled, this.chunk.length - this.pos));
+      this.scratch.set(part, filled);
+      filled += part.length;
+    }
+    return this.scratch.subarray(0, filled);
+  }
+
+  // Skips `length` bytes, or up to the end of the blob. Returns the number of
+  // bytes skipped.
+  public async skip(length: number): Promise<number> {
+    let skipped = 0;
+    while (skipped < length) {
+      if (this.pos == this.chunk.length && !(await this.next())) {
+        break;
+      }
+      skipped += this.take(Math.min(length - skipped, this.chunk.length - this.pos)).length;
+    }
+    return skipped;
+  }
+
+  // Returns the lines of text of the rest of the blob, decoded as UTF-8, a
+  // chunk at a time. Line terminators are removed.
+  public async *lines(): AsyncGenerator<string[]> {
+    const decoder = new TextDecoder();
+    let partial = "";
+    for (;;) {
+      const bytes = await this.readRecords(1);
+      const text = partial + decoder.decode(bytes, {stream: bytes.length > 0});
+      const lines = text.split(/\r?\n/);
+      if (bytes.length == 0) {
+        if (text.length > 0) yield lines;
+        return;
+      }
+      partial = lines.pop() ?? "";
+      if (lines.length > 0) yield lines;
+    }
+  }
+
+  // Stops reading, releasing the stream.
+  public async cancel() {
+    this.done = true;
+    this.chunk = new Uint8Array(0);
+    this.pos = 0;
+    await this.reader.cancel();
+  }
+
+  private take(length: number): Uint8Array {
+    const view = this.chunk.subarray(this.pos, this.pos + length);
+    this.pos += length;
+    this.bytesRead += length;
+    return view;
+  }
+
+  // Moves on to the next non-empty chunk if the current one is exhausted.
+  // Returns whether the current chunk then holds at least `length` bytes.
+  private async fill(length: number): Promise<boolean> {
+    while (this.pos == this.chunk.length) {
+      if (!(await this.next())) return false;
+    }
+    return this.chunk.length - this.pos >= length;
+  }
+
+  // Moves on to the next chunk of the stream, returning false at the end.
+  private async next(): Promise<boolean> {
+    if (this.done) return false;
+    const {done, value} = await this.reader.read();
+    if (done || value == undefined) {
+      this.done = true;
+      this.chunk = new Uint8Array(0);
+      this.pos = 0;
+      return false;
+    }
+    this.chunk = value;
+    this.pos = 0;
+    return true;
+  }
+}
@@ -0,0 +1,56 @@
+import { BlobReader } from "./blob_reader";
+
+// Returns a blob made of `parts`, which Blob.stream() may return as separate
+// chunks.
+function blob(...parts: Array<string | number[]>): Blob {
+  return new Blob(parts.map((p) => typeof p == "string" ? p : new Uint8Array(p)));
+}
+
+async function readAll(reader: BlobReader, recordSize: number, maxLength?: number): Promise<number[][]> {
+  const reads: number[][] = [];
+  for (;;) {
+    const bytes = await reader.readRecords(recordSize, maxLength);
+    if (bytes.length == 0) return reads;
+    reads.push(Array.from(bytes));
+  }
+}
+
+describe("BlobReader", () => {
+  it("should read whole records, across chunks", async () => {
+    const bytes = Array.from({length: 100}, (_, i) => i);
+    const reader = new BlobReader(new Blob(
+      [bytes.slice(0, 33), bytes.slice(33, 34), bytes.slice(34)].map((p) => new Uint8Array(p))));
+    const reads = await readAll(reader, 4);
+    expect(reads.every((r) => r.length % 4 == 0)).toBeTrue();
+    expect(reads.flat()).toEqual(bytes);
+    expect(reader.bytesRead).toBe(100);
+    expect(reader.progress).toBe(1);
+  });
+
+  it("should return a truncated last record", async () => {
+    const reads = await readAll(new BlobReader(blob([1, 2, 3, 4, 5, 6, 7])), 3);
+    expect(reads.flat()).toEqual([1, 2, 3, 4, 5, 6, 7]);
+    expect(reads[reads.length - 1]).toEqual([7]);
+  });
+
+  it("should limit the length of reads", async () => {
+    const reads = await readAll(new BlobReader(blob(Array(100).fill(1))), 3, 10);
+    expect(reads.slice(0, -1).every((r) => r.length == 9)).toBeTrue();
+    expect(reads.flat().length).toBe(100);
+  });
+
+  it("should skip and read exactly", async () => {
+    const reader = new BlobReader(blob([1, 2], [3, 4, 5], [6]));
+    expect(await reader.skip(1)).toBe(1);
+    expect(Array.from(await reader.readExactly(4))).toEqual([2, 3, 4, 5]);
+    expect(await reader.skip(10)).toBe(1);
+    expect((await reader.readExactly(1)).length).toBe(0);
+  });
+
+  it("should split lines across chunks", async () => {
+    const reader = new BlobReader(blob("F201 0408 2037 2020\r\nF201 04", "09 383B 494E\n\nF201 é", [0xC3], [0xA9]));
+    const lines: string[] = [];
+    for await (const l of reader.lines()) lines.push(...l);
+    expect(lines).toEqual(["F201 0408 2037 2020", "F201 0409 383B 494E", "", "F201 éé"]);
+  });
+});
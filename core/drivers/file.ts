@@ -1,10 +1,44 @@
 import { FMDemodulator } from "@jtarrio/webrtlsdr/dsp/demodulators";
-import { RdsPipeline, RdsSource, SeekDirection, parseHexGroup } from "./input";
-
+import { BlobReader } from "./blob_reader";
+import { Block, Group, RdsPipeline, RdsReportEventType, RdsSource, SeekDirection, parseHexGroup } from "./input";
+
+// Sample rate of the MPX demodulators.
+const SAMPLE_RATE = 250000;
+
+// Blocksize is chosen so that blockSize samples represent a bit less than
+// one group (so the UI is fluid). Since there are 11.4 groups per second,
+// we want sampleRate / blockSize to be 11.4, or a bit more. In addition,
+// we want blockSize to be a power of 2 (so that computing the modulo is
+// cheap). Therefore, it's the greatest power of 2 such that
+// sampleRate / blockSize >= 11.4.
+const BLOCK_SIZE = 16384;
+
+const BIT_RATE = 1187.5;
+
+// Duration of a group (104 bits), in milliseconds.
+const GROUP_DURATION = 1000 * 104 / BIT_RATE;
+
+// Bytes of unsynchronized bit streams passed to the pipeline at once: 8 bytes
+// (64 bits) in real time, more in fast playback.
+const REALTIME_BIT_BYTES = 8;
+const FAST_BIT_BYTES = 4096;
+
+// Largest number of group archive records read at once.
+const ARCHIVE_RECORDS_PER_READ = 4096;
+
+// Plays files: group logs, group archives, unsynchronized bit streams and
+// MPX or I/Q recordings. Files are streamed, so that their size does not
+// matter, except for audio files that Web Audio has to decode (FLAC files,
+// and WAV files at other sample rates or in other sample formats), which are
+// read at once.
 export class FileSource implements RdsSource {
   public name = "File";
   public realtimePlayback: boolean = false;
+  // Called with the fraction of the file played so far, at most once per
+  // frame.
+  public onProgress?: (progress: number) => void;
   private blob?: Blob;
+  private reader?: BlobReader;
   private stoppingPlayback = true;
 
   constructor (private pipeline: RdsPipeline) {}
@@ -23,94 +57,172 @@ export class FileSource implements RdsSource {
     }
 
     this.stoppingPlayback = false;
-    const header = await this.blob.slice(0, 16).arrayBuffer();
+    const blob = this.blob;
+    const header = await blob.slice(0, 16).arrayBuffer();
+    const reader = new BlobReader(blob);
+    this.reader = reader;
     switch (guessFileType(new Uint8Array(header))) {
-      case FileType.HEX_GROUPS: {
-        const text = await this.blob.text();
-        this.processTextualGroups(text);
+      case FileType.HEX_GROUPS:
+        this.processTextualGroups(reader);
         return true;
-      }
 
-      case FileType.UNSYNCED_BINARY_RDS: {
-        const bytes = await this.blob.arrayBuffer();
-        this.processBinaryGroups(new Uint8Array(bytes));
+      case FileType.GROUP_ARCHIVE:
+        this.processGroupArchive(reader);
+        return true;
+
+      case FileType.UNSYNCED_BINARY_RDS:
+        this.processBinaryGroups(reader);
+        return true;
+
+      case FileType.AUDIO_WAV:
+        this.processWav(reader, blob);
         return true;
-      }
 
       case FileType.AUDIO_FLAC:
-      case FileType.AUDIO_WAV: {
-        const buffer = await this.blob.arrayBuffer();
-        this.processAudio(buffer);
+        // Web Audio only decodes whole files.
+        await reader.cancel();
+        this.processAudio(await blob.arrayBuffer());
         return true;
-      }
     }
+    await reader.cancel();
     return false;
   }
 
   public async stop(): Promise<void> {
     this.stoppingPlayback = true;
+    await this.reader?.cancel();
   }
 
   public setBlob(blob: Blob): void {
     this.blob = blob;
   }
 
-  async processTextualGroups(s: string) {
-    const timing = new Timing();
-    for (let l of s.split('\n')) {
-      const event = parseHexGroup(l);
-      if (event == undefined) {
-        continue;
+  async processTextualGroups(reader: BlobReader) {
+    const pacer = this.pacer(reader);
+    for await (const lines of reader.lines()) {
+      for (const l of lines) {
+        const event = parseHexGroup(l);
+        if (event == undefined) {
+          continue;
+        }
+        this.pipeline.processRdsReportEvent(event);
+        if (this.stoppingPlayback) {
+          return;
+        }
+        // Stream 0 groups (which are always present) set the cadence: each
+        // lasts a group duration.
+        const wait = pacer.tick(event.stream == 0 ? GROUP_DURATION : 0);
+        if (wait != null) await wait;
+      }
+    }
+    this.end();
+  }
+
+  // Plays a group archive written by core/protocol/group_archive.py: a 16-byte
+  // header, then 14-byte records holding 4 blocks, their error counts, the
+  // stream number, and the reception time in centiseconds.
+  async processGroupArchive(reader: BlobReader) {
+    const pacer = this.pacer(reader);
+    let lastTime = 0;
+    await reader.skip(ARCHIVE_HEADER_SIZE);
+    for (;;) {
+      const records = await reader.readRecords(ARCHIVE_RECORD_SIZE, ARCHIVE_RECORDS_PER_READ * ARCHIVE_RECORD_SIZE);
+      const data = new DataView(records.buffer, records.byteOffset, records.length);
+      if (data.byteLength < ARCHIVE_RECORD_SIZE) {
+        break;
+      }
+      for (let pos = 0; pos + ARCHIVE_RECORD_SIZE <= data.byteLength; pos += ARCHIVE_RECORD_SIZE) {
+        const info = data.getUint16(pos + 8, true);
+        const time = data.getUint32(pos + 10, true);
+        const block = (i: number) => new Block(data.getUint16(pos + 2 * i, true), (info >> (3 * i)) & 0b111);
+        this.pipeline.processRdsReportEvent({
+          type: RdsReportEventType.GROUP,
+          stream: (info >> 12) & 0b11,
+          group: new Group([block(0), block(1), block(2), block(3)]),
+          sourceInfo: "file"
+        });
+        if (this.stoppingPlayback) {
+          return;
+        }
+        const wait = pacer.tick(10 * (time - lastTime));
+        lastTime = time;
+        if (wait != null) await wait;
+      }
+    }
+    this.end();
+  }
+
+  async processBinaryGroups(reader: BlobReader) {
+    const pacer = this.pacer(reader);
+    for (;;) {
+      const bytes = await reader.readRecords(1, this.realtimePlayback ? REALTIME_BIT_BYTES : FAST_BIT_BYTES);
+      if (bytes.length == 0) {
+        break;
       }
-      this.pipeline.processRdsReportEvent(event);
+      this.pipeline.processBits(bytes);
       if (this.stoppingPlayback) {
         return;
       }
-      // Stream 0 groups (which are always present) set the cadence. Enforce
-      // duration of a group (1000 ms / (1187.5/104)) each time a Stream 0
-      // group is received.
-      await timing.enforceInterval(
-        this.realtimePlayback && event.stream == 0 ? (1000 / (1187.5/104)) : 0);
+      const wait = pacer.tick(1000 * 8 * bytes.length / BIT_RATE);
+      if (wait != null) await wait;
     }
-    this.pipeline.reportSourceEnd();
+    this.end();
   }
 
-  async processBinaryGroups(data: Uint8Array) {
-    let remainingLength = data.length;
-    let pos = 0;
-
-    const timing = new Timing();
-    while (remainingLength > 0) {
-      const l = Math.min(remainingLength, 8);
-      const dataSlice = data.slice(pos, pos+l);
-      pos += 8;
-      remainingLength -= 8;
-      this.pipeline.processBits(dataSlice);
+  // Plays a WAV file. It is streamed if it holds 16-bit integer or 32-bit
+  // float samples at SAMPLE_RATE, and decoded at once with Web Audio
+  // otherwise.
+  async processWav(reader: BlobReader, blob: Blob) {
+    const format = await readWavHeader(reader);
+    if (format == null) {
+      await reader.cancel();
+      await this.processAudio(await blob.arrayBuffer());
+      return;
+    }
 
+    const pacer = this.pacer(reader);
+    const bytesPerSample = format.float ? 4 : 2;
+    const frameSize = format.channels * bytesPerSample;
+    const samplesI = new Float32Array(BLOCK_SIZE);
+    const samplesQ = new Float32Array(BLOCK_SIZE);
+    const out = new Float32Array(BLOCK_SIZE);
+    const demodulator = new FMDemodulator(MAX_FM_DEVIATION / SAMPLE_RATE);
+    let remaining = format.dataLength;
+    while (remaining >= frameSize) {
+      const bytes = await reader.readRecords(frameSize, Math.min(remaining, BLOCK_SIZE * frameSize));
+      const data = new DataView(bytes.buffer, bytes.byteOffset, bytes.length);
+      const count = Math.floor(bytes.length / frameSize);
+      if (count == 0) {
+        break;
+      }
+      remaining -= bytes.length;
+      for (let i = 0, pos = 0; i < count; i++, pos += frameSize) {
+        samplesI[i] = format.float ? data.getFloat32(pos, true) : data.getInt16(pos, true) / 32768;
+        if (format.channels == 2) {
+          const posQ = pos + bytesPerSample;
+          samplesQ[i] = format.float ? data.getFloat32(posQ, true) : data.getInt16(posQ, true) / 32768;
+        }
+      }
+      if (format.channels == 2) {
+        demodulator.demodulate(samplesI.subarray(0, count), samplesQ.subarray(0, count), out);
+        this.pipeline.processMpxSamples(out, count);
+      } else {
+        this.pipeline.processMpxSamples(samplesI, count);
+      }
       if (this.stoppingPlayback) {
         return;
       }
-      // Duration of a slice of 8*8 bits.
-      await timing.enforceInterval(this.realtimePlayback ? 1000 / (1187.5/(8*8)) : 0);
+      const wait = pacer.tick(count * 1000 / SAMPLE_RATE);
+      if (wait != null) await wait;
     }
-    this.pipeline.reportSourceEnd();
+    this.end();
   }
 
   async processAudio(buffer: ArrayBuffer) {
-    const sampleRate = 250000;
-    // Blocksize is chosen so that blockSize samples represent a bit less than
-    // one group (so the UI is fluid). Since there are 11.4 groups per second,
-    // we want sampleRate / blockSize to be 11.4, or a bit more. In addition,
-    // we want blockSize to be a power of 2 (so that computing the modulo is
-    // cheap). Therefore, it's the greatest power of 2 such that
-    // sampleRate / blockSize >= 11.4.
-    const blockSize = 16384;
-    const delayBetweenBlocks = blockSize * 1000 / sampleRate;
-
     const context = new OfflineAudioContext(
       1,        // Number of channels.
       1000000,  // Length.
-      sampleRate
+      SAMPLE_RATE
     );
     
     const audioBuffer = await context.decodeAudioData(buffer);
@@ -118,81 +230,175 @@ export class FileSource implements RdsSource {
     switch (audioBuffer.numberOfChannels) {
       case 1:
         console.log("Processing MPX file.");
-        await this.processMpx(blockSize, delayBetweenBlocks, audioBuffer.getChannelData(0));
+        await this.processMpx(audioBuffer.getChannelData(0));
         break;
 
       case 2:
         console.log("Processing I/Q file.");
-        await this.processIq(sampleRate, blockSize, delayBetweenBlocks, audioBuffer.getChannelData(0), audioBuffer.getChannelData(1));
+        await this.processIq(audioBuffer.getChannelData(0), audioBuffer.getChannelData(1));
         break;
 
       default:
         console.log(`Don't know what to do with ${audioBuffer.numberOfChannels}-channel audio file.`);
     }
-    this.pipeline.reportSourceEnd();
+    if (!this.stoppingPlayback) {
+      this.end();
+    }
   }
 
-  async processMpx(blockSize: number, delayBetweenBlocks: number, samples: Float32Array) {
-    const timing = new Timing();
+  async processMpx(samples: Float32Array) {
+    const pacer = this.pacer(null, samples.length);
 
-    for (let i = 0; i < samples.length; i += blockSize) {
-      const slice = samples.slice(i, Math.min(i + blockSize, samples.length));
+    for (let i = 0; i < samples.length; i += BLOCK_SIZE) {
+      const slice = samples.subarray(i, Math.min(i + BLOCK_SIZE, samples.length));
       this.pipeline.processMpxSamples(slice);
       if (this.stoppingPlayback) {
         return;
       }
-      await timing.enforceInterval(this.realtimePlayback ? delayBetweenBlocks : 0);
+      const wait = pacer.tick(slice.length * 1000 / SAMPLE_RATE, i + slice.length);
+      if (wait != null) await wait;
     }
   }
 
-  async processIq(sampleRate: number, blockSize: number, delayBetweenBlocks: number,
-                  samplesI: Float32Array, samplesQ: Float32Array) {
-    const timing = new Timing();
-    const demodulator = new FMDemodulator(MAX_FM_DEVIATION / sampleRate);
-    const out = new Float32Array(blockSize);
+  async processIq(samplesI: Float32Array, samplesQ: Float32Array) {
+    const pacer = this.pacer(null, samplesI.length);
+    const demodulator = new FMDemodulator(MAX_FM_DEVIATION / SAMPLE_RATE);
+    const out = new Float32Array(BLOCK_SIZE);
 
-    for (let i = 0; i < samplesI.length; i += blockSize) {
-      const sliceI = samplesI.slice(i, Math.min(i + blockSize, samplesI.length));
-      const sliceQ = samplesQ.slice(i, Math.min(i + blockSize, samplesQ.length));
+    for (let i = 0; i < samplesI.length; i += BLOCK_SIZE) {
+      // Views, not copies: the channel data is not modified.
+      const sliceI = samplesI.subarray(i, Math.min(i + BLOCK_SIZE, samplesI.length));
+      const sliceQ = samplesQ.subarray(i, Math.min(i + BLOCK_SIZE, samplesQ.length));
       demodulator.demodulate(sliceI, sliceQ, out);
       this.pipeline.processMpxSamples(out, sliceI.length);
       if (this.stoppingPlayback) {
         return;
       }
-      await timing.enforceInterval(this.realtimePlayback ? delayBetweenBlocks : 0);
+      const wait = pacer.tick(sliceI.length * 1000 / SAMPLE_RATE, i + sliceI.length);
+      if (wait != null) await wait;
     }
   }
+
+  // Returns a pacer reporting the progress of `reader`, or else of the
+  // position passed to Pacer.tick() among `total` items.
+  private pacer(reader: BlobReader | null, total = 0): Pacer {
+    return new Pacer(() => this.realtimePlayback, (position) => {
+      this.onProgress?.(reader != null ? reader.progress : position / total);
+    });
+  }
+
+  private end() {
+    this.onProgress?.(1);
+    this.pipeline.reportSourceEnd();
+  }
 }
 
 async function sleep(duration_msec: number) {
   return new Promise(resolve => setTimeout(resolve, duration_msec));
 }
 
-class Timing {
-  lastTimestamp = 0;
-
-  async enforceInterval(duration_msec: number) {
-    if (this.lastTimestamp == 0) {
-      this.lastTimestamp = Date.now();  // Milliseconds since epoch.
-      return;
+// Minimum interval between two yields to the event loop in fast playback,
+// i.e. a frame at 60 Hz.
+const FRAME_DURATION = 16;
+
+// How late real time playback may get before it stops catching up, e.g.
+// after fast playback.
+const MAX_LAG = 100;
+
+// Paces playback. In real time, it waits so that items are played at the
+// pace of their durations. In fast playback, items are processed
+// synchronously, thousands of them per task: it only yields to the event loop
+// once per frame, so that the UI stays responsive and shows the changes, and
+// reports progress then.
+class Pacer {
+  // When the items played so far end, in real time.
+  private due = 0;
+  private lastYield = Date.now();
+
+  constructor(private realtime: () => boolean, private onFrame: (position: number) => void) {}
+
+  // Accounts for an item lasting `duration_msec`, up to `position` if the
+  // progress is not that of a BlobReader. Returns a promise to await before
+  // processing the next item, or null to go on synchronously.
+  tick(duration_msec: number, position = 0): Promise<unknown> | null {
+    const now = Date.now();
+    let wait = 0;
+    if (this.realtime()) {
+      this.due = Math.max(this.due, now - MAX_LAG) + duration_msec;
+      wait = this.due - now;
+    }
+    if (wait <= 0 && now - this.lastYield < FRAME_DURATION) {
+      return null;
     }
+    this.lastYield = now;
+    this.onFrame(position);
+    return sleep(Math.max(wait, 0));
+  }
+}
 
-    // If we're not actually waiting (duration_msec = 0), then ensure we don't
-    // call sleep more than 10x per second (i.e. with intervals shorter than 100
-    // ms). The purpose is to be fast when we need to.
-    const timestamp = Date.now();
+// Format of the samples of a WAV file that can be streamed.
+interface WavFormat {
+  channels: number;
+  // 32-bit float samples if true, 16-bit integer samples otherwise.
+  float: boolean;
+  // Size of the samples, in bytes.
+  dataLength: number;
+}
 
-    if (duration_msec == 0 && timestamp - this.lastTimestamp < 100) {
-      return;
+const WAVE_FORMAT_PCM = 1;
+const WAVE_FORMAT_IEEE_FLOAT = 3;
+const WAVE_FORMAT_EXTENSIBLE = 0xFFFE;
+
+// Reads the header of a WAV file, up to the samples. Returns their format, or
+// null if they cannot be streamed.
+async function readWavHeader(reader: BlobReader): Promise<WavFormat | null> {
+  // "RIFF", the size, "WAVE".
+  await reader.skip(12);
+  let format: {tag: number, channels: number, sampleRate: number, bits: number} | null = null;
+  for (;;) {
+    const header = await reader.readExactly(8);
+    if (header.length < 8) {
+      return null;
+    }
+    const id = String.fromCharCode(...header.subarray(0, 4));
+    const size = new DataView(header.buffer, header.byteOffset, 8).getUint32(4, true);
+    if (id == "fmt ") {
+      const fmt = await reader.readExactly(size);
+      if (fmt.length < 16) {
+        return null;
+      }
+      const data = new DataView(fmt.buffer, fmt.byteOffset, fmt.length);
+      const tag = data.getUint16(0, true);
+      format = {
+        // The sub-format GUID starts with the format tag.
+        tag: tag == WAVE_FORMAT_EXTENSIBLE && fmt.length >= 26 ? data.getUint16(24, true) : tag,
+        channels: data.getUint16(2, true),
+        sampleRate: data.getUint32(4, true),
+        bits: data.getUint16(14, true),
+      };
+      await reader.skip(size % 2);
+    } else if (id == "data") {
+      if (format == null || format.sampleRate != SAMPLE_RATE || (format.channels != 1 && format.channels != 2)) {
+        return null;
+      }
+      const float = format.tag == WAVE_FORMAT_IEEE_FLOAT && format.bits == 32;
+      if (!float && !(format.tag == WAVE_FORMAT_PCM && format.bits == 16)) {
+        return null;
+      }
+      // Recorders that cannot seek back leave the size at 0 or 0xFFFFFFFF.
+      return {channels: format.channels, float, dataLength: size == 0 ? Infinity : size};
+    } else {
+      await reader.skip(size + size % 2);
     }
-
-    const sleepDuration = this.lastTimestamp + duration_msec - timestamp;
-    await sleep(sleepDuration > 0 ? sleepDuration : 0);
-    this.lastTimestamp = Date.now();
   }
 }
 
+const ARCHIVE_MAGIC = "RDSGARC1";
+const ARCHIVE_HEADER_SIZE = 16;
+const ARCHIVE_RECORD_SIZE = 14;
+
 enum FileType {
+  GROUP_ARCHIVE,
   UNSYNCED_BINARY_RDS,
   HEX_GROUPS,
   AUDIO_FLAC,
@@ -200,6 +406,10 @@ enum FileType {
 }
 
 function guessFileType(header: Uint8Array): FileType {
+  if (String.fromCharCode(...header.subarray(0, ARCHIVE_MAGIC.length)) == ARCHIVE_MAGIC) {
+    return FileType.GROUP_ARCHIVE;
+  }
+
   if (
       header[0] == 0x52 &&   // R
       header[1] == 0x49 &&   // I
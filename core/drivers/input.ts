@@ -35,6 +35,8 @@ export enum RdsReportEventType {
   INFO_REPORT
 }
 
+// Receives the data of an RdsSource. Sources may pass views into buffers that
+// they reuse: the arrays are only valid during the calls.
 export interface RdsPipeline {
   processMpxSamples(samples: Float32Array, length?: number): void;
   processBits(bytes: Uint8Array): void;
@@ -0,0 +1,18 @@
+import { serveDecoder } from "./ring_decoder";
+import { WorkerResponse } from "./worker_pipeline";
+
+// Entry point of the decoder worker in browsers, see worker_pipeline.ts.
+
+interface WorkerScope {
+  postMessage(message: WorkerResponse, transfer: ArrayBuffer[]): void;
+  onmessage: ((e: MessageEvent) => void) | null;
+}
+
+const scope = globalThis as unknown as WorkerScope;
+
+serveDecoder({
+  post: (message, transfer) => scope.postMessage(message, transfer),
+  listen: (handler) => {
+    scope.onmessage = (e) => handler(e.data);
+  },
+});
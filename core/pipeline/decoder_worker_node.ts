@@ -0,0 +1,26 @@
+import { serveDecoder } from "./ring_decoder";
+import { WorkerRequest, WorkerResponse } from "./worker_pipeline";
+
+// Entry point of the decoder worker under Node.js, in a worker_threads
+// Worker, see worker_pipeline.ts.
+//
+// core does not depend on @types/node: the worker_threads API used here is
+// declared below.
+
+declare const require: (id: string) => unknown;
+
+interface ParentPort {
+  postMessage(message: WorkerResponse, transfer: ArrayBuffer[]): void;
+  on(event: "message", handler: (message: WorkerRequest) => void): void;
+}
+
+const port = (require("worker_threads") as {parentPort: ParentPort | null}).parentPort;
+if (port == null) {
+  throw new Error("decoder_worker_node must run in a worker thread");
+}
+const parent = port;
+
+serveDecoder({
+  post: (message, transfer) => parent.postMessage(message, transfer),
+  listen: (handler) => parent.on("message", handler),
+});
@@ -0,0 +1,186 @@
+import { Group, RdsPipeline, RdsReportEvent, RdsReportEventType } from "../drivers/input";
+import { LogEntries, parse_group, StationImpl } from "../protocol/rds_types";
+import { ReceiverEventKind, StationChangeDetector } from "../protocol/station_change";
+import { BitStreamSynchronizer } from "../signals/bitstream";
+import { FREQ_STREAMS, MultiStreamDemodulator } from "../signals/mpx";
+import { RingReader, SharedRing } from "./shared_ring";
+import { DecoderUpdate, NEW_STATION, WorkerRequest, WorkerResponse } from "./worker_pipeline";
+
+// Decoding side of the worker pipeline: reads the records a source wrote to a
+// SharedRing, runs the MPX demodulators, the bit stream synchronizers, station
+// change detection and the parse functions, and summarizes what changed in
+// DecoderUpdates. It does not depend on the thread it runs on:
+// decoder_worker.ts runs it in a worker, tests run it directly.
+
+export class RingDecoder implements RingReader, RdsPipeline {
+  readonly station = new StationImpl();
+  maxErrors: number;
+  private stationChangeDetector = new StationChangeDetector();
+  private synchronizers: BitStreamSynchronizer[];
+  private mpxDemodulator: MultiStreamDemodulator;
+
+  // Contents of the next update.
+  private groups: number[] = [];
+  private unsynced: number[] = [];
+  private logs: LogEntries[] = [];
+  private mpxProcessed = false;
+  private frequencyKhz?: number;
+  private sourceEnded = false;
+
+  public constructor(private ring: SharedRing, maxErrors = 0) {
+    this.maxErrors = maxErrors;
+    this.synchronizers = FREQ_STREAMS.map((_, i) => new BitStreamSynchronizer(i, this));
+    this.mpxDemodulator = new MultiStreamDemodulator(this.synchronizers);
+  }
+
+  // Processes the records written to the ring so far, at most `maxRecords`,
+  // and returns what changed, or null if nothing did.
+  public drain(maxRecords = Infinity): DecoderUpdate | null {
+    this.ring.read(this, maxRecords);
+    return this.takeUpdate();
+  }
+
+  // RingReader.
+
+  public processGroup(stream: number, group: Group) {
+    for (const event of this.stationChangeDetector.processGroup(stream, group, this.maxErrors)) {
+      switch (event.kind) {
+        case ReceiverEventKind.NewStationEvent:
+          this.station.reset();
+          this.groups.push(NEW_STATION, event.pi, 0, 0, 0, 0, 0, 0, 0);
+          break;
+
+        case ReceiverEventKind.GroupEvent: {
+          const log = this.station.log.next();
+          log.add(event.stream + ':[' + event.hexDump() + '] ', false);
+          parse_group(event.stream, event.group, event.maxErrors, log, this.station);
+          this.station.tickGroupDuration();
+          this.logs.push(log.entries());
+          const blocks = event.group.blocks;
+          this.groups.push(
+            event.stream,
+            blocks[0].value, blocks[1].value, blocks[2].value, blocks[3].value,
+            blocks[0].errorCount, blocks[1].errorCount, blocks[2].errorCount, blocks[3].errorCount);
+          break;
+        }
+      }
+    }
+  }
+
+  public processBits(bytes: Uint8Array) {
+    this.synchronizers[0].addBits(bytes);
+  }
+
+  public processMpxSamples(samples: Float32Array) {
+    this.mpxDemodulator.addSamples(samples);
+    this.mpxProcessed = true;
+  }
+
+  public processUnsyncedGroupDuration(stream: number) {
+    this.unsynced.push(stream);
+  }
+
+  public reportFrequency(frequencyKhz: number) {
+    this.frequencyKhz = frequencyKhz;
+  }
+
+  public reportSourceEnd() {
+    this.sourceEnded = true;
+  }
+
+  // RdsPipeline, for the groups of the bit stream synchronizers.
+
+  public processRdsReportEvent(event: RdsReportEvent) {
+    if (event.type == RdsReportEventType.GROUP && event.group != undefined) {
+      this.processGroup(event.stream ?? 0, event.group);
+    } else if (event.type == RdsReportEventType.UNSYNCED_GROUP_DURATION && event.stream != undefined) {
+      this.processUnsyncedGroupDuration(event.stream);
+    }
+  }
+
+  private takeUpdate(): DecoderUpdate | null {
+    const changed = this.station.changes.any();
+    if (this.groups.length == 0 && this.unsynced.length == 0 && !changed && !this.mpxProcessed &&
+        this.frequencyKhz == undefined && !this.sourceEnded) {
+      return null;
+    }
+    const update: DecoderUpdate = {
+      groups: Uint16Array.from(this.groups),
+      unsynced: this.unsynced,
+      logs: this.logs,
+      changedFields: this.station.changes.fields(),
+      snapshot: changed ? this.station.snapshot() : undefined,
+      constellation: this.mpxProcessed ? {
+        i: this.mpxDemodulator.demodulators[0].syncOutI.slice(),
+        q: this.mpxDemodulator.demodulators[0].syncOutQ.slice(),
+      } : undefined,
+      frequencyKhz: this.frequencyKhz,
+      sourceEnded: this.sourceEnded,
+    };
+    this.station.changes.clear();
+    this.groups = [];
+    this.unsynced = [];
+    this.logs = [];
+    this.mpxProcessed = false;
+    this.frequencyKhz = undefined;
+    this.sourceEnded = false;
+    return update;
+  }
+}
+
+// Largest number of records processed per update, so that updates keep
+// flowing while the worker catches up with a backlog.
+const RECORDS_PER_UPDATE = 4096;
+
+// Message channel of a decoder worker to the thread running the
+// WorkerPipeline.
+export interface DecoderEndpoint {
+  post(message: WorkerResponse, transfer: ArrayBuffer[]): void;
+  listen(handler: (message: WorkerRequest) => void): void;
+}
+
+// Runs a RingDecoder on the ring that the WorkerPipeline at the other end of
+// `endpoint` sends. Records are decoded in batches of RECORDS_PER_UPDATE,
+// each run by `schedule`, so that messages and module imports (see
+// LazyModule) are handled in between while the ring stays busy.
+export function serveDecoder(
+    endpoint: DecoderEndpoint, schedule: (task: () => void) => void = (task) => setTimeout(task, 0)) {
+  let ring: SharedRing | null = null;
+  let decoder: RingDecoder | null = null;
+  let scheduled = false;
+
+  const drain = () => {
+    scheduled = false;
+    if (ring == null || decoder == null) {
+      return;
+    }
+    const update = decoder.drain(RECORDS_PER_UPDATE);
+    if (update != null) {
+      endpoint.post({type: "update", update}, [update.groups.buffer]);
+    }
+    if (ring.setIdle()) {
+      // The pipeline may wait for room in the ring.
+      endpoint.post({type: "idle"}, []);
+    } else {
+      scheduled = true;
+      schedule(drain);
+    }
+  };
+
+  endpoint.listen((message) => {
+    switch (message.type) {
+      case "init":
+        ring = new SharedRing(message.buffer);
+        decoder = new RingDecoder(ring, message.maxErrors);
+        break;
+      case "maxErrors":
+        if (decoder != null) decoder.maxErrors = message.maxErrors;
+        return;
+      case "wake":
+        break;
+    }
+    if (!scheduled) {
+      drain();
+    }
+  });
+}
@@ -0,0 +1,239 @@
+import { Block, Group } from "../drivers/input";
+
+// Single-producer, single-consumer ring buffer of input records (groups, bit
+// slices, MPX samples, ...) in a SharedArrayBuffer, through which a source on
+// one thread feeds a decoder on another one without copying or messaging
+// each record.
+//
+// The buffer holds a header of HEADER_WORDS 32-bit words (write and read
+// counters, consumer idle flag), then the records. Counters count bytes since
+// the creation of the ring and wrap at 2^32; the capacity is a power of 2, so
+// that they map to offsets with a mask. A record is a kind and a payload
+// length (two 32-bit words), then the payload, padded to RECORD_ALIGN bytes.
+// Records never wrap around the end of the buffer: a PADDING record fills it
+// instead.
+
+export enum RingRecord {
+  PADDING,
+  // 4 blocks (16 bits each), 4 error counts (8 bits each), stream.
+  GROUP,
+  // Bytes of an unsynchronized bit stream, most significant bit first.
+  BITS,
+  // MPX samples, as 32-bit floats.
+  MPX,
+  // Group duration without synchronization, on a stream.
+  UNSYNCED_GROUP_DURATION,
+  FREQUENCY,
+  SOURCE_END,
+}
+
+// Receives the records read from a SharedRing. Views passed to processBits
+// and processMpxSamples point into the ring: they are only valid during the
+// call.
+export interface RingReader {
+  processGroup(stream: number, group: Group): void;
+  processBits(bytes: Uint8Array): void;
+  processMpxSamples(samples: Float32Array): void;
+  processUnsyncedGroupDuration(stream: number): void;
+  reportFrequency(frequencyKhz: number): void;
+  reportSourceEnd(): void;
+}
+
+const HEADER_WORDS = 4;
+const WRITE = 0;
+const READ = 1;
+const IDLE = 2;
+const RECORD_HEADER_SIZE = 8;
+const RECORD_ALIGN = 8;
+const GROUP_SIZE = 16;
+
+export const DEFAULT_RING_CAPACITY = 1 << 20;
+
+function align(n: number): number {
+  return (n + RECORD_ALIGN - 1) & ~(RECORD_ALIGN - 1);
+}
+
+export class SharedRing {
+  readonly buffer: SharedArrayBuffer;
+  readonly capacity: number;
+  // Largest payload of a record, in bytes.
+  readonly maxPayload: number;
+  private header: Int32Array;
+  private bytes: Uint8Array;
+  private view: DataView;
+
+  // Creates a ring, to be passed to the other thread with `buffer`.
+  public static create(capacity: number = DEFAULT_RING_CAPACITY): SharedRing {
+    if (capacity < 1024 || (capacity & (capacity - 1)) != 0) {
+      throw new RangeError(`Ring capacity must be a power of 2 of at least 1024 bytes, got ${capacity}`);
+    }
+    return new SharedRing(new SharedArrayBuffer(4 * HEADER_WORDS + capacity));
+  }
+
+  // Attaches to a ring created by `create`, possibly on another thread.
+  public constructor(buffer: SharedArrayBuffer) {
+    this.buffer = buffer;
+    this.capacity = buffer.byteLength - 4 * HEADER_WORDS;
+    this.maxPayload = this.capacity / 4;
+    this.header = new Int32Array(buffer, 0, HEADER_WORDS);
+    this.bytes = new Uint8Array(buffer, 4 * HEADER_WORDS, this.capacity);
+    this.view = new DataView(buffer, 4 * HEADER_WORDS, this.capacity);
+  }
+
+  // Number of bytes used by records not read yet.
+  public get used(): number {
+    return (Atomics.load(this.header, WRITE) - Atomics.load(this.header, READ)) >>> 0;
+  }
+
+  // Producer side. Each write returns false, writing nothing, if the ring is
+  // full.
+
+  public writeGroup(stream: number, group: Group): boolean {
+    const pos = this.reserve(RingRecord.GROUP, GROUP_SIZE);
+    if (pos < 0) return false;
+    group.blocks.forEach((b, i) => {
+      this.view.setUint16(pos + 2 * i, b.value, true);
+      this.bytes[pos + 8 + i] = b.errorCount;
+    });
+    this.bytes[pos + 12] = stream;
+    this.commit(GROUP_SIZE);
+    return true;
+  }
+
+  // Writes at most maxPayload bytes.
+  public writeBits(bytes: Uint8Array): boolean {
+    const pos = this.reserve(RingRecord.BITS, bytes.length);
+    if (pos < 0) return false;
+    this.bytes.set(bytes, pos);
+    this.commit(bytes.length);
+    return true;
+  }
+
+  // Writes the first `length` samples, at most maxPayload / 4.
+  public writeMpxSamples(samples: Float32Array, length: number = samples.length): boolean {
+    const pos = this.reserve(RingRecord.MPX, 4 * length);
+    if (pos < 0) return false;
+    new Float32Array(this.buffer, 4 * HEADER_WORDS + pos, length).set(samples.subarray(0, length));
+    this.commit(4 * length);
+    return true;
+  }
+
+  public writeUnsyncedGroupDuration(stream: number): boolean {
+    return this.writeNumber(RingRecord.UNSYNCED_GROUP_DURATION, stream);
+  }
+
+  public writeFrequency(frequencyKhz: number): boolean {
+    return this.writeNumber(RingRecord.FREQUENCY, frequencyKhz);
+  }
+
+  public writeSourceEnd(): boolean {
+    const pos = this.reserve(RingRecord.SOURCE_END, 0);
+    if (pos < 0) return false;
+    this.commit(0);
+    return true;
+  }
+
+  // Returns whether the consumer went idle since the last call, and must be
+  // woken up (e.g. by a message) to read what was written.
+  public takeIdle(): boolean {
+    return Atomics.exchange(this.header, IDLE, 0) == 1;
+  }
+
+  // Consumer side.
+
+  // Reads the records written so far, at most `maxRecords`, and passes them
+  // to `reader`. Returns the number of records read, padding excluded.
+  public read(reader: RingReader, maxRecords = Infinity): number {
+    let count = 0;
+    let read = Atomics.load(this.header, READ) >>> 0;
+    const write = Atomics.load(this.header, WRITE) >>> 0;
+    while (read != write && count < maxRecords) {
+      const offset = read & (this.capacity - 1);
+      const kind = this.view.getUint32(offset, true) as RingRecord;
+      const length = this.view.getUint32(offset + 4, true);
+      const pos = offset + RECORD_HEADER_SIZE;
+      switch (kind) {
+        case RingRecord.PADDING:
+          break;
+        case RingRecord.GROUP: {
+          const block = (i: number) => new Block(this.view.getUint16(pos + 2 * i, true), this.bytes[pos + 8 + i]);
+          reader.processGroup(this.bytes[pos + 12], new Group([block(0), block(1), block(2), block(3)]));
+          break;
+        }
+        case RingRecord.BITS:
+          reader.processBits(this.bytes.subarray(pos, pos + length));
+          break;
+        case RingRecord.MPX:
+          reader.processMpxSamples(new Float32Array(this.buffer, 4 * HEADER_WORDS + pos, length / 4));
+          break;
+        case RingRecord.UNSYNCED_GROUP_DURATION:
+          reader.processUnsyncedGroupDuration(this.view.getFloat64(pos, true));
+          break;
+        case RingRecord.FREQUENCY:
+          reader.reportFrequency(this.view.getFloat64(pos, true));
+          break;
+        case RingRecord.SOURCE_END:
+          reader.reportSourceEnd();
+          break;
+      }
+      if (kind != RingRecord.PADDING) count++;
+      read = (read + RECORD_HEADER_SIZE + align(length)) >>> 0;
+      // Free the record as soon as it is processed.
+      Atomics.store(this.header, READ, read | 0);
+    }
+    return count;
+  }
+
+  // Marks the consumer idle, i.e. waiting to be woken up, unless records were
+  // written meanwhile. Returns whether it is idle.
+  public setIdle(): boolean {
+    Atomics.store(this.header, IDLE, 1);
+    if (this.used > 0) {
+      Atomics.store(this.header, IDLE, 0);
+      return false;
+    }
+    return true;
+  }
+
+  private writeNumber(kind: RingRecord, n: number): boolean {
+    const pos = this.reserve(kind, 8);
+    if (pos < 0) return false;
+    this.view.setFloat64(pos, n, true);
+    this.commit(8);
+    return true;
+  }
+
+  // Writes the header of a record of `length` bytes of payload, after a
+  // padding record if it does not fit before the end of the buffer. Returns
+  // the offset of the payload, or -1 if the ring is full. The record is only
+  // visible to the consumer once committed.
+  private reserve(kind: RingRecord, length: number): number {
+    if (length > this.maxPayload) {
+      throw new RangeError(`Record of ${length} bytes, the largest is ${this.maxPayload}`);
+    }
+    const size = RECORD_HEADER_SIZE + align(length);
+    let write = Atomics.load(this.header, WRITE) >>> 0;
+    let offset = write & (this.capacity - 1);
+    const tail = this.capacity - offset;
+    const needed = size <= tail ? size : size + tail;
+    if (needed > this.capacity - this.used) {
+      return -1;
+    }
+    if (size > tail) {
+      this.view.setUint32(offset, RingRecord.PADDING, true);
+      this.view.setUint32(offset + 4, tail - RECORD_HEADER_SIZE, true);
+      write = (write + tail) >>> 0;
+      Atomics.store(this.header, WRITE, write | 0);
+      offset = 0;
+    }
+    this.view.setUint32(offset, kind, true);
+    this.view.setUint32(offset + 4, length, true);
+    return offset + RECORD_HEADER_SIZE;
+  }
+
+  // Makes the record reserved last visible to the consumer.
+  private commit(length: number) {
+    const write = Atomics.load(this.header, WRITE) >>> 0;
+    Atomics.store(this.header, WRITE, (write + RECORD_HEADER_SIZE + align(length)) | 0);
+  }
+}
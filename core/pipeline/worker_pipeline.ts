@@ -0,0 +1,183 @@
+import { Group, RdsPipeline, RdsReportEvent, RdsReportEventType } from "../drivers/input";
+import { LogEntries } from "../protocol/rds_types";
+import { DEFAULT_RING_CAPACITY, SharedRing } from "./shared_ring";
+
+// Worker pipeline mode. Sources feed a WorkerPipeline, on the UI thread,
+// which writes their groups, bits and samples to a SharedRing. A worker
+// (decoder_worker.ts in browsers, decoder_worker_node.ts under Node.js) runs
+// a RingDecoder on the ring: demodulation, synchronization and parsing, and
+// posts back DecoderUpdates. Heavy MPX demodulation then does not stall the
+// UI, and a busy UI does not slow decoding down.
+//
+// SharedArrayBuffer requires a cross-origin isolated page in browsers (COOP
+// and COEP headers).
+
+// Number of entries per row of DecoderUpdate.groups.
+export const GROUP_ENTRIES = 9;
+
+// Value of the stream entry of a DecoderUpdate.groups row that marks a new
+// station, whose PI is in the next entry.
+export const NEW_STATION = 0xFFFF;
+
+// What changed since the previous update. Only holds plain data, so that it
+// can be posted between threads.
+export interface DecoderUpdate {
+  // Receiver events in order, GROUP_ENTRIES entries each: the stream, the 4
+  // blocks and their 4 error counts of groups, or NEW_STATION and the PI.
+  groups: Uint16Array;
+  // Streams on which a group duration elapsed without synchronization, in
+  // order.
+  unsynced: number[];
+  // Log messages of the groups, unformatted: see LogMessage.fromEntries.
+  logs: LogEntries[];
+  // Station fields that changed, indexed by StationField, and a snapshot of
+  // the station (see StationImpl.snapshot) if any did.
+  changedFields: number[];
+  snapshot?: Uint8Array;
+  // Latest demodulated symbols of stream 0, if MPX samples were processed.
+  constellation?: {i: number[], q: number[]};
+  frequencyKhz?: number;
+  sourceEnded: boolean;
+}
+
+// Messages to the decoder worker.
+export type WorkerRequest =
+  {type: "init", buffer: SharedArrayBuffer, maxErrors: number} |
+  // Records were written to the ring while the worker was idle.
+  {type: "wake"} |
+  {type: "maxErrors", maxErrors: number};
+
+// Messages from the decoder worker.
+export type WorkerResponse =
+  {type: "update", update: DecoderUpdate} |
+  // The worker read all the records, and waits for a "wake" message.
+  {type: "idle"};
+
+export interface DecoderUpdateListener {
+  processDecoderUpdate(update: DecoderUpdate): void;
+}
+
+export class WorkerPipeline implements RdsPipeline {
+  readonly ring: SharedRing;
+  // Writes that did not fit in the ring, in order, from `pendingStart`. They
+  // are retried when the worker has read records.
+  private pending: Array<() => boolean> = [];
+  private pendingStart = 0;
+
+  // `post` sends a message to the worker, whose messages must be passed to
+  // `receive`.
+  public constructor(
+      private post: (message: WorkerRequest) => void,
+      private listener: DecoderUpdateListener,
+      maxErrors = 0,
+      capacity = DEFAULT_RING_CAPACITY) {
+    this.ring = SharedRing.create(capacity);
+    post({type: "init", buffer: this.ring.buffer, maxErrors});
+  }
+
+  // Number of writes waiting for room in the ring.
+  public get backlog(): number {
+    return this.pending.length - this.pendingStart;
+  }
+
+  public setMaxErrors(maxErrors: number) {
+    this.post({type: "maxErrors", maxErrors});
+  }
+
+  // Handles a message from the worker.
+  public receive(message: WorkerResponse) {
+    this.flush();
+    if (message.type == "update") {
+      this.listener.processDecoderUpdate(message.update);
+    }
+  }
+
+  // RdsPipeline. Bits and samples are split into records of at most
+  // ring.maxPayload bytes. Sources may reuse their buffers: they are copied if
+  // they have to wait for room in the ring.
+
+  public processMpxSamples(samples: Float32Array, length: number = samples.length) {
+    const perRecord = this.ring.maxPayload / 4;
+    for (let i = 0; i < length; i += perRecord) {
+      const chunk = samples.subarray(i, Math.min(i + perRecord, length));
+      if (!this.write(() => this.ring.writeMpxSamples(chunk))) {
+        const copy = chunk.slice();
+        this.pending.push(() => this.ring.writeMpxSamples(copy));
+      }
+    }
+  }
+
+  public processBits(bytes: Uint8Array) {
+    for (let i = 0; i < bytes.length; i += this.ring.maxPayload) {
+      const chunk = bytes.subarray(i, Math.min(i + this.ring.maxPayload, bytes.length));
+      if (!this.write(() => this.ring.writeBits(chunk))) {
+        const copy = chunk.slice();
+        this.pending.push(() => this.ring.writeBits(copy));
+      }
+    }
+  }
+
+  public processRdsReportEvent(event: RdsReportEvent) {
+    const stream = event.stream ?? 0;
+    if (event.type == RdsReportEventType.GROUP && event.group != undefined) {
+      const group: Group = event.group;
+      this.writeOrQueue(() => this.ring.writeGroup(stream, group));
+    } else if (event.type == RdsReportEventType.UNSYNCED_GROUP_DURATION) {
+      this.writeOrQueue(() => this.ring.writeUnsyncedGroupDuration(stream));
+    }
+  }
+
+  public reportFrequency(frequencyKhz: number) {
+    this.writeOrQueue(() => this.ring.writeFrequency(frequencyKhz));
+  }
+
+  public reportSourceEnd() {
+    this.writeOrQueue(() => this.ring.writeSourceEnd());
+  }
+
+  private writeOrQueue(write: () => boolean) {
+    if (!this.write(write)) {
+      this.pending.push(write);
+    }
+  }
+
+  // Writes a record, unless earlier ones are still waiting. Returns whether
+  // it was written.
+  private write(write: () => boolean): boolean {
+    if (this.backlog > 0 || !write()) {
+      return false;
+    }
+    this.wake();
+    return true;
+  }
+
+  private flush() {
+    const start = this.pendingStart;
+    while (this.pendingStart < this.pending.length && this.pending[this.pendingStart]()) {
+      this.pendingStart++;
+    }
+    if (this.pendingStart == start) {
+      return;
+    }
+    if (this.pendingStart == this.pending.length) {
+      this.pending = [];
+      this.pendingStart = 0;
+    }
+    this.wake();
+  }
+
+  private wake() {
+    if (this.ring.takeIdle()) {
+      this.post({type: "wake"});
+    }
+  }
+}
+
+// Runs the decoder in a browser worker, and returns the pipeline feeding it,
+// e.g. connectWorker(new Worker(new URL("./decoder_worker", import.meta.url)),
+// listener).
+export function connectWorker(worker: Worker, listener: DecoderUpdateListener, maxErrors = 0): WorkerPipeline {
+  const pipeline = new WorkerPipeline((m) => worker.postMessage(m), listener, maxErrors);
+  worker.onmessage = (e: MessageEvent<WorkerResponse>) => pipeline.receive(e.data);
+  return pipeline;
+}
@@ -0,0 +1,227 @@
+import { Block, Group, parseHexGroup, RdsPipeline } from "../drivers/input";
+import { LogMessage, StationImpl } from "../protocol/rds_types";
+import { DecoderEndpoint, serveDecoder } from "./ring_decoder";
+import { RingReader, SharedRing } from "./shared_ring";
+import { DecoderUpdate, GROUP_ENTRIES, NEW_STATION, WorkerPipeline, WorkerRequest, WorkerResponse } from "./worker_pipeline";
+
+declare const require: (id: string) => unknown;
+declare const __dirname: string;
+
+// France Inter sample from 2011, as in decoder_test.ts.
+const FRANCE_INTER = `F201 0408 2037 2020
+                      F201 0409 383B 494E
+                      F201 040A 3D45 5445
+                      F201 040F 474E 5220`;
+
+function sendGroups(s: string, pipeline: RdsPipeline) {
+  for (const l of s.split("\n")) {
+    const evt = parseHexGroup(l);
+    if (evt != undefined) {
+      pipeline.processRdsReportEvent(evt);
+    }
+  }
+  pipeline.reportSourceEnd();
+}
+
+class RecordingReader implements RingReader {
+  records: Array<string> = [];
+
+  processGroup(stream: number, group: Group) {
+    this.records.push(`group ${stream} ${group}`);
+  }
+  processBits(bytes: Uint8Array) {
+    this.records.push(`bits ${Array.from(bytes)}`);
+  }
+  processMpxSamples(samples: Float32Array) {
+    this.records.push(`mpx ${Array.from(samples)}`);
+  }
+  processUnsyncedGroupDuration(stream: number) {
+    this.records.push(`unsynced ${stream}`);
+  }
+  reportFrequency(frequencyKhz: number) {
+    this.records.push(`frequency ${frequencyKhz}`);
+  }
+  reportSourceEnd() {
+    this.records.push("end");
+  }
+}
+
+// Collects the updates of the decoder, and applies them to a station.
+class UpdateCollector {
+  updates: DecoderUpdate[] = [];
+  station = new StationImpl();
+  ended = false;
+
+  processDecoderUpdate(update: DecoderUpdate) {
+    this.updates.push(update);
+    if (update.snapshot != undefined) {
+      this.station.restore(update.snapshot);
+    }
+    this.ended ||= update.sourceEnded;
+  }
+
+  groupRows(): number[][] {
+    const rows: number[][] = [];
+    for (const u of this.updates) {
+      for (let i = 0; i < u.groups.length; i += GROUP_ENTRIES) {
+        rows.push(Array.from(u.groups.subarray(i, i + GROUP_ENTRIES)));
+      }
+    }
+    return rows;
+  }
+}
+
+describe("SharedRing", () => {
+  it("should pass records in order", () => {
+    const ring = SharedRing.create(1024);
+    const reader = new RecordingReader();
+    expect(ring.writeGroup(1, new Group([
+      new Block(0xF201, 0), new Block(0x0408, 1), new Block(0x2037, 0), new Block(0x2020, 6)]))).toBeTrue();
+    expect(ring.writeBits(new Uint8Array([1, 2, 3]))).toBeTrue();
+    expect(ring.writeMpxSamples(new Float32Array([0.5, -1, 2]), 2)).toBeTrue();
+    expect(ring.writeUnsyncedGroupDuration(2)).toBeTrue();
+    expect(ring.writeFrequency(94800)).toBeTrue();
+    expect(ring.writeSourceEnd()).toBeTrue();
+    expect(ring.read(reader)).toBe(6);
+    expect(reader.records).toEqual([
+      "group 1 F201/0 0408/1 2037/0 2020/6",
+      "bits 1,2,3",
+      "mpx 0.5,-1",
+      "unsynced 2",
+      "frequency 94800",
+      "end",
+    ]);
+    expect(ring.used).toBe(0);
+  });
+
+  it("should wrap around, and refuse records when full", () => {
+    const ring = SharedRing.create(1024);
+    const reader = new RecordingReader();
+    const bytes = new Uint8Array(100);
+    let written = 0;
+    for (let round = 0; round < 20; round++) {
+      while (ring.writeBits(bytes.fill(written & 0xFF))) {
+        written++;
+      }
+      expect(ring.used).toBeGreaterThan(1024 - 2 * 112);
+      ring.read(reader, 3);
+    }
+    ring.read(reader);
+    expect(reader.records.length).toBe(written);
+    reader.records.forEach((r, i) => expect(r).toBe(`bits ${new Array(100).fill(i & 0xFF)}`));
+  });
+
+  it("should reject records larger than a quarter of its capacity", () => {
+    const ring = SharedRing.create(1024);
+    expect(() => ring.writeBits(new Uint8Array(257))).toThrowError(RangeError);
+  });
+});
+
+// Runs the decoder on the same thread, messages and batches of records being
+// delivered in order once the caller returns. Returns the pipeline, the
+// delivery function, and the list of requests the decoder handled, with
+// "batch" for its batches after the first one.
+function loopbackPipeline(collector: UpdateCollector, capacity: number): [WorkerPipeline, () => void, string[]] {
+  const toWorker: WorkerRequest[] = [];
+  const toPipeline: WorkerResponse[] = [];
+  const tasks: Array<() => void> = [];
+  const handled: string[] = [];
+  let handler: ((m: WorkerRequest) => void) | null = null;
+  const endpoint: DecoderEndpoint = {
+    post: (m) => toPipeline.push(m),
+    listen: (h) => {
+      handler = h;
+    },
+  };
+  serveDecoder(endpoint, (task) => tasks.push(task));
+  const pipeline = new WorkerPipeline((m) => toWorker.push(m), collector, 0, capacity);
+  const deliver = () => {
+    while (toWorker.length > 0 || toPipeline.length > 0 || tasks.length > 0) {
+      for (const m of toWorker.splice(0)) {
+        handled.push(m.type);
+        handler?.(m);
+      }
+      for (const m of toPipeline.splice(0)) pipeline.receive(m);
+      const task = tasks.shift();
+      if (task != undefined) {
+        handled.push("batch");
+        task();
+      }
+    }
+  };
+  return [pipeline, deliver, handled];
+}
+
+describe("Worker pipeline", () => {
+  it("should decode groups like parse_group", () => {
+    const collector = new UpdateCollector();
+    const [pipeline, deliver] = loopbackPipeline(collector, 1024);
+    sendGroups(FRANCE_INTER, pipeline);
+    deliver();
+    expect(collector.ended).toBeTrue();
+    expect(collector.station.pi).toBe(0xF201);
+    expect(collector.station.getPS()).toBe("  INTER ");
+    const rows = collector.groupRows();
+    expect(rows[0].slice(0, 2)).toEqual([NEW_STATION, 0xF201]);
+    expect(rows[1]).toEqual([0, 0xF201, 0x0408, 0x2037, 0x2020, 0, 0, 0, 0]);
+    expect(rows.length).toBe(5);
+    const logs = collector.updates.flatMap((u) => u.logs);
+    expect(logs.length).toBe(4);
+    expect(LogMessage.fromEntries(logs[0]).text).toContain("0:[F201 0408 2037 2020]");
+  });
+
+  it("should queue records while the ring is full", () => {
+    const collector = new UpdateCollector();
+    const [pipeline, deliver] = loopbackPipeline(collector, 1024);
+    // 200 groups do not fit in 1024 bytes: the worker only reads them once
+    // messages are delivered.
+    for (let i = 0; i < 50; i++) {
+      sendGroups(FRANCE_INTER, pipeline);
+    }
+    expect(pipeline.backlog).toBeGreaterThan(0);
+    deliver();
+    expect(pipeline.backlog).toBe(0);
+    expect(collector.groupRows().length).toBe(201);
+    expect(collector.station.getPS()).toBe("  INTER ");
+  });
+
+  it("should handle messages between batches of records", () => {
+    const collector = new UpdateCollector();
+    const [pipeline, deliver, handled] = loopbackPipeline(collector, 1 << 20);
+    for (let i = 0; i < 1500; i++) {
+      sendGroups(FRANCE_INTER, pipeline);
+    }
+    pipeline.setMaxErrors(1);
+    deliver();
+    expect(collector.groupRows().length).toBe(6001);
+    // The first batch runs on "init", the next ones are scheduled after the
+    // messages sent meanwhile.
+    expect(handled).toContain("batch");
+    expect(handled.indexOf("maxErrors")).toBeLessThan(handled.indexOf("batch"));
+  });
+});
+
+interface NodeWorker {
+  postMessage(message: unknown): void;
+  on(event: "message", handler: (message: WorkerResponse) => void): void;
+  terminate(): Promise<number>;
+}
+
+describe("Worker pipeline in a worker thread", () => {
+  it("should decode groups off the main thread", async () => {
+    const {Worker} = require("worker_threads") as {Worker: new (path: string) => NodeWorker};
+    const worker = new Worker(`${__dirname}/decoder_worker_node.js`);
+    const collector = new UpdateCollector();
+    const pipeline = new WorkerPipeline((m) => worker.postMessage(m), collector);
+    const ended = new Promise<void>((resolve) => {
+      worker.on("message", (m) => {
+        pipeline.receive(m);
+        if (collector.ended) resolve();
+      });
+    });
+    sendGroups(FRANCE_INTER, pipeline);
+    await ended;
+    await worker.terminate();
+    expect(collector.station.getPS()).toBe("  INTER ");
+  });
+});
@@ -90,3 +90,88 @@ export class AFList {
 		} else return true;
 	}
 }
+
+/**
+ * AF lists and mapped frequencies of a network, as received in groups 0A
+ * (for the tuned network) or 14A (for other networks).
+ */
+export class AlternativeFrequencies {
+  lists = new Map<number, AFList>();
+  current: AFList | null = null;
+  mapped = new Map<number, Set<number>>();
+
+  clear() {
+    this.lists = new Map<number, AFList>();
+    this.current = null;
+    this.mapped.clear();
+  }
+
+  /**
+   * @brief Adds a pair of AF codes to the current AF list, or starts a new one.
+   *
+   * @return null, or a diagnostic finding if the pair could not be processed
+   */
+  public addPair(codeA: number, codeB: number): string | null {
+    const a = parseAfCode(codeA);
+    const b = parseAfCode(codeB);
+    // If two filler codes, we cannot do anything.
+    if (a.kind == "AfFiller" && b.kind == "AfFiller") {
+      return "Waste of capacity by transmitting groups with two AF fillers.";
+    }
+    if (a.kind == "AfListLength") {
+      if (b.kind == "AfFrequency") {
+        const afList = this.lists.get(b.freq);
+        if (afList == undefined) {
+          this.current = new AFList(b.freq, a.length);
+          this.lists.set(b.freq, this.current);
+        } else {
+          this.current = afList;
+        }
+        return null;
+      }
+    } else {
+      if (a.kind == "AfFrequency" || b.kind == "AfFrequency") {
+        if (this.current == null || !this.current.addPair(a, b)) {
+          // This means that the method addPair has determined that
+          // the new AF pair cannot belong to the existing list.
+          // So create a new list. Use one of (a, b) that is not the
+          // filler code. There is always one that is not the filler, as the
+          // case where both a and b are the filler code has been proceeded at
+          // the beginning of the method.
+          this.current = new AFList(
+            a.kind == "AfFrequency" ? a.freq : b.kind == "AfFrequency" ? b.freq : 0);
+          this.current.addPair(a, b);
+        }
+        return null;
+      }
+    }
+    // If we reach this point, then the pair could not be processed.
+    return `Invalid AF pair: ${formatAf(codeA)}, ${formatAf(codeB)}`;
+  }
+
+  /**
+   * @brief Adds a mapped frequency.
+   *
+   * @param tunedCode The tuned (current) frequency, represented as a channel number
+   * @param mappedCode The mapped (other) frequency, represented as a channel number
+   */
+  public addMapped(tunedCode: number, mappedCode: number) {
+    const tuned = parseAfCode(tunedCode);
+    const mapped = parseAfCode(mappedCode);
+
+    if (tuned.kind != "AfFrequency" || mapped.kind != "AfFrequency") {
+      // TODO: Report error.
+      return;
+    }
+
+    // Get the set of AFs mapped to the frequency "freq", or create it.
+    let listOfMappedFreqs = this.mapped.get(tuned.freq);
+    if (listOfMappedFreqs == undefined) {
+      listOfMappedFreqs = new Set<number>();
+      this.mapped.set(tuned.freq, listOfMappedFreqs);
+    }
+
+    // Add the new mapped frequency.
+    listOfMappedFreqs.add(mapped.freq);
+  }
+}
@@ -42,7 +42,7 @@ struct Station {
     pin_minute: uint<6>
     ecc: uint<8>
     language_code: uint<12>
-    other_networks: map<uint<16>, StationImpl>
+    other_networks: map<uint<16>, OtherNetwork>
 
     addToGroupStats(type: uint<5>)
     setClockTime(mjd: uint<17>, hour: uint<5>, minute: uint<6>, tz_sign: bool, tz_offset: uint<5>)
@@ -54,6 +54,22 @@ struct Station {
     reportRftMetadata(pipe: uint<4>, fileSize: uint<18>, file_id: uint<6>, file_version: uint<3>, crc_present: bool)
 }
 
+# Other network, as announced by EON. Elements of maps of structs hold their
+# key in their first field.
+struct OtherNetwork {
+    pi: uint<16>
+    pty: uint<5>
+    tp: bool
+    ta: bool
+    ps: str<8>
+    pin_day: uint<5>
+    pin_hour: uint<5>
+    pin_minute: uint<6>
+
+    addAfPair(af1: uint<8>, af2: uint<8>)
+    addMappedAF(channel: uint<8>, mapped_channel: uint<8>)
+}
+
 bitstruct group_ab(station: Station) {
     # Block A.
     pi: uint<16>
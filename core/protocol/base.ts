@@ -1,9 +1,61 @@
 // Generated file. DO NOT EDIT.
 
 import { formatAf } from "./af";
-import { RDS_CHARMAP, LogMessage, RdsString, StationImpl } from "./rds_types";
+import { ChangeMask } from "./change_mask";
+import { LazyModule } from "./lazy_module";
+import { ParseMemo } from "./parse_memo";
+import { ParseStats } from "./parse_stats";
+import { RDS_CHARMAP, LogArg, LogMessage, RdsString, OtherNetworkImpl } from "./rds_types";
+import { SnapshotReader, SnapshotWriter } from "./snapshot";
+
+export enum Rule {
+	group_ab,
+	group_ab_without_pi,
+	group_unknown,
+	group_0A,
+	group_0B_0_common,
+	group_1A,
+	group_1A_ecc,
+	group_1B_1_common,
+	group_2A,
+	group_2B,
+	group_3A,
+	group_4A,
+	group_10A,
+	group_15A,
+	group_15B,
+	group_c,
+	group_c_fid_0,
+	group_c_rft,
+	group_c_oda,
+	group_c_oda_assignment,
+	group_c_oda_rft_assignment,
+	group_c_oda_rft_assignment_v0,
+	group_c_oda_rft_assignment_v1,
+	group_7A,
+	group_7A_address,
+	group_7A_numeric_10,
+	group_7A_numeric_18,
+	group_7A_alphanumeric,
+	group_14A,
+	group_14A_ps,
+	group_14A_af_a,
+	group_14A_mapped_af,
+	group_14A_pty_ta,
+	group_14A_pin,
+	group_14B,
+	group_rtplus,
+	group_dabxref,
+	group_dabxref_ensemble,
+	group_dabxref_service,
+	group_ert_declaration,
+	group_ert,
+	group_internet_connection,
+	group_internet_connection_url,
+}
 
 export interface Station {
+	changes: ChangeMask;
 	pi?: number;
 	pty?: number;
 	ptyn: RdsString;
@@ -18,12 +70,12 @@ export interface Station {
 	di_compressed?: boolean;
 	di_artificial_head?: boolean;
 	di_stereo?: boolean;
-	odas: Map<number, string>;
+	odas: Map<number, Rule>;
 	transmitted_odas: Map<number, number>;
 	transmitted_channel_odas: Map<number, number>;
-	app_mapping: Map<number, string>;
-	channel_app_mapping: Map<number, string>;
-	oda_3A_mapping: Map<number, string>;
+	app_mapping: Map<number, Rule>;
+	channel_app_mapping: Map<number, Rule>;
+	oda_3A_mapping: Map<number, Rule>;
 	rt_plus_app: RtPlusApp;
 	ert_app: ERtApp;
 	dab_cross_ref_app: DabCrossRefApp;
@@ -35,7 +87,7 @@ export interface Station {
 	pin_minute?: number;
 	ecc?: number;
 	language_code?: number;
-	other_networks: Map<number, StationImpl>;
+	other_networks: Map<number, OtherNetwork>;
 	addToGroupStats(type: number): void;
 	setClockTime(mjd: number, hour: number, minute: number, tz_sign: boolean, tz_offset: number): void;
 	addAfPair(af1: number, af2: number): void;
@@ -46,176 +98,426 @@ export interface Station {
 	reportRftMetadata(pipe: number, fileSize: number, file_id: number, file_version: number, crc_present: boolean): void;
 }
 
-export function parse_group_ab(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+// Bits of Station.changes.
+export enum StationField {
+	pi,
+	pty,
+	ptyn,
+	tp,
+	ta,
+	ps,
+	lps,
+	rt,
+	rt_flag,
+	music,
+	di_dynamic_pty,
+	di_compressed,
+	di_artificial_head,
+	di_stereo,
+	odas,
+	transmitted_odas,
+	transmitted_channel_odas,
+	app_mapping,
+	channel_app_mapping,
+	oda_3A_mapping,
+	rt_plus_app,
+	ert_app,
+	dab_cross_ref_app,
+	internet_connection_app,
+	rp_app,
+	linkage_actuator,
+	pin_day,
+	pin_hour,
+	pin_minute,
+	ecc,
+	language_code,
+	other_networks,
+	addToGroupStats,
+	setClockTime,
+	addAfPair,
+	addMappedAF,
+	reportOtherNetworkSwitch,
+	reportRftData,
+	reportRftCrc,
+	reportRftMetadata,
+}
+export const STATION_FIELD_COUNT = 40;
+
+export function serialize_Station(s: Station, w: SnapshotWriter) {
+	w.flag(s.pi != undefined);
+	w.flag(s.pty != undefined);
+	w.flag(s.tp != undefined);
+	w.flag(s.tp == true);
+	w.flag(s.ta != undefined);
+	w.flag(s.ta == true);
+	w.flag(s.rt_flag != undefined);
+	w.flag(s.music != undefined);
+	w.flag(s.music == true);
+	w.flag(s.di_dynamic_pty != undefined);
+	w.flag(s.di_dynamic_pty == true);
+	w.flag(s.di_compressed != undefined);
+	w.flag(s.di_compressed == true);
+	w.flag(s.di_artificial_head != undefined);
+	w.flag(s.di_artificial_head == true);
+	w.flag(s.di_stereo != undefined);
+	w.flag(s.di_stereo == true);
+	w.flag(s.linkage_actuator != undefined);
+	w.flag(s.linkage_actuator == true);
+	w.flag(s.pin_day != undefined);
+	w.flag(s.pin_hour != undefined);
+	w.flag(s.pin_minute != undefined);
+	w.flag(s.ecc != undefined);
+	w.flag(s.language_code != undefined);
+	if (s.pi != undefined) {
+		w.varint(s.pi);
+	}
+	if (s.pty != undefined) {
+		w.varint(s.pty);
+	}
+	s.ptyn.serialize(w);
+	s.ps.serialize(w);
+	s.lps.serialize(w);
+	s.rt.serialize(w);
+	if (s.rt_flag != undefined) {
+		w.varint(s.rt_flag);
+	}
+	w.varint(s.odas.size);
+	for (const [k, v] of s.odas) {
+		w.varint(k);
+		w.varint(v);
+	}
+	w.varint(s.transmitted_odas.size);
+	for (const [k, v] of s.transmitted_odas) {
+		w.varint(k);
+		w.varint(v);
+	}
+	w.varint(s.transmitted_channel_odas.size);
+	for (const [k, v] of s.transmitted_channel_odas) {
+		w.varint(k);
+		w.varint(v);
+	}
+	w.varint(s.app_mapping.size);
+	for (const [k, v] of s.app_mapping) {
+		w.varint(k);
+		w.varint(v);
+	}
+	w.varint(s.channel_app_mapping.size);
+	for (const [k, v] of s.channel_app_mapping) {
+		w.varint(k);
+		w.varint(v);
+	}
+	w.varint(s.oda_3A_mapping.size);
+	for (const [k, v] of s.oda_3A_mapping) {
+		w.varint(k);
+		w.varint(v);
+	}
+	serialize_RtPlusApp(s.rt_plus_app, w);
+	serialize_ERtApp(s.ert_app, w);
+	serialize_DabCrossRefApp(s.dab_cross_ref_app, w);
+	serialize_InternetConnectionApp(s.internet_connection_app, w);
+	serialize_RpApp(s.rp_app, w);
+	if (s.pin_day != undefined) {
+		w.varint(s.pin_day);
+	}
+	if (s.pin_hour != undefined) {
+		w.varint(s.pin_hour);
+	}
+	if (s.pin_minute != undefined) {
+		w.varint(s.pin_minute);
+	}
+	if (s.ecc != undefined) {
+		w.varint(s.ecc);
+	}
+	if (s.language_code != undefined) {
+		w.varint(s.language_code);
+	}
+	w.varint(s.other_networks.size);
+	for (const [k, v] of s.other_networks) {
+		w.varint(k);
+		serialize_OtherNetwork(v, w);
+	}
+}
+
+export function deserialize_Station(s: Station, r: SnapshotReader) {
+	const has_pi = r.flag();
+	const has_pty = r.flag();
+	const has_tp = r.flag();
+	const tp = r.flag();
+	const has_ta = r.flag();
+	const ta = r.flag();
+	const has_rt_flag = r.flag();
+	const has_music = r.flag();
+	const music = r.flag();
+	const has_di_dynamic_pty = r.flag();
+	const di_dynamic_pty = r.flag();
+	const has_di_compressed = r.flag();
+	const di_compressed = r.flag();
+	const has_di_artificial_head = r.flag();
+	const di_artificial_head = r.flag();
+	const has_di_stereo = r.flag();
+	const di_stereo = r.flag();
+	const has_linkage_actuator = r.flag();
+	const linkage_actuator = r.flag();
+	const has_pin_day = r.flag();
+	const has_pin_hour = r.flag();
+	const has_pin_minute = r.flag();
+	const has_ecc = r.flag();
+	const has_language_code = r.flag();
+	s.pi = has_pi ? r.varint() : undefined;
+	s.pty = has_pty ? r.varint() : undefined;
+	s.ptyn.deserialize(r);
+	s.tp = has_tp ? tp : undefined;
+	s.ta = has_ta ? ta : undefined;
+	s.ps.deserialize(r);
+	s.lps.deserialize(r);
+	s.rt.deserialize(r);
+	s.rt_flag = has_rt_flag ? r.varint() : undefined;
+	s.music = has_music ? music : undefined;
+	s.di_dynamic_pty = has_di_dynamic_pty ? di_dynamic_pty : undefined;
+	s.di_compressed = has_di_compressed ? di_compressed : undefined;
+	s.di_artificial_head = has_di_artificial_head ? di_artificial_head : undefined;
+	s.di_stereo = has_di_stereo ? di_stereo : undefined;
+	s.odas.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		s.odas.set(k, r.varint());
+	}
+	s.transmitted_odas.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		s.transmitted_odas.set(k, r.varint());
+	}
+	s.transmitted_channel_odas.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		s.transmitted_channel_odas.set(k, r.varint());
+	}
+	s.app_mapping.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		s.app_mapping.set(k, r.varint());
+	}
+	s.channel_app_mapping.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		s.channel_app_mapping.set(k, r.varint());
+	}
+	s.oda_3A_mapping.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		s.oda_3A_mapping.set(k, r.varint());
+	}
+	deserialize_RtPlusApp(s.rt_plus_app, r);
+	deserialize_ERtApp(s.ert_app, r);
+	deserialize_DabCrossRefApp(s.dab_cross_ref_app, r);
+	deserialize_InternetConnectionApp(s.internet_connection_app, r);
+	deserialize_RpApp(s.rp_app, r);
+	s.linkage_actuator = has_linkage_actuator ? linkage_actuator : undefined;
+	s.pin_day = has_pin_day ? r.varint() : undefined;
+	s.pin_hour = has_pin_hour ? r.varint() : undefined;
+	s.pin_minute = has_pin_minute ? r.varint() : undefined;
+	s.ecc = has_ecc ? r.varint() : undefined;
+	s.language_code = has_language_code ? r.varint() : undefined;
+	s.other_networks.clear();
+	for (let n = r.varint(); n > 0; n--) {
+		const k = r.varint();
+		const v = new OtherNetworkImpl(k);
+		deserialize_OtherNetwork(v, r);
+		s.other_networks.set(k, v);
+	}
+}
+
+export interface OtherNetwork {
+	pi?: number;
+	pty?: number;
+	tp?: boolean;
+	ta?: boolean;
+	ps: RdsString;
+	pin_day?: number;
+	pin_hour?: number;
+	pin_minute?: number;
+	addAfPair(af1: number, af2: number): void;
+	addMappedAF(channel: number, mapped_channel: number): void;
+}
+
+export function serialize_OtherNetwork(s: OtherNetwork, w: SnapshotWriter) {
+	w.flag(s.pi != undefined);
+	w.flag(s.pty != undefined);
+	w.flag(s.tp != undefined);
+	w.flag(s.tp == true);
+	w.flag(s.ta != undefined);
+	w.flag(s.ta == true);
+	w.flag(s.pin_day != undefined);
+	w.flag(s.pin_hour != undefined);
+	w.flag(s.pin_minute != undefined);
+	if (s.pi != undefined) {
+		w.varint(s.pi);
+	}
+	if (s.pty != undefined) {
+		w.varint(s.pty);
+	}
+	s.ps.serialize(w);
+	if (s.pin_day != undefined) {
+		w.varint(s.pin_day);
+	}
+	if (s.pin_hour != undefined) {
+		w.varint(s.pin_hour);
+	}
+	if (s.pin_minute != undefined) {
+		w.varint(s.pin_minute);
+	}
+}
+
+export function deserialize_OtherNetwork(s: OtherNetwork, r: SnapshotReader) {
+	const has_pi = r.flag();
+	const has_pty = r.flag();
+	const has_tp = r.flag();
+	const tp = r.flag();
+	const has_ta = r.flag();
+	const ta = r.flag();
+	const has_pin_day = r.flag();
+	const has_pin_hour = r.flag();
+	const has_pin_minute = r.flag();
+	s.pi = has_pi ? r.varint() : undefined;
+	s.pty = has_pty ? r.varint() : undefined;
+	s.tp = has_tp ? tp : undefined;
+	s.ta = has_ta ? ta : undefined;
+	s.ps.deserialize(r);
+	s.pin_day = has_pin_day ? r.varint() : undefined;
+	s.pin_hour = has_pin_hour ? r.varint() : undefined;
+	s.pin_minute = has_pin_minute ? r.varint() : undefined;
+}
+
+export function parse_group_ab(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field pi: uint<16> at +0, width 16.
-	let pi = (ok[0]) ?
-		((block[0]))
-		: null;
+	const pi = ((block[0]));
 	// Field _: unparsed<48> at +16, width 48.
 
 	// Actions.
-	if ((pi != null)) {
-		log.add(`PI=${pi.toString(16).toUpperCase().padStart(4, '0')}`);
-	}
-	if ((pi != null)) {
-		station.pi = pi;
+	if ((ok & 0b0001) == 0b0001) {
+		log.record(0).arg(pi);
+		if (station.pi !== pi) {
+			station.pi = pi;
+			station.changes.mark(StationField.pi);
+		}
 	}
-	get_parse_function("group_ab_without_pi")(block, ok, log, station);
+	parse_group_ab_without_pi(block, ok, log, station);
 }
 
-export function parse_group_ab_without_pi(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_ab_without_pi(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field _: unparsed<16> at +0, width 16.
 	// Field type: uint<5> at +16, width 5.
-	let type = (ok[1]) ?
-		((block[1] & 0b1111100000000000) >> 11)
-		: null;
+	const type = ((block[1] & 0b1111100000000000) >> 11);
 	// Field tp: bool at +21, width 1.
-	let tp = (ok[1]) ?
-		((block[1] & 0b10000000000) >> 10) == 1
-		: null;
+	const tp = ((block[1] & 0b10000000000) >> 10) == 1;
 	// Field pty: uint<5> at +22, width 5.
-	let pty = (ok[1]) ?
-		((block[1] & 0b1111100000) >> 5)
-		: null;
+	const pty = ((block[1] & 0b1111100000) >> 5);
 	// Field payload: unparsed<37> at +27, width 37.
 
 	// Actions.
-	if ((type != null)) {
-		log.add(`Group ${(type>>1).toString() + ((type & 1) == 0 ? 'A' : 'B')}`);
-	}
-	if ((tp != null)) {
-		log.add(`TP=${tp ? '1': '0'}`);
-	}
-	if ((pty != null)) {
-		log.add(`PTY=${pty}`);
-	}
-	if ((tp != null)) {
-		station.tp = tp;
-	}
-	if ((pty != null)) {
-		station.pty = pty;
-	}
-	if ((station != null) && (type != null)) {
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(1).arg(type);
+		log.record(2).arg(tp);
+		log.record(3).arg(pty);
+		if (station.tp !== tp) {
+			station.tp = tp;
+			station.changes.mark(StationField.tp);
+		}
+		if (station.pty !== pty) {
+			station.pty = pty;
+			station.changes.mark(StationField.pty);
+		}
 		station.addToGroupStats(type);
-	}
-	if ((type != null)) {
-		get_parse_function(station.app_mapping.get(type) ?? "group_unknown")(block, ok, log, station);
+		station.changes.mark(StationField.addToGroupStats);
+		PARSE_FUNCTIONS[station.app_mapping.get(type) ?? Rule.group_unknown](block, ok, log, station);
 	}
 }
 
-export function parse_group_unknown(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_unknown(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field block_b_rest: uint<5> at +27, width 5.
-	let block_b_rest = (ok[1]) ?
-		((block[1] & 0b11111))
-		: null;
 	// Field block_c: uint<16> at +32, width 16.
-	let block_c = (ok[2]) ?
-		((block[2]))
-		: null;
 	// Field block_d: uint<16> at +48, width 16.
-	let block_d = (ok[3]) ?
-		((block[3]))
-		: null;
 
 	// Actions.
 }
 
-export function parse_group_0A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_0A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field _: unparsed<5> at +27, width 5.
 	// Field af1: uint<8> at +32, width 8.
-	let af1 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
+	const af1 = ((block[2] & 0b1111111100000000) >> 8);
 	// Field af2: uint<8> at +40, width 8.
-	let af2 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
+	const af2 = ((block[2] & 0b11111111));
 	// Field _: unparsed<16> at +48, width 16.
 
 	// Actions.
-	if ((af1 != null) && (af2 != null)) {
-		log.add(`AFs ${formatAf(af1)}, ${formatAf(af2)}`);
-	}
-	if ((af1 != null) && (af2 != null) && (station != null)) {
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(4).arg(af1).arg(af2);
 		station.addAfPair(af1, af2);
+		station.changes.mark(StationField.addAfPair);
 	}
-	get_parse_function("group_0B_0_common")(block, ok, log, station);
+	parse_group_0B_0_common(block, ok, log, station);
 }
 
-export function parse_group_0B_0_common(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_0B_0_common(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field ta: bool at +27, width 1.
-	let ta = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
+	const ta = ((block[1] & 0b10000) >> 4) == 1;
 	// Field music: bool at +28, width 1.
-	let music = (ok[1]) ?
-		((block[1] & 0b1000) >> 3) == 1
-		: null;
+	const music = ((block[1] & 0b1000) >> 3) == 1;
 	// Field di: bool at +29, width 1.
-	let di = (ok[1]) ?
-		((block[1] & 0b100) >> 2) == 1
-		: null;
+	const di = ((block[1] & 0b100) >> 2) == 1;
 	// Field addr: uint<2> at +30, width 2.
-	let addr = (ok[1]) ?
-		((block[1] & 0b11))
-		: null;
+	const addr = ((block[1] & 0b11));
 	// Field _: uint<16> at +32, width 16.
 	// Field ps_seg: byte<2> at +48, width 16.
-	let ps_seg__0 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let ps_seg__1 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const ps_seg = [ps_seg__0, ps_seg__1];
+	const ps_seg__0 = ((block[3] & 0b1111111100000000) >> 8);
+	const ps_seg__1 = ((block[3] & 0b11111111));
 
 	// Actions.
-	if ((ta != null)) {
-		log.add(`TA=${ta ? '1': '0'}`);
-	}
-	if ((addr != null) && (ps_seg != null)) {
-		log.add(`PS seg @${addr} "${formatRdsText(ps_seg)}"`);
-	}
-	if ((ta != null)) {
-		station.ta = ta;
-	}
-	if ((music != null)) {
-		station.music = music;
-	}
-	if ((station != null)) {
-		if ((addr != null) && (ps_seg__0 != null)) {
-			station.ps.setByte(addr*2 + 0, ps_seg__0);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(5).arg(ta);
+		log.record(6).arg(addr).arg((ok & 0b1000) == 0b1000 ? ps_seg__0 : null).arg((ok & 0b1000) == 0b1000 ? ps_seg__1 : null);
+		if (station.ta !== ta) {
+			station.ta = ta;
+			station.changes.mark(StationField.ta);
 		}
-		if ((addr != null) && (ps_seg__1 != null)) {
-			station.ps.setByte(addr*2 + 1, ps_seg__1);
+		if (station.music !== music) {
+			station.music = music;
+			station.changes.mark(StationField.music);
+		}
+		BYTE_SCRATCH[0] = ps_seg__0;
+		BYTE_SCRATCH[1] = ps_seg__1;
+		if (station.ps.setBytes(addr*2, BYTE_SCRATCH, ((ok & 0b1000) == 0b1000 ? 0b11 : 0))) {
+			station.changes.mark(StationField.ps);
 		}
-	}
-	if ((addr != null)) {
 		switch (addr) {
 			case 0:
-				if ((di != null)) {
+				if (station.di_dynamic_pty !== di) {
 					station.di_dynamic_pty = di;
+					station.changes.mark(StationField.di_dynamic_pty);
 				}
 				break;
 
 			case 1:
-				if ((di != null)) {
+				if (station.di_compressed !== di) {
 					station.di_compressed = di;
+					station.changes.mark(StationField.di_compressed);
 				}
 				break;
 
 			case 2:
-				if ((di != null)) {
+				if (station.di_artificial_head !== di) {
 					station.di_artificial_head = di;
+					station.changes.mark(StationField.di_artificial_head);
 				}
 				break;
 
 			case 3:
-				if ((di != null)) {
+				if (station.di_stereo !== di) {
 					station.di_stereo = di;
+					station.changes.mark(StationField.di_stereo);
 				}
 				break;
 
@@ -223,46 +525,38 @@ export function parse_group_0B_0_common(block: Uint16Array, ok: boolean[], log:
 	}
 }
 
-export function parse_group_1A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_1A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field _: unparsed<5> at +27, width 5.
 	// Field linkage_actuator: bool at +32, width 1.
-	let linkage_actuator = (ok[2]) ?
-		((block[2] & 0b1000000000000000) >> 15) == 1
-		: null;
+	const linkage_actuator = ((block[2] & 0b1000000000000000) >> 15) == 1;
 	// Field variant: uint<3> at +33, width 3.
-	let variant = (ok[2]) ?
-		((block[2] & 0b111000000000000) >> 12)
-		: null;
+	const variant = ((block[2] & 0b111000000000000) >> 12);
 	// Field payload: uint<12> at +36, width 12.
-	let payload = (ok[2]) ?
-		((block[2] & 0b111111111111))
-		: null;
+	const payload = ((block[2] & 0b111111111111));
 	// Field pin: unparsed<16> at +48, width 16.
 
 	// Actions.
-	if ((linkage_actuator != null)) {
-		log.add(`LA=${linkage_actuator ? '1': '0'}`);
-	}
-	if ((variant != null)) {
-		log.add(`v=${variant}`);
-	}
-	if ((linkage_actuator != null)) {
-		station.linkage_actuator = linkage_actuator;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(7).arg(linkage_actuator);
+		log.record(8).arg(variant);
+		if (station.linkage_actuator !== linkage_actuator) {
+			station.linkage_actuator = linkage_actuator;
+			station.changes.mark(StationField.linkage_actuator);
+		}
 	}
-	get_parse_function("group_1B_1_common")(block, ok, log, station);
-	if ((variant != null)) {
+	parse_group_1B_1_common(block, ok, log, station);
+	if ((ok & 0b0100) == 0b0100) {
 		switch (variant) {
 			case 0:
-				get_parse_function("group_1A_ecc")(block, ok, log, station);
+				parse_group_1A_ecc(block, ok, log, station);
 				break;
 
 			case 3:
-				if ((payload != null)) {
-					log.add(`Language code: ${payload}`);
-				}
-				if ((payload != null)) {
+				log.record(9).arg(payload);
+				if (station.language_code !== payload) {
 					station.language_code = payload;
+					station.changes.mark(StationField.language_code);
 				}
 				break;
 
@@ -270,394 +564,297 @@ export function parse_group_1A(block: Uint16Array, ok: boolean[], log: LogMessag
 	}
 }
 
-export function parse_group_1A_ecc(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_1A_ecc(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field _: unparsed<32> at +0, width 32.
 	// Field linkage_actuator: unparsed<1> at +32, width 1.
 	// Field variant: unparsed<3> at +33, width 3.
 	// Field paging: unparsed<4> at +36, width 4.
 	// Field ecc: uint<8> at +40, width 8.
-	let ecc = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
+	const ecc = ((block[2] & 0b11111111));
 	// Field pin: unparsed<16> at +48, width 16.
 
 	// Actions.
-	if ((ecc != null)) {
-		log.add(`ECC=${ecc.toString(16).toUpperCase().padStart(2, '0')}`);
-	}
-	if ((ecc != null)) {
-		station.ecc = ecc;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(10).arg(ecc);
+		if (station.ecc !== ecc) {
+			station.ecc = ecc;
+			station.changes.mark(StationField.ecc);
+		}
 	}
 }
 
-export function parse_group_1B_1_common(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_1B_1_common(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field _: unparsed<5> at +27, width 5.
 	// Field _: unparsed<16> at +32, width 16.
 	// Field pin_day: uint<5> at +48, width 5.
-	let pin_day = (ok[3]) ?
-		((block[3] & 0b1111100000000000) >> 11)
-		: null;
+	const pin_day = ((block[3] & 0b1111100000000000) >> 11);
 	// Field pin_hour: uint<5> at +53, width 5.
-	let pin_hour = (ok[3]) ?
-		((block[3] & 0b11111000000) >> 6)
-		: null;
+	const pin_hour = ((block[3] & 0b11111000000) >> 6);
 	// Field pin_minute: uint<6> at +58, width 6.
-	let pin_minute = (ok[3]) ?
-		((block[3] & 0b111111))
-		: null;
+	const pin_minute = ((block[3] & 0b111111));
 
 	// Actions.
-	if ((pin_day != null) && (pin_hour != null) && (pin_minute != null)) {
-		log.add(`PIN=(D=${pin_day}, ${pin_hour.toString().padStart(2, '0')}:${pin_minute.toString().padStart(2, '0')})`);
-	}
-	if ((pin_day != null)) {
-		station.pin_day = pin_day;
-	}
-	if ((pin_hour != null)) {
-		station.pin_hour = pin_hour;
-	}
-	if ((pin_minute != null)) {
-		station.pin_minute = pin_minute;
+	if ((ok & 0b1000) == 0b1000) {
+		log.record(11).arg(pin_day).arg(pin_hour).arg(pin_minute);
+		if (station.pin_day !== pin_day) {
+			station.pin_day = pin_day;
+			station.changes.mark(StationField.pin_day);
+		}
+		if (station.pin_hour !== pin_hour) {
+			station.pin_hour = pin_hour;
+			station.changes.mark(StationField.pin_hour);
+		}
+		if (station.pin_minute !== pin_minute) {
+			station.pin_minute = pin_minute;
+			station.changes.mark(StationField.pin_minute);
+		}
 	}
 }
 
-export function parse_group_2A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_2A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field flag: uint<1> at +27, width 1.
-	let flag = (ok[1]) ?
-		((block[1] & 0b10000) >> 4)
-		: null;
+	const flag = ((block[1] & 0b10000) >> 4);
 	// Field addr: uint<4> at +28, width 4.
-	let addr = (ok[1]) ?
-		((block[1] & 0b1111))
-		: null;
+	const addr = ((block[1] & 0b1111));
 	// Field rt_seg: byte<4> at +32, width 32.
-	let rt_seg__0 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	let rt_seg__1 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	let rt_seg__2 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let rt_seg__3 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const rt_seg = [rt_seg__0, rt_seg__1, rt_seg__2, rt_seg__3];
+	const rt_seg__0 = ((block[2] & 0b1111111100000000) >> 8);
+	const rt_seg__1 = ((block[2] & 0b11111111));
+	const rt_seg__2 = ((block[3] & 0b1111111100000000) >> 8);
+	const rt_seg__3 = ((block[3] & 0b11111111));
 
 	// Actions.
-	if ((flag != null)) {
-		log.add(`RT flag=${flag ? 'A' : 'B'}`);
-	}
-	if ((addr != null) && (rt_seg != null)) {
-		log.add(`RT seg @${addr} "${formatRdsText(rt_seg)}"`);
-	}
-	if ((station != null)) {
-		if ((addr != null) && (rt_seg__0 != null)) {
-			station.rt.setByte(addr*4 + 0, rt_seg__0);
-		}
-		if ((addr != null) && (rt_seg__1 != null)) {
-			station.rt.setByte(addr*4 + 1, rt_seg__1);
-		}
-		if ((addr != null) && (rt_seg__2 != null)) {
-			station.rt.setByte(addr*4 + 2, rt_seg__2);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(12).arg(flag);
+		log.record(13).arg(addr).arg((ok & 0b0100) == 0b0100 ? rt_seg__0 : null).arg((ok & 0b0100) == 0b0100 ? rt_seg__1 : null).arg((ok & 0b1000) == 0b1000 ? rt_seg__2 : null).arg((ok & 0b1000) == 0b1000 ? rt_seg__3 : null);
+		BYTE_SCRATCH[0] = rt_seg__0;
+		BYTE_SCRATCH[1] = rt_seg__1;
+		BYTE_SCRATCH[2] = rt_seg__2;
+		BYTE_SCRATCH[3] = rt_seg__3;
+		if (station.rt.setBytes(addr*4, BYTE_SCRATCH, ((ok & 0b0100) == 0b0100 ? 0b11 : 0) | ((ok & 0b1000) == 0b1000 ? 0b1100 : 0))) {
+			station.changes.mark(StationField.rt);
 		}
-		if ((addr != null) && (rt_seg__3 != null)) {
-			station.rt.setByte(addr*4 + 3, rt_seg__3);
+		if (station.rt_flag !== flag) {
+			station.rt_flag = flag;
+			station.changes.mark(StationField.rt_flag);
 		}
 	}
-	if ((flag != null)) {
-		station.rt_flag = flag;
-	}
 }
 
-export function parse_group_2B(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_2B(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field flag: uint<1> at +27, width 1.
-	let flag = (ok[1]) ?
-		((block[1] & 0b10000) >> 4)
-		: null;
+	const flag = ((block[1] & 0b10000) >> 4);
 	// Field addr: uint<4> at +28, width 4.
-	let addr = (ok[1]) ?
-		((block[1] & 0b1111))
-		: null;
+	const addr = ((block[1] & 0b1111));
 	// Field pi: uint<16> at +32, width 16.
-	let pi = (ok[2]) ?
-		((block[2]))
-		: null;
 	// Field rt_seg: byte<2> at +48, width 16.
-	let rt_seg__0 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let rt_seg__1 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const rt_seg = [rt_seg__0, rt_seg__1];
+	const rt_seg__0 = ((block[3] & 0b1111111100000000) >> 8);
+	const rt_seg__1 = ((block[3] & 0b11111111));
 
 	// Actions.
-	if ((flag != null)) {
-		log.add(`RT flag=${flag ? 'A' : 'B'}`);
-	}
-	if ((addr != null) && (rt_seg != null)) {
-		log.add(`RT seg @${addr} "${formatRdsText(rt_seg)}"`);
-	}
-	if ((station != null)) {
-		if ((addr != null) && (rt_seg__0 != null)) {
-			station.rt.setByte(addr*2 + 0, rt_seg__0);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(12).arg(flag);
+		log.record(14).arg(addr).arg((ok & 0b1000) == 0b1000 ? rt_seg__0 : null).arg((ok & 0b1000) == 0b1000 ? rt_seg__1 : null);
+		BYTE_SCRATCH[0] = rt_seg__0;
+		BYTE_SCRATCH[1] = rt_seg__1;
+		if (station.rt.setBytes(addr*2, BYTE_SCRATCH, ((ok & 0b1000) == 0b1000 ? 0b11 : 0))) {
+			station.changes.mark(StationField.rt);
 		}
-		if ((addr != null) && (rt_seg__1 != null)) {
-			station.rt.setByte(addr*2 + 1, rt_seg__1);
+		if (station.rt_flag !== flag) {
+			station.rt_flag = flag;
+			station.changes.mark(StationField.rt_flag);
 		}
 	}
-	if ((flag != null)) {
-		station.rt_flag = flag;
-	}
 }
 
-export function parse_group_3A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_3A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field app_group_type: uint<5> at +27, width 5.
-	let app_group_type = (ok[1]) ?
-		((block[1] & 0b11111))
-		: null;
+	const app_group_type = ((block[1] & 0b11111));
 	// Field app_data: unparsed<16> at +32, width 16.
 	// Field aid: uint<16> at +48, width 16.
-	let aid = (ok[3]) ?
-		((block[3]))
-		: null;
+	const aid = ((block[3]));
 
 	// Actions.
-	if ((aid != null)) {
-		log.add(`ODA AID=${aid.toString(16).toUpperCase().padStart(4, '0')}`);
-	}
-	if ((aid != null) && (app_group_type != null)) {
-		station.transmitted_odas.set(app_group_type, aid);
+	if ((ok & 0b1000) == 0b1000) {
+		log.record(15).arg(aid);
+		if ((ok & 0b0010) == 0b0010) {
+			if (station.transmitted_odas.get(app_group_type) !== aid) {
+				station.transmitted_odas.set(app_group_type, aid);
+				station.changes.mark(StationField.transmitted_odas);
+			}
+		}
 	}
-	if ((app_group_type != null)) {
+	if ((ok & 0b0010) == 0b0010) {
 		switch (app_group_type) {
 			case 0:
 			case 31:
-				log.add(`no associated group`);
+				log.record(16);
 				break;
 
 			default:
-				if ((app_group_type != null)) {
-					log.add(`in group ${(app_group_type>>1).toString() + ((app_group_type & 1) == 0 ? 'A' : 'B')}`);
-				}
-				if ((aid != null) && (app_group_type != null)) {
-					station.app_mapping.set(app_group_type, station.odas.get(aid) ?? "group_unknown");
+				log.record(17).arg(app_group_type);
+				if ((ok & 0b1000) == 0b1000) {
+					if (station.app_mapping.get(app_group_type) !== (station.odas.get(aid) ?? Rule.group_unknown)) {
+						station.app_mapping.set(app_group_type, station.odas.get(aid) ?? Rule.group_unknown);
+						station.changes.mark(StationField.app_mapping);
+						load_rule(station.app_mapping.get(app_group_type)!);
+					}
 				}
 				break;
 
 		}
 	}
-	if ((aid != null)) {
-		get_parse_function(station.oda_3A_mapping.get(aid) ?? "group_unknown")(block, ok, log, station);
+	if ((ok & 0b1000) == 0b1000) {
+		PARSE_FUNCTIONS[station.oda_3A_mapping.get(aid) ?? Rule.group_unknown](block, ok, log, station);
 	}
 }
 
-export function parse_group_4A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_4A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field _: uint<3> at +27, width 3.
 	// Field mjd: uint<17> at +30, width 17.
-	let mjd = (ok[1] && ok[2]) ?
-		((block[1] & 0b11) << 15) | ((block[2] & 0b1111111111111110) >> 1)
-		: null;
+	const mjd = ((block[1] & 0b11) << 15) | ((block[2] & 0b1111111111111110) >> 1);
 	// Field hour: uint<5> at +47, width 5.
-	let hour = (ok[2] && ok[3]) ?
-		((block[2] & 0b1) << 4) | ((block[3] & 0b1111000000000000) >> 12)
-		: null;
+	const hour = ((block[2] & 0b1) << 4) | ((block[3] & 0b1111000000000000) >> 12);
 	// Field minute: uint<6> at +52, width 6.
-	let minute = (ok[3]) ?
-		((block[3] & 0b111111000000) >> 6)
-		: null;
+	const minute = ((block[3] & 0b111111000000) >> 6);
 	// Field tz_sign: bool at +58, width 1.
-	let tz_sign = (ok[3]) ?
-		((block[3] & 0b100000) >> 5) == 1
-		: null;
+	const tz_sign = ((block[3] & 0b100000) >> 5) == 1;
 	// Field tz_offset: uint<5> at +59, width 5.
-	let tz_offset = (ok[3]) ?
-		((block[3] & 0b11111))
-		: null;
+	const tz_offset = ((block[3] & 0b11111));
 
 	// Actions.
-	if ((mjd != null)) {
-		log.add(`MJD=${mjd}`);
-	}
-	if ((hour != null)) {
-		log.add(`Hour=${hour.toString().padStart(2, '0')}`);
-	}
-	if ((minute != null)) {
-		log.add(`Minute=${minute.toString().padStart(2, '0')}`);
-	}
-	if ((tz_offset != null) && (tz_sign != null)) {
-		log.add(`TZ=${tz_sign ? '+' : '-'}${tz_offset}`);
+	if ((ok & 0b0100) == 0b0100) {
+		if ((ok & 0b0010) == 0b0010) {
+			log.record(18).arg(mjd);
+		}
+		if ((ok & 0b1000) == 0b1000) {
+			log.record(19).arg(hour);
+		}
 	}
-	if ((hour != null) && (minute != null) && (mjd != null) && (station != null) && (tz_offset != null) && (tz_sign != null)) {
-		station.setClockTime(mjd, hour, minute, tz_sign, tz_offset);
+	if ((ok & 0b1000) == 0b1000) {
+		log.record(20).arg(minute);
+		log.record(21).arg(tz_sign).arg(tz_offset);
+		if ((ok & 0b0110) == 0b0110) {
+			station.setClockTime(mjd, hour, minute, tz_sign, tz_offset);
+			station.changes.mark(StationField.setClockTime);
+		}
 	}
 }
 
-export function parse_group_10A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_10A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field flag_ab: bool at +27, width 1.
-	let flag_ab = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
+	const flag_ab = ((block[1] & 0b10000) >> 4) == 1;
 	// Field _: uint<3> at +28, width 3.
 	// Field addr: uint<1> at +31, width 1.
-	let addr = (ok[1]) ?
-		((block[1] & 0b1))
-		: null;
+	const addr = ((block[1] & 0b1));
 	// Field ptyn_seg: byte<4> at +32, width 32.
-	let ptyn_seg__0 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	let ptyn_seg__1 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	let ptyn_seg__2 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let ptyn_seg__3 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const ptyn_seg = [ptyn_seg__0, ptyn_seg__1, ptyn_seg__2, ptyn_seg__3];
+	const ptyn_seg__0 = ((block[2] & 0b1111111100000000) >> 8);
+	const ptyn_seg__1 = ((block[2] & 0b11111111));
+	const ptyn_seg__2 = ((block[3] & 0b1111111100000000) >> 8);
+	const ptyn_seg__3 = ((block[3] & 0b11111111));
 
 	// Actions.
-	if ((flag_ab != null)) {
-		log.add(`PTYN flag=${flag_ab ? 'A' : 'B'}`);
-	}
-	if ((addr != null) && (ptyn_seg != null)) {
-		log.add(`PTYN seg @${addr} "${formatRdsText(ptyn_seg)}"`);
-	}
-	if ((station != null)) {
-		if ((addr != null) && (ptyn_seg__0 != null)) {
-			station.ptyn.setByte(addr*4 + 0, ptyn_seg__0);
-		}
-		if ((addr != null) && (ptyn_seg__1 != null)) {
-			station.ptyn.setByte(addr*4 + 1, ptyn_seg__1);
-		}
-		if ((addr != null) && (ptyn_seg__2 != null)) {
-			station.ptyn.setByte(addr*4 + 2, ptyn_seg__2);
-		}
-		if ((addr != null) && (ptyn_seg__3 != null)) {
-			station.ptyn.setByte(addr*4 + 3, ptyn_seg__3);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(22).arg(flag_ab);
+		log.record(23).arg(addr).arg((ok & 0b0100) == 0b0100 ? ptyn_seg__0 : null).arg((ok & 0b0100) == 0b0100 ? ptyn_seg__1 : null).arg((ok & 0b1000) == 0b1000 ? ptyn_seg__2 : null).arg((ok & 0b1000) == 0b1000 ? ptyn_seg__3 : null);
+		BYTE_SCRATCH[0] = ptyn_seg__0;
+		BYTE_SCRATCH[1] = ptyn_seg__1;
+		BYTE_SCRATCH[2] = ptyn_seg__2;
+		BYTE_SCRATCH[3] = ptyn_seg__3;
+		if (station.ptyn.setBytes(addr*4, BYTE_SCRATCH, ((ok & 0b0100) == 0b0100 ? 0b11 : 0) | ((ok & 0b1000) == 0b1000 ? 0b1100 : 0))) {
+			station.changes.mark(StationField.ptyn);
 		}
 	}
 }
 
-export function parse_group_15A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_15A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field ta: bool at +27, width 1.
-	let ta = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
+	const ta = ((block[1] & 0b10000) >> 4) == 1;
 	// Field _: bool at +28, width 1.
 	// Field addr: uint<3> at +29, width 3.
-	let addr = (ok[1]) ?
-		((block[1] & 0b111))
-		: null;
+	const addr = ((block[1] & 0b111));
 	// Field lps_seg: byte<4> at +32, width 32.
-	let lps_seg__0 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	let lps_seg__1 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	let lps_seg__2 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let lps_seg__3 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const lps_seg = [lps_seg__0, lps_seg__1, lps_seg__2, lps_seg__3];
+	const lps_seg__0 = ((block[2] & 0b1111111100000000) >> 8);
+	const lps_seg__1 = ((block[2] & 0b11111111));
+	const lps_seg__2 = ((block[3] & 0b1111111100000000) >> 8);
+	const lps_seg__3 = ((block[3] & 0b11111111));
 
 	// Actions.
-	if ((ta != null)) {
-		log.add(`TA=${ta ? '1': '0'}`);
-	}
-	if ((addr != null) && (lps_seg != null)) {
-		log.add(`Long PS seg @${addr} ${formatBytes(lps_seg)}`);
-	}
-	if ((station != null)) {
-		if ((addr != null) && (lps_seg__0 != null)) {
-			station.lps.setByte(addr*4 + 0, lps_seg__0);
-		}
-		if ((addr != null) && (lps_seg__1 != null)) {
-			station.lps.setByte(addr*4 + 1, lps_seg__1);
-		}
-		if ((addr != null) && (lps_seg__2 != null)) {
-			station.lps.setByte(addr*4 + 2, lps_seg__2);
-		}
-		if ((addr != null) && (lps_seg__3 != null)) {
-			station.lps.setByte(addr*4 + 3, lps_seg__3);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(5).arg(ta);
+		log.record(24).arg(addr).arg((ok & 0b0100) == 0b0100 ? lps_seg__0 : null).arg((ok & 0b0100) == 0b0100 ? lps_seg__1 : null).arg((ok & 0b1000) == 0b1000 ? lps_seg__2 : null).arg((ok & 0b1000) == 0b1000 ? lps_seg__3 : null);
+		BYTE_SCRATCH[0] = lps_seg__0;
+		BYTE_SCRATCH[1] = lps_seg__1;
+		BYTE_SCRATCH[2] = lps_seg__2;
+		BYTE_SCRATCH[3] = lps_seg__3;
+		if (station.lps.setBytes(addr*4, BYTE_SCRATCH, ((ok & 0b0100) == 0b0100 ? 0b11 : 0) | ((ok & 0b1000) == 0b1000 ? 0b1100 : 0))) {
+			station.changes.mark(StationField.lps);
 		}
 	}
 }
 
-export function parse_group_15B(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_15B(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field group_common: unparsed<27> at +0, width 27.
 	// Field ta: bool at +27, width 1.
-	let ta = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
+	const ta = ((block[1] & 0b10000) >> 4) == 1;
 	// Field music: bool at +28, width 1.
-	let music = (ok[1]) ?
-		((block[1] & 0b1000) >> 3) == 1
-		: null;
+	const music = ((block[1] & 0b1000) >> 3) == 1;
 	// Field di: bool at +29, width 1.
-	let di = (ok[1]) ?
-		((block[1] & 0b100) >> 2) == 1
-		: null;
+	const di = ((block[1] & 0b100) >> 2) == 1;
 	// Field addr: uint<2> at +30, width 2.
-	let addr = (ok[1]) ?
-		((block[1] & 0b11))
-		: null;
+	const addr = ((block[1] & 0b11));
 	// Field pi: uint<16> at +32, width 16.
-	let pi = (ok[2]) ?
-		((block[2]))
-		: null;
+	const pi = ((block[2]));
 	// Field repeat: unparsed<16> at +48, width 16.
 
 	// Actions.
-	if ((ta != null)) {
-		log.add(`TA=${ta ? '1': '0'}`);
-	}
-	if ((pi != null)) {
-		log.add(`PI=${pi.toString(16).toUpperCase().padStart(4, '0')}`);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(5).arg(ta);
 	}
-	if ((ta != null)) {
-		station.ta = ta;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(0).arg(pi);
 	}
-	if ((music != null)) {
-		station.music = music;
-	}
-	if ((addr != null)) {
+	if ((ok & 0b0010) == 0b0010) {
+		if (station.ta !== ta) {
+			station.ta = ta;
+			station.changes.mark(StationField.ta);
+		}
+		if (station.music !== music) {
+			station.music = music;
+			station.changes.mark(StationField.music);
+		}
 		switch (addr) {
 			case 0:
-				if ((di != null)) {
+				if (station.di_dynamic_pty !== di) {
 					station.di_dynamic_pty = di;
+					station.changes.mark(StationField.di_dynamic_pty);
 				}
 				break;
 
 			case 1:
-				if ((di != null)) {
+				if (station.di_compressed !== di) {
 					station.di_compressed = di;
+					station.changes.mark(StationField.di_compressed);
 				}
 				break;
 
 			case 2:
-				if ((di != null)) {
+				if (station.di_artificial_head !== di) {
 					station.di_artificial_head = di;
+					station.changes.mark(StationField.di_artificial_head);
 				}
 				break;
 
 			case 3:
-				if ((di != null)) {
+				if (station.di_stereo !== di) {
 					station.di_stereo = di;
+					station.changes.mark(StationField.di_stereo);
 				}
 				break;
 
@@ -665,42 +862,32 @@ export function parse_group_15B(block: Uint16Array, ok: boolean[], log: LogMessa
 	}
 }
 
-export function parse_group_c(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field fid: uint<2> at +0, width 2.
-	let fid = (ok[0]) ?
-		((block[0] & 0b1100000000000000) >> 14)
-		: null;
+	const fid = ((block[0] & 0b1100000000000000) >> 14);
 	// Field fn: uint<6> at +2, width 6.
-	let fn = (ok[0]) ?
-		((block[0] & 0b11111100000000) >> 8)
-		: null;
+	const fn = ((block[0] & 0b11111100000000) >> 8);
 	// Field payload: unparsed<56> at +8, width 56.
 
 	// Actions.
-	if ((fid != null)) {
-		log.add(`FID=${fid}`);
-	}
-	if ((fn != null)) {
-		log.add(`FN=${fn}`);
-	}
-	if ((fid != null)) {
+	if ((ok & 0b0001) == 0b0001) {
+		log.record(25).arg(fid);
+		log.record(26).arg(fn);
 		switch (fid) {
 			case 0:
-				get_parse_function("group_c_fid_0")(block, ok, log, station);
+				parse_group_c_fid_0(block, ok, log, station);
 				break;
 
 			case 1:
-				get_parse_function("group_c_oda")(block, ok, log, station);
+				parse_group_c_oda(block, ok, log, station);
 				break;
 
 			case 2:
-				if ((fn != null)) {
-					switch (fn) {
-						case 0:
-							get_parse_function("group_c_oda_assignment")(block, ok, log, station);
-							break;
+				switch (fn) {
+					case 0:
+						parse_group_c_oda_assignment(block, ok, log, station);
+						break;
 
-					}
 				}
 				break;
 
@@ -711,280 +898,218 @@ export function parse_group_c(block: Uint16Array, ok: boolean[], log: LogMessage
 	}
 }
 
-export function parse_group_c_fid_0(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_fid_0(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field fid: unparsed<2> at +0, width 2.
 	// Field type: uint<2> at +2, width 2.
-	let type = (ok[0]) ?
-		((block[0] & 0b11000000000000) >> 12)
-		: null;
+	const type = ((block[0] & 0b11000000000000) >> 12);
 	// Field _: unparsed<4> at +4, width 4.
 	// Field _: unparsed<56> at +8, width 56.
 
 	// Actions.
-	if ((type != null)) {
+	if ((ok & 0b0001) == 0b0001) {
 		switch (type) {
 			case 0:
-				log.add(`Tunnelled A/B group`);
-				get_parse_function("group_ab_without_pi")(block, ok, log, station);
+				log.record(27);
+				parse_group_ab_without_pi(block, ok, log, station);
 				break;
 
 			case 2:
-				get_parse_function("group_c_rft")(block, ok, log, station);
+				parse_group_c_rft(block, ok, log, station);
 				break;
 
 		}
 	}
 }
 
-export function parse_group_c_rft(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_rft(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field fid: unparsed<2> at +0, width 2.
 	// Field type: unparsed<2> at +2, width 2.
 	// Field pipe: uint<4> at +4, width 4.
-	let pipe = (ok[0]) ?
-		((block[0] & 0b111100000000) >> 8)
-		: null;
+	const pipe = ((block[0] & 0b111100000000) >> 8);
 	// Field toggle: uint<1> at +8, width 1.
-	let toggle = (ok[0]) ?
-		((block[0] & 0b10000000) >> 7)
-		: null;
+	const toggle = ((block[0] & 0b10000000) >> 7);
 	// Field addr: uint<15> at +9, width 15.
-	let addr = (ok[0] && ok[1]) ?
-		((block[0] & 0b1111111) << 8) | ((block[1] & 0b1111111100000000) >> 8)
-		: null;
+	const addr = ((block[0] & 0b1111111) << 8) | ((block[1] & 0b1111111100000000) >> 8);
 	// Field byte1: uint<8> at +24, width 8.
-	let byte1 = (ok[1]) ?
-		((block[1] & 0b11111111))
-		: null;
+	const byte1 = ((block[1] & 0b11111111));
 	// Field byte2: uint<8> at +32, width 8.
-	let byte2 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
+	const byte2 = ((block[2] & 0b1111111100000000) >> 8);
 	// Field byte3: uint<8> at +40, width 8.
-	let byte3 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
+	const byte3 = ((block[2] & 0b11111111));
 	// Field byte4: uint<8> at +48, width 8.
-	let byte4 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
+	const byte4 = ((block[3] & 0b1111111100000000) >> 8);
 	// Field byte5: uint<8> at +56, width 8.
-	let byte5 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
+	const byte5 = ((block[3] & 0b11111111));
 
 	// Actions.
-	if ((pipe != null)) {
-		log.add(`RFT pipe ${pipe}`);
-	}
-	if ((toggle != null)) {
-		log.add(`toggle ${toggle}`);
-	}
-	if ((addr != null)) {
-		log.add(`addr ${addr}`);
-	}
-	if ((addr != null) && (byte1 != null) && (byte2 != null) && (byte3 != null) && (byte4 != null) && (byte5 != null) && (pipe != null) && (station != null)) {
-		station.reportRftData(pipe, addr, byte1, byte2, byte3, byte4, byte5);
+	if ((ok & 0b0001) == 0b0001) {
+		log.record(28).arg(pipe);
+		log.record(29).arg(toggle);
+		if ((ok & 0b0010) == 0b0010) {
+			log.record(30).arg(addr);
+			if ((ok & 0b1100) == 0b1100) {
+				station.reportRftData(pipe, addr, byte1, byte2, byte3, byte4, byte5);
+				station.changes.mark(StationField.reportRftData);
+			}
+		}
 	}
 }
 
-export function parse_group_c_oda(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_oda(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field fid: unparsed<2> at +0, width 2.
 	// Field channel: uint<6> at +2, width 6.
-	let channel = (ok[0]) ?
-		((block[0] & 0b11111100000000) >> 8)
-		: null;
+	const channel = ((block[0] & 0b11111100000000) >> 8);
 	// Field app_data: unparsed<56> at +8, width 56.
 
 	// Actions.
-	if ((channel != null)) {
-		log.add(`ODA channel ${channel}`);
-	}
-	if ((channel != null)) {
-		get_parse_function(station.channel_app_mapping.get(channel) ?? "group_unknown")(block, ok, log, station);
+	if ((ok & 0b0001) == 0b0001) {
+		log.record(31).arg(channel);
+		PARSE_FUNCTIONS[station.channel_app_mapping.get(channel) ?? Rule.group_unknown](block, ok, log, station);
 	}
 }
 
-export function parse_group_c_oda_assignment(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_oda_assignment(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field header: unparsed<8> at +0, width 8.
 	// Field variant: uint<2> at +8, width 2.
-	let variant = (ok[0]) ?
-		((block[0] & 0b11000000) >> 6)
-		: null;
+	const variant = ((block[0] & 0b11000000) >> 6);
 	// Field channel: uint<6> at +10, width 6.
-	let channel = (ok[0]) ?
-		((block[0] & 0b111111))
-		: null;
+	const channel = ((block[0] & 0b111111));
 	// Field aid1: uint<16> at +16, width 16.
-	let aid1 = (ok[1]) ?
-		((block[1]))
-		: null;
+	const aid1 = ((block[1]));
 	// Field block_c: uint<16> at +32, width 16.
-	let block_c = (ok[2]) ?
-		((block[2]))
-		: null;
 	// Field block_d: uint<16> at +48, width 16.
-	let block_d = (ok[3]) ?
-		((block[3]))
-		: null;
 
 	// Actions.
-	if ((variant != null)) {
+	if ((ok & 0b0001) == 0b0001) {
 		switch (variant) {
 			case 0:
-				log.add(`ODA assignment`);
-				if ((aid1 != null) && (channel != null)) {
-					log.add(`Channel ${channel} -> AID ${aid1.toString(16).toUpperCase().padStart(4, '0')}`);
-				}
-				if ((aid1 != null) && (channel != null)) {
-					station.transmitted_channel_odas.set(channel, aid1);
-				}
-				if ((aid1 != null) && (channel != null)) {
-					station.channel_app_mapping.set(channel, station.odas.get(aid1) ?? "group_unknown");
+				log.record(32);
+				if ((ok & 0b0010) == 0b0010) {
+					log.record(33).arg(channel).arg(aid1);
+					if (station.transmitted_channel_odas.get(channel) !== aid1) {
+						station.transmitted_channel_odas.set(channel, aid1);
+						station.changes.mark(StationField.transmitted_channel_odas);
+					}
+					if (station.channel_app_mapping.get(channel) !== (station.odas.get(aid1) ?? Rule.group_unknown)) {
+						station.channel_app_mapping.set(channel, station.odas.get(aid1) ?? Rule.group_unknown);
+						station.changes.mark(StationField.channel_app_mapping);
+						load_rule(station.channel_app_mapping.get(channel)!);
+					}
 				}
-				if ((channel != null)) {
-					switch (channel) {
-						case 0:
-						case 1:
-						case 2:
-						case 3:
-						case 4:
-						case 5:
-						case 6:
-						case 7:
-						case 8:
-						case 9:
-						case 10:
-						case 11:
-						case 12:
-						case 13:
-						case 14:
-						case 15:
-							get_parse_function("group_c_oda_rft_assignment")(block, ok, log, station);
-							break;
+				switch (channel) {
+					case 0:
+					case 1:
+					case 2:
+					case 3:
+					case 4:
+					case 5:
+					case 6:
+					case 7:
+					case 8:
+					case 9:
+					case 10:
+					case 11:
+					case 12:
+					case 13:
+					case 14:
+					case 15:
+						parse_group_c_oda_rft_assignment(block, ok, log, station);
+						break;
 
-					}
 				}
 				break;
 
 			case 1:
 			case 2:
 			case 3:
-				if ((variant != null)) {
-					log.add(`Variant ${variant} not implemented.`);
-				}
+				log.record(34).arg(variant);
 				break;
 
 		}
 	}
 }
 
-export function parse_group_c_oda_rft_assignment(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_oda_rft_assignment(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field header: unparsed<8> at +0, width 8.
 	// Field zero: unparsed<4> at +8, width 4.
 	// Field pipe: unparsed<4> at +12, width 4.
 	// Field aid: unparsed<16> at +16, width 16.
 	// Field variant: uint<4> at +32, width 4.
-	let variant = (ok[2]) ?
-		((block[2] & 0b1111000000000000) >> 12)
-		: null;
+	const variant = ((block[2] & 0b1111000000000000) >> 12);
 	// Field _: unparsed<28> at +36, width 28.
 
 	// Actions.
-	if ((variant != null)) {
-		log.add(`Variant ${variant}`);
-	}
-	if ((variant != null)) {
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(35).arg(variant);
 		switch (variant) {
 			case 0:
-				get_parse_function("group_c_oda_rft_assignment_v0")(block, ok, log, station);
+				parse_group_c_oda_rft_assignment_v0(block, ok, log, station);
 				break;
 
 			case 1:
-				get_parse_function("group_c_oda_rft_assignment_v1")(block, ok, log, station);
+				parse_group_c_oda_rft_assignment_v1(block, ok, log, station);
 				break;
 
 		}
 	}
 }
 
-export function parse_group_c_oda_rft_assignment_v0(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_oda_rft_assignment_v0(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field header: unparsed<8> at +0, width 8.
 	// Field zero: unparsed<4> at +8, width 4.
 	// Field pipe: uint<4> at +12, width 4.
-	let pipe = (ok[0]) ?
-		((block[0] & 0b1111))
-		: null;
+	const pipe = ((block[0] & 0b1111));
 	// Field aid: unparsed<16> at +16, width 16.
 	// Field variant: unparsed<4> at +32, width 4.
 	// Field crc_present: bool at +36, width 1.
-	let crc_present = (ok[2]) ?
-		((block[2] & 0b100000000000) >> 11) == 1
-		: null;
+	const crc_present = ((block[2] & 0b100000000000) >> 11) == 1;
 	// Field file_version: uint<3> at +37, width 3.
-	let file_version = (ok[2]) ?
-		((block[2] & 0b11100000000) >> 8)
-		: null;
+	const file_version = ((block[2] & 0b11100000000) >> 8);
 	// Field file_id: uint<6> at +40, width 6.
-	let file_id = (ok[2]) ?
-		((block[2] & 0b11111100) >> 2)
-		: null;
+	const file_id = ((block[2] & 0b11111100) >> 2);
 	// Field file_size: uint<18> at +46, width 18.
-	let file_size = (ok[2] && ok[3]) ?
-		((block[2] & 0b11) << 16) | ((block[3]))
-		: null;
+	const file_size = ((block[2] & 0b11) << 16) | ((block[3]));
 
 	// Actions.
-	if ((crc_present != null)) {
-		log.add(`CRC? ${crc_present ? '1': '0'}`);
-	}
-	if ((file_version != null)) {
-		log.add(`File version: ${file_version}`);
-	}
-	if ((file_id != null)) {
-		log.add(`File id: ${file_id}`);
-	}
-	if ((file_size != null)) {
-		log.add(`File size: ${file_size}`);
-	}
-	if ((crc_present != null) && (file_id != null) && (file_size != null) && (file_version != null) && (pipe != null) && (station != null)) {
-		station.reportRftMetadata(pipe, file_size, file_id, file_version, crc_present);
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(36).arg(crc_present);
+		log.record(37).arg(file_version);
+		log.record(38).arg(file_id);
+		if ((ok & 0b1000) == 0b1000) {
+			log.record(39).arg(file_size);
+			if ((ok & 0b0001) == 0b0001) {
+				station.reportRftMetadata(pipe, file_size, file_id, file_version, crc_present);
+				station.changes.mark(StationField.reportRftMetadata);
+			}
+		}
 	}
 }
 
-export function parse_group_c_oda_rft_assignment_v1(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
+export function parse_group_c_oda_rft_assignment_v1(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
 	// Field header: unparsed<8> at +0, width 8.
 	// Field zero: unparsed<4> at +8, width 4.
 	// Field pipe: uint<4> at +12, width 4.
-	let pipe = (ok[0]) ?
-		((block[0] & 0b1111))
-		: null;
+	const pipe = ((block[0] & 0b1111));
 	// Field aid: unparsed<16> at +16, width 16.
 	// Field variant: unparsed<4> at +32, width 4.
 	// Field mode: uint<3> at +36, width 3.
-	let mode = (ok[2]) ?
-		((block[2] & 0b111000000000) >> 9)
-		: null;
+	const mode = ((block[2] & 0b111000000000) >> 9);
 	// Field chunk_address: uint<9> at +39, width 9.
-	let chunk_address = (ok[2]) ?
-		((block[2] & 0b111111111))
-		: null;
+	const chunk_address = ((block[2] & 0b111111111));
 	// Field crc: uint<16> at +48, width 16.
-	let crc = (ok[3]) ?
-		((block[3]))
-		: null;
+	const crc = ((block[3]));
 
 	// Actions.
-	if ((mode != null)) {
-		log.add(`CRC mode: ${mode}`);
-	}
-	if ((chunk_address != null)) {
-		log.add(`Chunk addr: ${chunk_address}`);
-	}
-	if ((crc != null)) {
-		log.add(`CRC: ${crc.toString(16).toUpperCase().padStart(4, '0')}`);
-	}
-	if ((chunk_address != null) && (crc != null) && (mode != null) && (pipe != null) && (station != null)) {
-		station.reportRftCrc(pipe, mode, chunk_address, crc);
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(40).arg(mode);
+		log.record(41).arg(chunk_address);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		log.record(42).arg(crc);
+		if ((ok & 0b0101) == 0b0101) {
+			station.reportRftCrc(pipe, mode, chunk_address, crc);
+			station.changes.mark(StationField.reportRftCrc);
+		}
 	}
 }
 
@@ -1000,1056 +1125,581 @@ export interface RpApp {
 	reportAlphaPart(flag_ab: boolean, addr: number, offset: number, c1: number, c2: number, last: boolean): void;
 }
 
-export function parse_group_7A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_common: unparsed<27> at +0, width 27.
-	// Field flag_ab: bool at +27, width 1.
-	let flag_ab = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field addr: uint<4> at +28, width 4.
-	let addr = (ok[1]) ?
-		((block[1] & 0b1111))
-		: null;
-	// Field paging_data: unparsed<32> at +32, width 32.
-
-	// Actions.
-	if ((flag_ab != null)) {
-		log.add(`Paging [flag=${flag_ab ? 'A' : 'B'}]`);
-	}
-	if ((addr != null)) {
-		switch (addr) {
-			case 0:
-				if ((flag_ab != null) && (station != null)) {
-					station.rp_app.newBeepMessage(flag_ab);
-				}
-				log.add(`Beep`);
-				get_parse_function("group_7A_address")(block, ok, log, station);
-				if ((flag_ab != null) && (station != null)) {
-					station.rp_app.reportBeep(flag_ab);
-				}
-				break;
-
-			case 1:
-				log.add(`Functions`);
-				break;
+export function serialize_RpApp(s: RpApp, w: SnapshotWriter) {
+}
 
-			case 2:
-			case 3:
-				log.add(`10-digit`);
-				get_parse_function("group_7A_numeric_10")(block, ok, log, station);
-				break;
+export function deserialize_RpApp(s: RpApp, r: SnapshotReader) {
+}
 
-			case 4:
-			case 5:
-			case 6:
-			case 7:
-				log.add(`18-digit`);
-				get_parse_function("group_7A_numeric_18")(block, ok, log, station);
-				break;
+export interface RtPlusApp {
+	setTag(content_type: number, start: number, length: number): void;
+}
 
-			case 8:
-			case 9:
-			case 10:
-			case 11:
-			case 12:
-			case 13:
-			case 14:
-			case 15:
-				log.add(`Alphanumeric`);
-				get_parse_function("group_7A_alphanumeric")(block, ok, log, station);
-				break;
+export function serialize_RtPlusApp(s: RtPlusApp, w: SnapshotWriter) {
+}
 
-		}
-	}
+export function deserialize_RtPlusApp(s: RtPlusApp, r: SnapshotReader) {
 }
 
-export function parse_group_7A_address(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field rp_common: unparsed<27> at +0, width 27.
-	// Field flag_ab: bool at +27, width 1.
-	let flag_ab = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field _: unparsed<4> at +28, width 4.
-	// Field y1: uint<4> at +32, width 4.
-	let y1 = (ok[2]) ?
-		((block[2] & 0b1111000000000000) >> 12)
-		: null;
-	// Field y2: uint<4> at +36, width 4.
-	let y2 = (ok[2]) ?
-		((block[2] & 0b111100000000) >> 8)
-		: null;
-	// Field z1: uint<4> at +40, width 4.
-	let z1 = (ok[2]) ?
-		((block[2] & 0b11110000) >> 4)
-		: null;
-	// Field z2: uint<4> at +44, width 4.
-	let z2 = (ok[2]) ?
-		((block[2] & 0b1111))
-		: null;
-	// Field z3: uint<4> at +48, width 4.
-	let z3 = (ok[3]) ?
-		((block[3] & 0b1111000000000000) >> 12)
-		: null;
-	// Field z4: uint<4> at +52, width 4.
-	let z4 = (ok[3]) ?
-		((block[3] & 0b111100000000) >> 8)
-		: null;
-	// Field _: unparsed<8> at +56, width 8.
+export interface DabCrossRefApp {
+	addEnsemble(mode: number, frequency: number, eid: number): void;
+	addServiceEnsembleInfo(eid: number, sid: number): void;
+	addServiceLinkageInfo(linkageInfo: number, sid: number): void;
+}
 
-	// Actions.
-	if ((y1 != null) && (y2 != null) && (z1 != null) && (z2 != null) && (z3 != null) && (z4 != null)) {
-		log.add(`Address: ${formatBcd(y1)}${formatBcd(y2)}/${formatBcd(z1)}${formatBcd(z2)}${formatBcd(z3)}${formatBcd(z4)}`);
-	}
-	if ((flag_ab != null) && (station != null) && (y1 != null) && (y2 != null) && (z1 != null) && (z2 != null) && (z3 != null) && (z4 != null)) {
-		station.rp_app.reportAddress(flag_ab, y1, y2, z1, z2, z3, z4);
-	}
+export function serialize_DabCrossRefApp(s: DabCrossRefApp, w: SnapshotWriter) {
 }
 
-export function parse_group_7A_numeric_10(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field rp_common: unparsed<27> at +0, width 27.
-	// Field flag_ab: bool at +27, width 1.
-	let flag_ab = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field _: unparsed<3> at +28, width 3.
-	// Field addr: uint<1> at +31, width 1.
-	let addr = (ok[1]) ?
-		((block[1] & 0b1))
-		: null;
-	// Field a1: uint<4> at +32, width 4.
-	let a1 = (ok[2]) ?
-		((block[2] & 0b1111000000000000) >> 12)
-		: null;
-	// Field a2: uint<4> at +36, width 4.
-	let a2 = (ok[2]) ?
-		((block[2] & 0b111100000000) >> 8)
-		: null;
-	// Field a3: uint<4> at +40, width 4.
-	let a3 = (ok[2]) ?
-		((block[2] & 0b11110000) >> 4)
-		: null;
-	// Field a4: uint<4> at +44, width 4.
-	let a4 = (ok[2]) ?
-		((block[2] & 0b1111))
-		: null;
-	// Field a5: uint<4> at +48, width 4.
-	let a5 = (ok[3]) ?
-		((block[3] & 0b1111000000000000) >> 12)
-		: null;
-	// Field a6: uint<4> at +52, width 4.
-	let a6 = (ok[3]) ?
-		((block[3] & 0b111100000000) >> 8)
-		: null;
-	// Field a7: uint<4> at +56, width 4.
-	let a7 = (ok[3]) ?
-		((block[3] & 0b11110000) >> 4)
-		: null;
-	// Field a8: uint<4> at +60, width 4.
-	let a8 = (ok[3]) ?
-		((block[3] & 0b1111))
-		: null;
+export function deserialize_DabCrossRefApp(s: DabCrossRefApp, r: SnapshotReader) {
+}
 
-	// Actions.
-	if ((addr != null)) {
-		switch (addr) {
-			case 0:
-				if ((flag_ab != null) && (station != null)) {
-					station.rp_app.new10dMessage(flag_ab);
-				}
-				get_parse_function("group_7A_address")(block, ok, log, station);
-				if ((a7 != null) && (a8 != null)) {
-					log.add(`Part 1/2: ${formatBcd(a7)}${formatBcd(a8)}`);
-				}
-				if ((a7 != null) && (a8 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report10dPart(flag_ab, 0, a7, a8);
-				}
-				break;
+export interface ERtApp {
+	ert: RdsString;
+	utf8_encoding?: boolean;
+	enabled?: boolean;
+}
 
-			case 1:
-				if ((a1 != null) && (a2 != null) && (a3 != null) && (a4 != null) && (a5 != null) && (a6 != null) && (a7 != null) && (a8 != null)) {
-					log.add(`Part 2/2: ${formatBcd(a1)}${formatBcd(a2)}${formatBcd(a3)}${formatBcd(a4)}${formatBcd(a5)}${formatBcd(a6)}${formatBcd(a7)}${formatBcd(a8)}`);
-				}
-				if ((a1 != null) && (a2 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report10dPart(flag_ab, 1, a1, a2);
-				}
-				if ((a3 != null) && (a4 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report10dPart(flag_ab, 2, a3, a4);
-				}
-				if ((a5 != null) && (a6 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report10dPart(flag_ab, 3, a5, a6);
-				}
-				if ((a7 != null) && (a8 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report10dPart(flag_ab, 4, a7, a8);
-				}
-				break;
+export function serialize_ERtApp(s: ERtApp, w: SnapshotWriter) {
+	w.flag(s.utf8_encoding != undefined);
+	w.flag(s.utf8_encoding == true);
+	w.flag(s.enabled != undefined);
+	w.flag(s.enabled == true);
+	s.ert.serialize(w);
+}
 
-		}
-	}
+export function deserialize_ERtApp(s: ERtApp, r: SnapshotReader) {
+	const has_utf8_encoding = r.flag();
+	const utf8_encoding = r.flag();
+	const has_enabled = r.flag();
+	const enabled = r.flag();
+	s.ert.deserialize(r);
+	s.utf8_encoding = has_utf8_encoding ? utf8_encoding : undefined;
+	s.enabled = has_enabled ? enabled : undefined;
 }
 
-export function parse_group_7A_numeric_18(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field rp_common: unparsed<27> at +0, width 27.
-	// Field flag_ab: bool at +27, width 1.
-	let flag_ab = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field _: unparsed<2> at +28, width 2.
-	// Field addr: uint<2> at +30, width 2.
-	let addr = (ok[1]) ?
-		((block[1] & 0b11))
-		: null;
-	// Field a1: uint<4> at +32, width 4.
-	let a1 = (ok[2]) ?
-		((block[2] & 0b1111000000000000) >> 12)
-		: null;
-	// Field a2: uint<4> at +36, width 4.
-	let a2 = (ok[2]) ?
-		((block[2] & 0b111100000000) >> 8)
-		: null;
-	// Field a3: uint<4> at +40, width 4.
-	let a3 = (ok[2]) ?
-		((block[2] & 0b11110000) >> 4)
-		: null;
-	// Field a4: uint<4> at +44, width 4.
-	let a4 = (ok[2]) ?
-		((block[2] & 0b1111))
-		: null;
-	// Field a5: uint<4> at +48, width 4.
-	let a5 = (ok[3]) ?
-		((block[3] & 0b1111000000000000) >> 12)
-		: null;
-	// Field a6: uint<4> at +52, width 4.
-	let a6 = (ok[3]) ?
-		((block[3] & 0b111100000000) >> 8)
-		: null;
-	// Field a7: uint<4> at +56, width 4.
-	let a7 = (ok[3]) ?
-		((block[3] & 0b11110000) >> 4)
-		: null;
-	// Field a8: uint<4> at +60, width 4.
-	let a8 = (ok[3]) ?
-		((block[3] & 0b1111))
-		: null;
+export interface InternetConnectionApp {
+	url: RdsString;
+	enabled?: boolean;
+}
 
-	// Actions.
-	if ((addr != null)) {
-		switch (addr) {
-			case 0:
-				if ((flag_ab != null) && (station != null)) {
-					station.rp_app.new18dMessage(flag_ab);
-				}
-				get_parse_function("group_7A_address")(block, ok, log, station);
-				if ((a7 != null) && (a8 != null)) {
-					log.add(`Part 1/3: ${formatBcd(a7)}${formatBcd(a8)}`);
-				}
-				if ((a7 != null) && (a8 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 0, a7, a8);
-				}
-				break;
+export function serialize_InternetConnectionApp(s: InternetConnectionApp, w: SnapshotWriter) {
+	w.flag(s.enabled != undefined);
+	w.flag(s.enabled == true);
+	s.url.serialize(w);
+}
 
-			case 1:
-				if ((a1 != null) && (a2 != null) && (a3 != null) && (a4 != null) && (a5 != null) && (a6 != null) && (a7 != null) && (a8 != null)) {
-					log.add(`Part 2/3: ${formatBcd(a1)}${formatBcd(a2)}${formatBcd(a3)}${formatBcd(a4)}${formatBcd(a5)}${formatBcd(a6)}${formatBcd(a7)}${formatBcd(a8)}`);
-				}
-				if ((a1 != null) && (a2 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 1, a1, a2);
-				}
-				if ((a3 != null) && (a4 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 2, a3, a4);
-				}
-				if ((a5 != null) && (a6 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 3, a5, a6);
-				}
-				if ((a7 != null) && (a8 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 4, a7, a8);
-				}
-				break;
+export function deserialize_InternetConnectionApp(s: InternetConnectionApp, r: SnapshotReader) {
+	const has_enabled = r.flag();
+	const enabled = r.flag();
+	s.url.deserialize(r);
+	s.enabled = has_enabled ? enabled : undefined;
+}
 
-			case 2:
-				if ((a1 != null) && (a2 != null) && (a3 != null) && (a4 != null) && (a5 != null) && (a6 != null) && (a7 != null) && (a8 != null)) {
-					log.add(`Part 3/3: ${formatBcd(a1)}${formatBcd(a2)}${formatBcd(a3)}${formatBcd(a4)}${formatBcd(a5)}${formatBcd(a6)}${formatBcd(a7)}${formatBcd(a8)}`);
-				}
-				if ((a1 != null) && (a2 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 5, a1, a2);
-				}
-				if ((a3 != null) && (a4 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 6, a3, a4);
-				}
-				if ((a5 != null) && (a6 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 7, a5, a6);
-				}
-				if ((a7 != null) && (a8 != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.report18dPart(flag_ab, 8, a7, a8);
-				}
-				break;
+export const BYTE_SCRATCH = new Uint8Array(8);
+
+// Lazily loaded modules, by source file.
+export const PARSE_MODULES = {
+	rp: new LazyModule("rp", () => import("./base_rp"), () => PARSE_FUNCTIONS),
+	eon: new LazyModule("eon", () => import("./base_eon"), () => PARSE_FUNCTIONS),
+	oda_rtplus: new LazyModule("oda_rtplus", () => import("./base_oda_rtplus"), () => PARSE_FUNCTIONS),
+	oda_dabxref: new LazyModule("oda_dabxref", () => import("./base_oda_dabxref"), () => PARSE_FUNCTIONS),
+	oda_ert: new LazyModule("oda_ert", () => import("./base_oda_ert"), () => PARSE_FUNCTIONS),
+	oda_internet_connection: new LazyModule("oda_internet_connection", () => import("./base_oda_internet_connection"), () => PARSE_FUNCTIONS),
+};
+
+// Parse functions, indexed by rule ID. The rules of a lazily loaded module
+// have stubs of the module until it is loaded.
+export const PARSE_FUNCTIONS = [
+	parse_group_ab,
+	parse_group_ab_without_pi,
+	parse_group_unknown,
+	parse_group_0A,
+	parse_group_0B_0_common,
+	parse_group_1A,
+	parse_group_1A_ecc,
+	parse_group_1B_1_common,
+	parse_group_2A,
+	parse_group_2B,
+	parse_group_3A,
+	parse_group_4A,
+	parse_group_10A,
+	parse_group_15A,
+	parse_group_15B,
+	parse_group_c,
+	parse_group_c_fid_0,
+	parse_group_c_rft,
+	parse_group_c_oda,
+	parse_group_c_oda_assignment,
+	parse_group_c_oda_rft_assignment,
+	parse_group_c_oda_rft_assignment_v0,
+	parse_group_c_oda_rft_assignment_v1,
+	PARSE_MODULES.rp.stub(Rule.group_7A),
+	PARSE_MODULES.rp.stub(Rule.group_7A_address),
+	PARSE_MODULES.rp.stub(Rule.group_7A_numeric_10),
+	PARSE_MODULES.rp.stub(Rule.group_7A_numeric_18),
+	PARSE_MODULES.rp.stub(Rule.group_7A_alphanumeric),
+	PARSE_MODULES.eon.stub(Rule.group_14A),
+	PARSE_MODULES.eon.stub(Rule.group_14A_ps),
+	PARSE_MODULES.eon.stub(Rule.group_14A_af_a),
+	PARSE_MODULES.eon.stub(Rule.group_14A_mapped_af),
+	PARSE_MODULES.eon.stub(Rule.group_14A_pty_ta),
+	PARSE_MODULES.eon.stub(Rule.group_14A_pin),
+	PARSE_MODULES.eon.stub(Rule.group_14B),
+	PARSE_MODULES.oda_rtplus.stub(Rule.group_rtplus),
+	PARSE_MODULES.oda_dabxref.stub(Rule.group_dabxref),
+	PARSE_MODULES.oda_dabxref.stub(Rule.group_dabxref_ensemble),
+	PARSE_MODULES.oda_dabxref.stub(Rule.group_dabxref_service),
+	PARSE_MODULES.oda_ert.stub(Rule.group_ert_declaration),
+	PARSE_MODULES.oda_ert.stub(Rule.group_ert),
+	PARSE_MODULES.oda_internet_connection.stub(Rule.group_internet_connection),
+	PARSE_MODULES.oda_internet_connection.stub(Rule.group_internet_connection_url),
+];
+
+export function get_parse_function(rule: Rule) {
+	const f = PARSE_FUNCTIONS[rule];
+	if (f == undefined) {
+		throw new RangeError("Invalid rule: " + rule);
+	}
+	return f;
+}
 
-		}
-	}
+// Module of each rule, undefined for the rules of this module.
+const RULE_MODULES = [
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	undefined,
+	PARSE_MODULES.rp,
+	PARSE_MODULES.rp,
+	PARSE_MODULES.rp,
+	PARSE_MODULES.rp,
+	PARSE_MODULES.rp,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.eon,
+	PARSE_MODULES.oda_rtplus,
+	PARSE_MODULES.oda_dabxref,
+	PARSE_MODULES.oda_dabxref,
+	PARSE_MODULES.oda_dabxref,
+	PARSE_MODULES.oda_ert,
+	PARSE_MODULES.oda_ert,
+	PARSE_MODULES.oda_internet_connection,
+	PARSE_MODULES.oda_internet_connection,
+];
+
+// Starts loading the module of `rule` if needed. Rules are loaded as soon as
+// they are mapped to a group type, so that they are ready for their groups.
+export function load_rule(rule: Rule) {
+	RULE_MODULES[rule]?.load();
 }
 
-export function parse_group_7A_alphanumeric(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field rp_common: unparsed<27> at +0, width 27.
-	// Field flag_ab: bool at +27, width 1.
-	let flag_ab = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field _: unparsed<1> at +28, width 1.
-	// Field addr: uint<3> at +29, width 3.
-	let addr = (ok[1]) ?
-		((block[1] & 0b111))
-		: null;
-	// Field char1: uint<8> at +32, width 8.
-	let char1 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	// Field char2: uint<8> at +40, width 8.
-	let char2 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	// Field char3: uint<8> at +48, width 8.
-	let char3 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	// Field char4: uint<8> at +56, width 8.
-	let char4 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
+// Loads all the lazily loaded modules.
+export function load_all_rules(): Promise<void> {
+	return Promise.all(Object.values(PARSE_MODULES).map((m) => m.load())).then(() => undefined);
+}
 
-	// Actions.
-	if ((addr != null)) {
-		switch (addr) {
-			case 0:
-				if ((flag_ab != null) && (station != null)) {
-					station.rp_app.newAlphaMessage(flag_ab);
-				}
-				get_parse_function("group_7A_address")(block, ok, log, station);
-				break;
+// Decoding statistics, only updated if compiled with --stats.
+export const PARSE_STATS = new ParseStats(false, PARSE_FUNCTIONS.map((_, rule) => Rule[rule]), []);
 
-			case 1:
-			case 2:
-			case 3:
-			case 4:
-			case 5:
-			case 6:
-				if ((addr != null) && (char1 != null) && (char2 != null) && (char3 != null) && (char4 != null)) {
-					log.add(`Part (${addr} + 6k)/n: "${RDS_CHARMAP[char1]}${RDS_CHARMAP[char2]}${RDS_CHARMAP[char3]}${RDS_CHARMAP[char4]}"`);
-				}
-				if ((addr != null) && (char1 != null) && (char2 != null) && (false != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.reportAlphaPart(flag_ab, addr, 0, char1, char2, false);
-				}
-				if ((addr != null) && (char3 != null) && (char4 != null) && (false != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.reportAlphaPart(flag_ab, addr, 1, char3, char4, false);
-				}
-				break;
+// Cache of the groups parsed by idempotent rules, only used if compiled with --memo.
+export const PARSE_MEMO = new ParseMemo(0, 0);
 
-			case 7:
-				if ((char1 != null) && (char2 != null) && (char3 != null) && (char4 != null)) {
-					log.add(`Part n/n: "${RDS_CHARMAP[char1]}${RDS_CHARMAP[char2]}${RDS_CHARMAP[char3]}${RDS_CHARMAP[char4]}"`);
-				}
-				if ((addr != null) && (char1 != null) && (char2 != null) && (false != null) && (flag_ab != null) && (station != null)) {
-					station.rp_app.reportAlphaPart(flag_ab, addr, 0, char1, char2, false);
-				}
-				if ((addr != null) && (char3 != null) && (char4 != null) && (flag_ab != null) && (station != null) && (true != null)) {
-					station.rp_app.reportAlphaPart(flag_ab, addr, 1, char3, char4, true);
-				}
-				break;
+// Identifies the layout of snapshots, given to SnapshotWriter and SnapshotReader.
+export const SNAPSHOT_FORMAT = 0x35c9028;
 
+// Formats a log message recorded in deferred mode.
+export function formatDeferredLog(format: number, args: ReadonlyArray<LogArg>, start: number): string {
+	switch (format) {
+		case 0: {
+			const pi = args[start + 0] as number;
+			return `PI=${pi.toString(16).toUpperCase().padStart(4, '0')}`;
 		}
-	}
-}
-
-export function parse_group_14A(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_common: unparsed<27> at +0, width 27.
-	// Field tp_on: bool at +27, width 1.
-	let tp_on = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field variant: uint<4> at +28, width 4.
-	let variant = (ok[1]) ?
-		((block[1] & 0b1111))
-		: null;
-	// Field _: uint<16> at +32, width 16.
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((variant != null)) {
-		log.add(`EON v=${variant}`);
-	}
-	if ((pi_on != null)) {
-		log.add(`ON.PI=${pi_on.toString(16).toUpperCase().padStart(4, '0')}`);
-	}
-	if ((tp_on != null)) {
-		log.add(`ON.TP=${tp_on ? '1': '0'}`);
-	}
-	let elt0: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt0 = station.other_networks.get(pi_on);
-		if (elt0 == undefined) {
-			elt0 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt0);
+		case 1: {
+			const type = args[start + 0] as number;
+			return `Group ${(type>>1).toString() + ((type & 1) == 0 ? 'A' : 'B')}`;
 		}
-	}
-	if ((elt0 != undefined) && (tp_on != null)) {
-		elt0.tp = tp_on;
-	}
-	let elt1: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt1 = station.other_networks.get(pi_on);
-		if (elt1 == undefined) {
-			elt1 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt1);
+		case 2: {
+			const tp = args[start + 0] as boolean;
+			return `TP=${tp ? '1': '0'}`;
 		}
-	}
-	if ((elt1 != undefined) && (pi_on != null)) {
-		elt1.pi = pi_on;
-	}
-	if ((variant != null)) {
-		switch (variant) {
-			case 0:
-			case 1:
-			case 2:
-			case 3:
-				get_parse_function("group_14A_ps")(block, ok, log, station);
-				break;
-
-			case 4:
-				get_parse_function("group_14A_af_a")(block, ok, log, station);
-				break;
-
-			case 5:
-			case 6:
-			case 7:
-			case 8:
-				get_parse_function("group_14A_mapped_af")(block, ok, log, station);
-				break;
-
-			case 9:
-				break;
-
-			case 12:
-				break;
-
-			case 13:
-				get_parse_function("group_14A_pty_ta")(block, ok, log, station);
-				break;
-
-			case 14:
-				get_parse_function("group_14A_pin")(block, ok, log, station);
-				break;
-
+		case 3: {
+			const pty = args[start + 0] as number;
+			return `PTY=${pty}`;
 		}
-	}
-}
-
-export function parse_group_14A_ps(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field common: unparsed<30> at +0, width 30.
-	// Field addr: uint<2> at +30, width 2.
-	let addr = (ok[1]) ?
-		((block[1] & 0b11))
-		: null;
-	// Field ps_seg: byte<2> at +32, width 16.
-	let ps_seg__0 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	let ps_seg__1 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	const ps_seg = [ps_seg__0, ps_seg__1];
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((addr != null) && (ps_seg != null)) {
-		log.add(`ON.PS seg @${addr}: "${formatRdsText(ps_seg)}"`);
-	}
-	let elt2: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt2 = station.other_networks.get(pi_on);
-		if (elt2 == undefined) {
-			elt2 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt2);
+		case 4: {
+			const af1 = args[start + 0] as number;
+			const af2 = args[start + 1] as number;
+			return `AFs ${formatAf(af1)}, ${formatAf(af2)}`;
 		}
-	}
-	if ((elt2 != undefined) && (station != null)) {
-		if ((addr != null) && (ps_seg__0 != null)) {
-			elt2.ps.setByte(addr*2 + 0, ps_seg__0);
+		case 5: {
+			const ta = args[start + 0] as boolean;
+			return `TA=${ta ? '1': '0'}`;
 		}
-		if ((addr != null) && (ps_seg__1 != null)) {
-			elt2.ps.setByte(addr*2 + 1, ps_seg__1);
+		case 6: {
+			const addr = args[start + 0] as number;
+			const ps_seg = args.slice(start + 1, start + 3) as Array<number | null>;
+			return `PS seg @${addr} "${formatRdsText(ps_seg)}"`;
 		}
-	}
-}
-
-export function parse_group_14A_af_a(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field common: unparsed<32> at +0, width 32.
-	// Field af1: uint<8> at +32, width 8.
-	let af1 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	// Field af2: uint<8> at +40, width 8.
-	let af2 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((af1 != null) && (af2 != null)) {
-		log.add(`ON.AFs ${formatAf(af1)} ${formatAf(af2)}`);
-	}
-	let elt3: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt3 = station.other_networks.get(pi_on);
-		if (elt3 == undefined) {
-			elt3 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt3);
+		case 7: {
+			const linkage_actuator = args[start + 0] as boolean;
+			return `LA=${linkage_actuator ? '1': '0'}`;
 		}
-	}
-	if ((af1 != null) && (af2 != null) && (elt3 != undefined) && (station != null)) {
-		elt3.addAfPair(af1, af2);
-	}
-}
-
-export function parse_group_14A_mapped_af(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field common: unparsed<32> at +0, width 32.
-	// Field channel: uint<8> at +32, width 8.
-	let channel = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	// Field mapped_channel: uint<8> at +40, width 8.
-	let mapped_channel = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((channel != null) && (mapped_channel != null)) {
-		log.add(`ON.AF mapped ${formatAf(channel)} → ${formatAf(mapped_channel)}`);
-	}
-	let elt4: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt4 = station.other_networks.get(pi_on);
-		if (elt4 == undefined) {
-			elt4 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt4);
+		case 8: {
+			const variant = args[start + 0] as number;
+			return `v=${variant}`;
 		}
-	}
-	if ((channel != null) && (elt4 != undefined) && (mapped_channel != null) && (station != null)) {
-		elt4.addMappedAF(channel, mapped_channel);
-	}
-}
-
-export function parse_group_14A_pty_ta(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field common: unparsed<32> at +0, width 32.
-	// Field pty_on: uint<5> at +32, width 5.
-	let pty_on = (ok[2]) ?
-		((block[2] & 0b1111100000000000) >> 11)
-		: null;
-	// Field _: unparsed<10> at +37, width 10.
-	// Field ta_on: bool at +47, width 1.
-	let ta_on = (ok[2]) ?
-		((block[2] & 0b1)) == 1
-		: null;
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((pty_on != null)) {
-		log.add(`ON.PTY = ${pty_on}`);
-	}
-	if ((ta_on != null)) {
-		log.add(`ON.TA = ${ta_on ? '1': '0'}`);
-	}
-	let elt5: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt5 = station.other_networks.get(pi_on);
-		if (elt5 == undefined) {
-			elt5 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt5);
+		case 9: {
+			const payload = args[start + 0] as number;
+			return `Language code: ${payload}`;
 		}
-	}
-	if ((elt5 != undefined) && (pty_on != null)) {
-		elt5.pty = pty_on;
-	}
-	let elt6: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt6 = station.other_networks.get(pi_on);
-		if (elt6 == undefined) {
-			elt6 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt6);
+		case 10: {
+			const ecc = args[start + 0] as number;
+			return `ECC=${ecc.toString(16).toUpperCase().padStart(2, '0')}`;
 		}
-	}
-	if ((elt6 != undefined) && (ta_on != null)) {
-		elt6.ta = ta_on;
-	}
-}
-
-export function parse_group_14A_pin(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field common: unparsed<32> at +0, width 32.
-	// Field pin_day_on: uint<5> at +32, width 5.
-	let pin_day_on = (ok[2]) ?
-		((block[2] & 0b1111100000000000) >> 11)
-		: null;
-	// Field pin_hour_on: uint<5> at +37, width 5.
-	let pin_hour_on = (ok[2]) ?
-		((block[2] & 0b11111000000) >> 6)
-		: null;
-	// Field pin_minute_on: uint<6> at +42, width 6.
-	let pin_minute_on = (ok[2]) ?
-		((block[2] & 0b111111))
-		: null;
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((pin_day_on != null) && (pin_hour_on != null) && (pin_minute_on != null)) {
-		log.add(`ON.PIN=(D=${pin_day_on}, ${pin_hour_on.toString().padStart(2, '0')}:${pin_minute_on.toString().padStart(2, '0')})`);
-	}
-	let elt7: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt7 = station.other_networks.get(pi_on);
-		if (elt7 == undefined) {
-			elt7 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt7);
+		case 11: {
+			const pin_day = args[start + 0] as number;
+			const pin_hour = args[start + 1] as number;
+			const pin_minute = args[start + 2] as number;
+			return `PIN=(D=${pin_day}, ${pin_hour.toString().padStart(2, '0')}:${pin_minute.toString().padStart(2, '0')})`;
 		}
-	}
-	if ((elt7 != undefined) && (pin_day_on != null)) {
-		elt7.pin_day = pin_day_on;
-	}
-	let elt8: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt8 = station.other_networks.get(pi_on);
-		if (elt8 == undefined) {
-			elt8 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt8);
+		case 12: {
+			const flag = args[start + 0] as number;
+			return `RT flag=${flag ? 'A' : 'B'}`;
 		}
-	}
-	if ((elt8 != undefined) && (pin_hour_on != null)) {
-		elt8.pin_hour = pin_hour_on;
-	}
-	let elt9: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt9 = station.other_networks.get(pi_on);
-		if (elt9 == undefined) {
-			elt9 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt9);
+		case 13: {
+			const addr = args[start + 0] as number;
+			const rt_seg = args.slice(start + 1, start + 5) as Array<number | null>;
+			return `RT seg @${addr} "${formatRdsText(rt_seg)}"`;
 		}
-	}
-	if ((elt9 != undefined) && (pin_minute_on != null)) {
-		elt9.pin_minute = pin_minute_on;
-	}
-}
-
-export function parse_group_14B(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_common: unparsed<27> at +0, width 27.
-	// Field tp_on: bool at +27, width 1.
-	let tp_on = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field ta_on: bool at +28, width 1.
-	let ta_on = (ok[1]) ?
-		((block[1] & 0b1000) >> 3) == 1
-		: null;
-	// Field _: unparsed<3> at +29, width 3.
-	// Field pi: unparsed<16> at +32, width 16.
-	// Field pi_on: uint<16> at +48, width 16.
-	let pi_on = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((ta_on != null)) {
-		log.add(`Other network switch ON.TA=${ta_on ? '1': '0'}`);
-	}
-	let elt10: StationImpl | undefined;
-	if ((pi_on != null)) {
-		elt10 = station.other_networks.get(pi_on);
-		if (elt10 == undefined) {
-			elt10 = new StationImpl(pi_on);
-			station.other_networks.set(pi_on, elt10);
+		case 14: {
+			const addr = args[start + 0] as number;
+			const rt_seg = args.slice(start + 1, start + 3) as Array<number | null>;
+			return `RT seg @${addr} "${formatRdsText(rt_seg)}"`;
 		}
-	}
-	if ((elt10 != undefined) && (ta_on != null)) {
-		elt10.ta = ta_on;
-	}
-	if ((pi_on != null) && (station != null) && (ta_on != null)) {
-		station.reportOtherNetworkSwitch(pi_on, ta_on);
-	}
-}
-
-export interface RtPlusApp {
-	setTag(content_type: number, start: number, length: number): void;
-}
-
-export function parse_group_rtplus(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_common: unparsed<27> at +0, width 27.
-	// Field item_toggle: bool at +27, width 1.
-	let item_toggle = (ok[1]) ?
-		((block[1] & 0b10000) >> 4) == 1
-		: null;
-	// Field item_running: bool at +28, width 1.
-	let item_running = (ok[1]) ?
-		((block[1] & 0b1000) >> 3) == 1
-		: null;
-	// Field content_type_1: uint<6> at +29, width 6.
-	let content_type_1 = (ok[1] && ok[2]) ?
-		((block[1] & 0b111) << 3) | ((block[2] & 0b1110000000000000) >> 13)
-		: null;
-	// Field start_1: uint<6> at +35, width 6.
-	let start_1 = (ok[2]) ?
-		((block[2] & 0b1111110000000) >> 7)
-		: null;
-	// Field length_1: uint<6> at +41, width 6.
-	let length_1 = (ok[2]) ?
-		((block[2] & 0b1111110) >> 1)
-		: null;
-	// Field content_type_2: uint<6> at +47, width 6.
-	let content_type_2 = (ok[2] && ok[3]) ?
-		((block[2] & 0b1) << 5) | ((block[3] & 0b1111100000000000) >> 11)
-		: null;
-	// Field start_2: uint<6> at +53, width 6.
-	let start_2 = (ok[3]) ?
-		((block[3] & 0b11111100000) >> 5)
-		: null;
-	// Field length_2: uint<5> at +59, width 5.
-	let length_2 = (ok[3]) ?
-		((block[3] & 0b11111))
-		: null;
-
-	// Actions.
-	if ((item_running != null) && (item_toggle != null)) {
-		log.add(`RT+ item_toggle=${item_toggle ? '1': '0'} item_running=${item_running ? '1': '0'}`);
-	}
-	if ((content_type_1 != null) && (length_1 != null) && (start_1 != null)) {
-		log.add(`Tag 1: type=${content_type_1}, start=${start_1}, length=${length_1}`);
-	}
-	if ((content_type_2 != null) && (length_2 != null) && (start_2 != null)) {
-		log.add(`Tag 2: type=${content_type_2}, start=${start_2}, length=${length_2}`);
-	}
-	if ((content_type_1 != null) && (length_1 != null) && (start_1 != null) && (station != null)) {
-		station.rt_plus_app.setTag(content_type_1, start_1, length_1);
-	}
-	if ((content_type_2 != null) && (length_2 != null) && (start_2 != null) && (station != null)) {
-		station.rt_plus_app.setTag(content_type_2, start_2, length_2);
-	}
-}
-
-export interface DabCrossRefApp {
-	addEnsemble(mode: number, frequency: number, eid: number): void;
-	addServiceEnsembleInfo(eid: number, sid: number): void;
-	addServiceLinkageInfo(linkageInfo: number, sid: number): void;
-}
-
-export function parse_group_dabxref(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_common: unparsed<27> at +0, width 27.
-	// Field es: uint<1> at +27, width 1.
-	let es = (ok[1]) ?
-		((block[1] & 0b10000) >> 4)
-		: null;
-	// Field _: unparsed<36> at +28, width 36.
-
-	// Actions.
-	if ((es != null)) {
-		switch (es) {
-			case 0:
-				get_parse_function("group_dabxref_ensemble")(block, ok, log, station);
-				break;
-
-			case 1:
-				get_parse_function("group_dabxref_service")(block, ok, log, station);
-				break;
-
+		case 15: {
+			const aid = args[start + 0] as number;
+			return `ODA AID=${aid.toString(16).toUpperCase().padStart(4, '0')}`;
 		}
-	}
-}
-
-export function parse_group_dabxref_ensemble(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field _: unparsed<28> at +0, width 28.
-	// Field mode: uint<2> at +28, width 2.
-	let mode = (ok[1]) ?
-		((block[1] & 0b1100) >> 2)
-		: null;
-	// Field frequency: uint<18> at +30, width 18.
-	let frequency = (ok[1] && ok[2]) ?
-		((block[1] & 0b11) << 16) | ((block[2]))
-		: null;
-	// Field eid: uint<16> at +48, width 16.
-	let eid = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	if ((eid != null) && (frequency != null) && (mode != null) && (station != null)) {
-		station.dab_cross_ref_app.addEnsemble(mode, frequency, eid);
-	}
-}
-
-export function parse_group_dabxref_service(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field _: unparsed<28> at +0, width 28.
-	// Field variant: uint<4> at +28, width 4.
-	let variant = (ok[1]) ?
-		((block[1] & 0b1111))
-		: null;
-	// Field info: uint<16> at +32, width 16.
-	let info = (ok[2]) ?
-		((block[2]))
-		: null;
-	// Field sid: uint<16> at +48, width 16.
-	let sid = (ok[3]) ?
-		((block[3]))
-		: null;
-
-	// Actions.
-	log.add(`DAB xref`);
-	if ((variant != null)) {
-		log.add(`v=${variant}`);
-	}
-	if ((info != null)) {
-		log.add(`info=${info.toString(16).toUpperCase().padStart(4, '0')}`);
-	}
-	if ((sid != null)) {
-		log.add(`sid=${sid.toString(16).toUpperCase().padStart(4, '0')}`);
-	}
-	if ((variant != null)) {
-		switch (variant) {
-			case 0:
-				if ((info != null) && (sid != null) && (station != null)) {
-					station.dab_cross_ref_app.addServiceEnsembleInfo(info, sid);
-				}
-				break;
-
-			case 1:
-				if ((info != null) && (sid != null) && (station != null)) {
-					station.dab_cross_ref_app.addServiceLinkageInfo(info, sid);
-				}
-				break;
-
+		case 16: {
+			return `no associated group`;
 		}
-	}
-}
-
-export interface ERtApp {
-	ert: RdsString;
-	utf8_encoding?: boolean;
-	enabled?: boolean;
-}
-
-export function parse_group_ert_declaration(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_3A_common: unparsed<32> at +0, width 32.
-	// Field rfu: unparsed<15> at +32, width 15.
-	// Field utf8_encoding: bool at +47, width 1.
-	let utf8_encoding = (ok[2]) ?
-		((block[2] & 0b1)) == 1
-		: null;
-	// Field ert_aid: unparsed<16> at +48, width 16.
-
-	// Actions.
-	if ((utf8_encoding != null)) {
-		log.add(`eRT utf8 encoding? ${utf8_encoding ? '1': '0'}`);
-	}
-	if ((utf8_encoding != null)) {
-		station.ert_app.utf8_encoding = utf8_encoding;
-	}
-	if ((true != null)) {
-		station.ert_app.enabled = true;
-	}
-}
-
-export function parse_group_ert(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field group_common: unparsed<27> at +0, width 27.
-	// Field addr: uint<5> at +27, width 5.
-	let addr = (ok[1]) ?
-		((block[1] & 0b11111))
-		: null;
-	// Field ert_seg: byte<4> at +32, width 32.
-	let ert_seg__0 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	let ert_seg__1 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	let ert_seg__2 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let ert_seg__3 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const ert_seg = [ert_seg__0, ert_seg__1, ert_seg__2, ert_seg__3];
-
-	// Actions.
-	if ((addr != null) && (ert_seg != null)) {
-		log.add(`eRT seg @${addr} "${formatBytes(ert_seg)}"`);
-	}
-	if ((station != null)) {
-		if ((addr != null) && (ert_seg__0 != null)) {
-			station.ert_app.ert.setByte(addr*4 + 0, ert_seg__0);
+		case 17: {
+			const app_group_type = args[start + 0] as number;
+			return `in group ${(app_group_type>>1).toString() + ((app_group_type & 1) == 0 ? 'A' : 'B')}`;
 		}
-		if ((addr != null) && (ert_seg__1 != null)) {
-			station.ert_app.ert.setByte(addr*4 + 1, ert_seg__1);
+		case 18: {
+			const mjd = args[start + 0] as number;
+			return `MJD=${mjd}`;
 		}
-		if ((addr != null) && (ert_seg__2 != null)) {
-			station.ert_app.ert.setByte(addr*4 + 2, ert_seg__2);
+		case 19: {
+			const hour = args[start + 0] as number;
+			return `Hour=${hour.toString().padStart(2, '0')}`;
 		}
-		if ((addr != null) && (ert_seg__3 != null)) {
-			station.ert_app.ert.setByte(addr*4 + 3, ert_seg__3);
+		case 20: {
+			const minute = args[start + 0] as number;
+			return `Minute=${minute.toString().padStart(2, '0')}`;
 		}
-	}
-}
-
-export interface InternetConnectionApp {
-	url: RdsString;
-	enabled?: boolean;
-}
-
-export function parse_group_internet_connection(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field header: unparsed<8> at +0, width 8.
-	// Field type: uint<1> at +8, width 1.
-	let type = (ok[0]) ?
-		((block[0] & 0b10000000) >> 7)
-		: null;
-	// Field _: unparsed<55> at +9, width 55.
-
-	// Actions.
-	log.add(`Internet connection`);
-	if ((type != null)) {
-		switch (type) {
-			case 0:
-			case 1:
-				get_parse_function("group_internet_connection_url")(block, ok, log, station);
-				break;
-
+		case 21: {
+			const tz_sign = args[start + 0] as boolean;
+			const tz_offset = args[start + 1] as number;
+			return `TZ=${tz_sign ? '+' : '-'}${tz_offset}`;
 		}
-	}
-	if ((true != null)) {
-		station.internet_connection_app.enabled = true;
-	}
-}
-
-export function parse_group_internet_connection_url(block: Uint16Array, ok: boolean[], log: LogMessage, station: Station) {
-	// Field header: unparsed<8> at +0, width 8.
-	// Field type: unparsed<1> at +8, width 1.
-	// Field addr: uint<7> at +9, width 7.
-	let addr = (ok[0]) ?
-		((block[0] & 0b1111111))
-		: null;
-	// Field url_seg: byte<6> at +16, width 48.
-	let url_seg__0 = (ok[1]) ?
-		((block[1] & 0b1111111100000000) >> 8)
-		: null;
-	let url_seg__1 = (ok[1]) ?
-		((block[1] & 0b11111111))
-		: null;
-	let url_seg__2 = (ok[2]) ?
-		((block[2] & 0b1111111100000000) >> 8)
-		: null;
-	let url_seg__3 = (ok[2]) ?
-		((block[2] & 0b11111111))
-		: null;
-	let url_seg__4 = (ok[3]) ?
-		((block[3] & 0b1111111100000000) >> 8)
-		: null;
-	let url_seg__5 = (ok[3]) ?
-		((block[3] & 0b11111111))
-		: null;
-	const url_seg = [url_seg__0, url_seg__1, url_seg__2, url_seg__3, url_seg__4, url_seg__5];
-
-	// Actions.
-	if ((addr != null) && (url_seg != null)) {
-		log.add(`URL seg @${addr} "${formatBytes(url_seg)}"`);
-	}
-	if ((station != null)) {
-		if ((addr != null) && (url_seg__0 != null)) {
-			station.internet_connection_app.url.setByte(addr*6 + 0, url_seg__0);
+		case 22: {
+			const flag_ab = args[start + 0] as boolean;
+			return `PTYN flag=${flag_ab ? 'A' : 'B'}`;
 		}
-		if ((addr != null) && (url_seg__1 != null)) {
-			station.internet_connection_app.url.setByte(addr*6 + 1, url_seg__1);
+		case 23: {
+			const addr = args[start + 0] as number;
+			const ptyn_seg = args.slice(start + 1, start + 5) as Array<number | null>;
+			return `PTYN seg @${addr} "${formatRdsText(ptyn_seg)}"`;
 		}
-		if ((addr != null) && (url_seg__2 != null)) {
-			station.internet_connection_app.url.setByte(addr*6 + 2, url_seg__2);
+		case 24: {
+			const addr = args[start + 0] as number;
+			const lps_seg = args.slice(start + 1, start + 5) as Array<number | null>;
+			return `Long PS seg @${addr} ${formatBytes(lps_seg)}`;
 		}
-		if ((addr != null) && (url_seg__3 != null)) {
-			station.internet_connection_app.url.setByte(addr*6 + 3, url_seg__3);
+		case 25: {
+			const fid = args[start + 0] as number;
+			return `FID=${fid}`;
 		}
-		if ((addr != null) && (url_seg__4 != null)) {
-			station.internet_connection_app.url.setByte(addr*6 + 4, url_seg__4);
+		case 26: {
+			const fn = args[start + 0] as number;
+			return `FN=${fn}`;
 		}
-		if ((addr != null) && (url_seg__5 != null)) {
-			station.internet_connection_app.url.setByte(addr*6 + 5, url_seg__5);
+		case 27: {
+			return `Tunnelled A/B group`;
+		}
+		case 28: {
+			const pipe = args[start + 0] as number;
+			return `RFT pipe ${pipe}`;
+		}
+		case 29: {
+			const toggle = args[start + 0] as number;
+			return `toggle ${toggle}`;
+		}
+		case 30: {
+			const addr = args[start + 0] as number;
+			return `addr ${addr}`;
+		}
+		case 31: {
+			const channel = args[start + 0] as number;
+			return `ODA channel ${channel}`;
+		}
+		case 32: {
+			return `ODA assignment`;
+		}
+		case 33: {
+			const channel = args[start + 0] as number;
+			const aid1 = args[start + 1] as number;
+			return `Channel ${channel} -> AID ${aid1.toString(16).toUpperCase().padStart(4, '0')}`;
+		}
+		case 34: {
+			const variant = args[start + 0] as number;
+			return `Variant ${variant} not implemented.`;
+		}
+		case 35: {
+			const variant = args[start + 0] as number;
+			return `Variant ${variant}`;
+		}
+		case 36: {
+			const crc_present = args[start + 0] as boolean;
+			return `CRC? ${crc_present ? '1': '0'}`;
+		}
+		case 37: {
+			const file_version = args[start + 0] as number;
+			return `File version: ${file_version}`;
+		}
+		case 38: {
+			const file_id = args[start + 0] as number;
+			return `File id: ${file_id}`;
+		}
+		case 39: {
+			const file_size = args[start + 0] as number;
+			return `File size: ${file_size}`;
+		}
+		case 40: {
+			const mode = args[start + 0] as number;
+			return `CRC mode: ${mode}`;
+		}
+		case 41: {
+			const chunk_address = args[start + 0] as number;
+			return `Chunk addr: ${chunk_address}`;
+		}
+		case 42: {
+			const crc = args[start + 0] as number;
+			return `CRC: ${crc.toString(16).toUpperCase().padStart(4, '0')}`;
+		}
+		case 43: {
+			const flag_ab = args[start + 0] as boolean;
+			return `Paging [flag=${flag_ab ? 'A' : 'B'}]`;
+		}
+		case 44: {
+			return `Beep`;
+		}
+		case 45: {
+			return `Functions`;
+		}
+		case 46: {
+			return `10-digit`;
+		}
+		case 47: {
+			return `18-digit`;
+		}
+		case 48: {
+			return `Alphanumeric`;
+		}
+		case 49: {
+			const y1 = args[start + 0] as number;
+			const y2 = args[start + 1] as number;
+			const z1 = args[start + 2] as number;
+			const z2 = args[start + 3] as number;
+			const z3 = args[start + 4] as number;
+			const z4 = args[start + 5] as number;
+			return `Address: ${formatBcd(y1)}${formatBcd(y2)}/${formatBcd(z1)}${formatBcd(z2)}${formatBcd(z3)}${formatBcd(z4)}`;
+		}
+		case 50: {
+			const a7 = args[start + 0] as number;
+			const a8 = args[start + 1] as number;
+			return `Part 1/2: ${formatBcd(a7)}${formatBcd(a8)}`;
+		}
+		case 51: {
+			const a1 = args[start + 0] as number;
+			const a2 = args[start + 1] as number;
+			const a3 = args[start + 2] as number;
+			const a4 = args[start + 3] as number;
+			const a5 = args[start + 4] as number;
+			const a6 = args[start + 5] as number;
+			const a7 = args[start + 6] as number;
+			const a8 = args[start + 7] as number;
+			return `Part 2/2: ${formatBcd(a1)}${formatBcd(a2)}${formatBcd(a3)}${formatBcd(a4)}${formatBcd(a5)}${formatBcd(a6)}${formatBcd(a7)}${formatBcd(a8)}`;
+		}
+		case 52: {
+			const a7 = args[start + 0] as number;
+			const a8 = args[start + 1] as number;
+			return `Part 1/3: ${formatBcd(a7)}${formatBcd(a8)}`;
+		}
+		case 53: {
+			const a1 = args[start + 0] as number;
+			const a2 = args[start + 1] as number;
+			const a3 = args[start + 2] as number;
+			const a4 = args[start + 3] as number;
+			const a5 = args[start + 4] as number;
+			const a6 = args[start + 5] as number;
+			const a7 = args[start + 6] as number;
+			const a8 = args[start + 7] as number;
+			return `Part 2/3: ${formatBcd(a1)}${formatBcd(a2)}${formatBcd(a3)}${formatBcd(a4)}${formatBcd(a5)}${formatBcd(a6)}${formatBcd(a7)}${formatBcd(a8)}`;
+		}
+		case 54: {
+			const a1 = args[start + 0] as number;
+			const a2 = args[start + 1] as number;
+			const a3 = args[start + 2] as number;
+			const a4 = args[start + 3] as number;
+			const a5 = args[start + 4] as number;
+			const a6 = args[start + 5] as number;
+			const a7 = args[start + 6] as number;
+			const a8 = args[start + 7] as number;
+			return `Part 3/3: ${formatBcd(a1)}${formatBcd(a2)}${formatBcd(a3)}${formatBcd(a4)}${formatBcd(a5)}${formatBcd(a6)}${formatBcd(a7)}${formatBcd(a8)}`;
+		}
+		case 55: {
+			const addr = args[start + 0] as number;
+			const char1 = args[start + 1] as number;
+			const char2 = args[start + 2] as number;
+			const char3 = args[start + 3] as number;
+			const char4 = args[start + 4] as number;
+			return `Part (${addr} + 6k)/n: "${RDS_CHARMAP[char1]}${RDS_CHARMAP[char2]}${RDS_CHARMAP[char3]}${RDS_CHARMAP[char4]}"`;
+		}
+		case 56: {
+			const char1 = args[start + 0] as number;
+			const char2 = args[start + 1] as number;
+			const char3 = args[start + 2] as number;
+			const char4 = args[start + 3] as number;
+			return `Part n/n: "${RDS_CHARMAP[char1]}${RDS_CHARMAP[char2]}${RDS_CHARMAP[char3]}${RDS_CHARMAP[char4]}"`;
+		}
+		case 57: {
+			const variant = args[start + 0] as number;
+			return `EON v=${variant}`;
+		}
+		case 58: {
+			const pi_on = args[start + 0] as number;
+			return `ON.PI=${pi_on.toString(16).toUpperCase().padStart(4, '0')}`;
+		}
+		case 59: {
+			const tp_on = args[start + 0] as boolean;
+			return `ON.TP=${tp_on ? '1': '0'}`;
+		}
+		case 60: {
+			const addr = args[start + 0] as number;
+			const ps_seg = args.slice(start + 1, start + 3) as Array<number | null>;
+			return `ON.PS seg @${addr}: "${formatRdsText(ps_seg)}"`;
+		}
+		case 61: {
+			const af1 = args[start + 0] as number;
+			const af2 = args[start + 1] as number;
+			return `ON.AFs ${formatAf(af1)} ${formatAf(af2)}`;
+		}
+		case 62: {
+			const channel = args[start + 0] as number;
+			const mapped_channel = args[start + 1] as number;
+			return `ON.AF mapped ${formatAf(channel)} → ${formatAf(mapped_channel)}`;
+		}
+		case 63: {
+			const pty_on = args[start + 0] as number;
+			return `ON.PTY = ${pty_on}`;
+		}
+		case 64: {
+			const ta_on = args[start + 0] as boolean;
+			return `ON.TA = ${ta_on ? '1': '0'}`;
+		}
+		case 65: {
+			const pin_day_on = args[start + 0] as number;
+			const pin_hour_on = args[start + 1] as number;
+			const pin_minute_on = args[start + 2] as number;
+			return `ON.PIN=(D=${pin_day_on}, ${pin_hour_on.toString().padStart(2, '0')}:${pin_minute_on.toString().padStart(2, '0')})`;
+		}
+		case 66: {
+			const ta_on = args[start + 0] as boolean;
+			return `Other network switch ON.TA=${ta_on ? '1': '0'}`;
+		}
+		case 67: {
+			const item_toggle = args[start + 0] as boolean;
+			const item_running = args[start + 1] as boolean;
+			return `RT+ item_toggle=${item_toggle ? '1': '0'} item_running=${item_running ? '1': '0'}`;
+		}
+		case 68: {
+			const content_type_1 = args[start + 0] as number;
+			const start_1 = args[start + 1] as number;
+			const length_1 = args[start + 2] as number;
+			return `Tag 1: type=${content_type_1}, start=${start_1}, length=${length_1}`;
+		}
+		case 69: {
+			const content_type_2 = args[start + 0] as number;
+			const start_2 = args[start + 1] as number;
+			const length_2 = args[start + 2] as number;
+			return `Tag 2: type=${content_type_2}, start=${start_2}, length=${length_2}`;
+		}
+		case 70: {
+			return `DAB xref`;
+		}
+		case 71: {
+			const info = args[start + 0] as number;
+			return `info=${info.toString(16).toUpperCase().padStart(4, '0')}`;
+		}
+		case 72: {
+			const sid = args[start + 0] as number;
+			return `sid=${sid.toString(16).toUpperCase().padStart(4, '0')}`;
+		}
+		case 73: {
+			const utf8_encoding = args[start + 0] as boolean;
+			return `eRT utf8 encoding? ${utf8_encoding ? '1': '0'}`;
+		}
+		case 74: {
+			const addr = args[start + 0] as number;
+			const ert_seg = args.slice(start + 1, start + 5) as Array<number | null>;
+			return `eRT seg @${addr} "${formatBytes(ert_seg)}"`;
+		}
+		case 75: {
+			return `Internet connection`;
+		}
+		case 76: {
+			const addr = args[start + 0] as number;
+			const url_seg = args.slice(start + 1, start + 7) as Array<number | null>;
+			return `URL seg @${addr} "${formatBytes(url_seg)}"`;
 		}
 	}
+	throw new RangeError("Invalid log format: " + format);
 }
 
-export function get_parse_function(rule: string) {
-	switch (rule) {
-		case "group_ab": return parse_group_ab;
-		case "group_ab_without_pi": return parse_group_ab_without_pi;
-		case "group_unknown": return parse_group_unknown;
-		case "group_0A": return parse_group_0A;
-		case "group_0B_0_common": return parse_group_0B_0_common;
-		case "group_1A": return parse_group_1A;
-		case "group_1A_ecc": return parse_group_1A_ecc;
-		case "group_1B_1_common": return parse_group_1B_1_common;
-		case "group_2A": return parse_group_2A;
-		case "group_2B": return parse_group_2B;
-		case "group_3A": return parse_group_3A;
-		case "group_4A": return parse_group_4A;
-		case "group_10A": return parse_group_10A;
-		case "group_15A": return parse_group_15A;
-		case "group_15B": return parse_group_15B;
-		case "group_c": return parse_group_c;
-		case "group_c_fid_0": return parse_group_c_fid_0;
-		case "group_c_rft": return parse_group_c_rft;
-		case "group_c_oda": return parse_group_c_oda;
-		case "group_c_oda_assignment": return parse_group_c_oda_assignment;
-		case "group_c_oda_rft_assignment": return parse_group_c_oda_rft_assignment;
-		case "group_c_oda_rft_assignment_v0": return parse_group_c_oda_rft_assignment_v0;
-		case "group_c_oda_rft_assignment_v1": return parse_group_c_oda_rft_assignment_v1;
-		case "group_7A": return parse_group_7A;
-		case "group_7A_address": return parse_group_7A_address;
-		case "group_7A_numeric_10": return parse_group_7A_numeric_10;
-		case "group_7A_numeric_18": return parse_group_7A_numeric_18;
-		case "group_7A_alphanumeric": return parse_group_7A_alphanumeric;
-		case "group_14A": return parse_group_14A;
-		case "group_14A_ps": return parse_group_14A_ps;
-		case "group_14A_af_a": return parse_group_14A_af_a;
-		case "group_14A_mapped_af": return parse_group_14A_mapped_af;
-		case "group_14A_pty_ta": return parse_group_14A_pty_ta;
-		case "group_14A_pin": return parse_group_14A_pin;
-		case "group_14B": return parse_group_14B;
-		case "group_rtplus": return parse_group_rtplus;
-		case "group_dabxref": return parse_group_dabxref;
-		case "group_dabxref_ensemble": return parse_group_dabxref_ensemble;
-		case "group_dabxref_service": return parse_group_dabxref_service;
-		case "group_ert_declaration": return parse_group_ert_declaration;
-		case "group_ert": return parse_group_ert;
-		case "group_internet_connection": return parse_group_internet_connection;
-		case "group_internet_connection_url": return parse_group_internet_connection_url;
-	}
-	throw new RangeError("Invalid rule: " + rule);
-}
-
-function formatRdsText(text: Array<number | null>): string {
+export function formatRdsText(text: Array<number | null>): string {
 	return text.map((c) => c == null ? "." : RDS_CHARMAP[c]).join("");
 }
 
-function formatBytes(bytes: Array<number | null>): string {
+export function formatBytes(bytes: Array<number | null>): string {
 	return bytes.map((b) => b == null ? ".." : b.toString(16).toUpperCase().padStart(2, "0")).join(" ");
 }
 
-function formatBcd(digit: number): string {
+export function formatBcd(digit: number): string {
 	return (digit >= 0 && digit <= 9) ? digit.toString() : " ";
 }
@@ -0,0 +1,10 @@
+// Generated file. DO NOT EDIT.
+// Loads all the modules of base.ts upfront, for programs that decode
+// everything from the first group, such as tests.
+
+import "./base_rp";
+import "./base_eon";
+import "./base_oda_rtplus";
+import "./base_oda_dabxref";
+import "./base_oda_ert";
+import "./base_oda_internet_connection";
@@ -0,0 +1,294 @@
+// Generated file. DO NOT EDIT.
+// Rules of eon.p, loaded on demand by base.ts.
+
+import { BYTE_SCRATCH, OtherNetwork, PARSE_FUNCTIONS, Rule, Station, StationField } from "./base";
+import { LogMessage, OtherNetworkImpl } from "./rds_types";
+
+export function parse_group_14A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_common: unparsed<27> at +0, width 27.
+	// Field tp_on: bool at +27, width 1.
+	const tp_on = ((block[1] & 0b10000) >> 4) == 1;
+	// Field variant: uint<4> at +28, width 4.
+	const variant = ((block[1] & 0b1111));
+	// Field _: uint<16> at +32, width 16.
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(57).arg(variant);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		log.record(58).arg(pi_on);
+	}
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(59).arg(tp_on);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if (elt0 != undefined) {
+		if ((ok & 0b0010) == 0b0010) {
+			if (elt0.tp !== tp_on) {
+				elt0.tp = tp_on;
+				station.changes.mark(StationField.other_networks);
+			}
+		}
+		if (elt0.pi !== pi_on) {
+			elt0.pi = pi_on;
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0010) == 0b0010) {
+		switch (variant) {
+			case 0:
+			case 1:
+			case 2:
+			case 3:
+				parse_group_14A_ps(block, ok, log, station);
+				break;
+
+			case 4:
+				parse_group_14A_af_a(block, ok, log, station);
+				break;
+
+			case 5:
+			case 6:
+			case 7:
+			case 8:
+				parse_group_14A_mapped_af(block, ok, log, station);
+				break;
+
+			case 9:
+				break;
+
+			case 12:
+				break;
+
+			case 13:
+				parse_group_14A_pty_ta(block, ok, log, station);
+				break;
+
+			case 14:
+				parse_group_14A_pin(block, ok, log, station);
+				break;
+
+		}
+	}
+}
+
+export function parse_group_14A_ps(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field common: unparsed<30> at +0, width 30.
+	// Field addr: uint<2> at +30, width 2.
+	const addr = ((block[1] & 0b11));
+	// Field ps_seg: byte<2> at +32, width 16.
+	const ps_seg__0 = ((block[2] & 0b1111111100000000) >> 8);
+	const ps_seg__1 = ((block[2] & 0b11111111));
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(60).arg(addr).arg((ok & 0b0100) == 0b0100 ? ps_seg__0 : null).arg((ok & 0b0100) == 0b0100 ? ps_seg__1 : null);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0010) == 0b0010 && elt0 != undefined) {
+		BYTE_SCRATCH[0] = ps_seg__0;
+		BYTE_SCRATCH[1] = ps_seg__1;
+		if (elt0.ps.setBytes(addr*2, BYTE_SCRATCH, ((ok & 0b0100) == 0b0100 ? 0b11 : 0))) {
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+}
+
+export function parse_group_14A_af_a(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field common: unparsed<32> at +0, width 32.
+	// Field af1: uint<8> at +32, width 8.
+	const af1 = ((block[2] & 0b1111111100000000) >> 8);
+	// Field af2: uint<8> at +40, width 8.
+	const af2 = ((block[2] & 0b11111111));
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(61).arg(af1).arg(af2);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0100) == 0b0100 && elt0 != undefined) {
+		elt0.addAfPair(af1, af2);
+		station.changes.mark(StationField.other_networks);
+	}
+}
+
+export function parse_group_14A_mapped_af(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field common: unparsed<32> at +0, width 32.
+	// Field channel: uint<8> at +32, width 8.
+	const channel = ((block[2] & 0b1111111100000000) >> 8);
+	// Field mapped_channel: uint<8> at +40, width 8.
+	const mapped_channel = ((block[2] & 0b11111111));
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(62).arg(channel).arg(mapped_channel);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0100) == 0b0100 && elt0 != undefined) {
+		elt0.addMappedAF(channel, mapped_channel);
+		station.changes.mark(StationField.other_networks);
+	}
+}
+
+export function parse_group_14A_pty_ta(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field common: unparsed<32> at +0, width 32.
+	// Field pty_on: uint<5> at +32, width 5.
+	const pty_on = ((block[2] & 0b1111100000000000) >> 11);
+	// Field _: unparsed<10> at +37, width 10.
+	// Field ta_on: bool at +47, width 1.
+	const ta_on = ((block[2] & 0b1)) == 1;
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(63).arg(pty_on);
+		log.record(64).arg(ta_on);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0100) == 0b0100 && elt0 != undefined) {
+		if (elt0.pty !== pty_on) {
+			elt0.pty = pty_on;
+			station.changes.mark(StationField.other_networks);
+		}
+		if (elt0.ta !== ta_on) {
+			elt0.ta = ta_on;
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+}
+
+export function parse_group_14A_pin(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field common: unparsed<32> at +0, width 32.
+	// Field pin_day_on: uint<5> at +32, width 5.
+	const pin_day_on = ((block[2] & 0b1111100000000000) >> 11);
+	// Field pin_hour_on: uint<5> at +37, width 5.
+	const pin_hour_on = ((block[2] & 0b11111000000) >> 6);
+	// Field pin_minute_on: uint<6> at +42, width 6.
+	const pin_minute_on = ((block[2] & 0b111111));
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(65).arg(pin_day_on).arg(pin_hour_on).arg(pin_minute_on);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0100) == 0b0100 && elt0 != undefined) {
+		if (elt0.pin_day !== pin_day_on) {
+			elt0.pin_day = pin_day_on;
+			station.changes.mark(StationField.other_networks);
+		}
+		if (elt0.pin_hour !== pin_hour_on) {
+			elt0.pin_hour = pin_hour_on;
+			station.changes.mark(StationField.other_networks);
+		}
+		if (elt0.pin_minute !== pin_minute_on) {
+			elt0.pin_minute = pin_minute_on;
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+}
+
+export function parse_group_14B(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_common: unparsed<27> at +0, width 27.
+	// Field tp_on: bool at +27, width 1.
+	// Field ta_on: bool at +28, width 1.
+	const ta_on = ((block[1] & 0b1000) >> 3) == 1;
+	// Field _: unparsed<3> at +29, width 3.
+	// Field pi: unparsed<16> at +32, width 16.
+	// Field pi_on: uint<16> at +48, width 16.
+	const pi_on = ((block[3]));
+
+	// Actions.
+	let elt0: OtherNetwork | undefined;
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(66).arg(ta_on);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		elt0 = station.other_networks.get(pi_on);
+		if (elt0 == undefined) {
+			elt0 = new OtherNetworkImpl(pi_on);
+			station.other_networks.set(pi_on, elt0);
+			station.changes.mark(StationField.other_networks);
+		}
+	}
+	if ((ok & 0b0010) == 0b0010) {
+		if (elt0 != undefined) {
+			if (elt0.ta !== ta_on) {
+				elt0.ta = ta_on;
+				station.changes.mark(StationField.other_networks);
+			}
+		}
+		if ((ok & 0b1000) == 0b1000) {
+			station.reportOtherNetworkSwitch(pi_on, ta_on);
+			station.changes.mark(StationField.reportOtherNetworkSwitch);
+		}
+	}
+}
+
+// Replace the stubs of the rules of this module.
+PARSE_FUNCTIONS[Rule.group_14A] = parse_group_14A;
+PARSE_FUNCTIONS[Rule.group_14A_ps] = parse_group_14A_ps;
+PARSE_FUNCTIONS[Rule.group_14A_af_a] = parse_group_14A_af_a;
+PARSE_FUNCTIONS[Rule.group_14A_mapped_af] = parse_group_14A_mapped_af;
+PARSE_FUNCTIONS[Rule.group_14A_pty_ta] = parse_group_14A_pty_ta;
+PARSE_FUNCTIONS[Rule.group_14A_pin] = parse_group_14A_pin;
+PARSE_FUNCTIONS[Rule.group_14B] = parse_group_14B;
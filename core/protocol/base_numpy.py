@@ -0,0 +1,1113 @@
+# Generated file. DO NOT EDIT.
+
+"""Vectorized field extractors for the bitstructs of the RDS protocol.
+
+Each extract_<bitstruct> function takes an (N, 4) array of blocks and an
+(N, 4) array of block validity flags, and returns a dict mapping field names
+to masked arrays with one entry per group (N x num for byte<num> fields).
+An entry is masked when one of the blocks it spans was bad. Actions are not
+executed: selecting the groups a bitstruct applies to is up to the caller.
+"""
+
+import numpy as np
+
+
+def _check_arrays(blocks, ok):
+    blocks = np.asarray(blocks, dtype=np.uint16)
+    ok = np.asarray(ok, dtype=np.bool_)
+    if blocks.ndim != 2 or blocks.shape[1] != 4 or ok.shape != blocks.shape:
+        raise ValueError(f'Expected (N, 4) blocks and validity arrays, got {blocks.shape} and {ok.shape}.')
+    return (blocks, ok)
+
+
+def extract_group_ab(blocks, ok):
+    """Extracts the fields of bitstruct group_ab from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field pi: uint<16> at +0, width 16.
+    fields['pi'] = np.ma.MaskedArray(
+        blocks[:, 0],
+        mask=~ok[:, 0])
+    # Field _: unparsed<48> at +16, width 48.
+    return fields
+
+
+def extract_group_ab_without_pi(blocks, ok):
+    """Extracts the fields of bitstruct group_ab_without_pi from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field _: unparsed<16> at +0, width 16.
+    # Field type: uint<5> at +16, width 5.
+    fields['type'] = np.ma.MaskedArray(
+        ((blocks[:, 1] & 0b1111100000000000) >> 11),
+        mask=~ok[:, 1])
+    # Field tp: bool at +21, width 1.
+    fields['tp'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000000000) >> 10)) == 1,
+        mask=~ok[:, 1])
+    # Field pty: uint<5> at +22, width 5.
+    fields['pty'] = np.ma.MaskedArray(
+        ((blocks[:, 1] & 0b1111100000) >> 5),
+        mask=~ok[:, 1])
+    # Field payload: unparsed<37> at +27, width 37.
+    return fields
+
+
+def extract_group_unknown(blocks, ok):
+    """Extracts the fields of bitstruct group_unknown from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field block_b_rest: uint<5> at +27, width 5.
+    fields['block_b_rest'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11111),
+        mask=~ok[:, 1])
+    # Field block_c: uint<16> at +32, width 16.
+    fields['block_c'] = np.ma.MaskedArray(
+        blocks[:, 2],
+        mask=~ok[:, 2])
+    # Field block_d: uint<16> at +48, width 16.
+    fields['block_d'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_0A(blocks, ok):
+    """Extracts the fields of bitstruct group_0A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: unparsed<5> at +27, width 5.
+    # Field af1: uint<8> at +32, width 8.
+    fields['af1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field af2: uint<8> at +40, width 8.
+    fields['af2'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b11111111),
+        mask=~ok[:, 2])
+    # Field _: unparsed<16> at +48, width 16.
+    return fields
+
+
+def extract_group_0B_0_common(blocks, ok):
+    """Extracts the fields of bitstruct group_0B_0_common from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field ta: bool at +27, width 1.
+    fields['ta'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field music: bool at +28, width 1.
+    fields['music'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b1000) >> 3)) == 1,
+        mask=~ok[:, 1])
+    # Field di: bool at +29, width 1.
+    fields['di'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b100) >> 2)) == 1,
+        mask=~ok[:, 1])
+    # Field addr: uint<2> at +30, width 2.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11),
+        mask=~ok[:, 1])
+    # Field _: uint<16> at +32, width 16.
+    # Field ps_seg: byte<2> at +48, width 16.
+    fields['ps_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+def extract_group_1A(blocks, ok):
+    """Extracts the fields of bitstruct group_1A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: unparsed<5> at +27, width 5.
+    # Field linkage_actuator: bool at +32, width 1.
+    fields['linkage_actuator'] = np.ma.MaskedArray(
+        (((blocks[:, 2] & 0b1000000000000000) >> 15)) == 1,
+        mask=~ok[:, 2])
+    # Field variant: uint<3> at +33, width 3.
+    fields['variant'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b111000000000000) >> 12),
+        mask=~ok[:, 2])
+    # Field payload: uint<12> at +36, width 12.
+    fields['payload'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b111111111111),
+        mask=~ok[:, 2])
+    # Field pin: unparsed<16> at +48, width 16.
+    return fields
+
+
+def extract_group_1A_ecc(blocks, ok):
+    """Extracts the fields of bitstruct group_1A_ecc from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field _: unparsed<32> at +0, width 32.
+    # Field linkage_actuator: unparsed<1> at +32, width 1.
+    # Field variant: unparsed<3> at +33, width 3.
+    # Field paging: unparsed<4> at +36, width 4.
+    # Field ecc: uint<8> at +40, width 8.
+    fields['ecc'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b11111111),
+        mask=~ok[:, 2])
+    # Field pin: unparsed<16> at +48, width 16.
+    return fields
+
+
+def extract_group_1B_1_common(blocks, ok):
+    """Extracts the fields of bitstruct group_1B_1_common from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: unparsed<5> at +27, width 5.
+    # Field _: unparsed<16> at +32, width 16.
+    # Field pin_day: uint<5> at +48, width 5.
+    fields['pin_day'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b1111100000000000) >> 11),
+        mask=~ok[:, 3])
+    # Field pin_hour: uint<5> at +53, width 5.
+    fields['pin_hour'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b11111000000) >> 6),
+        mask=~ok[:, 3])
+    # Field pin_minute: uint<6> at +58, width 6.
+    fields['pin_minute'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b111111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_2A(blocks, ok):
+    """Extracts the fields of bitstruct group_2A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag: uint<1> at +27, width 1.
+    fields['flag'] = np.ma.MaskedArray(
+        ((blocks[:, 1] & 0b10000) >> 4),
+        mask=~ok[:, 1])
+    # Field addr: uint<4> at +28, width 4.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1111),
+        mask=~ok[:, 1])
+    # Field rt_seg: byte<4> at +32, width 32.
+    fields['rt_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 2] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 2] & 0b11111111)).astype(np.uint8), (((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 2], ~ok[:, 2], ~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+def extract_group_2B(blocks, ok):
+    """Extracts the fields of bitstruct group_2B from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag: uint<1> at +27, width 1.
+    fields['flag'] = np.ma.MaskedArray(
+        ((blocks[:, 1] & 0b10000) >> 4),
+        mask=~ok[:, 1])
+    # Field addr: uint<4> at +28, width 4.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1111),
+        mask=~ok[:, 1])
+    # Field pi: uint<16> at +32, width 16.
+    fields['pi'] = np.ma.MaskedArray(
+        blocks[:, 2],
+        mask=~ok[:, 2])
+    # Field rt_seg: byte<2> at +48, width 16.
+    fields['rt_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+def extract_group_3A(blocks, ok):
+    """Extracts the fields of bitstruct group_3A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field app_group_type: uint<5> at +27, width 5.
+    fields['app_group_type'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11111),
+        mask=~ok[:, 1])
+    # Field app_data: unparsed<16> at +32, width 16.
+    # Field aid: uint<16> at +48, width 16.
+    fields['aid'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_4A(blocks, ok):
+    """Extracts the fields of bitstruct group_4A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: uint<3> at +27, width 3.
+    # Field mjd: uint<17> at +30, width 17.
+    fields['mjd'] = np.ma.MaskedArray(
+        ((blocks[:, 1].astype(np.uint32) & 0b11) << 15) | ((blocks[:, 2].astype(np.uint32) & 0b1111111111111110) >> 1),
+        mask=~(ok[:, 1] & ok[:, 2]))
+    # Field hour: uint<5> at +47, width 5.
+    fields['hour'] = np.ma.MaskedArray(
+        ((blocks[:, 2].astype(np.uint32) & 0b1) << 4) | ((blocks[:, 3].astype(np.uint32) & 0b1111000000000000) >> 12),
+        mask=~(ok[:, 2] & ok[:, 3]))
+    # Field minute: uint<6> at +52, width 6.
+    fields['minute'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b111111000000) >> 6),
+        mask=~ok[:, 3])
+    # Field tz_sign: bool at +58, width 1.
+    fields['tz_sign'] = np.ma.MaskedArray(
+        (((blocks[:, 3] & 0b100000) >> 5)) == 1,
+        mask=~ok[:, 3])
+    # Field tz_offset: uint<5> at +59, width 5.
+    fields['tz_offset'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b11111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_10A(blocks, ok):
+    """Extracts the fields of bitstruct group_10A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    fields['flag_ab'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field _: uint<3> at +28, width 3.
+    # Field addr: uint<1> at +31, width 1.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1),
+        mask=~ok[:, 1])
+    # Field ptyn_seg: byte<4> at +32, width 32.
+    fields['ptyn_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 2] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 2] & 0b11111111)).astype(np.uint8), (((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 2], ~ok[:, 2], ~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+def extract_group_15A(blocks, ok):
+    """Extracts the fields of bitstruct group_15A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field ta: bool at +27, width 1.
+    fields['ta'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field _: bool at +28, width 1.
+    # Field addr: uint<3> at +29, width 3.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b111),
+        mask=~ok[:, 1])
+    # Field lps_seg: byte<4> at +32, width 32.
+    fields['lps_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 2] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 2] & 0b11111111)).astype(np.uint8), (((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 2], ~ok[:, 2], ~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+def extract_group_15B(blocks, ok):
+    """Extracts the fields of bitstruct group_15B from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field ta: bool at +27, width 1.
+    fields['ta'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field music: bool at +28, width 1.
+    fields['music'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b1000) >> 3)) == 1,
+        mask=~ok[:, 1])
+    # Field di: bool at +29, width 1.
+    fields['di'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b100) >> 2)) == 1,
+        mask=~ok[:, 1])
+    # Field addr: uint<2> at +30, width 2.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11),
+        mask=~ok[:, 1])
+    # Field pi: uint<16> at +32, width 16.
+    fields['pi'] = np.ma.MaskedArray(
+        blocks[:, 2],
+        mask=~ok[:, 2])
+    # Field repeat: unparsed<16> at +48, width 16.
+    return fields
+
+
+def extract_group_c(blocks, ok):
+    """Extracts the fields of bitstruct group_c from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field fid: uint<2> at +0, width 2.
+    fields['fid'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b1100000000000000) >> 14),
+        mask=~ok[:, 0])
+    # Field fn: uint<6> at +2, width 6.
+    fields['fn'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b11111100000000) >> 8),
+        mask=~ok[:, 0])
+    # Field payload: unparsed<56> at +8, width 56.
+    return fields
+
+
+def extract_group_c_fid_0(blocks, ok):
+    """Extracts the fields of bitstruct group_c_fid_0 from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field fid: unparsed<2> at +0, width 2.
+    # Field type: uint<2> at +2, width 2.
+    fields['type'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b11000000000000) >> 12),
+        mask=~ok[:, 0])
+    # Field _: unparsed<4> at +4, width 4.
+    # Field _: unparsed<56> at +8, width 56.
+    return fields
+
+
+def extract_group_c_rft(blocks, ok):
+    """Extracts the fields of bitstruct group_c_rft from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field fid: unparsed<2> at +0, width 2.
+    # Field type: unparsed<2> at +2, width 2.
+    # Field pipe: uint<4> at +4, width 4.
+    fields['pipe'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b111100000000) >> 8),
+        mask=~ok[:, 0])
+    # Field toggle: uint<1> at +8, width 1.
+    fields['toggle'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b10000000) >> 7),
+        mask=~ok[:, 0])
+    # Field addr: uint<15> at +9, width 15.
+    fields['addr'] = np.ma.MaskedArray(
+        ((blocks[:, 0].astype(np.uint32) & 0b1111111) << 8) | ((blocks[:, 1].astype(np.uint32) & 0b1111111100000000) >> 8),
+        mask=~(ok[:, 0] & ok[:, 1]))
+    # Field byte1: uint<8> at +24, width 8.
+    fields['byte1'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11111111),
+        mask=~ok[:, 1])
+    # Field byte2: uint<8> at +32, width 8.
+    fields['byte2'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field byte3: uint<8> at +40, width 8.
+    fields['byte3'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b11111111),
+        mask=~ok[:, 2])
+    # Field byte4: uint<8> at +48, width 8.
+    fields['byte4'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 3])
+    # Field byte5: uint<8> at +56, width 8.
+    fields['byte5'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b11111111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_c_oda(blocks, ok):
+    """Extracts the fields of bitstruct group_c_oda from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field fid: unparsed<2> at +0, width 2.
+    # Field channel: uint<6> at +2, width 6.
+    fields['channel'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b11111100000000) >> 8),
+        mask=~ok[:, 0])
+    # Field app_data: unparsed<56> at +8, width 56.
+    return fields
+
+
+def extract_group_c_oda_assignment(blocks, ok):
+    """Extracts the fields of bitstruct group_c_oda_assignment from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field header: unparsed<8> at +0, width 8.
+    # Field variant: uint<2> at +8, width 2.
+    fields['variant'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b11000000) >> 6),
+        mask=~ok[:, 0])
+    # Field channel: uint<6> at +10, width 6.
+    fields['channel'] = np.ma.MaskedArray(
+        (blocks[:, 0] & 0b111111),
+        mask=~ok[:, 0])
+    # Field aid1: uint<16> at +16, width 16.
+    fields['aid1'] = np.ma.MaskedArray(
+        blocks[:, 1],
+        mask=~ok[:, 1])
+    # Field block_c: uint<16> at +32, width 16.
+    fields['block_c'] = np.ma.MaskedArray(
+        blocks[:, 2],
+        mask=~ok[:, 2])
+    # Field block_d: uint<16> at +48, width 16.
+    fields['block_d'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_c_oda_rft_assignment(blocks, ok):
+    """Extracts the fields of bitstruct group_c_oda_rft_assignment from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field header: unparsed<8> at +0, width 8.
+    # Field zero: unparsed<4> at +8, width 4.
+    # Field pipe: unparsed<4> at +12, width 4.
+    # Field aid: unparsed<16> at +16, width 16.
+    # Field variant: uint<4> at +32, width 4.
+    fields['variant'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 2])
+    # Field _: unparsed<28> at +36, width 28.
+    return fields
+
+
+def extract_group_c_oda_rft_assignment_v0(blocks, ok):
+    """Extracts the fields of bitstruct group_c_oda_rft_assignment_v0 from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field header: unparsed<8> at +0, width 8.
+    # Field zero: unparsed<4> at +8, width 4.
+    # Field pipe: uint<4> at +12, width 4.
+    fields['pipe'] = np.ma.MaskedArray(
+        (blocks[:, 0] & 0b1111),
+        mask=~ok[:, 0])
+    # Field aid: unparsed<16> at +16, width 16.
+    # Field variant: unparsed<4> at +32, width 4.
+    # Field crc_present: bool at +36, width 1.
+    fields['crc_present'] = np.ma.MaskedArray(
+        (((blocks[:, 2] & 0b100000000000) >> 11)) == 1,
+        mask=~ok[:, 2])
+    # Field file_version: uint<3> at +37, width 3.
+    fields['file_version'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b11100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field file_id: uint<6> at +40, width 6.
+    fields['file_id'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b11111100) >> 2),
+        mask=~ok[:, 2])
+    # Field file_size: uint<18> at +46, width 18.
+    fields['file_size'] = np.ma.MaskedArray(
+        ((blocks[:, 2].astype(np.uint32) & 0b11) << 16) | blocks[:, 3].astype(np.uint32),
+        mask=~(ok[:, 2] & ok[:, 3]))
+    return fields
+
+
+def extract_group_c_oda_rft_assignment_v1(blocks, ok):
+    """Extracts the fields of bitstruct group_c_oda_rft_assignment_v1 from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field header: unparsed<8> at +0, width 8.
+    # Field zero: unparsed<4> at +8, width 4.
+    # Field pipe: uint<4> at +12, width 4.
+    fields['pipe'] = np.ma.MaskedArray(
+        (blocks[:, 0] & 0b1111),
+        mask=~ok[:, 0])
+    # Field aid: unparsed<16> at +16, width 16.
+    # Field variant: unparsed<4> at +32, width 4.
+    # Field mode: uint<3> at +36, width 3.
+    fields['mode'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b111000000000) >> 9),
+        mask=~ok[:, 2])
+    # Field chunk_address: uint<9> at +39, width 9.
+    fields['chunk_address'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b111111111),
+        mask=~ok[:, 2])
+    # Field crc: uint<16> at +48, width 16.
+    fields['crc'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_7A(blocks, ok):
+    """Extracts the fields of bitstruct group_7A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    fields['flag_ab'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field addr: uint<4> at +28, width 4.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1111),
+        mask=~ok[:, 1])
+    # Field paging_data: unparsed<32> at +32, width 32.
+    return fields
+
+
+def extract_group_7A_address(blocks, ok):
+    """Extracts the fields of bitstruct group_7A_address from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    fields['flag_ab'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field _: unparsed<4> at +28, width 4.
+    # Field y1: uint<4> at +32, width 4.
+    fields['y1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 2])
+    # Field y2: uint<4> at +36, width 4.
+    fields['y2'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field z1: uint<4> at +40, width 4.
+    fields['z1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b11110000) >> 4),
+        mask=~ok[:, 2])
+    # Field z2: uint<4> at +44, width 4.
+    fields['z2'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b1111),
+        mask=~ok[:, 2])
+    # Field z3: uint<4> at +48, width 4.
+    fields['z3'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 3])
+    # Field z4: uint<4> at +52, width 4.
+    fields['z4'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b111100000000) >> 8),
+        mask=~ok[:, 3])
+    # Field _: unparsed<8> at +56, width 8.
+    return fields
+
+
+def extract_group_7A_numeric_10(blocks, ok):
+    """Extracts the fields of bitstruct group_7A_numeric_10 from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    fields['flag_ab'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field _: unparsed<3> at +28, width 3.
+    # Field addr: uint<1> at +31, width 1.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1),
+        mask=~ok[:, 1])
+    # Field a1: uint<4> at +32, width 4.
+    fields['a1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 2])
+    # Field a2: uint<4> at +36, width 4.
+    fields['a2'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field a3: uint<4> at +40, width 4.
+    fields['a3'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b11110000) >> 4),
+        mask=~ok[:, 2])
+    # Field a4: uint<4> at +44, width 4.
+    fields['a4'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b1111),
+        mask=~ok[:, 2])
+    # Field a5: uint<4> at +48, width 4.
+    fields['a5'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 3])
+    # Field a6: uint<4> at +52, width 4.
+    fields['a6'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b111100000000) >> 8),
+        mask=~ok[:, 3])
+    # Field a7: uint<4> at +56, width 4.
+    fields['a7'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b11110000) >> 4),
+        mask=~ok[:, 3])
+    # Field a8: uint<4> at +60, width 4.
+    fields['a8'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b1111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_7A_numeric_18(blocks, ok):
+    """Extracts the fields of bitstruct group_7A_numeric_18 from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    fields['flag_ab'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field _: unparsed<2> at +28, width 2.
+    # Field addr: uint<2> at +30, width 2.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11),
+        mask=~ok[:, 1])
+    # Field a1: uint<4> at +32, width 4.
+    fields['a1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 2])
+    # Field a2: uint<4> at +36, width 4.
+    fields['a2'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field a3: uint<4> at +40, width 4.
+    fields['a3'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b11110000) >> 4),
+        mask=~ok[:, 2])
+    # Field a4: uint<4> at +44, width 4.
+    fields['a4'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b1111),
+        mask=~ok[:, 2])
+    # Field a5: uint<4> at +48, width 4.
+    fields['a5'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b1111000000000000) >> 12),
+        mask=~ok[:, 3])
+    # Field a6: uint<4> at +52, width 4.
+    fields['a6'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b111100000000) >> 8),
+        mask=~ok[:, 3])
+    # Field a7: uint<4> at +56, width 4.
+    fields['a7'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b11110000) >> 4),
+        mask=~ok[:, 3])
+    # Field a8: uint<4> at +60, width 4.
+    fields['a8'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b1111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_7A_alphanumeric(blocks, ok):
+    """Extracts the fields of bitstruct group_7A_alphanumeric from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    fields['flag_ab'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field _: unparsed<1> at +28, width 1.
+    # Field addr: uint<3> at +29, width 3.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b111),
+        mask=~ok[:, 1])
+    # Field char1: uint<8> at +32, width 8.
+    fields['char1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field char2: uint<8> at +40, width 8.
+    fields['char2'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b11111111),
+        mask=~ok[:, 2])
+    # Field char3: uint<8> at +48, width 8.
+    fields['char3'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 3])
+    # Field char4: uint<8> at +56, width 8.
+    fields['char4'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b11111111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14A(blocks, ok):
+    """Extracts the fields of bitstruct group_14A from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field tp_on: bool at +27, width 1.
+    fields['tp_on'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field variant: uint<4> at +28, width 4.
+    fields['variant'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1111),
+        mask=~ok[:, 1])
+    # Field _: uint<16> at +32, width 16.
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14A_ps(blocks, ok):
+    """Extracts the fields of bitstruct group_14A_ps from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field common: unparsed<30> at +0, width 30.
+    # Field addr: uint<2> at +30, width 2.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11),
+        mask=~ok[:, 1])
+    # Field ps_seg: byte<2> at +32, width 16.
+    fields['ps_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 2] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 2] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 2], ~ok[:, 2]], axis=1))
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14A_af_a(blocks, ok):
+    """Extracts the fields of bitstruct group_14A_af_a from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field common: unparsed<32> at +0, width 32.
+    # Field af1: uint<8> at +32, width 8.
+    fields['af1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field af2: uint<8> at +40, width 8.
+    fields['af2'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b11111111),
+        mask=~ok[:, 2])
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14A_mapped_af(blocks, ok):
+    """Extracts the fields of bitstruct group_14A_mapped_af from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field common: unparsed<32> at +0, width 32.
+    # Field channel: uint<8> at +32, width 8.
+    fields['channel'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111111100000000) >> 8),
+        mask=~ok[:, 2])
+    # Field mapped_channel: uint<8> at +40, width 8.
+    fields['mapped_channel'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b11111111),
+        mask=~ok[:, 2])
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14A_pty_ta(blocks, ok):
+    """Extracts the fields of bitstruct group_14A_pty_ta from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field common: unparsed<32> at +0, width 32.
+    # Field pty_on: uint<5> at +32, width 5.
+    fields['pty_on'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111100000000000) >> 11),
+        mask=~ok[:, 2])
+    # Field _: unparsed<10> at +37, width 10.
+    # Field ta_on: bool at +47, width 1.
+    fields['ta_on'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1)) == 1,
+        mask=~ok[:, 2])
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14A_pin(blocks, ok):
+    """Extracts the fields of bitstruct group_14A_pin from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field common: unparsed<32> at +0, width 32.
+    # Field pin_day_on: uint<5> at +32, width 5.
+    fields['pin_day_on'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111100000000000) >> 11),
+        mask=~ok[:, 2])
+    # Field pin_hour_on: uint<5> at +37, width 5.
+    fields['pin_hour_on'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b11111000000) >> 6),
+        mask=~ok[:, 2])
+    # Field pin_minute_on: uint<6> at +42, width 6.
+    fields['pin_minute_on'] = np.ma.MaskedArray(
+        (blocks[:, 2] & 0b111111),
+        mask=~ok[:, 2])
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_14B(blocks, ok):
+    """Extracts the fields of bitstruct group_14B from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field tp_on: bool at +27, width 1.
+    fields['tp_on'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field ta_on: bool at +28, width 1.
+    fields['ta_on'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b1000) >> 3)) == 1,
+        mask=~ok[:, 1])
+    # Field _: unparsed<3> at +29, width 3.
+    # Field pi: unparsed<16> at +32, width 16.
+    # Field pi_on: uint<16> at +48, width 16.
+    fields['pi_on'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_rtplus(blocks, ok):
+    """Extracts the fields of bitstruct group_rtplus from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field item_toggle: bool at +27, width 1.
+    fields['item_toggle'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b10000) >> 4)) == 1,
+        mask=~ok[:, 1])
+    # Field item_running: bool at +28, width 1.
+    fields['item_running'] = np.ma.MaskedArray(
+        (((blocks[:, 1] & 0b1000) >> 3)) == 1,
+        mask=~ok[:, 1])
+    # Field content_type_1: uint<6> at +29, width 6.
+    fields['content_type_1'] = np.ma.MaskedArray(
+        ((blocks[:, 1].astype(np.uint32) & 0b111) << 3) | ((blocks[:, 2].astype(np.uint32) & 0b1110000000000000) >> 13),
+        mask=~(ok[:, 1] & ok[:, 2]))
+    # Field start_1: uint<6> at +35, width 6.
+    fields['start_1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111110000000) >> 7),
+        mask=~ok[:, 2])
+    # Field length_1: uint<6> at +41, width 6.
+    fields['length_1'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1111110) >> 1),
+        mask=~ok[:, 2])
+    # Field content_type_2: uint<6> at +47, width 6.
+    fields['content_type_2'] = np.ma.MaskedArray(
+        ((blocks[:, 2].astype(np.uint32) & 0b1) << 5) | ((blocks[:, 3].astype(np.uint32) & 0b1111100000000000) >> 11),
+        mask=~(ok[:, 2] & ok[:, 3]))
+    # Field start_2: uint<6> at +53, width 6.
+    fields['start_2'] = np.ma.MaskedArray(
+        ((blocks[:, 3] & 0b11111100000) >> 5),
+        mask=~ok[:, 3])
+    # Field length_2: uint<5> at +59, width 5.
+    fields['length_2'] = np.ma.MaskedArray(
+        (blocks[:, 3] & 0b11111),
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_dabxref(blocks, ok):
+    """Extracts the fields of bitstruct group_dabxref from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field es: uint<1> at +27, width 1.
+    fields['es'] = np.ma.MaskedArray(
+        ((blocks[:, 1] & 0b10000) >> 4),
+        mask=~ok[:, 1])
+    # Field _: unparsed<36> at +28, width 36.
+    return fields
+
+
+def extract_group_dabxref_ensemble(blocks, ok):
+    """Extracts the fields of bitstruct group_dabxref_ensemble from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field _: unparsed<28> at +0, width 28.
+    # Field mode: uint<2> at +28, width 2.
+    fields['mode'] = np.ma.MaskedArray(
+        ((blocks[:, 1] & 0b1100) >> 2),
+        mask=~ok[:, 1])
+    # Field frequency: uint<18> at +30, width 18.
+    fields['frequency'] = np.ma.MaskedArray(
+        ((blocks[:, 1].astype(np.uint32) & 0b11) << 16) | blocks[:, 2].astype(np.uint32),
+        mask=~(ok[:, 1] & ok[:, 2]))
+    # Field eid: uint<16> at +48, width 16.
+    fields['eid'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_dabxref_service(blocks, ok):
+    """Extracts the fields of bitstruct group_dabxref_service from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field _: unparsed<28> at +0, width 28.
+    # Field variant: uint<4> at +28, width 4.
+    fields['variant'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b1111),
+        mask=~ok[:, 1])
+    # Field info: uint<16> at +32, width 16.
+    fields['info'] = np.ma.MaskedArray(
+        blocks[:, 2],
+        mask=~ok[:, 2])
+    # Field sid: uint<16> at +48, width 16.
+    fields['sid'] = np.ma.MaskedArray(
+        blocks[:, 3],
+        mask=~ok[:, 3])
+    return fields
+
+
+def extract_group_ert_declaration(blocks, ok):
+    """Extracts the fields of bitstruct group_ert_declaration from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_3A_common: unparsed<32> at +0, width 32.
+    # Field rfu: unparsed<15> at +32, width 15.
+    # Field utf8_encoding: bool at +47, width 1.
+    fields['utf8_encoding'] = np.ma.MaskedArray(
+        ((blocks[:, 2] & 0b1)) == 1,
+        mask=~ok[:, 2])
+    # Field ert_aid: unparsed<16> at +48, width 16.
+    return fields
+
+
+def extract_group_ert(blocks, ok):
+    """Extracts the fields of bitstruct group_ert from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field addr: uint<5> at +27, width 5.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 1] & 0b11111),
+        mask=~ok[:, 1])
+    # Field ert_seg: byte<4> at +32, width 32.
+    fields['ert_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 2] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 2] & 0b11111111)).astype(np.uint8), (((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 2], ~ok[:, 2], ~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+def extract_group_internet_connection(blocks, ok):
+    """Extracts the fields of bitstruct group_internet_connection from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field header: unparsed<8> at +0, width 8.
+    # Field type: uint<1> at +8, width 1.
+    fields['type'] = np.ma.MaskedArray(
+        ((blocks[:, 0] & 0b10000000) >> 7),
+        mask=~ok[:, 0])
+    # Field _: unparsed<55> at +9, width 55.
+    return fields
+
+
+def extract_group_internet_connection_url(blocks, ok):
+    """Extracts the fields of bitstruct group_internet_connection_url from N groups."""
+    (blocks, ok) = _check_arrays(blocks, ok)
+    fields = {}
+    # Field header: unparsed<8> at +0, width 8.
+    # Field type: unparsed<1> at +8, width 1.
+    # Field addr: uint<7> at +9, width 7.
+    fields['addr'] = np.ma.MaskedArray(
+        (blocks[:, 0] & 0b1111111),
+        mask=~ok[:, 0])
+    # Field url_seg: byte<6> at +16, width 48.
+    fields['url_seg'] = np.ma.MaskedArray(
+        np.stack([(((blocks[:, 1] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 1] & 0b11111111)).astype(np.uint8), (((blocks[:, 2] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 2] & 0b11111111)).astype(np.uint8), (((blocks[:, 3] & 0b1111111100000000) >> 8)).astype(np.uint8), ((blocks[:, 3] & 0b11111111)).astype(np.uint8)], axis=1),
+        mask=np.stack([~ok[:, 1], ~ok[:, 1], ~ok[:, 2], ~ok[:, 2], ~ok[:, 3], ~ok[:, 3]], axis=1))
+    return fields
+
+
+# Fields output by each bitstruct, as (name, type) pairs.
+FIELDS = {
+    'group_ab': (('pi', 'uint<16>'),),
+    'group_ab_without_pi': (('type', 'uint<5>'), ('tp', 'bool'), ('pty', 'uint<5>')),
+    'group_unknown': (('block_b_rest', 'uint<5>'), ('block_c', 'uint<16>'), ('block_d', 'uint<16>')),
+    'group_0A': (('af1', 'uint<8>'), ('af2', 'uint<8>')),
+    'group_0B_0_common': (('ta', 'bool'), ('music', 'bool'), ('di', 'bool'), ('addr', 'uint<2>'), ('ps_seg', 'byte<2>')),
+    'group_1A': (('linkage_actuator', 'bool'), ('variant', 'uint<3>'), ('payload', 'uint<12>')),
+    'group_1A_ecc': (('ecc', 'uint<8>'),),
+    'group_1B_1_common': (('pin_day', 'uint<5>'), ('pin_hour', 'uint<5>'), ('pin_minute', 'uint<6>')),
+    'group_2A': (('flag', 'uint<1>'), ('addr', 'uint<4>'), ('rt_seg', 'byte<4>')),
+    'group_2B': (('flag', 'uint<1>'), ('addr', 'uint<4>'), ('pi', 'uint<16>'), ('rt_seg', 'byte<2>')),
+    'group_3A': (('app_group_type', 'uint<5>'), ('aid', 'uint<16>')),
+    'group_4A': (('mjd', 'uint<17>'), ('hour', 'uint<5>'), ('minute', 'uint<6>'), ('tz_sign', 'bool'), ('tz_offset', 'uint<5>')),
+    'group_10A': (('flag_ab', 'bool'), ('addr', 'uint<1>'), ('ptyn_seg', 'byte<4>')),
+    'group_15A': (('ta', 'bool'), ('addr', 'uint<3>'), ('lps_seg', 'byte<4>')),
+    'group_15B': (('ta', 'bool'), ('music', 'bool'), ('di', 'bool'), ('addr', 'uint<2>'), ('pi', 'uint<16>')),
+    'group_c': (('fid', 'uint<2>'), ('fn', 'uint<6>')),
+    'group_c_fid_0': (('type', 'uint<2>'),),
+    'group_c_rft': (('pipe', 'uint<4>'), ('toggle', 'uint<1>'), ('addr', 'uint<15>'), ('byte1', 'uint<8>'), ('byte2', 'uint<8>'), ('byte3', 'uint<8>'), ('byte4', 'uint<8>'), ('byte5', 'uint<8>')),
+    'group_c_oda': (('channel', 'uint<6>'),),
+    'group_c_oda_assignment': (('variant', 'uint<2>'), ('channel', 'uint<6>'), ('aid1', 'uint<16>'), ('block_c', 'uint<16>'), ('block_d', 'uint<16>')),
+    'group_c_oda_rft_assignment': (('variant', 'uint<4>'),),
+    'group_c_oda_rft_assignment_v0': (('pipe', 'uint<4>'), ('crc_present', 'bool'), ('file_version', 'uint<3>'), ('file_id', 'uint<6>'), ('file_size', 'uint<18>')),
+    'group_c_oda_rft_assignment_v1': (('pipe', 'uint<4>'), ('mode', 'uint<3>'), ('chunk_address', 'uint<9>'), ('crc', 'uint<16>')),
+    'group_7A': (('flag_ab', 'bool'), ('addr', 'uint<4>')),
+    'group_7A_address': (('flag_ab', 'bool'), ('y1', 'uint<4>'), ('y2', 'uint<4>'), ('z1', 'uint<4>'), ('z2', 'uint<4>'), ('z3', 'uint<4>'), ('z4', 'uint<4>')),
+    'group_7A_numeric_10': (('flag_ab', 'bool'), ('addr', 'uint<1>'), ('a1', 'uint<4>'), ('a2', 'uint<4>'), ('a3', 'uint<4>'), ('a4', 'uint<4>'), ('a5', 'uint<4>'), ('a6', 'uint<4>'), ('a7', 'uint<4>'), ('a8', 'uint<4>')),
+    'group_7A_numeric_18': (('flag_ab', 'bool'), ('addr', 'uint<2>'), ('a1', 'uint<4>'), ('a2', 'uint<4>'), ('a3', 'uint<4>'), ('a4', 'uint<4>'), ('a5', 'uint<4>'), ('a6', 'uint<4>'), ('a7', 'uint<4>'), ('a8', 'uint<4>')),
+    'group_7A_alphanumeric': (('flag_ab', 'bool'), ('addr', 'uint<3>'), ('char1', 'uint<8>'), ('char2', 'uint<8>'), ('char3', 'uint<8>'), ('char4', 'uint<8>')),
+    'group_14A': (('tp_on', 'bool'), ('variant', 'uint<4>'), ('pi_on', 'uint<16>')),
+    'group_14A_ps': (('addr', 'uint<2>'), ('ps_seg', 'byte<2>'), ('pi_on', 'uint<16>')),
+    'group_14A_af_a': (('af1', 'uint<8>'), ('af2', 'uint<8>'), ('pi_on', 'uint<16>')),
+    'group_14A_mapped_af': (('channel', 'uint<8>'), ('mapped_channel', 'uint<8>'), ('pi_on', 'uint<16>')),
+    'group_14A_pty_ta': (('pty_on', 'uint<5>'), ('ta_on', 'bool'), ('pi_on', 'uint<16>')),
+    'group_14A_pin': (('pin_day_on', 'uint<5>'), ('pin_hour_on', 'uint<5>'), ('pin_minute_on', 'uint<6>'), ('pi_on', 'uint<16>')),
+    'group_14B': (('tp_on', 'bool'), ('ta_on', 'bool'), ('pi_on', 'uint<16>')),
+    'group_rtplus': (('item_toggle', 'bool'), ('item_running', 'bool'), ('content_type_1', 'uint<6>'), ('start_1', 'uint<6>'), ('length_1', 'uint<6>'), ('content_type_2', 'uint<6>'), ('start_2', 'uint<6>'), ('length_2', 'uint<5>')),
+    'group_dabxref': (('es', 'uint<1>'),),
+    'group_dabxref_ensemble': (('mode', 'uint<2>'), ('frequency', 'uint<18>'), ('eid', 'uint<16>')),
+    'group_dabxref_service': (('variant', 'uint<4>'), ('info', 'uint<16>'), ('sid', 'uint<16>')),
+    'group_ert_declaration': (('utf8_encoding', 'bool'),),
+    'group_ert': (('addr', 'uint<5>'), ('ert_seg', 'byte<4>')),
+    'group_internet_connection': (('type', 'uint<1>'),),
+    'group_internet_connection_url': (('addr', 'uint<7>'), ('url_seg', 'byte<6>')),
+}
+
+EXTRACTORS = {
+    'group_ab': extract_group_ab,
+    'group_ab_without_pi': extract_group_ab_without_pi,
+    'group_unknown': extract_group_unknown,
+    'group_0A': extract_group_0A,
+    'group_0B_0_common': extract_group_0B_0_common,
+    'group_1A': extract_group_1A,
+    'group_1A_ecc': extract_group_1A_ecc,
+    'group_1B_1_common': extract_group_1B_1_common,
+    'group_2A': extract_group_2A,
+    'group_2B': extract_group_2B,
+    'group_3A': extract_group_3A,
+    'group_4A': extract_group_4A,
+    'group_10A': extract_group_10A,
+    'group_15A': extract_group_15A,
+    'group_15B': extract_group_15B,
+    'group_c': extract_group_c,
+    'group_c_fid_0': extract_group_c_fid_0,
+    'group_c_rft': extract_group_c_rft,
+    'group_c_oda': extract_group_c_oda,
+    'group_c_oda_assignment': extract_group_c_oda_assignment,
+    'group_c_oda_rft_assignment': extract_group_c_oda_rft_assignment,
+    'group_c_oda_rft_assignment_v0': extract_group_c_oda_rft_assignment_v0,
+    'group_c_oda_rft_assignment_v1': extract_group_c_oda_rft_assignment_v1,
+    'group_7A': extract_group_7A,
+    'group_7A_address': extract_group_7A_address,
+    'group_7A_numeric_10': extract_group_7A_numeric_10,
+    'group_7A_numeric_18': extract_group_7A_numeric_18,
+    'group_7A_alphanumeric': extract_group_7A_alphanumeric,
+    'group_14A': extract_group_14A,
+    'group_14A_ps': extract_group_14A_ps,
+    'group_14A_af_a': extract_group_14A_af_a,
+    'group_14A_mapped_af': extract_group_14A_mapped_af,
+    'group_14A_pty_ta': extract_group_14A_pty_ta,
+    'group_14A_pin': extract_group_14A_pin,
+    'group_14B': extract_group_14B,
+    'group_rtplus': extract_group_rtplus,
+    'group_dabxref': extract_group_dabxref,
+    'group_dabxref_ensemble': extract_group_dabxref_ensemble,
+    'group_dabxref_service': extract_group_dabxref_service,
+    'group_ert_declaration': extract_group_ert_declaration,
+    'group_ert': extract_group_ert,
+    'group_internet_connection': extract_group_internet_connection,
+    'group_internet_connection_url': extract_group_internet_connection_url,
+}
+
+
+def extract(rule, blocks, ok):
+    """Extracts the fields of the bitstruct named `rule` from N groups."""
+    return EXTRACTORS[rule](blocks, ok)
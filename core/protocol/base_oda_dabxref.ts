@@ -0,0 +1,87 @@
+// Generated file. DO NOT EDIT.
+// Rules of oda_dabxref.p, loaded on demand by base.ts.
+
+import { PARSE_FUNCTIONS, Rule, Station, StationField } from "./base";
+import { LogMessage } from "./rds_types";
+
+export function parse_group_dabxref(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_common: unparsed<27> at +0, width 27.
+	// Field es: uint<1> at +27, width 1.
+	const es = ((block[1] & 0b10000) >> 4);
+	// Field _: unparsed<36> at +28, width 36.
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		switch (es) {
+			case 0:
+				parse_group_dabxref_ensemble(block, ok, log, station);
+				break;
+
+			case 1:
+				parse_group_dabxref_service(block, ok, log, station);
+				break;
+
+		}
+	}
+}
+
+export function parse_group_dabxref_ensemble(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field _: unparsed<28> at +0, width 28.
+	// Field mode: uint<2> at +28, width 2.
+	const mode = ((block[1] & 0b1100) >> 2);
+	// Field frequency: uint<18> at +30, width 18.
+	const frequency = ((block[1] & 0b11) << 16) | ((block[2]));
+	// Field eid: uint<16> at +48, width 16.
+	const eid = ((block[3]));
+
+	// Actions.
+	if ((ok & 0b1110) == 0b1110) {
+		station.dab_cross_ref_app.addEnsemble(mode, frequency, eid);
+		station.changes.mark(StationField.dab_cross_ref_app);
+	}
+}
+
+export function parse_group_dabxref_service(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field _: unparsed<28> at +0, width 28.
+	// Field variant: uint<4> at +28, width 4.
+	const variant = ((block[1] & 0b1111));
+	// Field info: uint<16> at +32, width 16.
+	const info = ((block[2]));
+	// Field sid: uint<16> at +48, width 16.
+	const sid = ((block[3]));
+
+	// Actions.
+	log.record(70);
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(8).arg(variant);
+	}
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(71).arg(info);
+	}
+	if ((ok & 0b1000) == 0b1000) {
+		log.record(72).arg(sid);
+	}
+	if ((ok & 0b0010) == 0b0010) {
+		switch (variant) {
+			case 0:
+				if ((ok & 0b1100) == 0b1100) {
+					station.dab_cross_ref_app.addServiceEnsembleInfo(info, sid);
+					station.changes.mark(StationField.dab_cross_ref_app);
+				}
+				break;
+
+			case 1:
+				if ((ok & 0b1100) == 0b1100) {
+					station.dab_cross_ref_app.addServiceLinkageInfo(info, sid);
+					station.changes.mark(StationField.dab_cross_ref_app);
+				}
+				break;
+
+		}
+	}
+}
+
+// Replace the stubs of the rules of this module.
+PARSE_FUNCTIONS[Rule.group_dabxref] = parse_group_dabxref;
+PARSE_FUNCTIONS[Rule.group_dabxref_ensemble] = parse_group_dabxref_ensemble;
+PARSE_FUNCTIONS[Rule.group_dabxref_service] = parse_group_dabxref_service;
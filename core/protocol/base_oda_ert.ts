@@ -0,0 +1,53 @@
+// Generated file. DO NOT EDIT.
+// Rules of oda_ert.p, loaded on demand by base.ts.
+
+import { BYTE_SCRATCH, PARSE_FUNCTIONS, Rule, Station, StationField } from "./base";
+import { LogMessage } from "./rds_types";
+
+export function parse_group_ert_declaration(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_3A_common: unparsed<32> at +0, width 32.
+	// Field rfu: unparsed<15> at +32, width 15.
+	// Field utf8_encoding: bool at +47, width 1.
+	const utf8_encoding = ((block[2] & 0b1)) == 1;
+	// Field ert_aid: unparsed<16> at +48, width 16.
+
+	// Actions.
+	if ((ok & 0b0100) == 0b0100) {
+		log.record(73).arg(utf8_encoding);
+		if (station.ert_app.utf8_encoding !== utf8_encoding) {
+			station.ert_app.utf8_encoding = utf8_encoding;
+			station.changes.mark(StationField.ert_app);
+		}
+	}
+	if (station.ert_app.enabled !== true) {
+		station.ert_app.enabled = true;
+		station.changes.mark(StationField.ert_app);
+	}
+}
+
+export function parse_group_ert(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_common: unparsed<27> at +0, width 27.
+	// Field addr: uint<5> at +27, width 5.
+	const addr = ((block[1] & 0b11111));
+	// Field ert_seg: byte<4> at +32, width 32.
+	const ert_seg__0 = ((block[2] & 0b1111111100000000) >> 8);
+	const ert_seg__1 = ((block[2] & 0b11111111));
+	const ert_seg__2 = ((block[3] & 0b1111111100000000) >> 8);
+	const ert_seg__3 = ((block[3] & 0b11111111));
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(74).arg(addr).arg((ok & 0b0100) == 0b0100 ? ert_seg__0 : null).arg((ok & 0b0100) == 0b0100 ? ert_seg__1 : null).arg((ok & 0b1000) == 0b1000 ? ert_seg__2 : null).arg((ok & 0b1000) == 0b1000 ? ert_seg__3 : null);
+		BYTE_SCRATCH[0] = ert_seg__0;
+		BYTE_SCRATCH[1] = ert_seg__1;
+		BYTE_SCRATCH[2] = ert_seg__2;
+		BYTE_SCRATCH[3] = ert_seg__3;
+		if (station.ert_app.ert.setBytes(addr*4, BYTE_SCRATCH, ((ok & 0b0100) == 0b0100 ? 0b11 : 0) | ((ok & 0b1000) == 0b1000 ? 0b1100 : 0))) {
+			station.changes.mark(StationField.ert_app);
+		}
+	}
+}
+
+// Replace the stubs of the rules of this module.
+PARSE_FUNCTIONS[Rule.group_ert_declaration] = parse_group_ert_declaration;
+PARSE_FUNCTIONS[Rule.group_ert] = parse_group_ert;
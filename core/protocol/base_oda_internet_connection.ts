@@ -0,0 +1,60 @@
+// Generated file. DO NOT EDIT.
+// Rules of oda_internet_connection.p, loaded on demand by base.ts.
+
+import { BYTE_SCRATCH, PARSE_FUNCTIONS, Rule, Station, StationField } from "./base";
+import { LogMessage } from "./rds_types";
+
+export function parse_group_internet_connection(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field header: unparsed<8> at +0, width 8.
+	// Field type: uint<1> at +8, width 1.
+	const type = ((block[0] & 0b10000000) >> 7);
+	// Field _: unparsed<55> at +9, width 55.
+
+	// Actions.
+	log.record(75);
+	if ((ok & 0b0001) == 0b0001) {
+		switch (type) {
+			case 0:
+			case 1:
+				parse_group_internet_connection_url(block, ok, log, station);
+				break;
+
+		}
+	}
+	if (station.internet_connection_app.enabled !== true) {
+		station.internet_connection_app.enabled = true;
+		station.changes.mark(StationField.internet_connection_app);
+	}
+}
+
+export function parse_group_internet_connection_url(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field header: unparsed<8> at +0, width 8.
+	// Field type: unparsed<1> at +8, width 1.
+	// Field addr: uint<7> at +9, width 7.
+	const addr = ((block[0] & 0b1111111));
+	// Field url_seg: byte<6> at +16, width 48.
+	const url_seg__0 = ((block[1] & 0b1111111100000000) >> 8);
+	const url_seg__1 = ((block[1] & 0b11111111));
+	const url_seg__2 = ((block[2] & 0b1111111100000000) >> 8);
+	const url_seg__3 = ((block[2] & 0b11111111));
+	const url_seg__4 = ((block[3] & 0b1111111100000000) >> 8);
+	const url_seg__5 = ((block[3] & 0b11111111));
+
+	// Actions.
+	if ((ok & 0b0001) == 0b0001) {
+		log.record(76).arg(addr).arg((ok & 0b0010) == 0b0010 ? url_seg__0 : null).arg((ok & 0b0010) == 0b0010 ? url_seg__1 : null).arg((ok & 0b0100) == 0b0100 ? url_seg__2 : null).arg((ok & 0b0100) == 0b0100 ? url_seg__3 : null).arg((ok & 0b1000) == 0b1000 ? url_seg__4 : null).arg((ok & 0b1000) == 0b1000 ? url_seg__5 : null);
+		BYTE_SCRATCH[0] = url_seg__0;
+		BYTE_SCRATCH[1] = url_seg__1;
+		BYTE_SCRATCH[2] = url_seg__2;
+		BYTE_SCRATCH[3] = url_seg__3;
+		BYTE_SCRATCH[4] = url_seg__4;
+		BYTE_SCRATCH[5] = url_seg__5;
+		if (station.internet_connection_app.url.setBytes(addr*6, BYTE_SCRATCH, ((ok & 0b0010) == 0b0010 ? 0b11 : 0) | ((ok & 0b0100) == 0b0100 ? 0b1100 : 0) | ((ok & 0b1000) == 0b1000 ? 0b110000 : 0))) {
+			station.changes.mark(StationField.internet_connection_app);
+		}
+	}
+}
+
+// Replace the stubs of the rules of this module.
+PARSE_FUNCTIONS[Rule.group_internet_connection] = parse_group_internet_connection;
+PARSE_FUNCTIONS[Rule.group_internet_connection_url] = parse_group_internet_connection_url;
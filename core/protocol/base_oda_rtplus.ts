@@ -0,0 +1,49 @@
+// Generated file. DO NOT EDIT.
+// Rules of oda_rtplus.p, loaded on demand by base.ts.
+
+import { PARSE_FUNCTIONS, Rule, Station, StationField } from "./base";
+import { LogMessage } from "./rds_types";
+
+export function parse_group_rtplus(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_common: unparsed<27> at +0, width 27.
+	// Field item_toggle: bool at +27, width 1.
+	const item_toggle = ((block[1] & 0b10000) >> 4) == 1;
+	// Field item_running: bool at +28, width 1.
+	const item_running = ((block[1] & 0b1000) >> 3) == 1;
+	// Field content_type_1: uint<6> at +29, width 6.
+	const content_type_1 = ((block[1] & 0b111) << 3) | ((block[2] & 0b1110000000000000) >> 13);
+	// Field start_1: uint<6> at +35, width 6.
+	const start_1 = ((block[2] & 0b1111110000000) >> 7);
+	// Field length_1: uint<6> at +41, width 6.
+	const length_1 = ((block[2] & 0b1111110) >> 1);
+	// Field content_type_2: uint<6> at +47, width 6.
+	const content_type_2 = ((block[2] & 0b1) << 5) | ((block[3] & 0b1111100000000000) >> 11);
+	// Field start_2: uint<6> at +53, width 6.
+	const start_2 = ((block[3] & 0b11111100000) >> 5);
+	// Field length_2: uint<5> at +59, width 5.
+	const length_2 = ((block[3] & 0b11111));
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(67).arg(item_toggle).arg(item_running);
+		if ((ok & 0b0100) == 0b0100) {
+			log.record(68).arg(content_type_1).arg(start_1).arg(length_1);
+		}
+	}
+	if ((ok & 0b0100) == 0b0100) {
+		if ((ok & 0b1000) == 0b1000) {
+			log.record(69).arg(content_type_2).arg(start_2).arg(length_2);
+		}
+		if ((ok & 0b0010) == 0b0010) {
+			station.rt_plus_app.setTag(content_type_1, start_1, length_1);
+			station.changes.mark(StationField.rt_plus_app);
+		}
+		if ((ok & 0b1000) == 0b1000) {
+			station.rt_plus_app.setTag(content_type_2, start_2, length_2);
+			station.changes.mark(StationField.rt_plus_app);
+		}
+	}
+}
+
+// Replace the stubs of the rules of this module.
+PARSE_FUNCTIONS[Rule.group_rtplus] = parse_group_rtplus;
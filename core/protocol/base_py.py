@@ -0,0 +1,1606 @@
+# Generated file. DO NOT EDIT.
+
+"""RDS decoder: parse functions for the bitstructs of the protocol description.
+
+Each parse_<bitstruct> function takes a group as a sequence of 4 blocks, a
+mask of their validity (bit i set if block i is valid), a list to which log
+messages are appended, and the structs it updates. Structs are plain classes
+with __slots__. See rds_stream.py for decoding RDS Spy hex logs.
+"""
+
+import enum
+
+from rds_runtime import RDS_CHARMAP, RdsString, format_af
+
+
+class Rule(enum.IntEnum):
+    group_ab = 0
+    group_ab_without_pi = 1
+    group_unknown = 2
+    group_0A = 3
+    group_0B_0_common = 4
+    group_1A = 5
+    group_1A_ecc = 6
+    group_1B_1_common = 7
+    group_2A = 8
+    group_2B = 9
+    group_3A = 10
+    group_4A = 11
+    group_10A = 12
+    group_15A = 13
+    group_15B = 14
+    group_c = 15
+    group_c_fid_0 = 16
+    group_c_rft = 17
+    group_c_oda = 18
+    group_c_oda_assignment = 19
+    group_c_oda_rft_assignment = 20
+    group_c_oda_rft_assignment_v0 = 21
+    group_c_oda_rft_assignment_v1 = 22
+    group_7A = 23
+    group_7A_address = 24
+    group_7A_numeric_10 = 25
+    group_7A_numeric_18 = 26
+    group_7A_alphanumeric = 27
+    group_14A = 28
+    group_14A_ps = 29
+    group_14A_af_a = 30
+    group_14A_mapped_af = 31
+    group_14A_pty_ta = 32
+    group_14A_pin = 33
+    group_14B = 34
+    group_rtplus = 35
+    group_dabxref = 36
+    group_dabxref_ensemble = 37
+    group_dabxref_service = 38
+    group_ert_declaration = 39
+    group_ert = 40
+    group_internet_connection = 41
+    group_internet_connection_url = 42
+
+
+class Station:
+    """Struct Station. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    Bit i of `changes` is set when StationField i changes.
+    """
+
+    __slots__ = (
+        'calls',
+        'changes',
+        'pi',
+        'pty',
+        'ptyn',
+        'tp',
+        'ta',
+        'ps',
+        'lps',
+        'rt',
+        'rt_flag',
+        'music',
+        'di_dynamic_pty',
+        'di_compressed',
+        'di_artificial_head',
+        'di_stereo',
+        'odas',
+        'transmitted_odas',
+        'transmitted_channel_odas',
+        'app_mapping',
+        'channel_app_mapping',
+        'oda_3A_mapping',
+        'rt_plus_app',
+        'ert_app',
+        'dab_cross_ref_app',
+        'internet_connection_app',
+        'rp_app',
+        'linkage_actuator',
+        'pin_day',
+        'pin_hour',
+        'pin_minute',
+        'ecc',
+        'language_code',
+        'other_networks',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+        self.changes = 0
+        self.pi = None
+        self.pty = None
+        self.ptyn = RdsString(8)
+        self.tp = None
+        self.ta = None
+        self.ps = RdsString(8)
+        self.lps = RdsString(32)
+        self.rt = RdsString(64)
+        self.rt_flag = None
+        self.music = None
+        self.di_dynamic_pty = None
+        self.di_compressed = None
+        self.di_artificial_head = None
+        self.di_stereo = None
+        self.odas = {}
+        self.transmitted_odas = {}
+        self.transmitted_channel_odas = {}
+        self.app_mapping = {}
+        self.channel_app_mapping = {}
+        self.oda_3A_mapping = {}
+        self.rt_plus_app = RtPlusApp(self.calls)
+        self.ert_app = ERtApp(self.calls)
+        self.dab_cross_ref_app = DabCrossRefApp(self.calls)
+        self.internet_connection_app = InternetConnectionApp(self.calls)
+        self.rp_app = RpApp(self.calls)
+        self.linkage_actuator = None
+        self.pin_day = None
+        self.pin_hour = None
+        self.pin_minute = None
+        self.ecc = None
+        self.language_code = None
+        self.other_networks = {}
+
+    def addToGroupStats(self, type):
+        self.calls.append((self, 'addToGroupStats', (type,)))
+
+    def setClockTime(self, mjd, hour, minute, tz_sign, tz_offset):
+        self.calls.append((self, 'setClockTime', (mjd, hour, minute, tz_sign, tz_offset)))
+
+    def addAfPair(self, af1, af2):
+        self.calls.append((self, 'addAfPair', (af1, af2)))
+
+    def addMappedAF(self, channel, mapped_channel):
+        self.calls.append((self, 'addMappedAF', (channel, mapped_channel)))
+
+    def reportOtherNetworkSwitch(self, pi, ta):
+        self.calls.append((self, 'reportOtherNetworkSwitch', (pi, ta)))
+
+    def reportRftData(self, pipe, addr, byte1, byte2, byte3, byte4, byte5):
+        self.calls.append((self, 'reportRftData', (pipe, addr, byte1, byte2, byte3, byte4, byte5)))
+
+    def reportRftCrc(self, pipe, mode, chunkAddr, crc):
+        self.calls.append((self, 'reportRftCrc', (pipe, mode, chunkAddr, crc)))
+
+    def reportRftMetadata(self, pipe, fileSize, file_id, file_version, crc_present):
+        self.calls.append((self, 'reportRftMetadata', (pipe, fileSize, file_id, file_version, crc_present)))
+
+
+class StationField(enum.IntEnum):
+    """Bits of Station.changes."""
+    pi = 0
+    pty = 1
+    ptyn = 2
+    tp = 3
+    ta = 4
+    ps = 5
+    lps = 6
+    rt = 7
+    rt_flag = 8
+    music = 9
+    di_dynamic_pty = 10
+    di_compressed = 11
+    di_artificial_head = 12
+    di_stereo = 13
+    odas = 14
+    transmitted_odas = 15
+    transmitted_channel_odas = 16
+    app_mapping = 17
+    channel_app_mapping = 18
+    oda_3A_mapping = 19
+    rt_plus_app = 20
+    ert_app = 21
+    dab_cross_ref_app = 22
+    internet_connection_app = 23
+    rp_app = 24
+    linkage_actuator = 25
+    pin_day = 26
+    pin_hour = 27
+    pin_minute = 28
+    ecc = 29
+    language_code = 30
+    other_networks = 31
+    addToGroupStats = 32
+    setClockTime = 33
+    addAfPair = 34
+    addMappedAF = 35
+    reportOtherNetworkSwitch = 36
+    reportRftData = 37
+    reportRftCrc = 38
+    reportRftMetadata = 39
+
+
+STATION_FIELD_COUNT = 40
+
+
+class OtherNetwork:
+    """Struct OtherNetwork. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    """
+
+    __slots__ = (
+        'calls',
+        'pi',
+        'pty',
+        'tp',
+        'ta',
+        'ps',
+        'pin_day',
+        'pin_hour',
+        'pin_minute',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+        self.pi = None
+        self.pty = None
+        self.tp = None
+        self.ta = None
+        self.ps = RdsString(8)
+        self.pin_day = None
+        self.pin_hour = None
+        self.pin_minute = None
+
+    def addAfPair(self, af1, af2):
+        self.calls.append((self, 'addAfPair', (af1, af2)))
+
+    def addMappedAF(self, channel, mapped_channel):
+        self.calls.append((self, 'addMappedAF', (channel, mapped_channel)))
+
+
+def parse_group_ab(block, ok, log, station):
+    # Field pi: uint<16> at +0, width 16.
+    pi = ((block[0]))
+    # Field _: unparsed<48> at +16, width 48.
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        log.append(f'PI={pi:04X}')
+        if station.pi != pi:
+            station.pi = pi
+            station.changes |= 0x1  # pi
+    parse_group_ab_without_pi(block, ok, log, station)
+
+
+def parse_group_ab_without_pi(block, ok, log, station):
+    # Field _: unparsed<16> at +0, width 16.
+    # Field type: uint<5> at +16, width 5.
+    type = ((block[1] & 0b1111100000000000) >> 11)
+    # Field tp: bool at +21, width 1.
+    tp = ((block[1] & 0b10000000000) >> 10) == 1
+    # Field pty: uint<5> at +22, width 5.
+    pty = ((block[1] & 0b1111100000) >> 5)
+    # Field payload: unparsed<37> at +27, width 37.
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'Group {type >> 1}{"A" if (type & 1) == 0 else "B"}')
+        log.append(f'TP={"1" if tp else "0"}')
+        log.append(f'PTY={pty}')
+        if station.tp != tp:
+            station.tp = tp
+            station.changes |= 0x8  # tp
+        if station.pty != pty:
+            station.pty = pty
+            station.changes |= 0x2  # pty
+        station.addToGroupStats(type)
+        station.changes |= 0x100000000  # addToGroupStats
+        PARSE_FUNCTIONS[station.app_mapping.get(type, Rule.group_unknown)](block, ok, log, station)
+
+
+def parse_group_unknown(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field block_b_rest: uint<5> at +27, width 5.
+    # Field block_c: uint<16> at +32, width 16.
+    # Field block_d: uint<16> at +48, width 16.
+
+    # Actions.
+    pass
+
+
+def parse_group_0A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: unparsed<5> at +27, width 5.
+    # Field af1: uint<8> at +32, width 8.
+    af1 = ((block[2] & 0b1111111100000000) >> 8)
+    # Field af2: uint<8> at +40, width 8.
+    af2 = ((block[2] & 0b11111111))
+    # Field _: unparsed<16> at +48, width 16.
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'AFs {format_af(af1)}, {format_af(af2)}')
+        station.addAfPair(af1, af2)
+        station.changes |= 0x400000000  # addAfPair
+    parse_group_0B_0_common(block, ok, log, station)
+
+
+def parse_group_0B_0_common(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field ta: bool at +27, width 1.
+    ta = ((block[1] & 0b10000) >> 4) == 1
+    # Field music: bool at +28, width 1.
+    music = ((block[1] & 0b1000) >> 3) == 1
+    # Field di: bool at +29, width 1.
+    di = ((block[1] & 0b100) >> 2) == 1
+    # Field addr: uint<2> at +30, width 2.
+    addr = ((block[1] & 0b11))
+    # Field _: uint<16> at +32, width 16.
+    # Field ps_seg: byte<2> at +48, width 16.
+    ps_seg__0 = ((block[3] & 0b1111111100000000) >> 8)
+    ps_seg__1 = ((block[3] & 0b11111111))
+    ps_seg = (ps_seg__0 if (ok & 0b1000) == 0b1000 else None, ps_seg__1 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'TA={"1" if ta else "0"}')
+        log.append(f'PS seg @{addr} "{format_rds_text(ps_seg)}"')
+        if station.ta != ta:
+            station.ta = ta
+            station.changes |= 0x10  # ta
+        if station.music != music:
+            station.music = music
+            station.changes |= 0x200  # music
+        if station.ps.set_bytes(addr*2, (ps_seg__0, ps_seg__1), (0b11 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x20  # ps
+        match addr:
+            case 0:
+                if station.di_dynamic_pty != di:
+                    station.di_dynamic_pty = di
+                    station.changes |= 0x400  # di_dynamic_pty
+            case 1:
+                if station.di_compressed != di:
+                    station.di_compressed = di
+                    station.changes |= 0x800  # di_compressed
+            case 2:
+                if station.di_artificial_head != di:
+                    station.di_artificial_head = di
+                    station.changes |= 0x1000  # di_artificial_head
+            case 3:
+                if station.di_stereo != di:
+                    station.di_stereo = di
+                    station.changes |= 0x2000  # di_stereo
+
+
+def parse_group_1A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: unparsed<5> at +27, width 5.
+    # Field linkage_actuator: bool at +32, width 1.
+    linkage_actuator = ((block[2] & 0b1000000000000000) >> 15) == 1
+    # Field variant: uint<3> at +33, width 3.
+    variant = ((block[2] & 0b111000000000000) >> 12)
+    # Field payload: uint<12> at +36, width 12.
+    payload = ((block[2] & 0b111111111111))
+    # Field pin: unparsed<16> at +48, width 16.
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'LA={"1" if linkage_actuator else "0"}')
+        log.append(f'v={variant}')
+        if station.linkage_actuator != linkage_actuator:
+            station.linkage_actuator = linkage_actuator
+            station.changes |= 0x2000000  # linkage_actuator
+    parse_group_1B_1_common(block, ok, log, station)
+    if (ok & 0b0100) == 0b0100:
+        match variant:
+            case 0:
+                parse_group_1A_ecc(block, ok, log, station)
+            case 3:
+                log.append(f'Language code: {payload}')
+                if station.language_code != payload:
+                    station.language_code = payload
+                    station.changes |= 0x40000000  # language_code
+
+
+def parse_group_1A_ecc(block, ok, log, station):
+    # Field _: unparsed<32> at +0, width 32.
+    # Field linkage_actuator: unparsed<1> at +32, width 1.
+    # Field variant: unparsed<3> at +33, width 3.
+    # Field paging: unparsed<4> at +36, width 4.
+    # Field ecc: uint<8> at +40, width 8.
+    ecc = ((block[2] & 0b11111111))
+    # Field pin: unparsed<16> at +48, width 16.
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'ECC={ecc:02X}')
+        if station.ecc != ecc:
+            station.ecc = ecc
+            station.changes |= 0x20000000  # ecc
+
+
+def parse_group_1B_1_common(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: unparsed<5> at +27, width 5.
+    # Field _: unparsed<16> at +32, width 16.
+    # Field pin_day: uint<5> at +48, width 5.
+    pin_day = ((block[3] & 0b1111100000000000) >> 11)
+    # Field pin_hour: uint<5> at +53, width 5.
+    pin_hour = ((block[3] & 0b11111000000) >> 6)
+    # Field pin_minute: uint<6> at +58, width 6.
+    pin_minute = ((block[3] & 0b111111))
+
+    # Actions.
+    if (ok & 0b1000) == 0b1000:
+        log.append(f'PIN=(D={pin_day}, {pin_hour:02d}:{pin_minute:02d})')
+        if station.pin_day != pin_day:
+            station.pin_day = pin_day
+            station.changes |= 0x4000000  # pin_day
+        if station.pin_hour != pin_hour:
+            station.pin_hour = pin_hour
+            station.changes |= 0x8000000  # pin_hour
+        if station.pin_minute != pin_minute:
+            station.pin_minute = pin_minute
+            station.changes |= 0x10000000  # pin_minute
+
+
+def parse_group_2A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag: uint<1> at +27, width 1.
+    flag = ((block[1] & 0b10000) >> 4)
+    # Field addr: uint<4> at +28, width 4.
+    addr = ((block[1] & 0b1111))
+    # Field rt_seg: byte<4> at +32, width 32.
+    rt_seg__0 = ((block[2] & 0b1111111100000000) >> 8)
+    rt_seg__1 = ((block[2] & 0b11111111))
+    rt_seg__2 = ((block[3] & 0b1111111100000000) >> 8)
+    rt_seg__3 = ((block[3] & 0b11111111))
+    rt_seg = (rt_seg__0 if (ok & 0b0100) == 0b0100 else None, rt_seg__1 if (ok & 0b0100) == 0b0100 else None, rt_seg__2 if (ok & 0b1000) == 0b1000 else None, rt_seg__3 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'RT flag={"A" if flag else "B"}')
+        log.append(f'RT seg @{addr} "{format_rds_text(rt_seg)}"')
+        if station.rt.set_bytes(addr*4, (rt_seg__0, rt_seg__1, rt_seg__2, rt_seg__3), (0b11 if (ok & 0b0100) == 0b0100 else 0) | (0b1100 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x80  # rt
+        if station.rt_flag != flag:
+            station.rt_flag = flag
+            station.changes |= 0x100  # rt_flag
+
+
+def parse_group_2B(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag: uint<1> at +27, width 1.
+    flag = ((block[1] & 0b10000) >> 4)
+    # Field addr: uint<4> at +28, width 4.
+    addr = ((block[1] & 0b1111))
+    # Field pi: uint<16> at +32, width 16.
+    # Field rt_seg: byte<2> at +48, width 16.
+    rt_seg__0 = ((block[3] & 0b1111111100000000) >> 8)
+    rt_seg__1 = ((block[3] & 0b11111111))
+    rt_seg = (rt_seg__0 if (ok & 0b1000) == 0b1000 else None, rt_seg__1 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'RT flag={"A" if flag else "B"}')
+        log.append(f'RT seg @{addr} "{format_rds_text(rt_seg)}"')
+        if station.rt.set_bytes(addr*2, (rt_seg__0, rt_seg__1), (0b11 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x80  # rt
+        if station.rt_flag != flag:
+            station.rt_flag = flag
+            station.changes |= 0x100  # rt_flag
+
+
+def parse_group_3A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field app_group_type: uint<5> at +27, width 5.
+    app_group_type = ((block[1] & 0b11111))
+    # Field app_data: unparsed<16> at +32, width 16.
+    # Field aid: uint<16> at +48, width 16.
+    aid = ((block[3]))
+
+    # Actions.
+    if (ok & 0b1000) == 0b1000:
+        log.append(f'ODA AID={aid:04X}')
+        if (ok & 0b0010) == 0b0010:
+            if station.transmitted_odas.get(app_group_type) != aid:
+                station.transmitted_odas[app_group_type] = aid
+                station.changes |= 0x8000  # transmitted_odas
+    if (ok & 0b0010) == 0b0010:
+        match app_group_type:
+            case 0 | 31:
+                log.append('no associated group')
+            case _:
+                log.append(f'in group {app_group_type >> 1}{"A" if (app_group_type & 1) == 0 else "B"}')
+                if (ok & 0b1000) == 0b1000:
+                    if station.app_mapping.get(app_group_type) != station.odas.get(aid, Rule.group_unknown):
+                        station.app_mapping[app_group_type] = station.odas.get(aid, Rule.group_unknown)
+                        station.changes |= 0x20000  # app_mapping
+    if (ok & 0b1000) == 0b1000:
+        PARSE_FUNCTIONS[station.oda_3A_mapping.get(aid, Rule.group_unknown)](block, ok, log, station)
+
+
+def parse_group_4A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field _: uint<3> at +27, width 3.
+    # Field mjd: uint<17> at +30, width 17.
+    mjd = ((block[1] & 0b11) << 15) | ((block[2] & 0b1111111111111110) >> 1)
+    # Field hour: uint<5> at +47, width 5.
+    hour = ((block[2] & 0b1) << 4) | ((block[3] & 0b1111000000000000) >> 12)
+    # Field minute: uint<6> at +52, width 6.
+    minute = ((block[3] & 0b111111000000) >> 6)
+    # Field tz_sign: bool at +58, width 1.
+    tz_sign = ((block[3] & 0b100000) >> 5) == 1
+    # Field tz_offset: uint<5> at +59, width 5.
+    tz_offset = ((block[3] & 0b11111))
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        if (ok & 0b0010) == 0b0010:
+            log.append(f'MJD={mjd}')
+        if (ok & 0b1000) == 0b1000:
+            log.append(f'Hour={hour:02d}')
+    if (ok & 0b1000) == 0b1000:
+        log.append(f'Minute={minute:02d}')
+        log.append(f'TZ={"+" if tz_sign else "-"}{tz_offset}')
+        if (ok & 0b0110) == 0b0110:
+            station.setClockTime(mjd, hour, minute, tz_sign, tz_offset)
+            station.changes |= 0x200000000  # setClockTime
+
+
+def parse_group_10A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    flag_ab = ((block[1] & 0b10000) >> 4) == 1
+    # Field _: uint<3> at +28, width 3.
+    # Field addr: uint<1> at +31, width 1.
+    addr = ((block[1] & 0b1))
+    # Field ptyn_seg: byte<4> at +32, width 32.
+    ptyn_seg__0 = ((block[2] & 0b1111111100000000) >> 8)
+    ptyn_seg__1 = ((block[2] & 0b11111111))
+    ptyn_seg__2 = ((block[3] & 0b1111111100000000) >> 8)
+    ptyn_seg__3 = ((block[3] & 0b11111111))
+    ptyn_seg = (ptyn_seg__0 if (ok & 0b0100) == 0b0100 else None, ptyn_seg__1 if (ok & 0b0100) == 0b0100 else None, ptyn_seg__2 if (ok & 0b1000) == 0b1000 else None, ptyn_seg__3 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'PTYN flag={"A" if flag_ab else "B"}')
+        log.append(f'PTYN seg @{addr} "{format_rds_text(ptyn_seg)}"')
+        if station.ptyn.set_bytes(addr*4, (ptyn_seg__0, ptyn_seg__1, ptyn_seg__2, ptyn_seg__3), (0b11 if (ok & 0b0100) == 0b0100 else 0) | (0b1100 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x4  # ptyn
+
+
+def parse_group_15A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field ta: bool at +27, width 1.
+    ta = ((block[1] & 0b10000) >> 4) == 1
+    # Field _: bool at +28, width 1.
+    # Field addr: uint<3> at +29, width 3.
+    addr = ((block[1] & 0b111))
+    # Field lps_seg: byte<4> at +32, width 32.
+    lps_seg__0 = ((block[2] & 0b1111111100000000) >> 8)
+    lps_seg__1 = ((block[2] & 0b11111111))
+    lps_seg__2 = ((block[3] & 0b1111111100000000) >> 8)
+    lps_seg__3 = ((block[3] & 0b11111111))
+    lps_seg = (lps_seg__0 if (ok & 0b0100) == 0b0100 else None, lps_seg__1 if (ok & 0b0100) == 0b0100 else None, lps_seg__2 if (ok & 0b1000) == 0b1000 else None, lps_seg__3 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'TA={"1" if ta else "0"}')
+        log.append(f'Long PS seg @{addr} {format_bytes(lps_seg)}')
+        if station.lps.set_bytes(addr*4, (lps_seg__0, lps_seg__1, lps_seg__2, lps_seg__3), (0b11 if (ok & 0b0100) == 0b0100 else 0) | (0b1100 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x40  # lps
+
+
+def parse_group_15B(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field ta: bool at +27, width 1.
+    ta = ((block[1] & 0b10000) >> 4) == 1
+    # Field music: bool at +28, width 1.
+    music = ((block[1] & 0b1000) >> 3) == 1
+    # Field di: bool at +29, width 1.
+    di = ((block[1] & 0b100) >> 2) == 1
+    # Field addr: uint<2> at +30, width 2.
+    addr = ((block[1] & 0b11))
+    # Field pi: uint<16> at +32, width 16.
+    pi = ((block[2]))
+    # Field repeat: unparsed<16> at +48, width 16.
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'TA={"1" if ta else "0"}')
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'PI={pi:04X}')
+    if (ok & 0b0010) == 0b0010:
+        if station.ta != ta:
+            station.ta = ta
+            station.changes |= 0x10  # ta
+        if station.music != music:
+            station.music = music
+            station.changes |= 0x200  # music
+        match addr:
+            case 0:
+                if station.di_dynamic_pty != di:
+                    station.di_dynamic_pty = di
+                    station.changes |= 0x400  # di_dynamic_pty
+            case 1:
+                if station.di_compressed != di:
+                    station.di_compressed = di
+                    station.changes |= 0x800  # di_compressed
+            case 2:
+                if station.di_artificial_head != di:
+                    station.di_artificial_head = di
+                    station.changes |= 0x1000  # di_artificial_head
+            case 3:
+                if station.di_stereo != di:
+                    station.di_stereo = di
+                    station.changes |= 0x2000  # di_stereo
+
+
+def parse_group_c(block, ok, log, station):
+    # Field fid: uint<2> at +0, width 2.
+    fid = ((block[0] & 0b1100000000000000) >> 14)
+    # Field fn: uint<6> at +2, width 6.
+    fn = ((block[0] & 0b11111100000000) >> 8)
+    # Field payload: unparsed<56> at +8, width 56.
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        log.append(f'FID={fid}')
+        log.append(f'FN={fn}')
+        match fid:
+            case 0:
+                parse_group_c_fid_0(block, ok, log, station)
+            case 1:
+                parse_group_c_oda(block, ok, log, station)
+            case 2:
+                match fn:
+                    case 0:
+                        parse_group_c_oda_assignment(block, ok, log, station)
+            case 3:
+                pass
+
+
+def parse_group_c_fid_0(block, ok, log, station):
+    # Field fid: unparsed<2> at +0, width 2.
+    # Field type: uint<2> at +2, width 2.
+    type = ((block[0] & 0b11000000000000) >> 12)
+    # Field _: unparsed<4> at +4, width 4.
+    # Field _: unparsed<56> at +8, width 56.
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        match type:
+            case 0:
+                log.append('Tunnelled A/B group')
+                parse_group_ab_without_pi(block, ok, log, station)
+            case 2:
+                parse_group_c_rft(block, ok, log, station)
+
+
+def parse_group_c_rft(block, ok, log, station):
+    # Field fid: unparsed<2> at +0, width 2.
+    # Field type: unparsed<2> at +2, width 2.
+    # Field pipe: uint<4> at +4, width 4.
+    pipe = ((block[0] & 0b111100000000) >> 8)
+    # Field toggle: uint<1> at +8, width 1.
+    toggle = ((block[0] & 0b10000000) >> 7)
+    # Field addr: uint<15> at +9, width 15.
+    addr = ((block[0] & 0b1111111) << 8) | ((block[1] & 0b1111111100000000) >> 8)
+    # Field byte1: uint<8> at +24, width 8.
+    byte1 = ((block[1] & 0b11111111))
+    # Field byte2: uint<8> at +32, width 8.
+    byte2 = ((block[2] & 0b1111111100000000) >> 8)
+    # Field byte3: uint<8> at +40, width 8.
+    byte3 = ((block[2] & 0b11111111))
+    # Field byte4: uint<8> at +48, width 8.
+    byte4 = ((block[3] & 0b1111111100000000) >> 8)
+    # Field byte5: uint<8> at +56, width 8.
+    byte5 = ((block[3] & 0b11111111))
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        log.append(f'RFT pipe {pipe}')
+        log.append(f'toggle {toggle}')
+        if (ok & 0b0010) == 0b0010:
+            log.append(f'addr {addr}')
+            if (ok & 0b1100) == 0b1100:
+                station.reportRftData(pipe, addr, byte1, byte2, byte3, byte4, byte5)
+                station.changes |= 0x2000000000  # reportRftData
+
+
+def parse_group_c_oda(block, ok, log, station):
+    # Field fid: unparsed<2> at +0, width 2.
+    # Field channel: uint<6> at +2, width 6.
+    channel = ((block[0] & 0b11111100000000) >> 8)
+    # Field app_data: unparsed<56> at +8, width 56.
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        log.append(f'ODA channel {channel}')
+        PARSE_FUNCTIONS[station.channel_app_mapping.get(channel, Rule.group_unknown)](block, ok, log, station)
+
+
+def parse_group_c_oda_assignment(block, ok, log, station):
+    # Field header: unparsed<8> at +0, width 8.
+    # Field variant: uint<2> at +8, width 2.
+    variant = ((block[0] & 0b11000000) >> 6)
+    # Field channel: uint<6> at +10, width 6.
+    channel = ((block[0] & 0b111111))
+    # Field aid1: uint<16> at +16, width 16.
+    aid1 = ((block[1]))
+    # Field block_c: uint<16> at +32, width 16.
+    # Field block_d: uint<16> at +48, width 16.
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        match variant:
+            case 0:
+                log.append('ODA assignment')
+                if (ok & 0b0010) == 0b0010:
+                    log.append(f'Channel {channel} -> AID {aid1:04X}')
+                    if station.transmitted_channel_odas.get(channel) != aid1:
+                        station.transmitted_channel_odas[channel] = aid1
+                        station.changes |= 0x10000  # transmitted_channel_odas
+                    if station.channel_app_mapping.get(channel) != station.odas.get(aid1, Rule.group_unknown):
+                        station.channel_app_mapping[channel] = station.odas.get(aid1, Rule.group_unknown)
+                        station.changes |= 0x40000  # channel_app_mapping
+                match channel:
+                    case 0 | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 | 10 | 11 | 12 | 13 | 14 | 15:
+                        parse_group_c_oda_rft_assignment(block, ok, log, station)
+            case 1 | 2 | 3:
+                log.append(f'Variant {variant} not implemented.')
+
+
+def parse_group_c_oda_rft_assignment(block, ok, log, station):
+    # Field header: unparsed<8> at +0, width 8.
+    # Field zero: unparsed<4> at +8, width 4.
+    # Field pipe: unparsed<4> at +12, width 4.
+    # Field aid: unparsed<16> at +16, width 16.
+    # Field variant: uint<4> at +32, width 4.
+    variant = ((block[2] & 0b1111000000000000) >> 12)
+    # Field _: unparsed<28> at +36, width 28.
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'Variant {variant}')
+        match variant:
+            case 0:
+                parse_group_c_oda_rft_assignment_v0(block, ok, log, station)
+            case 1:
+                parse_group_c_oda_rft_assignment_v1(block, ok, log, station)
+
+
+def parse_group_c_oda_rft_assignment_v0(block, ok, log, station):
+    # Field header: unparsed<8> at +0, width 8.
+    # Field zero: unparsed<4> at +8, width 4.
+    # Field pipe: uint<4> at +12, width 4.
+    pipe = ((block[0] & 0b1111))
+    # Field aid: unparsed<16> at +16, width 16.
+    # Field variant: unparsed<4> at +32, width 4.
+    # Field crc_present: bool at +36, width 1.
+    crc_present = ((block[2] & 0b100000000000) >> 11) == 1
+    # Field file_version: uint<3> at +37, width 3.
+    file_version = ((block[2] & 0b11100000000) >> 8)
+    # Field file_id: uint<6> at +40, width 6.
+    file_id = ((block[2] & 0b11111100) >> 2)
+    # Field file_size: uint<18> at +46, width 18.
+    file_size = ((block[2] & 0b11) << 16) | ((block[3]))
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'CRC? {"1" if crc_present else "0"}')
+        log.append(f'File version: {file_version}')
+        log.append(f'File id: {file_id}')
+        if (ok & 0b1000) == 0b1000:
+            log.append(f'File size: {file_size}')
+            if (ok & 0b0001) == 0b0001:
+                station.reportRftMetadata(pipe, file_size, file_id, file_version, crc_present)
+                station.changes |= 0x8000000000  # reportRftMetadata
+
+
+def parse_group_c_oda_rft_assignment_v1(block, ok, log, station):
+    # Field header: unparsed<8> at +0, width 8.
+    # Field zero: unparsed<4> at +8, width 4.
+    # Field pipe: uint<4> at +12, width 4.
+    pipe = ((block[0] & 0b1111))
+    # Field aid: unparsed<16> at +16, width 16.
+    # Field variant: unparsed<4> at +32, width 4.
+    # Field mode: uint<3> at +36, width 3.
+    mode = ((block[2] & 0b111000000000) >> 9)
+    # Field chunk_address: uint<9> at +39, width 9.
+    chunk_address = ((block[2] & 0b111111111))
+    # Field crc: uint<16> at +48, width 16.
+    crc = ((block[3]))
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'CRC mode: {mode}')
+        log.append(f'Chunk addr: {chunk_address}')
+    if (ok & 0b1000) == 0b1000:
+        log.append(f'CRC: {crc:04X}')
+        if (ok & 0b0101) == 0b0101:
+            station.reportRftCrc(pipe, mode, chunk_address, crc)
+            station.changes |= 0x4000000000  # reportRftCrc
+
+
+class RpApp:
+    """Struct RpApp. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    """
+
+    __slots__ = (
+        'calls',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+
+    def newBeepMessage(self, flag_ab):
+        self.calls.append((self, 'newBeepMessage', (flag_ab,)))
+
+    def new10dMessage(self, flag_ab):
+        self.calls.append((self, 'new10dMessage', (flag_ab,)))
+
+    def new18dMessage(self, flag_ab):
+        self.calls.append((self, 'new18dMessage', (flag_ab,)))
+
+    def newAlphaMessage(self, flag_ab):
+        self.calls.append((self, 'newAlphaMessage', (flag_ab,)))
+
+    def reportAddress(self, flag_ab, y1, y2, z1, z2, z3, z4):
+        self.calls.append((self, 'reportAddress', (flag_ab, y1, y2, z1, z2, z3, z4)))
+
+    def reportBeep(self, flag_ab):
+        self.calls.append((self, 'reportBeep', (flag_ab,)))
+
+    def report10dPart(self, flag_ab, addr, d1, d2):
+        self.calls.append((self, 'report10dPart', (flag_ab, addr, d1, d2)))
+
+    def report18dPart(self, flag_ab, addr, d1, d2):
+        self.calls.append((self, 'report18dPart', (flag_ab, addr, d1, d2)))
+
+    def reportAlphaPart(self, flag_ab, addr, offset, c1, c2, last):
+        self.calls.append((self, 'reportAlphaPart', (flag_ab, addr, offset, c1, c2, last)))
+
+
+def parse_group_7A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    flag_ab = ((block[1] & 0b10000) >> 4) == 1
+    # Field addr: uint<4> at +28, width 4.
+    addr = ((block[1] & 0b1111))
+    # Field paging_data: unparsed<32> at +32, width 32.
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'Paging [flag={"A" if flag_ab else "B"}]')
+        match addr:
+            case 0:
+                station.rp_app.newBeepMessage(flag_ab)
+                station.changes |= 0x1000000  # rp_app
+                log.append('Beep')
+                parse_group_7A_address(block, ok, log, station)
+                station.rp_app.reportBeep(flag_ab)
+                station.changes |= 0x1000000  # rp_app
+            case 1:
+                log.append('Functions')
+            case 2 | 3:
+                log.append('10-digit')
+                parse_group_7A_numeric_10(block, ok, log, station)
+            case 4 | 5 | 6 | 7:
+                log.append('18-digit')
+                parse_group_7A_numeric_18(block, ok, log, station)
+            case 8 | 9 | 10 | 11 | 12 | 13 | 14 | 15:
+                log.append('Alphanumeric')
+                parse_group_7A_alphanumeric(block, ok, log, station)
+
+
+def parse_group_7A_address(block, ok, log, station):
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    flag_ab = ((block[1] & 0b10000) >> 4) == 1
+    # Field _: unparsed<4> at +28, width 4.
+    # Field y1: uint<4> at +32, width 4.
+    y1 = ((block[2] & 0b1111000000000000) >> 12)
+    # Field y2: uint<4> at +36, width 4.
+    y2 = ((block[2] & 0b111100000000) >> 8)
+    # Field z1: uint<4> at +40, width 4.
+    z1 = ((block[2] & 0b11110000) >> 4)
+    # Field z2: uint<4> at +44, width 4.
+    z2 = ((block[2] & 0b1111))
+    # Field z3: uint<4> at +48, width 4.
+    z3 = ((block[3] & 0b1111000000000000) >> 12)
+    # Field z4: uint<4> at +52, width 4.
+    z4 = ((block[3] & 0b111100000000) >> 8)
+    # Field _: unparsed<8> at +56, width 8.
+
+    # Actions.
+    if (ok & 0b1100) == 0b1100:
+        log.append(f'Address: {format_bcd(y1)}{format_bcd(y2)}/{format_bcd(z1)}{format_bcd(z2)}{format_bcd(z3)}{format_bcd(z4)}')
+        if (ok & 0b0010) == 0b0010:
+            station.rp_app.reportAddress(flag_ab, y1, y2, z1, z2, z3, z4)
+            station.changes |= 0x1000000  # rp_app
+
+
+def parse_group_7A_numeric_10(block, ok, log, station):
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    flag_ab = ((block[1] & 0b10000) >> 4) == 1
+    # Field _: unparsed<3> at +28, width 3.
+    # Field addr: uint<1> at +31, width 1.
+    addr = ((block[1] & 0b1))
+    # Field a1: uint<4> at +32, width 4.
+    a1 = ((block[2] & 0b1111000000000000) >> 12)
+    # Field a2: uint<4> at +36, width 4.
+    a2 = ((block[2] & 0b111100000000) >> 8)
+    # Field a3: uint<4> at +40, width 4.
+    a3 = ((block[2] & 0b11110000) >> 4)
+    # Field a4: uint<4> at +44, width 4.
+    a4 = ((block[2] & 0b1111))
+    # Field a5: uint<4> at +48, width 4.
+    a5 = ((block[3] & 0b1111000000000000) >> 12)
+    # Field a6: uint<4> at +52, width 4.
+    a6 = ((block[3] & 0b111100000000) >> 8)
+    # Field a7: uint<4> at +56, width 4.
+    a7 = ((block[3] & 0b11110000) >> 4)
+    # Field a8: uint<4> at +60, width 4.
+    a8 = ((block[3] & 0b1111))
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        match addr:
+            case 0:
+                station.rp_app.new10dMessage(flag_ab)
+                station.changes |= 0x1000000  # rp_app
+                parse_group_7A_address(block, ok, log, station)
+                if (ok & 0b1000) == 0b1000:
+                    log.append(f'Part 1/2: {format_bcd(a7)}{format_bcd(a8)}')
+                    station.rp_app.report10dPart(flag_ab, 0, a7, a8)
+                    station.changes |= 0x1000000  # rp_app
+            case 1:
+                if (ok & 0b0100) == 0b0100:
+                    if (ok & 0b1000) == 0b1000:
+                        log.append(f'Part 2/2: {format_bcd(a1)}{format_bcd(a2)}{format_bcd(a3)}{format_bcd(a4)}{format_bcd(a5)}{format_bcd(a6)}{format_bcd(a7)}{format_bcd(a8)}')
+                    station.rp_app.report10dPart(flag_ab, 1, a1, a2)
+                    station.changes |= 0x1000000  # rp_app
+                    station.rp_app.report10dPart(flag_ab, 2, a3, a4)
+                    station.changes |= 0x1000000  # rp_app
+                if (ok & 0b1000) == 0b1000:
+                    station.rp_app.report10dPart(flag_ab, 3, a5, a6)
+                    station.changes |= 0x1000000  # rp_app
+                    station.rp_app.report10dPart(flag_ab, 4, a7, a8)
+                    station.changes |= 0x1000000  # rp_app
+
+
+def parse_group_7A_numeric_18(block, ok, log, station):
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    flag_ab = ((block[1] & 0b10000) >> 4) == 1
+    # Field _: unparsed<2> at +28, width 2.
+    # Field addr: uint<2> at +30, width 2.
+    addr = ((block[1] & 0b11))
+    # Field a1: uint<4> at +32, width 4.
+    a1 = ((block[2] & 0b1111000000000000) >> 12)
+    # Field a2: uint<4> at +36, width 4.
+    a2 = ((block[2] & 0b111100000000) >> 8)
+    # Field a3: uint<4> at +40, width 4.
+    a3 = ((block[2] & 0b11110000) >> 4)
+    # Field a4: uint<4> at +44, width 4.
+    a4 = ((block[2] & 0b1111))
+    # Field a5: uint<4> at +48, width 4.
+    a5 = ((block[3] & 0b1111000000000000) >> 12)
+    # Field a6: uint<4> at +52, width 4.
+    a6 = ((block[3] & 0b111100000000) >> 8)
+    # Field a7: uint<4> at +56, width 4.
+    a7 = ((block[3] & 0b11110000) >> 4)
+    # Field a8: uint<4> at +60, width 4.
+    a8 = ((block[3] & 0b1111))
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        match addr:
+            case 0:
+                station.rp_app.new18dMessage(flag_ab)
+                station.changes |= 0x1000000  # rp_app
+                parse_group_7A_address(block, ok, log, station)
+                if (ok & 0b1000) == 0b1000:
+                    log.append(f'Part 1/3: {format_bcd(a7)}{format_bcd(a8)}')
+                    station.rp_app.report18dPart(flag_ab, 0, a7, a8)
+                    station.changes |= 0x1000000  # rp_app
+            case 1:
+                if (ok & 0b0100) == 0b0100:
+                    if (ok & 0b1000) == 0b1000:
+                        log.append(f'Part 2/3: {format_bcd(a1)}{format_bcd(a2)}{format_bcd(a3)}{format_bcd(a4)}{format_bcd(a5)}{format_bcd(a6)}{format_bcd(a7)}{format_bcd(a8)}')
+                    station.rp_app.report18dPart(flag_ab, 1, a1, a2)
+                    station.changes |= 0x1000000  # rp_app
+                    station.rp_app.report18dPart(flag_ab, 2, a3, a4)
+                    station.changes |= 0x1000000  # rp_app
+                if (ok & 0b1000) == 0b1000:
+                    station.rp_app.report18dPart(flag_ab, 3, a5, a6)
+                    station.changes |= 0x1000000  # rp_app
+                    station.rp_app.report18dPart(flag_ab, 4, a7, a8)
+                    station.changes |= 0x1000000  # rp_app
+            case 2:
+                if (ok & 0b0100) == 0b0100:
+                    if (ok & 0b1000) == 0b1000:
+                        log.append(f'Part 3/3: {format_bcd(a1)}{format_bcd(a2)}{format_bcd(a3)}{format_bcd(a4)}{format_bcd(a5)}{format_bcd(a6)}{format_bcd(a7)}{format_bcd(a8)}')
+                    station.rp_app.report18dPart(flag_ab, 5, a1, a2)
+                    station.changes |= 0x1000000  # rp_app
+                    station.rp_app.report18dPart(flag_ab, 6, a3, a4)
+                    station.changes |= 0x1000000  # rp_app
+                if (ok & 0b1000) == 0b1000:
+                    station.rp_app.report18dPart(flag_ab, 7, a5, a6)
+                    station.changes |= 0x1000000  # rp_app
+                    station.rp_app.report18dPart(flag_ab, 8, a7, a8)
+                    station.changes |= 0x1000000  # rp_app
+
+
+def parse_group_7A_alphanumeric(block, ok, log, station):
+    # Field rp_common: unparsed<27> at +0, width 27.
+    # Field flag_ab: bool at +27, width 1.
+    flag_ab = ((block[1] & 0b10000) >> 4) == 1
+    # Field _: unparsed<1> at +28, width 1.
+    # Field addr: uint<3> at +29, width 3.
+    addr = ((block[1] & 0b111))
+    # Field char1: uint<8> at +32, width 8.
+    char1 = ((block[2] & 0b1111111100000000) >> 8)
+    # Field char2: uint<8> at +40, width 8.
+    char2 = ((block[2] & 0b11111111))
+    # Field char3: uint<8> at +48, width 8.
+    char3 = ((block[3] & 0b1111111100000000) >> 8)
+    # Field char4: uint<8> at +56, width 8.
+    char4 = ((block[3] & 0b11111111))
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        match addr:
+            case 0:
+                station.rp_app.newAlphaMessage(flag_ab)
+                station.changes |= 0x1000000  # rp_app
+                parse_group_7A_address(block, ok, log, station)
+            case 1 | 2 | 3 | 4 | 5 | 6:
+                if (ok & 0b0100) == 0b0100:
+                    if (ok & 0b1000) == 0b1000:
+                        log.append(f'Part ({addr} + 6k)/n: "{RDS_CHARMAP[char1]}{RDS_CHARMAP[char2]}{RDS_CHARMAP[char3]}{RDS_CHARMAP[char4]}"')
+                    station.rp_app.reportAlphaPart(flag_ab, addr, 0, char1, char2, False)
+                    station.changes |= 0x1000000  # rp_app
+                if (ok & 0b1000) == 0b1000:
+                    station.rp_app.reportAlphaPart(flag_ab, addr, 1, char3, char4, False)
+                    station.changes |= 0x1000000  # rp_app
+            case 7:
+                if (ok & 0b0100) == 0b0100:
+                    if (ok & 0b1000) == 0b1000:
+                        log.append(f'Part n/n: "{RDS_CHARMAP[char1]}{RDS_CHARMAP[char2]}{RDS_CHARMAP[char3]}{RDS_CHARMAP[char4]}"')
+                    station.rp_app.reportAlphaPart(flag_ab, addr, 0, char1, char2, False)
+                    station.changes |= 0x1000000  # rp_app
+                if (ok & 0b1000) == 0b1000:
+                    station.rp_app.reportAlphaPart(flag_ab, addr, 1, char3, char4, True)
+                    station.changes |= 0x1000000  # rp_app
+
+
+def parse_group_14A(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field tp_on: bool at +27, width 1.
+    tp_on = ((block[1] & 0b10000) >> 4) == 1
+    # Field variant: uint<4> at +28, width 4.
+    variant = ((block[1] & 0b1111))
+    # Field _: uint<16> at +32, width 16.
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'EON v={variant}')
+    if (ok & 0b1000) == 0b1000:
+        log.append(f'ON.PI={pi_on:04X}')
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'ON.TP={"1" if tp_on else "0"}')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if elt0 is not None:
+        if (ok & 0b0010) == 0b0010:
+            if elt0.tp != tp_on:
+                elt0.tp = tp_on
+                station.changes |= 0x80000000  # other_networks
+        if elt0.pi != pi_on:
+            elt0.pi = pi_on
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0010) == 0b0010:
+        match variant:
+            case 0 | 1 | 2 | 3:
+                parse_group_14A_ps(block, ok, log, station)
+            case 4:
+                parse_group_14A_af_a(block, ok, log, station)
+            case 5 | 6 | 7 | 8:
+                parse_group_14A_mapped_af(block, ok, log, station)
+            case 9:
+                pass
+            case 12:
+                pass
+            case 13:
+                parse_group_14A_pty_ta(block, ok, log, station)
+            case 14:
+                parse_group_14A_pin(block, ok, log, station)
+
+
+def parse_group_14A_ps(block, ok, log, station):
+    # Field common: unparsed<30> at +0, width 30.
+    # Field addr: uint<2> at +30, width 2.
+    addr = ((block[1] & 0b11))
+    # Field ps_seg: byte<2> at +32, width 16.
+    ps_seg__0 = ((block[2] & 0b1111111100000000) >> 8)
+    ps_seg__1 = ((block[2] & 0b11111111))
+    ps_seg = (ps_seg__0 if (ok & 0b0100) == 0b0100 else None, ps_seg__1 if (ok & 0b0100) == 0b0100 else None)
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'ON.PS seg @{addr}: "{format_rds_text(ps_seg)}"')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0010) == 0b0010 and elt0 is not None:
+        if elt0.ps.set_bytes(addr*2, (ps_seg__0, ps_seg__1), (0b11 if (ok & 0b0100) == 0b0100 else 0)):
+            station.changes |= 0x80000000  # other_networks
+
+
+def parse_group_14A_af_a(block, ok, log, station):
+    # Field common: unparsed<32> at +0, width 32.
+    # Field af1: uint<8> at +32, width 8.
+    af1 = ((block[2] & 0b1111111100000000) >> 8)
+    # Field af2: uint<8> at +40, width 8.
+    af2 = ((block[2] & 0b11111111))
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'ON.AFs {format_af(af1)} {format_af(af2)}')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0100) == 0b0100 and elt0 is not None:
+        elt0.addAfPair(af1, af2)
+        station.changes |= 0x80000000  # other_networks
+
+
+def parse_group_14A_mapped_af(block, ok, log, station):
+    # Field common: unparsed<32> at +0, width 32.
+    # Field channel: uint<8> at +32, width 8.
+    channel = ((block[2] & 0b1111111100000000) >> 8)
+    # Field mapped_channel: uint<8> at +40, width 8.
+    mapped_channel = ((block[2] & 0b11111111))
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'ON.AF mapped {format_af(channel)} → {format_af(mapped_channel)}')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0100) == 0b0100 and elt0 is not None:
+        elt0.addMappedAF(channel, mapped_channel)
+        station.changes |= 0x80000000  # other_networks
+
+
+def parse_group_14A_pty_ta(block, ok, log, station):
+    # Field common: unparsed<32> at +0, width 32.
+    # Field pty_on: uint<5> at +32, width 5.
+    pty_on = ((block[2] & 0b1111100000000000) >> 11)
+    # Field _: unparsed<10> at +37, width 10.
+    # Field ta_on: bool at +47, width 1.
+    ta_on = ((block[2] & 0b1)) == 1
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'ON.PTY = {pty_on}')
+        log.append(f'ON.TA = {"1" if ta_on else "0"}')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0100) == 0b0100 and elt0 is not None:
+        if elt0.pty != pty_on:
+            elt0.pty = pty_on
+            station.changes |= 0x80000000  # other_networks
+        if elt0.ta != ta_on:
+            elt0.ta = ta_on
+            station.changes |= 0x80000000  # other_networks
+
+
+def parse_group_14A_pin(block, ok, log, station):
+    # Field common: unparsed<32> at +0, width 32.
+    # Field pin_day_on: uint<5> at +32, width 5.
+    pin_day_on = ((block[2] & 0b1111100000000000) >> 11)
+    # Field pin_hour_on: uint<5> at +37, width 5.
+    pin_hour_on = ((block[2] & 0b11111000000) >> 6)
+    # Field pin_minute_on: uint<6> at +42, width 6.
+    pin_minute_on = ((block[2] & 0b111111))
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'ON.PIN=(D={pin_day_on}, {pin_hour_on:02d}:{pin_minute_on:02d})')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0100) == 0b0100 and elt0 is not None:
+        if elt0.pin_day != pin_day_on:
+            elt0.pin_day = pin_day_on
+            station.changes |= 0x80000000  # other_networks
+        if elt0.pin_hour != pin_hour_on:
+            elt0.pin_hour = pin_hour_on
+            station.changes |= 0x80000000  # other_networks
+        if elt0.pin_minute != pin_minute_on:
+            elt0.pin_minute = pin_minute_on
+            station.changes |= 0x80000000  # other_networks
+
+
+def parse_group_14B(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field tp_on: bool at +27, width 1.
+    # Field ta_on: bool at +28, width 1.
+    ta_on = ((block[1] & 0b1000) >> 3) == 1
+    # Field _: unparsed<3> at +29, width 3.
+    # Field pi: unparsed<16> at +32, width 16.
+    # Field pi_on: uint<16> at +48, width 16.
+    pi_on = ((block[3]))
+
+    # Actions.
+    elt0 = None
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'Other network switch ON.TA={"1" if ta_on else "0"}')
+    if (ok & 0b1000) == 0b1000:
+        elt0 = station.other_networks.get(pi_on)
+        if elt0 is None:
+            elt0 = OtherNetwork(station.calls)
+            elt0.pi = pi_on
+            station.other_networks[pi_on] = elt0
+            station.changes |= 0x80000000  # other_networks
+    if (ok & 0b0010) == 0b0010:
+        if elt0 is not None:
+            if elt0.ta != ta_on:
+                elt0.ta = ta_on
+                station.changes |= 0x80000000  # other_networks
+        if (ok & 0b1000) == 0b1000:
+            station.reportOtherNetworkSwitch(pi_on, ta_on)
+            station.changes |= 0x1000000000  # reportOtherNetworkSwitch
+
+
+class RtPlusApp:
+    """Struct RtPlusApp. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    """
+
+    __slots__ = (
+        'calls',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+
+    def setTag(self, content_type, start, length):
+        self.calls.append((self, 'setTag', (content_type, start, length)))
+
+
+def parse_group_rtplus(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field item_toggle: bool at +27, width 1.
+    item_toggle = ((block[1] & 0b10000) >> 4) == 1
+    # Field item_running: bool at +28, width 1.
+    item_running = ((block[1] & 0b1000) >> 3) == 1
+    # Field content_type_1: uint<6> at +29, width 6.
+    content_type_1 = ((block[1] & 0b111) << 3) | ((block[2] & 0b1110000000000000) >> 13)
+    # Field start_1: uint<6> at +35, width 6.
+    start_1 = ((block[2] & 0b1111110000000) >> 7)
+    # Field length_1: uint<6> at +41, width 6.
+    length_1 = ((block[2] & 0b1111110) >> 1)
+    # Field content_type_2: uint<6> at +47, width 6.
+    content_type_2 = ((block[2] & 0b1) << 5) | ((block[3] & 0b1111100000000000) >> 11)
+    # Field start_2: uint<6> at +53, width 6.
+    start_2 = ((block[3] & 0b11111100000) >> 5)
+    # Field length_2: uint<5> at +59, width 5.
+    length_2 = ((block[3] & 0b11111))
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'RT+ item_toggle={"1" if item_toggle else "0"} item_running={"1" if item_running else "0"}')
+        if (ok & 0b0100) == 0b0100:
+            log.append(f'Tag 1: type={content_type_1}, start={start_1}, length={length_1}')
+    if (ok & 0b0100) == 0b0100:
+        if (ok & 0b1000) == 0b1000:
+            log.append(f'Tag 2: type={content_type_2}, start={start_2}, length={length_2}')
+        if (ok & 0b0010) == 0b0010:
+            station.rt_plus_app.setTag(content_type_1, start_1, length_1)
+            station.changes |= 0x100000  # rt_plus_app
+        if (ok & 0b1000) == 0b1000:
+            station.rt_plus_app.setTag(content_type_2, start_2, length_2)
+            station.changes |= 0x100000  # rt_plus_app
+
+
+class DabCrossRefApp:
+    """Struct DabCrossRefApp. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    """
+
+    __slots__ = (
+        'calls',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+
+    def addEnsemble(self, mode, frequency, eid):
+        self.calls.append((self, 'addEnsemble', (mode, frequency, eid)))
+
+    def addServiceEnsembleInfo(self, eid, sid):
+        self.calls.append((self, 'addServiceEnsembleInfo', (eid, sid)))
+
+    def addServiceLinkageInfo(self, linkageInfo, sid):
+        self.calls.append((self, 'addServiceLinkageInfo', (linkageInfo, sid)))
+
+
+def parse_group_dabxref(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field es: uint<1> at +27, width 1.
+    es = ((block[1] & 0b10000) >> 4)
+    # Field _: unparsed<36> at +28, width 36.
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        match es:
+            case 0:
+                parse_group_dabxref_ensemble(block, ok, log, station)
+            case 1:
+                parse_group_dabxref_service(block, ok, log, station)
+
+
+def parse_group_dabxref_ensemble(block, ok, log, station):
+    # Field _: unparsed<28> at +0, width 28.
+    # Field mode: uint<2> at +28, width 2.
+    mode = ((block[1] & 0b1100) >> 2)
+    # Field frequency: uint<18> at +30, width 18.
+    frequency = ((block[1] & 0b11) << 16) | ((block[2]))
+    # Field eid: uint<16> at +48, width 16.
+    eid = ((block[3]))
+
+    # Actions.
+    if (ok & 0b1110) == 0b1110:
+        station.dab_cross_ref_app.addEnsemble(mode, frequency, eid)
+        station.changes |= 0x400000  # dab_cross_ref_app
+
+
+def parse_group_dabxref_service(block, ok, log, station):
+    # Field _: unparsed<28> at +0, width 28.
+    # Field variant: uint<4> at +28, width 4.
+    variant = ((block[1] & 0b1111))
+    # Field info: uint<16> at +32, width 16.
+    info = ((block[2]))
+    # Field sid: uint<16> at +48, width 16.
+    sid = ((block[3]))
+
+    # Actions.
+    log.append('DAB xref')
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'v={variant}')
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'info={info:04X}')
+    if (ok & 0b1000) == 0b1000:
+        log.append(f'sid={sid:04X}')
+    if (ok & 0b0010) == 0b0010:
+        match variant:
+            case 0:
+                if (ok & 0b1100) == 0b1100:
+                    station.dab_cross_ref_app.addServiceEnsembleInfo(info, sid)
+                    station.changes |= 0x400000  # dab_cross_ref_app
+            case 1:
+                if (ok & 0b1100) == 0b1100:
+                    station.dab_cross_ref_app.addServiceLinkageInfo(info, sid)
+                    station.changes |= 0x400000  # dab_cross_ref_app
+
+
+class ERtApp:
+    """Struct ERtApp. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    """
+
+    __slots__ = (
+        'calls',
+        'ert',
+        'utf8_encoding',
+        'enabled',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+        self.ert = RdsString(128)
+        self.utf8_encoding = None
+        self.enabled = None
+
+
+def parse_group_ert_declaration(block, ok, log, station):
+    # Field group_3A_common: unparsed<32> at +0, width 32.
+    # Field rfu: unparsed<15> at +32, width 15.
+    # Field utf8_encoding: bool at +47, width 1.
+    utf8_encoding = ((block[2] & 0b1)) == 1
+    # Field ert_aid: unparsed<16> at +48, width 16.
+
+    # Actions.
+    if (ok & 0b0100) == 0b0100:
+        log.append(f'eRT utf8 encoding? {"1" if utf8_encoding else "0"}')
+        if station.ert_app.utf8_encoding != utf8_encoding:
+            station.ert_app.utf8_encoding = utf8_encoding
+            station.changes |= 0x200000  # ert_app
+    if station.ert_app.enabled != True:
+        station.ert_app.enabled = True
+        station.changes |= 0x200000  # ert_app
+
+
+def parse_group_ert(block, ok, log, station):
+    # Field group_common: unparsed<27> at +0, width 27.
+    # Field addr: uint<5> at +27, width 5.
+    addr = ((block[1] & 0b11111))
+    # Field ert_seg: byte<4> at +32, width 32.
+    ert_seg__0 = ((block[2] & 0b1111111100000000) >> 8)
+    ert_seg__1 = ((block[2] & 0b11111111))
+    ert_seg__2 = ((block[3] & 0b1111111100000000) >> 8)
+    ert_seg__3 = ((block[3] & 0b11111111))
+    ert_seg = (ert_seg__0 if (ok & 0b0100) == 0b0100 else None, ert_seg__1 if (ok & 0b0100) == 0b0100 else None, ert_seg__2 if (ok & 0b1000) == 0b1000 else None, ert_seg__3 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0010) == 0b0010:
+        log.append(f'eRT seg @{addr} "{format_bytes(ert_seg)}"')
+        if station.ert_app.ert.set_bytes(addr*4, (ert_seg__0, ert_seg__1, ert_seg__2, ert_seg__3), (0b11 if (ok & 0b0100) == 0b0100 else 0) | (0b1100 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x200000  # ert_app
+
+
+class InternetConnectionApp:
+    """Struct InternetConnectionApp. Fields are None until they are received.
+
+    Methods append (object, method name, arguments) tuples to `calls`, which
+    is shared with nested structs. Override them to act on calls directly.
+    """
+
+    __slots__ = (
+        'calls',
+        'url',
+        'enabled',
+    )
+
+    def __init__(self, calls=None):
+        self.calls = [] if calls is None else calls
+        self.url = RdsString(128)
+        self.enabled = None
+
+
+def parse_group_internet_connection(block, ok, log, station):
+    # Field header: unparsed<8> at +0, width 8.
+    # Field type: uint<1> at +8, width 1.
+    type = ((block[0] & 0b10000000) >> 7)
+    # Field _: unparsed<55> at +9, width 55.
+
+    # Actions.
+    log.append('Internet connection')
+    if (ok & 0b0001) == 0b0001:
+        match type:
+            case 0 | 1:
+                parse_group_internet_connection_url(block, ok, log, station)
+    if station.internet_connection_app.enabled != True:
+        station.internet_connection_app.enabled = True
+        station.changes |= 0x800000  # internet_connection_app
+
+
+def parse_group_internet_connection_url(block, ok, log, station):
+    # Field header: unparsed<8> at +0, width 8.
+    # Field type: unparsed<1> at +8, width 1.
+    # Field addr: uint<7> at +9, width 7.
+    addr = ((block[0] & 0b1111111))
+    # Field url_seg: byte<6> at +16, width 48.
+    url_seg__0 = ((block[1] & 0b1111111100000000) >> 8)
+    url_seg__1 = ((block[1] & 0b11111111))
+    url_seg__2 = ((block[2] & 0b1111111100000000) >> 8)
+    url_seg__3 = ((block[2] & 0b11111111))
+    url_seg__4 = ((block[3] & 0b1111111100000000) >> 8)
+    url_seg__5 = ((block[3] & 0b11111111))
+    url_seg = (url_seg__0 if (ok & 0b0010) == 0b0010 else None, url_seg__1 if (ok & 0b0010) == 0b0010 else None, url_seg__2 if (ok & 0b0100) == 0b0100 else None, url_seg__3 if (ok & 0b0100) == 0b0100 else None, url_seg__4 if (ok & 0b1000) == 0b1000 else None, url_seg__5 if (ok & 0b1000) == 0b1000 else None)
+
+    # Actions.
+    if (ok & 0b0001) == 0b0001:
+        log.append(f'URL seg @{addr} "{format_bytes(url_seg)}"')
+        if station.internet_connection_app.url.set_bytes(addr*6, (url_seg__0, url_seg__1, url_seg__2, url_seg__3, url_seg__4, url_seg__5), (0b11 if (ok & 0b0010) == 0b0010 else 0) | (0b1100 if (ok & 0b0100) == 0b0100 else 0) | (0b110000 if (ok & 0b1000) == 0b1000 else 0)):
+            station.changes |= 0x800000  # internet_connection_app
+
+
+# Parse functions, indexed by rule ID.
+PARSE_FUNCTIONS = [
+    parse_group_ab,
+    parse_group_ab_without_pi,
+    parse_group_unknown,
+    parse_group_0A,
+    parse_group_0B_0_common,
+    parse_group_1A,
+    parse_group_1A_ecc,
+    parse_group_1B_1_common,
+    parse_group_2A,
+    parse_group_2B,
+    parse_group_3A,
+    parse_group_4A,
+    parse_group_10A,
+    parse_group_15A,
+    parse_group_15B,
+    parse_group_c,
+    parse_group_c_fid_0,
+    parse_group_c_rft,
+    parse_group_c_oda,
+    parse_group_c_oda_assignment,
+    parse_group_c_oda_rft_assignment,
+    parse_group_c_oda_rft_assignment_v0,
+    parse_group_c_oda_rft_assignment_v1,
+    parse_group_7A,
+    parse_group_7A_address,
+    parse_group_7A_numeric_10,
+    parse_group_7A_numeric_18,
+    parse_group_7A_alphanumeric,
+    parse_group_14A,
+    parse_group_14A_ps,
+    parse_group_14A_af_a,
+    parse_group_14A_mapped_af,
+    parse_group_14A_pty_ta,
+    parse_group_14A_pin,
+    parse_group_14B,
+    parse_group_rtplus,
+    parse_group_dabxref,
+    parse_group_dabxref_ensemble,
+    parse_group_dabxref_service,
+    parse_group_ert_declaration,
+    parse_group_ert,
+    parse_group_internet_connection,
+    parse_group_internet_connection_url,
+]
+
+
+def format_rds_text(text):
+    return ''.join('.' if c is None else RDS_CHARMAP[c] for c in text)
+
+
+def format_bytes(data):
+    return ' '.join('..' if b is None else f'{b:02X}' for b in data)
+
+
+def format_bcd(digit):
+    return str(digit) if 0 <= digit <= 9 else ' '
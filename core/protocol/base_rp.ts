@@ -0,0 +1,296 @@
+// Generated file. DO NOT EDIT.
+// Rules of rp.p, loaded on demand by base.ts.
+
+import { PARSE_FUNCTIONS, Rule, Station, StationField } from "./base";
+import { LogMessage } from "./rds_types";
+
+export function parse_group_7A(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field group_common: unparsed<27> at +0, width 27.
+	// Field flag_ab: bool at +27, width 1.
+	const flag_ab = ((block[1] & 0b10000) >> 4) == 1;
+	// Field addr: uint<4> at +28, width 4.
+	const addr = ((block[1] & 0b1111));
+	// Field paging_data: unparsed<32> at +32, width 32.
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		log.record(43).arg(flag_ab);
+		switch (addr) {
+			case 0:
+				station.rp_app.newBeepMessage(flag_ab);
+				station.changes.mark(StationField.rp_app);
+				log.record(44);
+				parse_group_7A_address(block, ok, log, station);
+				station.rp_app.reportBeep(flag_ab);
+				station.changes.mark(StationField.rp_app);
+				break;
+
+			case 1:
+				log.record(45);
+				break;
+
+			case 2:
+			case 3:
+				log.record(46);
+				parse_group_7A_numeric_10(block, ok, log, station);
+				break;
+
+			case 4:
+			case 5:
+			case 6:
+			case 7:
+				log.record(47);
+				parse_group_7A_numeric_18(block, ok, log, station);
+				break;
+
+			case 8:
+			case 9:
+			case 10:
+			case 11:
+			case 12:
+			case 13:
+			case 14:
+			case 15:
+				log.record(48);
+				parse_group_7A_alphanumeric(block, ok, log, station);
+				break;
+
+		}
+	}
+}
+
+export function parse_group_7A_address(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field rp_common: unparsed<27> at +0, width 27.
+	// Field flag_ab: bool at +27, width 1.
+	const flag_ab = ((block[1] & 0b10000) >> 4) == 1;
+	// Field _: unparsed<4> at +28, width 4.
+	// Field y1: uint<4> at +32, width 4.
+	const y1 = ((block[2] & 0b1111000000000000) >> 12);
+	// Field y2: uint<4> at +36, width 4.
+	const y2 = ((block[2] & 0b111100000000) >> 8);
+	// Field z1: uint<4> at +40, width 4.
+	const z1 = ((block[2] & 0b11110000) >> 4);
+	// Field z2: uint<4> at +44, width 4.
+	const z2 = ((block[2] & 0b1111));
+	// Field z3: uint<4> at +48, width 4.
+	const z3 = ((block[3] & 0b1111000000000000) >> 12);
+	// Field z4: uint<4> at +52, width 4.
+	const z4 = ((block[3] & 0b111100000000) >> 8);
+	// Field _: unparsed<8> at +56, width 8.
+
+	// Actions.
+	if ((ok & 0b1100) == 0b1100) {
+		log.record(49).arg(y1).arg(y2).arg(z1).arg(z2).arg(z3).arg(z4);
+		if ((ok & 0b0010) == 0b0010) {
+			station.rp_app.reportAddress(flag_ab, y1, y2, z1, z2, z3, z4);
+			station.changes.mark(StationField.rp_app);
+		}
+	}
+}
+
+export function parse_group_7A_numeric_10(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field rp_common: unparsed<27> at +0, width 27.
+	// Field flag_ab: bool at +27, width 1.
+	const flag_ab = ((block[1] & 0b10000) >> 4) == 1;
+	// Field _: unparsed<3> at +28, width 3.
+	// Field addr: uint<1> at +31, width 1.
+	const addr = ((block[1] & 0b1));
+	// Field a1: uint<4> at +32, width 4.
+	const a1 = ((block[2] & 0b1111000000000000) >> 12);
+	// Field a2: uint<4> at +36, width 4.
+	const a2 = ((block[2] & 0b111100000000) >> 8);
+	// Field a3: uint<4> at +40, width 4.
+	const a3 = ((block[2] & 0b11110000) >> 4);
+	// Field a4: uint<4> at +44, width 4.
+	const a4 = ((block[2] & 0b1111));
+	// Field a5: uint<4> at +48, width 4.
+	const a5 = ((block[3] & 0b1111000000000000) >> 12);
+	// Field a6: uint<4> at +52, width 4.
+	const a6 = ((block[3] & 0b111100000000) >> 8);
+	// Field a7: uint<4> at +56, width 4.
+	const a7 = ((block[3] & 0b11110000) >> 4);
+	// Field a8: uint<4> at +60, width 4.
+	const a8 = ((block[3] & 0b1111));
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		switch (addr) {
+			case 0:
+				station.rp_app.new10dMessage(flag_ab);
+				station.changes.mark(StationField.rp_app);
+				parse_group_7A_address(block, ok, log, station);
+				if ((ok & 0b1000) == 0b1000) {
+					log.record(50).arg(a7).arg(a8);
+					station.rp_app.report10dPart(flag_ab, 0, a7, a8);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+			case 1:
+				if ((ok & 0b0100) == 0b0100) {
+					if ((ok & 0b1000) == 0b1000) {
+						log.record(51).arg(a1).arg(a2).arg(a3).arg(a4).arg(a5).arg(a6).arg(a7).arg(a8);
+					}
+					station.rp_app.report10dPart(flag_ab, 1, a1, a2);
+					station.changes.mark(StationField.rp_app);
+					station.rp_app.report10dPart(flag_ab, 2, a3, a4);
+					station.changes.mark(StationField.rp_app);
+				}
+				if ((ok & 0b1000) == 0b1000) {
+					station.rp_app.report10dPart(flag_ab, 3, a5, a6);
+					station.changes.mark(StationField.rp_app);
+					station.rp_app.report10dPart(flag_ab, 4, a7, a8);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+		}
+	}
+}
+
+export function parse_group_7A_numeric_18(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field rp_common: unparsed<27> at +0, width 27.
+	// Field flag_ab: bool at +27, width 1.
+	const flag_ab = ((block[1] & 0b10000) >> 4) == 1;
+	// Field _: unparsed<2> at +28, width 2.
+	// Field addr: uint<2> at +30, width 2.
+	const addr = ((block[1] & 0b11));
+	// Field a1: uint<4> at +32, width 4.
+	const a1 = ((block[2] & 0b1111000000000000) >> 12);
+	// Field a2: uint<4> at +36, width 4.
+	const a2 = ((block[2] & 0b111100000000) >> 8);
+	// Field a3: uint<4> at +40, width 4.
+	const a3 = ((block[2] & 0b11110000) >> 4);
+	// Field a4: uint<4> at +44, width 4.
+	const a4 = ((block[2] & 0b1111));
+	// Field a5: uint<4> at +48, width 4.
+	const a5 = ((block[3] & 0b1111000000000000) >> 12);
+	// Field a6: uint<4> at +52, width 4.
+	const a6 = ((block[3] & 0b111100000000) >> 8);
+	// Field a7: uint<4> at +56, width 4.
+	const a7 = ((block[3] & 0b11110000) >> 4);
+	// Field a8: uint<4> at +60, width 4.
+	const a8 = ((block[3] & 0b1111));
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		switch (addr) {
+			case 0:
+				station.rp_app.new18dMessage(flag_ab);
+				station.changes.mark(StationField.rp_app);
+				parse_group_7A_address(block, ok, log, station);
+				if ((ok & 0b1000) == 0b1000) {
+					log.record(52).arg(a7).arg(a8);
+					station.rp_app.report18dPart(flag_ab, 0, a7, a8);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+			case 1:
+				if ((ok & 0b0100) == 0b0100) {
+					if ((ok & 0b1000) == 0b1000) {
+						log.record(53).arg(a1).arg(a2).arg(a3).arg(a4).arg(a5).arg(a6).arg(a7).arg(a8);
+					}
+					station.rp_app.report18dPart(flag_ab, 1, a1, a2);
+					station.changes.mark(StationField.rp_app);
+					station.rp_app.report18dPart(flag_ab, 2, a3, a4);
+					station.changes.mark(StationField.rp_app);
+				}
+				if ((ok & 0b1000) == 0b1000) {
+					station.rp_app.report18dPart(flag_ab, 3, a5, a6);
+					station.changes.mark(StationField.rp_app);
+					station.rp_app.report18dPart(flag_ab, 4, a7, a8);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+			case 2:
+				if ((ok & 0b0100) == 0b0100) {
+					if ((ok & 0b1000) == 0b1000) {
+						log.record(54).arg(a1).arg(a2).arg(a3).arg(a4).arg(a5).arg(a6).arg(a7).arg(a8);
+					}
+					station.rp_app.report18dPart(flag_ab, 5, a1, a2);
+					station.changes.mark(StationField.rp_app);
+					station.rp_app.report18dPart(flag_ab, 6, a3, a4);
+					station.changes.mark(StationField.rp_app);
+				}
+				if ((ok & 0b1000) == 0b1000) {
+					station.rp_app.report18dPart(flag_ab, 7, a5, a6);
+					station.changes.mark(StationField.rp_app);
+					station.rp_app.report18dPart(flag_ab, 8, a7, a8);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+		}
+	}
+}
+
+export function parse_group_7A_alphanumeric(block: Uint16Array, ok: number, log: LogMessage, station: Station) {
+	// Field rp_common: unparsed<27> at +0, width 27.
+	// Field flag_ab: bool at +27, width 1.
+	const flag_ab = ((block[1] & 0b10000) >> 4) == 1;
+	// Field _: unparsed<1> at +28, width 1.
+	// Field addr: uint<3> at +29, width 3.
+	const addr = ((block[1] & 0b111));
+	// Field char1: uint<8> at +32, width 8.
+	const char1 = ((block[2] & 0b1111111100000000) >> 8);
+	// Field char2: uint<8> at +40, width 8.
+	const char2 = ((block[2] & 0b11111111));
+	// Field char3: uint<8> at +48, width 8.
+	const char3 = ((block[3] & 0b1111111100000000) >> 8);
+	// Field char4: uint<8> at +56, width 8.
+	const char4 = ((block[3] & 0b11111111));
+
+	// Actions.
+	if ((ok & 0b0010) == 0b0010) {
+		switch (addr) {
+			case 0:
+				station.rp_app.newAlphaMessage(flag_ab);
+				station.changes.mark(StationField.rp_app);
+				parse_group_7A_address(block, ok, log, station);
+				break;
+
+			case 1:
+			case 2:
+			case 3:
+			case 4:
+			case 5:
+			case 6:
+				if ((ok & 0b0100) == 0b0100) {
+					if ((ok & 0b1000) == 0b1000) {
+						log.record(55).arg(addr).arg(char1).arg(char2).arg(char3).arg(char4);
+					}
+					station.rp_app.reportAlphaPart(flag_ab, addr, 0, char1, char2, false);
+					station.changes.mark(StationField.rp_app);
+				}
+				if ((ok & 0b1000) == 0b1000) {
+					station.rp_app.reportAlphaPart(flag_ab, addr, 1, char3, char4, false);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+			case 7:
+				if ((ok & 0b0100) == 0b0100) {
+					if ((ok & 0b1000) == 0b1000) {
+						log.record(56).arg(char1).arg(char2).arg(char3).arg(char4);
+					}
+					station.rp_app.reportAlphaPart(flag_ab, addr, 0, char1, char2, false);
+					station.changes.mark(StationField.rp_app);
+				}
+				if ((ok & 0b1000) == 0b1000) {
+					station.rp_app.reportAlphaPart(flag_ab, addr, 1, char3, char4, true);
+					station.changes.mark(StationField.rp_app);
+				}
+				break;
+
+		}
+	}
+}
+
+// Replace the stubs of the rules of this module.
+PARSE_FUNCTIONS[Rule.group_7A] = parse_group_7A;
+PARSE_FUNCTIONS[Rule.group_7A_address] = parse_group_7A_address;
+PARSE_FUNCTIONS[Rule.group_7A_numeric_10] = parse_group_7A_numeric_10;
+PARSE_FUNCTIONS[Rule.group_7A_numeric_18] = parse_group_7A_numeric_18;
+PARSE_FUNCTIONS[Rule.group_7A_alphanumeric] = parse_group_7A_alphanumeric;
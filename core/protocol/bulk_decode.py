@@ -0,0 +1,157 @@
+"""Decodes directories of RDS Spy hex logs in parallel, summarizing stations by PI.
+
+Files are decoded independently by a pool of processes, each into one
+summary per PI. Summaries are then merged by PI as files complete, so memory
+use depends on the number of stations, not on the volume of recordings.
+
+    python bulk_decode.py --jobs=8 recordings/ > stations.json
+
+Within a file, a group belongs to the station of its PI, or, if block A is
+invalid (or for type C groups), to the station of the last valid PI. Unlike
+StationChangeDetector in station_change.ts, new PIs need no confirmation.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import dataclasses
+from dataclasses import dataclass
+import json
+import os
+import sys
+
+import rds_stream
+
+
+@dataclass
+class StationSummary:
+    """What was received from a station, in one or several files."""
+    pi: int
+    # Number of groups, and number of groups of each type (2 * number, plus 1
+    # for version B).
+    groups: int = 0
+    group_types: list = dataclasses.field(default_factory=lambda: [0] * 32)
+    # Number of characters received for each PS and RT text.
+    ps: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+    rt: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+    # AIDs of the ODAs announced in 3A groups.
+    odas: set = dataclasses.field(default_factory=set)
+    files: set = dataclasses.field(default_factory=set)
+
+    def merge(self, other):
+        """Adds the contents of `other`, a summary of the same station, to this summary."""
+        self.groups += other.groups
+        self.group_types = [a + b for (a, b) in zip(self.group_types, other.group_types)]
+        self.ps.update(other.ps)
+        self.rt.update(other.rt)
+        self.odas |= other.odas
+        self.files |= other.files
+
+    def to_json(self):
+        return {
+            'pi': f'{self.pi:04X}',
+            'groups': self.groups,
+            'group_types': {
+                f'{t >> 1}{"AB"[t & 1]}': n for (t, n) in enumerate(self.group_types) if n > 0},
+            'ps': dict(self.ps.most_common()),
+            'rt': dict(self.rt.most_common()),
+            'odas': [f'{aid:04X}' for aid in sorted(self.odas)],
+            'files': sorted(self.files),
+        }
+
+
+def text_ticks(s):
+    """Returns the number of characters received for each text of an RdsString."""
+    ticks = collections.Counter(s.tick_history)
+    if not s.empty:
+        ticks[str(s)] += s.ticks
+    return ticks
+
+
+def decode_file(path, max_errors=0):
+    """Decodes an RDS Spy hex log. Returns a dict mapping PIs to StationSummaries."""
+    router = rds_stream.StationRouter()
+    summaries = {}
+    with open(path, encoding='utf8', errors='replace') as f:
+        for line in f:
+            group = rds_stream.parse_hex_line(line)
+            if group is None:
+                continue
+            (stream, blocks, errors) = group
+            decoded = router.decode_group(stream, blocks, rds_stream.validity_mask(errors, max_errors))
+            if decoded is None:
+                continue
+            (pi, event) = decoded
+            summary = summaries.get(pi)
+            if summary is None:
+                summary = summaries[pi] = StationSummary(pi, files={path})
+            summary.groups += 1
+            for (_, method, args) in event.calls:
+                if method == 'addToGroupStats':
+                    summary.group_types[args[0]] += 1
+    # Texts and ODAs are read from the final station states.
+    for (pi, station) in router.stations.items():
+        summaries[pi].ps = text_ticks(station.ps)
+        summaries[pi].rt = text_ticks(station.rt)
+        summaries[pi].odas = set(station.transmitted_odas.values())
+    return summaries
+
+
+def is_hex_log(path):
+    """Returns whether a file looks like a hex group log, like guessFileType in file.ts."""
+    with open(path, 'rb') as f:
+        header = f.read(16)
+    return len(header) > 0 and all(32 <= b < 127 or b in (10, 13) for b in header)
+
+
+def find_logs(paths):
+    """Yields the hex logs among `paths` and in the directories in `paths`, recursively."""
+    for p in paths:
+        if os.path.isdir(p):
+            for (root, dirs, files) in os.walk(p):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if is_hex_log(path):
+                        yield path
+        elif is_hex_log(p):
+            yield p
+
+
+def merge(results):
+    """Merges an iterable of dicts of StationSummaries by PI."""
+    merged = {}
+    for summaries in results:
+        for (pi, s) in summaries.items():
+            if pi in merged:
+                merged[pi].merge(s)
+            else:
+                merged[pi] = s
+    return merged
+
+
+def bulk_decode(paths, jobs=None, max_errors=0):
+    """Decodes the hex logs found in `paths` with `jobs` processes. Returns merged StationSummaries by PI."""
+    logs = list(find_logs(paths))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(decode_file, path, max_errors) for path in logs]
+        return merge(f.result() for f in concurrent.futures.as_completed(futures))
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Decodes RDS Spy hex logs in parallel, and prints a JSON summary of each station.')
+    argparser.add_argument('--jobs', type=int, default=None,
+                           help='Number of processes. Defaults to the number of processors.')
+    argparser.add_argument('--max-errors', type=int, default=0,
+                           help='Maximum number of corrected errors of a valid block.')
+    argparser.add_argument('paths', nargs='+', help='Log files, or directories to search for logs.')
+    args = argparser.parse_args()
+
+    stations = bulk_decode(args.paths, args.jobs, args.max_errors)
+    json.dump([stations[pi].to_json() for pi in sorted(stations)], sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Tests for the bulk decoder."""
+
+import os
+import tempfile
+import unittest
+
+import bulk_decode
+
+FRANCE_INTER = '''F201 0408 2037 2020
+F201 0409 383B 494E
+F201 040A 3D45 5445
+F201 040F 474E 5220
+'''
+
+
+class BulkDecodeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, contents):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb' if isinstance(contents, bytes) else 'w') as f:
+            f.write(contents)
+        return path
+
+    def test_decode_file(self):
+        # Groups without PI go to the last station.
+        path = self.write('a.spy', FRANCE_INTER + '----/6 0409 383B 494E\nF202 0408 2037 4142\n')
+        summaries = bulk_decode.decode_file(path)
+        self.assertEqual(sorted(summaries), [0xF201, 0xF202])
+        self.assertEqual(summaries[0xF201].groups, 5)
+        self.assertEqual(summaries[0xF201].group_types[0], 5)
+        self.assertEqual(list(summaries[0xF201].ps), ['  INTER '])
+        self.assertEqual(summaries[0xF202].files, {path})
+
+    def test_decode_file_pi_from_block_c(self):
+        # Type B groups repeat the PI in block C'.
+        path = self.write('a.spy', FRANCE_INTER + '---- 0808 F202 2020\n')
+        summaries = bulk_decode.decode_file(path)
+        self.assertEqual(sorted(summaries), [0xF201, 0xF202])
+        self.assertEqual(summaries[0xF202].groups, 1)
+
+    def test_merge_directory(self):
+        self.write('a.spy', FRANCE_INTER)
+        self.write('sub/b.txt', FRANCE_INTER + 'F201 E410 4BD7 0000\n')
+        self.write('c.rds', bytes(range(256)))
+        stations = bulk_decode.bulk_decode([self.tmp.name], jobs=2)
+        self.assertEqual(list(stations), [0xF201])
+        s = stations[0xF201]
+        self.assertEqual(s.groups, 9)
+        self.assertEqual(s.group_types[28], 1)
+        self.assertEqual(len(s.files), 2)
+        self.assertEqual(s.to_json()['group_types'], {'0A': 8, '14A': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+// Fields of a struct changed by parse functions, indexed by the generated
+// `<Struct>Field` enums, e.g. `StationField`.
+//
+// The generated code only marks a field when its value actually changes, or
+// when a method that may change the state behind it is called. Consumers,
+// such as UIs, read and clear the mask after each group or batch of groups,
+// and only refresh what depends on the marked fields.
+export class ChangeMask {
+  readonly words: Uint32Array;
+
+  public constructor(size: number) {
+    this.words = new Uint32Array((size + 31) >>> 5);
+  }
+
+  public mark(field: number) {
+    this.words[field >>> 5] |= 1 << (field & 31);
+  }
+
+  public has(field: number): boolean {
+    return (this.words[field >>> 5] & (1 << (field & 31))) != 0;
+  }
+
+  public any(): boolean {
+    for (const w of this.words) {
+      if (w != 0) {
+        return true;
+      }
+    }
+    return false;
+  }
+
+  public clear() {
+    this.words.fill(0);
+  }
+
+  // Returns the marked fields, in increasing order.
+  public fields(): Array<number> {
+    const result = new Array<number>();
+    this.words.forEach((w, i) => {
+      for (let b = 0; w != 0; b++, w >>>= 1) {
+        if ((w & 1) != 0) {
+          result.push(32 * i + b);
+        }
+      }
+    });
+    return result;
+  }
+}
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 
-from dataclasses import dataclass
+import argparse
+import dataclasses
+from dataclasses import dataclass, replace
+import functools
+import hashlib
+import io
+import json
 import os
+import re
 import sys
+import time
 import lark
 from lark import Lark
 
@@ -35,8 +43,7 @@ decl: ID ":" type
 
 type: ID ("<" INT ">")?
 
-action: 
-    | assignment
+action: assignment
     | parse_statement
     | invocation
     | copy
@@ -44,10 +51,16 @@ action:
     | switch
     | log_element
 
-expr: lvalue
+expr: sum
+
+?sum: product
+    | sum "+" product -> add
+
+?product: atom
+    | product "*" atom -> mul
+
+?atom: lvalue
     | function_call
-    | mul
-    | add
     | INT
     | ESCAPED_STRING
 
@@ -55,10 +68,6 @@ function_call: ID "(" expr ("," expr)* ")"
 
 invocation: lvalue "." ID "(" expr ("," expr)* ")"
 
-mul: expr "*" expr
-
-add: expr "+" expr
-
 lvalue: ID
     | array_access
     | field_access
@@ -98,23 +107,12 @@ COMMENT: "#" /(.)+/ NEWLINE
 %import common.ESCAPED_STRING
 '''
 
-@dataclass(frozen=True)
-class MapElementGuard:
-    """Guard for describing the existence of a Map element."""
-    map: str
-    element: str
-    element_guard: set
-    var: str
-
-# Global variable counters
-elt_counter = 0
-log_counter = 0
-
 class CodeGenerator:
-    def __init__(self, of, indent=0, in_block=False):
+    def __init__(self, of, indent=0, in_block=False, indent_unit='\t'):
         self.of = of
         self.indent = indent
         self.in_block = in_block
+        self.indent_unit = indent_unit
     
     def __enter__(self):
         return self
@@ -128,43 +126,17 @@ class CodeGenerator:
         if instr == '':
             tabs = ''
         else:
-            tabs = '\t' * self.indent
+            tabs = self.indent_unit * self.indent
         self.of.write(f'{tabs}{instr}\n')
 
     def block(self, instr):
         self.line(instr)
-        return CodeGenerator(of=self.of, indent=self.indent+1, in_block=True)
+        return CodeGenerator(of=self.of, indent=self.indent+1, in_block=True, indent_unit=self.indent_unit)
 
     def non_block_indent(self):
         # Special case used under "case" keywords inside "switch": indent
         # without block. Otherwise, similar to block.
-        return CodeGenerator(of=self.of, indent=self.indent+1, in_block=False)
-
-    def guarded_block(self, guards):
-        guard_vars = set({})
-
-        for guard in guards:
-            if isinstance(guard, str):
-                guard_vars.add((guard, 'null'))
-            match guard:
-                case MapElementGuard(map=m, element=e, element_guard=eg, var=v):
-                    # TODO (here and below): This is a hackish shortcut that
-                    # works only as long as the only struct is Station.
-                    # Replace with proper type resolution.
-                    self.line(f'let {v}: StationImpl | undefined;')
-                    with self.guarded_block(eg) as new_elt_block:
-                        new_elt_block.line(f'{v} = {m}.get({e});')
-                        with new_elt_block.block(f'if ({v} == undefined) {{') as b:
-                            b.line(f'{v} = new StationImpl({e});')
-                            b.line(f'{m}.set({e}, {v});')
-                    guard_vars.add((v, 'undefined'))
-
-        if len(guard_vars) > 0:
-            vars_test = ' && '.join(f'({v} != {bad})' for v, bad in sorted(guard_vars))
-            return self.block(f'if ({vars_test}) {{')
-        else:
-            # Create a block, but without an indent and without a closing symbol.
-            return CodeGenerator(of=self.of, indent=self.indent, in_block=False)
+        return CodeGenerator(of=self.of, indent=self.indent+1, in_block=False, indent_unit=self.indent_unit)
 
 class Type:
     def conv(self, bit_expr):
@@ -276,215 +248,6 @@ def field_extent(pos, width):
     masks[first_block] &= 2**(16-first_bit)-1
     return (masks, shifts)
 
-def compile_field_parsing(codegen, st, pos):
-    cc = st.children
-    field = pick_child_token(cc, 'ID')
-    typ = parse_type(subtree_of_type(cc, 'type'))
-    codegen.line(f'// Field {field}: {typ} at +{pos}, width {typ.width}.')
-    end_pos = pos + typ.width   # Need to store it here because we're going to touch pos.
-    if typ.output and field != '_':
-        for i in range(typ.num):
-            (masks, shifts) = field_extent(pos, typ.elemwidth)
-            ts_ok = []
-            ts_ops = []
-            for b in range(4):
-                if masks[b] != 0:
-                    ts_ok.append(f'ok[{b}]')
-                    if shifts[b] < 0:
-                        shift = f' << {-shifts[b]}'
-                    elif shifts[b] > 0:
-                        shift = f' >> {shifts[b]}'
-                    else:
-                        shift = ''
-                    if masks[b] != 65535:
-                        mask = f' & {bin(masks[b])}'
-                    else:
-                        mask = ''
-                    ts_ops.append(f'((block[{b}]{mask}){shift})')
-            codegen.line(f'let {field}{'__' + str(i) if typ.num>1 else ''} = ({" && ".join(ts_ok)}) ?')
-            with codegen.non_block_indent() as cgn:
-                cgn.line(f'{typ.conv(" | ".join(ts_ops))}')
-                cgn.line(f': null;')
-            pos += typ.elemwidth
-        # Add summary constant for logging.
-        if typ.num > 1:
-            codegen.line(
-                f'const {field} = [' +
-                ', '.join(f'{field}__{i}' for i in range(typ.num)) +
-                '];')
-
-    return end_pos
-
-def compile_lvalue(st):
-    global elt_counter
-    match st:
-        case lark.Tree(data='lvalue', children=[lark.Token(type='ID', value=v)]):
-            return (v, set([v]))
-        case lark.Tree(data='lvalue',  children=[
-                lark.Tree(data='field_access', children=[
-                    lark.Tree(data='lvalue') as object,
-                    lark.Token(type='ID', value=field)])]):
-            (c_object, vars_object) = compile_lvalue(object)
-            return (f'{c_object}.{field}', vars_object)
-        case lark.Tree(data='lvalue', children=[
-                lark.Tree(data='array_access', children=[
-                    lark.Tree(data='lvalue') as object,
-                    lark.Tree(data='expr') as index])]):
-            (c_object, vars_object) = compile_lvalue(object)
-            (c_index, vars_index) = compile_expr(index)
-            elt_var = f'elt{elt_counter}'
-            elt_counter += 1
-            return (
-                elt_var, 
-                vars_object | set(
-                    {MapElementGuard(
-                        map=c_object,
-                        element=c_index,
-                        element_guard=frozenset(vars_index),
-                        var=elt_var)}))
-        case _:
-            return (f'<<< Unhandled lvalue: {st} >>>', set())
-
-def compile_expr(st):
-    """Compiles the `expr` subtree and returns a TypeScript expression and a set of variables."""
-    match st:
-        case lark.Tree(data='expr', children=[lark.Tree(data='lvalue') as lvalue]):
-            return compile_lvalue(lvalue)
-        case lark.Tree(data='expr', children=[lark.Token(type='INT', value=v)]):
-            return (str(v), set())
-        case lark.Tree(data='expr', children=[lark.Token(type='ESCAPED_STRING', value=v)]):
-            return (v, set())
-        case lark.Tree(data='expr', children=[lark.Tree(data='function_call', children=[
-            lark.Token(type='ID', value='lookup'),
-            lark.Tree(data='expr') as mapping,
-            lark.Tree(data='expr') as key,
-            lark.Tree(data='expr') as default])]):
-                
-            (c_mapping, _) = compile_expr(mapping)
-            (c_key, v_key) = compile_expr(key)
-            (c_default, v_default) = compile_expr(default)
-            return (f'{c_mapping}.get({c_key}) ?? {c_default}', v_key | v_default)
-        case _:
-            return (f'<<< Unhandled expr: {st} >>>', set())
-
-def compile_action(codegen, st, arguments):
-    if len(st.children) == 0:
-        return
-    elif len(st.children) > 1:
-        raise Exception('More than one action!')
-    action = st.children[0]
-
-    match action:
-        case lark.Tree(data='assignment', children=[
-            lark.Tree(data='lvalue') as lvalue,
-            lark.Tree(data='expr') as expr]):
-            
-            (e, v_expr) = compile_expr(expr)
-            (e_lvalue, v_lvalue) = compile_lvalue(lvalue)
-            variables = v_expr | v_lvalue
-            for a in arguments:
-                variables.discard(a)
-            with codegen.guarded_block(variables) as cgn:
-                cgn.line(f'{e_lvalue} = {e};')
-        case lark.Tree(data='copy', children=[
-            lark.Tree(data='lvalue') as target,
-            lark.Tree(data='expr') as addr,
-            lark.Tree(data='expr') as seg_size,
-            lark.Tree(data='expr') as value]):
-            
-            (c_target, v_target) = compile_lvalue(target)
-            (c_addr, v_addr) = compile_expr(addr)
-            (c_seg_size, v_seg_size) = compile_expr(seg_size)    # TODO: Add check - seg_size must be an INT litteral.
-            (c_value, _) = compile_expr(value)             # TODO: Add check - c_value must be a parse field name.
-            with codegen.guarded_block(v_target) as gb:
-                for i in range(int(c_seg_size)):
-                    with gb.guarded_block(v_addr | v_seg_size | set([f'{c_value}__{i}'])) as cgn:
-                        cgn.line(f'{c_target}.setByte({c_addr}*{c_seg_size} + {i}, {c_value}__{i});')
-        case lark.Tree(data='put', children=[
-            lark.Tree(data='lvalue') as target,
-            lark.Tree(data='expr') as key,
-            lark.Tree(data='expr') as value]):
-
-            (c_target, _) = compile_lvalue(target)    # TODO: Add check - target must be a map.
-            (c_key, v_key) = compile_expr(key)
-            (c_value, v_value) = compile_expr(value)
-            with codegen.guarded_block(v_key | v_value) as cgn:
-                cgn.line(f'{c_target}.set({c_key}, {c_value});')
-
-        case lark.Tree(data='parse_statement', children=[
-            lark.Token(),
-            lark.Tree(data='expr') as rule]):
-            
-            (c_rule, v_rule) = compile_expr(rule);
-            with codegen.guarded_block(v_rule) as cgn:
-                cgn.line(f'get_parse_function({c_rule})(block, ok, log{build_argument_list(arguments, with_types=False)});')
-        case lark.Tree(data='invocation', children=[
-            lark.Tree(data='lvalue') as obj,
-            lark.Token(type='ID', value=method),
-            *args]):
-
-            (c_args, v_args) = zip(*map(compile_expr, args))
-
-            v = set()
-            for v_a in v_args:
-                v |= v_a
-
-            (c_obj, v_obj) = compile_lvalue(obj)
-            v |= v_obj
-
-            with codegen.guarded_block(v) as cgn:
-                cgn.line(f'{c_obj}.{method}({", ".join(c_args)});')
-
-        case lark.Tree(data='switch', children=[
-            lark.Tree(data='expr') as expr,
-            *cases]):
-
-            (c_expr, v_expr) = compile_expr(expr)
-
-            with codegen.guarded_block(v_expr) as cgn:
-                with cgn.block(f'switch ({c_expr}) {{') as cgn2:
-
-                    for c in cases:
-                        match c:
-                            case lark.Tree(data='switch_case', children=cc):
-                                values = []
-                                for c in cc:
-                                    match c:
-                                        case lark.Token(type='INT') as i:
-                                            values.append(i)
-                                        case lark.Token(type='ID', value='_'):
-                                            values = None
-                                if values is None:
-                                    cgn2.line('default:')
-                                else:
-                                    for v in values:
-                                        cgn2.line(f'case {v}:')
-                                with cgn2.non_block_indent() as cgn3:
-                                    for a in subtrees_of_type(cc, 'action'):
-                                        compile_action(cgn3, a, arguments)
-                                    cgn3.line('break;')
-                                    cgn3.line()
-
-        case lark.Tree(data='log_element') as st:
-            compile_log_element(codegen, st)
-
-        case _:
-            codegen.line(f'// Unhandled action: {action}')
-
-def compile_log_element(codegen, st):
-    if len(st.children) == 0:
-        return
-    elif len(st.children) > 1:
-        raise Exception('More than one log element!')
-    log_element = st.children[0]
-
-    match log_element:
-        case lark.Token(type='ESCAPED_STRING', value=s):
-            s = s[1:-1].replace('\\"', '"')
-            compile_log_string(codegen, s)
-        case _:
-            raise Exception(f'Unexpected log element: {log_action}')
-
 def format_expr(var, fmt):
     match fmt:
         case 'bool':
@@ -516,23 +279,224 @@ def format_expr(var, fmt):
         case _:
             raise Exception(f'Unknwon log format string: "{fmt}"')
 
-def compile_log_string(codegen, s):
-    global log_counter
+def rule_name(literal, rules):
+    """Returns the rule named by a string literal, checking that it exists."""
+    name = literal[1:-1]
+    if name not in rules:
+        raise Exception(f'Unknown rule: {literal}')
+    return name
+
+def build_argument_list(arguments, with_types):
+    if len(arguments) > 0:
+        return ', ' + ', '.join(n + (f': {t}' if with_types else '') for n, t in arguments.items())
+    return ''
+
+def field_element_expr(masks, shifts):
+    """Returns a TypeScript expression extracting a field element from `block`."""
+    ts_ops = []
+    for b in range(4):
+        if masks[b] != 0:
+            if shifts[b] < 0:
+                shift = f' << {-shifts[b]}'
+            elif shifts[b] > 0:
+                shift = f' >> {shifts[b]}'
+            else:
+                shift = ''
+            if masks[b] != 65535:
+                mask = f' & {bin(masks[b])}'
+            else:
+                mask = ''
+            ts_ops.append(f'((block[{b}]{mask}){shift})')
+    return ' | '.join(ts_ops)
+
+# Intermediate representation.
+#
+# Bitstructs are first lowered to a tree of actions. Each action carries a
+# guard, i.e. the set of conditions that must hold for the values it uses to
+# be valid. Optimization passes work on this tree before code is emitted.
+
+@dataclass(frozen=True)
+class BlockOk:
+    """Guard atom: block `block` was received correctly."""
+    block: int
+
+@dataclass(frozen=True)
+class Defined:
+    """Guard atom: map element variable `var` has been resolved."""
+    var: str
+
+@dataclass(frozen=True)
+class Var:
+    name: str
+
+@dataclass(frozen=True)
+class Const:
+    value: int
+
+@dataclass(frozen=True)
+class RuleRef:
+    name: str
+
+@dataclass(frozen=True)
+class Member:
+    obj: object
+    name: str
+
+@dataclass(frozen=True)
+class Element:
+    """Reference to a map element, resolved beforehand into variable `var`."""
+    var: str
 
-    var = f'log{log_counter}'
-    log_counter += 1
+@dataclass(frozen=True)
+class Lookup:
+    map: object
+    key: object
+    default: object
 
+@dataclass(frozen=True)
+class BinOp:
+    op: str
+    left: object
+    right: object
+
+@dataclass
+class Field:
+    name: str
+    typ: Type
+    pos: int
+
+    def elements(self):
+        """Yields (variable name, masks, shifts) for all elements of the field."""
+        for i in range(self.typ.num):
+            (masks, shifts) = field_extent(self.pos + i*self.typ.elemwidth, self.typ.elemwidth)
+            yield (f'{self.name}__{i}' if self.typ.num > 1 else self.name, masks, shifts)
+
+@dataclass
+class Assign:
+    target: object
+    value: object
+    guard: frozenset = frozenset()
+
+@dataclass
+class SetBytes:
+    """Copies field elements `values` to `target` from position `index`.
+
+    Elements whose guard in `value_guards` does not hold are skipped.
+    """
+    target: object
+    index: object
+    values: tuple
+    value_guards: tuple
+    guard: frozenset = frozenset()
+
+@dataclass
+class Put:
+    map: object
+    key: object
+    value: object
+    guard: frozenset = frozenset()
+
+@dataclass
+class Parse:
+    rule: object
+    guard: frozenset = frozenset()
+
+@dataclass
+class Invoke:
+    obj: object
+    method: str
+    args: tuple
+    guard: frozenset = frozenset()
+
+@dataclass
+class Log:
+    """Log line: `parts` contains literal strings and (variable, format) pairs."""
+    parts: tuple
+    guard: frozenset = frozenset()
+
+@dataclass
+class Resolve:
+    """Gets map element `map[key]` into variable `var`, creating it if needed."""
+    var: str
+    map: object
+    key: object
+    guard: frozenset = frozenset()
+
+@dataclass
+class Switch:
+    expr: object
+    cases: list     # Pairs (values, actions). values is None for the default case.
+    guard: frozenset = frozenset()
+
+@dataclass
+class Guarded:
+    guard: frozenset
+    actions: list
+
+@dataclass
+class Bitstruct:
+    name: str
+    arguments: dict
+    fields: list
+    elements: list  # Map element variables.
+    actions: list
+    live_vars: frozenset = frozenset()  # Variables used by the actions.
+    # Struct and key field of each map element variable, see type_elements.
+    element_structs: dict = dataclasses.field(default_factory=dict)
+
+def block_atoms(masks):
+    """Returns the guard atoms of a field element spanning the blocks in `masks`."""
+    return frozenset(BlockOk(b) for b in range(4) if masks[b] != 0)
+
+def expr_vars(e):
+    """Returns the set of variables an IR expression depends on."""
+    match e:
+        case Var(name=n) | Element(var=n):
+            return {n}
+        case Member(obj=o):
+            return expr_vars(o)
+        case Lookup(key=k, default=d):
+            return expr_vars(k) | expr_vars(d)
+        case BinOp(left=l, right=r):
+            return expr_vars(l) | expr_vars(r)
+        case _:
+            return set()
+
+def action_vars(a):
+    """Returns the set of variables used by an action and its sub-actions."""
+    match a:
+        case Assign(target=t, value=v):
+            return expr_vars(t) | expr_vars(v)
+        case SetBytes(target=t, index=i, values=values):
+            return expr_vars(t) | expr_vars(i) | set(values)
+        case Put(map=m, key=k, value=v):
+            return expr_vars(m) | expr_vars(k) | expr_vars(v)
+        case Parse(rule=r):
+            return expr_vars(r)
+        case Invoke(obj=o, args=args):
+            return expr_vars(o).union(*map(expr_vars, args))
+        case Log(parts=parts):
+            return {p[0] for p in parts if isinstance(p, tuple)}
+        case Resolve(map=m, key=k):
+            return expr_vars(m) | expr_vars(k)
+        case Switch(expr=e, cases=cases):
+            return expr_vars(e).union(*(action_vars(x) for (_, aa) in cases for x in aa))
+        case Guarded(actions=aa):
+            return set().union(*map(action_vars, aa))
+
+def parse_log_string(s):
+    """Splits a log string into literal parts and (variable, format) pairs."""
     # Modes:
-    #  0: appending literal characters
+    #  0: appending literal characters
     #  1: appending expression
     mode = 0
     part = ''
-    variables = set()
-    logstr = ''
+    parts = []
 
     for c in s:
         if mode == 0 and c == '{':
-            logstr += part
+            if part != '':
+                parts.append(part)
             part = ''
             mode = 1
         elif mode == 1 and c == '}':
@@ -540,9 +504,7 @@ def compile_log_string(codegen, s):
             if len(format_parts) != 2:
                 raise Exception(
                     f'Format must be of the form {{variable:formatter}} in log string {s}')
-            [var, fmt] = format_parts
-            logstr += f'${{{format_expr(var, fmt)}}}'
-            variables.add(var)
+            parts.append(tuple(format_parts))
             part = ''
             mode = 0
         else:
@@ -551,22 +513,182 @@ def compile_log_string(codegen, s):
     # Handle last current part.
     if mode != 0:
         raise Exception(f'Log string stopped inside expression: {s}')
-    logstr += part
-
-    with codegen.guarded_block(variables) as b:
-        b.line(f'log.add(`{logstr}`);')
-
-rules = {}
+    if part != '':
+        parts.append(part)
+    return tuple(parts)
+
+class BitstructLowering:
+    """Lowers a bitstruct from the Lark tree to the IR."""
+
+    def __init__(self, fields, rules, logs):
+        self.rules = rules
+        self.logs = logs
+        # Guard atoms of the variables holding field elements.
+        self.var_atoms = {}
+        for f in fields:
+            if f.typ.output and f.name != '_':
+                for (var, masks, _) in f.elements():
+                    self.var_atoms[var] = block_atoms(masks)
+        # Guards under which map element variables are resolved.
+        self.element_guards = {}
+
+    def guard(self, *exprs):
+        variables = set().union(*map(expr_vars, exprs))
+        atoms = set()
+        for v in variables:
+            if v in self.element_guards:
+                atoms.add(Defined(v))
+            else:
+                # Arguments, constants and byte array summaries are never null.
+                atoms |= self.var_atoms.get(v, frozenset())
+        # A resolved element implies that the guard of its key held.
+        for v in variables:
+            if v in self.element_guards:
+                atoms -= self.element_guards[v]
+        return frozenset(atoms)
+
+    def lvalue(self, st, scope, pre):
+        match st:
+            case lark.Tree(data='lvalue', children=[lark.Token(type='ID', value=v)]):
+                return Var(v)
+            case lark.Tree(data='lvalue',  children=[
+                    lark.Tree(data='field_access', children=[
+                        lark.Tree(data='lvalue') as obj,
+                        lark.Token(type='ID', value=field)])]):
+                return Member(self.lvalue(obj, scope, pre), field)
+            case lark.Tree(data='lvalue', children=[
+                    lark.Tree(data='array_access', children=[
+                        lark.Tree(data='lvalue') as obj,
+                        lark.Tree(data='expr') as index])]):
+                m = self.lvalue(obj, scope, pre)
+                key = self.expr(index, scope, pre)
+                # Map elements are resolved once, at their first use in a
+                # scope. Sibling scopes (switch cases) resolve them again.
+                var = scope.get((m, key))
+                if var is None:
+                    var = f'elt{len(self.element_guards)}'
+                    g = self.guard(key)
+                    pre.append(Resolve(var, m, key, g))
+                    self.element_guards[var] = g
+                    scope[(m, key)] = var
+                return Element(var)
+            case _:
+                raise Exception(f'Unhandled lvalue: {st}')
 
-def build_argument_list(arguments, with_types):
-    if len(arguments) > 0:
-        return ', ' + ', '.join(n + (f': {t}' if with_types else '') for n, t in arguments.items())
-    return ''
+    def expr(self, st, scope, pre):
+        match st:
+            case lark.Tree(data='expr', children=[lark.Tree(data='lvalue') as lvalue]):
+                return self.lvalue(lvalue, scope, pre)
+            case lark.Tree(data='expr', children=[lark.Token(type='INT', value=v)]):
+                return Const(int(v))
+            case lark.Tree(data='expr', children=[lark.Token(type='ESCAPED_STRING', value=v)]):
+                # String literals denote rules, which are resolved at compile time.
+                return RuleRef(rule_name(v, self.rules))
+            case lark.Tree(data='expr', children=[lark.Tree(data='function_call', children=[
+                lark.Token(type='ID', value='lookup'),
+                lark.Tree(data='expr') as mapping,
+                lark.Tree(data='expr') as key,
+                lark.Tree(data='expr') as default])]):
+                return Lookup(
+                    self.expr(mapping, scope, pre),
+                    self.expr(key, scope, pre),
+                    self.expr(default, scope, pre))
+            case lark.Tree(data='expr', children=[lark.Tree(data=op, children=[left, right])]) if op in ('add', 'mul'):
+                # Operands are not wrapped in `expr` trees.
+                return BinOp(
+                    '+' if op == 'add' else '*',
+                    self.expr(lark.Tree('expr', [left]), scope, pre),
+                    self.expr(lark.Tree('expr', [right]), scope, pre))
+            case _:
+                raise Exception(f'Unhandled expr: {st}')
+
+    def actions(self, trees, scope):
+        out = []
+        for st in trees:
+            self.action(st, scope, out)
+        return out
+
+    def action(self, st, scope, out):
+        if len(st.children) == 0:
+            return
+        elif len(st.children) > 1:
+            raise Exception('More than one action!')
+        action = st.children[0]
+
+        match action:
+            case lark.Tree(data='assignment', children=[
+                lark.Tree(data='lvalue') as lvalue,
+                lark.Tree(data='expr') as expr]):
+
+                value = self.expr(expr, scope, out)
+                target = self.lvalue(lvalue, scope, out)
+                out.append(Assign(target, value, self.guard(target, value)))
+            case lark.Tree(data='copy', children=[
+                lark.Tree(data='lvalue') as target,
+                lark.Tree(data='expr') as addr,
+                lark.Tree(data='expr') as seg_size,
+                lark.Tree(data='expr', children=[lark.Tree(data='lvalue', children=[
+                    lark.Token(type='ID', value=value)])])]):
+
+                target = self.lvalue(target, scope, out)
+                addr = self.expr(addr, scope, out)
+                seg_size = self.expr(seg_size, scope, out)
+                if not isinstance(seg_size, Const):
+                    raise Exception(f'Segment size must be an integer: {action}')
+                index = BinOp('*', addr, seg_size)
+                values = tuple(f'{value}__{i}' for i in range(seg_size.value))
+                value_guards = tuple(self.var_atoms[v] for v in values)
+                out.append(SetBytes(target, index, values, value_guards, self.guard(target, index)))
+            case lark.Tree(data='put', children=[
+                lark.Tree(data='lvalue') as target,
+                lark.Tree(data='expr') as key,
+                lark.Tree(data='expr') as value]):
+
+                target = self.lvalue(target, scope, out)
+                key = self.expr(key, scope, out)
+                value = self.expr(value, scope, out)
+                out.append(Put(target, key, value, self.guard(target, key, value)))
+            case lark.Tree(data='parse_statement', children=[
+                lark.Token(),
+                lark.Tree(data='expr') as rule]):
+
+                rule = self.expr(rule, scope, out)
+                out.append(Parse(rule, self.guard(rule)))
+            case lark.Tree(data='invocation', children=[
+                lark.Tree(data='lvalue') as obj,
+                lark.Token(type='ID', value=method),
+                *args]):
+
+                args = tuple(self.expr(a, scope, out) for a in args)
+                obj = self.lvalue(obj, scope, out)
+                out.append(Invoke(obj, method, args, self.guard(obj, *args)))
+            case lark.Tree(data='switch', children=[
+                lark.Tree(data='expr') as expr,
+                *cases]):
+
+                expr = self.expr(expr, scope, out)
+                lowered_cases = []
+                for c in subtrees_of_type(cases, 'switch_case'):
+                    values = []
+                    for t in c.children:
+                        match t:
+                            case lark.Token(type='INT', value=v):
+                                values.append(int(v))
+                            case lark.Token(type='ID', value='_'):
+                                values = None
+                    body = self.actions(subtrees_of_type(c.children, 'action'), dict(scope))
+                    lowered_cases.append((values, body))
+                out.append(Switch(expr, lowered_cases, self.guard(expr)))
+            case lark.Tree(data='log_element', children=[lark.Token(type='ESCAPED_STRING', value=s)]):
+                if self.logs:
+                    parts = parse_log_string(s[1:-1].replace('\\"', '"'))
+                    variables = [Var(p[0]) for p in parts if isinstance(p, tuple)]
+                    out.append(Log(parts, self.guard(*variables)))
+            case _:
+                raise Exception(f'Unhandled action: {action}')
 
-def compile_bitstruct(codegen, cc):
-    i = pick_child_token(cc, 'ID')
-    ts_func = f'parse_{i}'
-    rules[i] = ts_func
+def lower_bitstruct(cc, rules, logs=True):
+    name = pick_child_token(cc, 'ID')
 
     # Build map of arguments.
     arguments = {}
@@ -577,25 +699,632 @@ def compile_bitstruct(codegen, cc):
                 lark.Tree(data='type', children=[
                     lark.Token(type='ID', value=arg_type)
                 ])]):
-                
+
                 arguments[arg_name] = arg_type
-    
-    with codegen.block(f'export function {ts_func}(block: Uint16Array, ok: boolean[], log: LogMessage{build_argument_list(arguments, with_types=True)}) {{') as cgn:
 
-        pos = 0
-        for st in subtrees_of_type(cc, 'decl'):
-            pos = compile_field_parsing(cgn, st, pos)
-        
-        if pos != 64:
-            raise Exception(f'Inconsistent group length: {pos}.')
+    fields = []
+    pos = 0
+    for st in subtrees_of_type(cc, 'decl'):
+        typ = parse_type(subtree_of_type(st.children, 'type'))
+        fields.append(Field(pick_child_token(st.children, 'ID'), typ, pos))
+        pos += typ.width
+    if pos != 64:
+        raise Exception(f'Inconsistent group length: {pos}.')
+
+    lowering = BitstructLowering(fields, rules, logs)
+    actions = lowering.actions(subtrees_of_type(cc, 'action'), {})
+    return Bitstruct(name, arguments, fields, list(lowering.element_guards), actions)
+
+# Optimization passes.
+
+def merge_guards(actions, known=frozenset()):
+    """Groups consecutive actions sharing guard atoms under a single test.
+
+    `known` contains the atoms already tested by enclosing blocks. In the
+    result, only Guarded nodes carry guards.
+    """
+    out = []
+    i = 0
+    while i < len(actions):
+        g = actions[i].guard - known
+        if len(g) == 0:
+            out.append(merge_nested_guards(actions[i], known))
+            i += 1
+            continue
+        # Extend the group as long as some atoms are common to all actions.
+        common = g
+        j = i + 1
+        while j < len(actions) and len(common & actions[j].guard) > 0:
+            common = common & actions[j].guard
+            j += 1
+        out.append(Guarded(common, merge_guards(actions[i:j], known | common)))
+        i = j
+    return out
+
+def merge_nested_guards(action, known):
+    match action:
+        case Switch(cases=cases):
+            cases = [(values, merge_guards(body, known)) for (values, body) in cases]
+            return replace(action, cases=cases, guard=frozenset())
+        case _:
+            return replace(action, guard=frozenset())
+
+def optimize(bitstruct):
+    bitstruct.actions = merge_guards(bitstruct.actions)
+    # Dead field elimination: only the field elements used by actions are
+    # computed. Without logs, this drops the fields used only for logging.
+    bitstruct.live_vars = frozenset().union(*map(action_vars, bitstruct.actions))
+    return bitstruct
+
+# Effect analysis.
+
+@dataclass
+class Effects:
+    """What running the actions of a bitstruct does, besides computing fields.
+
+    Paths in `writes` start with the type of an argument, followed by member
+    names, e.g. ('Station', 'ecc'). '*' stands for any element of a map.
+    `effects` describes the actions that are not idempotent, or whose outcome
+    depends on the decoder state. `calls` contains the rules parsed by name.
+    """
+    writes: set = dataclasses.field(default_factory=set)
+    effects: list = dataclasses.field(default_factory=list)
+    calls: set = dataclasses.field(default_factory=set)
+
+    @property
+    def idempotent(self):
+        return len(self.effects) == 0
+
+def member_path(e, roots):
+    match e:
+        case Var(name=n) | Element(var=n) if n in roots:
+            return roots[n]
+        case Member(obj=o, name=n):
+            return member_path(o, roots) + (n,)
+    raise Exception(f'Not a member of an argument: {e}')
+
+def reads_state(e):
+    """Returns whether an IR expression reads struct members or maps."""
+    match e:
+        case Member() | Lookup():
+            return True
+        case BinOp(left=l, right=r):
+            return reads_state(l) or reads_state(r)
+        case _:
+            return False
+
+def collect_effects(actions, roots, effects):
+    for a in actions:
+        match a:
+            case Guarded(actions=aa):
+                collect_effects(aa, roots, effects)
+            case Assign(target=t, value=v):
+                effects.writes.add(member_path(t, roots))
+                if reads_state(v):
+                    effects.effects.append(f'assigns {ts_expr(v)}')
+            case Put(map=m, key=k, value=v):
+                effects.writes.add(member_path(m, roots))
+                if reads_state(k) or reads_state(v):
+                    effects.effects.append(f'puts {ts_expr(v)} at {ts_expr(k)}')
+            case Resolve(var=v, map=m, key=k):
+                # Getting an element, or creating it if needed, has the same
+                # outcome when repeated, and leaves the other elements alone.
+                roots[v] = member_path(m, roots) + ('*',)
+                if reads_state(k):
+                    effects.effects.append(f'resolves {ts_expr(m)} element {ts_expr(k)}')
+            case Switch(expr=e, cases=cases):
+                if reads_state(e):
+                    effects.effects.append(f'switches on {ts_expr(e)}')
+                for (_, body) in cases:
+                    collect_effects(body, roots, effects)
+            case Parse(rule=RuleRef(name=n)):
+                effects.calls.add(n)
+            case Parse(rule=r):
+                effects.effects.append(f'parses rule {ts_expr(r)}')
+            case SetBytes(target=t):
+                # RdsStrings keep a history of their contents.
+                effects.writes.add(member_path(t, roots))
+                effects.effects.append(f'copies bytes to {ts_expr(t)}')
+            case Invoke(obj=o, method=method):
+                effects.effects.append(f'calls {ts_expr(o)}.{method}')
+            case Log():
+                effects.effects.append('logs')
+
+def direct_effects(bitstruct):
+    """Returns the Effects of the actions of `bitstruct`, not of the rules it parses."""
+    effects = Effects()
+    collect_effects(bitstruct.actions, {n: (t,) for (n, t) in bitstruct.arguments.items()}, effects)
+    return effects
+
+# Map element types.
+
+def struct_field_types(t):
+    """Returns the declared type of each field of each struct, by struct and field name."""
+    return {
+        pick_child_token(st.children, 'ID'): {
+            pick_child_token(d.children, 'ID'): subtree_of_type(d.children, 'vartype').children[0]
+            for d in subtrees_of_type(st.children, 'vardecl')}
+        for st in subtrees_of_type(t.children, 'struct')}
+
+def path_struct(path, structs):
+    """Returns the struct reached by a member path, e.g. ('Station', 'other_networks', '*')."""
+    (name, t) = (path[0], None)
+    for step in path[1:]:
+        match (step, t):
+            case ('*', lark.Tree(data='maptype', children=[_, value])):
+                t = value
+            case (_, _) if step in structs.get(name, {}):
+                t = structs[name][step]
+            case _:
+                raise Exception(f'Cannot resolve {step} in {".".join(path)}')
+        match t:
+            case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value=n)]) if n in structs:
+                name = n
+            case _:
+                name = None
+    if name is None:
+        raise Exception(f'Not a struct: {".".join(path)}')
+    return name
+
+def map_element_structs(structs):
+    """Returns the structs that are the values of maps, in declaration order."""
+    result = []
+    for fields in structs.values():
+        for t in fields.values():
+            match t:
+                case lark.Tree(data='maptype', children=[_, lark.Tree(children=[lark.Token(type='ID', value=n)])]) \
+                        if n in structs and n not in result:
+                    result.append(n)
+    return result
+
+def type_elements(bitstruct, structs):
+    """Types the map element variables of `bitstruct` from the declarations of `structs`.
+
+    Maps of structs are declared as e.g. `map<uint<16>, OtherNetwork>`.
+    Elements that do not exist yet are created with their key in the first
+    field of their struct, e.g. OtherNetwork.pi.
+    """
+    roots = {n: (t,) for (n, t) in bitstruct.arguments.items()}
+    collect_effects(bitstruct.actions, roots, Effects())
+    for v in bitstruct.elements:
+        name = path_struct(roots[v], structs)
+        if len(structs[name]) == 0:
+            raise Exception(f'Struct {name} has no key field')
+        bitstruct.element_structs[v] = (name, next(iter(structs[name])))
+    return bitstruct
+
+def analyze_effects(bitstructs):
+    """Returns the Effects of each bitstruct, including those of the rules it parses.
+
+    A bitstruct is idempotent if parsing the same group twice in a row leaves
+    the decoder in the same state as parsing it once: it only assigns fields
+    and puts map entries, from values that only depend on the group.
+    """
+    direct = {name: direct_effects(b) for (name, b) in bitstructs.items()}
+    result = {}
+    def visit(name, visiting):
+        if name not in result:
+            e = direct[name]
+            total = Effects(set(e.writes), list(e.effects), set(e.calls))
+            for callee in sorted(e.calls):
+                if callee in visiting:
+                    total.effects.append(f'parses {callee} recursively')
+                    continue
+                c = visit(callee, visiting | {name})
+                total.writes |= c.writes
+                total.effects.extend(f'{callee} {x}' for x in c.effects)
+            result[name] = total
+        return result[name]
+    for name in bitstructs:
+        visit(name, frozenset())
+    return result
+
+def paths_overlap(p, q):
+    """Returns whether writing at path `p` may change what is at path `q`, or conversely."""
+    n = min(len(p), len(q))
+    return p[:n] == q[:n]
+
+# Module split.
+
+# Rules the decoder calls directly.
+ENTRY_RULES = ('group_ab', 'group_c')
+
+@dataclass
+class Split:
+    """Split of a TypeScript decoder into a main module and lazily loaded modules."""
+    # Name of the main module, and the main source file.
+    module: str
+    main: str
+    # Source file of each struct and bitstruct, by name.
+    origins: dict = dataclasses.field(default_factory=dict)
+    # Output: code of the lazily loaded modules, by module name.
+    modules: dict = dataclasses.field(default_factory=dict)
+
+    @staticmethod
+    def key(source):
+        """Returns the key of the module of a source file in PARSE_MODULES."""
+        return os.path.splitext(os.path.basename(source))[0]
+
+    def module_name(self, source):
+        return f'{self.module}_{self.key(source)}'
+
+def expr_rules(e):
+    """Returns the set of rules an IR expression names."""
+    match e:
+        case RuleRef(name=n):
+            return {n}
+        case Lookup(key=k, default=d):
+            return expr_rules(k) | expr_rules(d)
+        case BinOp(left=l, right=r):
+            return expr_rules(l) | expr_rules(r)
+        case _:
+            return set()
+
+def action_rules(a):
+    """Returns the set of rules an action and its sub-actions name: parsed directly, or used as values."""
+    match a:
+        case Guarded(actions=aa):
+            return set().union(*map(action_rules, aa))
+        case Switch(expr=e, cases=cases):
+            return expr_rules(e).union(*(action_rules(x) for (_, aa) in cases for x in aa))
+        case Assign(value=v) | Put(value=v):
+            return expr_rules(v)
+        case Parse(rule=r):
+            return expr_rules(r)
+        case _:
+            return set()
+
+def partition_rules(bitstructs, origins, main):
+    """Assigns rules to modules. Returns a dict mapping each rule to its source file, or None for the main module.
+
+    The main module holds the rules reachable from ENTRY_RULES and from the
+    rules declared in the main file (which the decoder maps to group types),
+    by name: the decoder needs them from the start. The other rules are only
+    reached by dynamic dispatch, e.g. once the AID of an ODA is received. They
+    go to a lazily loaded module per source file, unless rules of several
+    modules name them. Modules start loading as soon as one of their rules is
+    mapped to a group type, including by the default mapping of stations
+    (e.g. EON for group 14A), see StationImpl.reset.
+    """
+    names = {n: set().union(*map(action_rules, b.actions)) for (n, b) in bitstructs.items()}
+    core = set()
+    def reach(name):
+        if name not in core:
+            core.add(name)
+            for n in names[name]:
+                reach(n)
+    for n in bitstructs:
+        if n in ENTRY_RULES or origins[n] == main:
+            reach(n)
+    while True:
+        shared = {
+            n for (r, rr) in names.items() if r not in core
+            for n in rr if n not in core and origins[n] != origins[r]}
+        if len(shared) == 0:
+            break
+        for n in shared:
+            reach(n)
+    return {n: None if n in core else origins[n] for n in bitstructs}
+
+def rule_valued(e):
+    """Returns whether an IR expression evaluates to a rule."""
+    match e:
+        case RuleRef():
+            return True
+        case Lookup(default=d):
+            return rule_valued(d)
+        case _:
+            return False
+
+# TypeScript emission.
+
+def ts_expr(e):
+    match e:
+        case Var(name=n) | Element(var=n):
+            return n
+        case Const(value=v):
+            return str(v)
+        case RuleRef(name=n):
+            return f'Rule.{n}'
+        case Member(obj=o, name=n):
+            return f'{ts_expr(o)}.{n}'
+        case Lookup(map=m, key=k, default=d):
+            return f'{ts_expr(m)}.get({ts_expr(k)}) ?? {ts_expr(d)}'
+        case BinOp(op='*', left=l, right=r):
+            return f'{ts_operand(l)}*{ts_operand(r)}'
+        case BinOp(op=op, left=l, right=r):
+            return f'{ts_expr(l)} {op} {ts_expr(r)}'
+
+def ts_operand(e):
+    """Returns a TypeScript expression usable as an operand of `*` or `!==`."""
+    match e:
+        case BinOp(op='+') | Lookup():
+            return f'({ts_expr(e)})'
+        case _:
+            return ts_expr(e)
+
+def ts_ok_mask(guard):
+    """Returns the mask of the blocks that must be valid for `guard` to hold."""
+    return sum(1 << a.block for a in guard if isinstance(a, BlockOk))
+
+def ts_guard(guard):
+    # `ok` has bit b set if block b is valid.
+    mask = ts_ok_mask(guard)
+    elements = sorted(a.var for a in guard if isinstance(a, Defined))
+    return ' && '.join(
+        ([f'(ok & {mask:#06b}) == {mask:#06b}'] if mask != 0 else []) +
+        [f'{v} != undefined' for v in elements])
+
+def ts_valid_mask(value_guards):
+    """Returns an expression of the mask of the valid values of a SetBytes action."""
+    # Group values by the blocks they depend on.
+    masks = {}
+    for (i, g) in enumerate(value_guards):
+        masks[ts_ok_mask(g)] = masks.get(ts_ok_mask(g), 0) | (1 << i)
+    return ' | '.join(
+        f'((ok & {ok_mask:#06b}) == {ok_mask:#06b} ? {bin(value_mask)} : 0)'
+        for (ok_mask, value_mask) in masks.items())
+
+def ts_log_string(parts):
+    logstr = ''
+    for p in parts:
+        match p:
+            case (var, fmt):
+                logstr += f'${{{format_expr(var, fmt)}}}'
+            case _:
+                logstr += p
+    return logstr
+
+def ts_deferred_log(bitstruct, parts, log_formats):
+    """Registers a deferred log format, returning its id and the arguments to record."""
+    fields = {f.name: f for f in bitstruct.fields}
+    decls = []
+    args = []
+    for var in dict.fromkeys(p[0] for p in parts if isinstance(p, tuple)):
+        f = fields.get(var)
+        match f:
+            case Field(typ=Byte()):
+                decls.append((var, f'args.slice(start + {len(args)}, start + {len(args) + f.typ.num}) as Array<number | null>'))
+                for (elt, masks, _) in f.elements():
+                    args.append(f'{ts_guard(block_atoms(masks))} ? {elt} : null')
+            case Field(typ=Bool()):
+                decls.append((var, f'args[start + {len(args)}] as boolean'))
+                args.append(var)
+            case Field(typ=Uint()):
+                decls.append((var, f'args[start + {len(args)}] as number'))
+                args.append(var)
+            case _:
+                raise Exception(f'Cannot log {var}: only fields can be logged.')
+    key = (tuple(decls), ts_log_string(parts))
+    if key not in log_formats:
+        log_formats[key] = len(log_formats)
+    return (log_formats[key], args)
+
+@dataclass
+class TsContext:
+    """State of the compilation of a protocol description to TypeScript."""
+    log_mode: str
+    rules: list = dataclasses.field(default_factory=list)
+    # Deferred log formats: maps (declarations, template string) to format ids.
+    log_formats: dict = dataclasses.field(default_factory=dict)
+    # Whether parse functions update PARSE_STATS.
+    stats: bool = False
+    # Names of the fields that have a null counter, indexed by counter.
+    stats_fields: list = dataclasses.field(default_factory=list)
+    # Rules whose parse functions skip the groups they have just parsed.
+    memoized: set = dataclasses.field(default_factory=set)
+    # Effects of each rule, and the paths written by memoized rules, indexed
+    # by write counter.
+    effects: dict = dataclasses.field(default_factory=dict)
+    memo_paths: list = dataclasses.field(default_factory=list)
+    # Bits of the change masks of the structs passed to parse functions: their
+    # fields, then their methods.
+    change_fields: dict = dataclasses.field(default_factory=dict)
+    # Member paths of the arguments and map elements of the current bitstruct,
+    # starting with an argument.
+    roots: dict = dataclasses.field(default_factory=dict)
+    # Whether some rules are in lazily loaded modules.
+    lazy: bool = False
+
+    def memo_version(self, rule):
+        """Returns the sum of the write counters of the paths written by `rule`."""
+        return ' + '.join(
+            f'PARSE_MEMO.writes[{i}]' for (i, p) in enumerate(self.memo_paths)
+            if p in self.effects[rule].writes)
+
+def change_bit(target, bitstruct, ctx, method=None):
+    """Returns the (argument, type, field) whose change mask bit records a change of `target`.
+
+    `target` is reached from an argument, through one of its fields, or is the
+    argument itself if `method` is given. Returns None if the type of the
+    argument has no change mask.
+    """
+    path = member_path(target, ctx.roots)
+    typ = bitstruct.arguments[path[0]]
+    if typ not in ctx.change_fields:
+        return None
+    return (path[0], typ, path[1] if len(path) > 1 else method)
+
+def ts_mark_change(target, bitstruct, ctx, method=None):
+    """Returns the statement marking a change of `target`, or of the state behind `method`.
+
+    Changes are recorded in the change mask of the argument that `target` is
+    reached from, at the bit of its field (or method) that leads to `target`.
+    Returns None if the argument has no change mask.
+    """
+    bit = change_bit(target, bitstruct, ctx, method)
+    if bit is None:
+        return None
+    (arg, typ, name) = bit
+    return f'{arg}.changes.mark({typ}Field.{name});'
+
+def emit_ts_actions(codegen, actions, bitstruct, ctx):
+    arguments = bitstruct.arguments
+    for a in actions:
+        match a:
+            case Guarded(guard=g, actions=aa):
+                with codegen.block(f'if ({ts_guard(g)}) {{') as cgn:
+                    emit_ts_actions(cgn, aa, bitstruct, ctx)
+            case Assign(target=t, value=v):
+                mark = ts_mark_change(t, bitstruct, ctx)
+                if mark is None:
+                    codegen.line(f'{ts_expr(t)} = {ts_expr(v)};')
+                else:
+                    with codegen.block(f'if ({ts_expr(t)} !== {ts_operand(v)}) {{') as cgn:
+                        cgn.line(f'{ts_expr(t)} = {ts_expr(v)};')
+                        cgn.line(mark)
+            case SetBytes(target=t, index=i, values=values, value_guards=value_guards):
+                # Values go through a scratch buffer so that nothing is allocated.
+                for (j, v) in enumerate(values):
+                    codegen.line(f'BYTE_SCRATCH[{j}] = {v};')
+                set_bytes = f'{ts_expr(t)}.setBytes({ts_expr(i)}, BYTE_SCRATCH, {ts_valid_mask(value_guards)})'
+                mark = ts_mark_change(t, bitstruct, ctx)
+                if mark is None:
+                    codegen.line(f'{set_bytes};')
+                else:
+                    with codegen.block(f'if ({set_bytes}) {{') as cgn:
+                        cgn.line(mark)
+            case Put(map=m, key=k, value=v):
+                # Rules mapped to group types start loading ahead of their groups.
+                load = f'load_rule({ts_expr(m)}.get({ts_expr(k)})!);' if ctx.lazy and rule_valued(v) else None
+                mark = ts_mark_change(m, bitstruct, ctx)
+                if mark is None:
+                    codegen.line(f'{ts_expr(m)}.set({ts_expr(k)}, {ts_expr(v)});')
+                    if load is not None:
+                        codegen.line(load)
+                else:
+                    with codegen.block(f'if ({ts_expr(m)}.get({ts_expr(k)}) !== {ts_operand(v)}) {{') as cgn:
+                        cgn.line(f'{ts_expr(m)}.set({ts_expr(k)}, {ts_expr(v)});')
+                        cgn.line(mark)
+                        if load is not None:
+                            cgn.line(load)
+            case Parse(rule=RuleRef(name=n)):
+                # Literal rule: call the parse function directly.
+                codegen.line(f'parse_{n}(block, ok, log{build_argument_list(arguments, with_types=False)});')
+            case Parse(rule=r):
+                codegen.line(f'PARSE_FUNCTIONS[{ts_expr(r)}](block, ok, log{build_argument_list(arguments, with_types=False)});')
+            case Invoke(obj=o, method=method, args=args):
+                codegen.line(f'{ts_expr(o)}.{method}({", ".join(map(ts_expr, args))});')
+                # Methods change state that is not declared: assume it changed.
+                mark = ts_mark_change(o, bitstruct, ctx, method)
+                if mark is not None:
+                    codegen.line(mark)
+            case Log(parts=parts) if ctx.log_mode == 'deferred':
+                # Record the format id and the raw values; the string is only
+                # built if the message is displayed.
+                (format_id, args) = ts_deferred_log(bitstruct, parts, ctx.log_formats)
+                codegen.line(f'log.record({format_id}){"".join(f".arg({arg})" for arg in args)};')
+            case Log(parts=parts):
+                codegen.line(f'log.add(`{ts_log_string(parts)}`);')
+            case Resolve(var=v, map=m, key=k):
+                codegen.line(f'{v} = {ts_expr(m)}.get({ts_expr(k)});')
+                with codegen.block(f'if ({v} == undefined) {{') as b:
+                    b.line(f'{v} = new {ts_element_class(bitstruct.element_structs[v][0])}({ts_expr(k)});')
+                    b.line(f'{ts_expr(m)}.set({ts_expr(k)}, {v});')
+                    mark = ts_mark_change(m, bitstruct, ctx)
+                    if mark is not None:
+                        b.line(mark)
+            case Switch(expr=e, cases=cases):
+                with codegen.block(f'switch ({ts_expr(e)}) {{') as cgn:
+                    for (values, body) in cases:
+                        if values is None:
+                            cgn.line('default:')
+                        else:
+                            for v in values:
+                                cgn.line(f'case {v}:')
+                        with cgn.non_block_indent() as cgn2:
+                            emit_ts_actions(cgn2, body, bitstruct, ctx)
+                            cgn2.line('break;')
+                            cgn2.line()
+
+def emit_ts_field(codegen, f, live_vars, log_mode):
+    codegen.line(f'// Field {f.name}: {f.typ} at +{f.pos}, width {f.typ.width}.')
+    if not f.typ.output or f.name == '_':
+        return
+    # Elements are computed unconditionally: actions test block validity
+    # themselves.
+    elements = list(f.elements())
+    for (var, masks, shifts) in elements:
+        if var in live_vars or f.name in live_vars:
+            codegen.line(f'const {var} = {f.typ.conv(field_element_expr(masks, shifts))};')
+    # Add summary constant for logging, where invalid elements are null.
+    # Deferred logs record the elements instead.
+    if f.typ.num > 1 and f.name in live_vars and log_mode == 'eager':
+        codegen.line(
+            f'const {f.name} = [' +
+            ', '.join(f'{ts_guard(block_atoms(masks))} ? {var} : null'
+                for (var, masks, _) in elements) +
+            '];')
+
+def emit_ts_null_counters(codegen, bitstruct, ctx):
+    """Emits the counting of the fields that are null because a block failed."""
+    # Fields that depend on the same blocks share a test. A field of several
+    # elements counts as null if any of them is.
+    by_mask = {}
+    for f in bitstruct.fields:
+        if not f.typ.output or f.name == '_':
+            continue
+        mask = 0
+        for (_, masks, _) in f.elements():
+            mask |= ts_ok_mask(block_atoms(masks))
+        if mask != 0:
+            by_mask.setdefault(mask, []).append(f.name)
+    for (mask, names) in by_mask.items():
+        with codegen.block(f'if ((ok & {mask:#06b}) != {mask:#06b}) {{') as cgn:
+            for name in names:
+                cgn.line(f'PARSE_STATS.nullFields[{len(ctx.stats_fields)}]++;  // {name}')
+                ctx.stats_fields.append(f'{bitstruct.name}.{name}')
+
+def emit_ts_memo_probe(codegen, bitstruct, ctx):
+    """Emits the early return of a memoized parse function on a cache hit."""
+    args = f'Rule.{bitstruct.name}, block, ok, {next(iter(bitstruct.arguments))}, {ctx.memo_version(bitstruct.name)}'
+    codegen.line(f'const memoSlot = PARSE_MEMO.slot(Rule.{bitstruct.name}, block, ok);')
+    with codegen.block(f'if (PARSE_MEMO.matches(memoSlot, {args})) {{') as cgn:
+        if ctx.stats:
+            cgn.line(f'PARSE_STATS.time[Rule.{bitstruct.name}] += PARSE_STATS.clock() - clockStart;')
+        cgn.line('return;')
+    return args
+
+def emit_ts_write_counters(codegen, bitstruct, ctx):
+    """Emits the increments of the write counters of the paths memoized rules depend on."""
+    writes = direct_effects(bitstruct).writes
+    for (i, p) in enumerate(ctx.memo_paths):
+        if any(paths_overlap(w, p) for w in writes):
+            codegen.line(f'PARSE_MEMO.writes[{i}]++;  // {".".join(p)}')
+
+def compile_bitstruct(codegen, bitstruct, ctx):
+    arguments = bitstruct.arguments
+    ctx.roots = {n: (n,) for n in arguments}
+    collect_effects(bitstruct.actions, ctx.roots, Effects())
+
+    with codegen.block(f'export function parse_{bitstruct.name}(block: Uint16Array, ok: number, log: LogMessage{build_argument_list(arguments, with_types=True)}) {{') as cgn:
+        if ctx.stats:
+            cgn.line(f'PARSE_STATS.hits[Rule.{bitstruct.name}]++;')
+            cgn.line('const clockStart = PARSE_STATS.clock();')
+        if bitstruct.name in ctx.memoized:
+            memo_args = emit_ts_memo_probe(cgn, bitstruct, ctx)
+        emit_ts_write_counters(cgn, bitstruct, ctx)
+        for f in bitstruct.fields:
+            emit_ts_field(cgn, f, bitstruct.live_vars, ctx.log_mode)
+        if ctx.stats:
+            emit_ts_null_counters(cgn, bitstruct, ctx)
 
         cgn.line()
         cgn.line('// Actions.')
-        for st in subtrees_of_type(cc, 'action'):
-            compile_action(cgn, st, arguments)
-        
+        for v in bitstruct.elements:
+            cgn.line(f'let {v}: {bitstruct.element_structs[v][0]} | undefined;')
+        emit_ts_actions(cgn, bitstruct.actions, bitstruct, ctx)
+        if bitstruct.name in ctx.memoized:
+            cgn.line(f'PARSE_MEMO.store(memoSlot, {memo_args});')
+        if ctx.stats:
+            cgn.line(f'PARSE_STATS.time[Rule.{bitstruct.name}] += PARSE_STATS.clock() - clockStart;')
+
     cgn.line()
 
+def ts_element_class(struct_name):
+    """Returns the class of the elements of maps of `struct_name`, implemented in rds_types.ts."""
+    return f'{struct_name}Impl'
+
 def compile_vartype(t):
     """Returns a pair: a type-string and a boolean telling if the field can be undefined."""
     match t:
@@ -606,7 +1335,7 @@ def compile_vartype(t):
         case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='str'), _]):
             return ('RdsString', False)
         case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='tag')]):
-            return ('string', True)
+            return ('Rule', True)
         case lark.Tree(data='maptype', children=[lark.Tree() as keytype, lark.Tree() as valuetype]):
             return (f'Map<{compile_vartype(keytype)[0]}, {compile_vartype(valuetype)[0]}>', False)
         # Allow user-defined types to be used as-is in struct fields. In that
@@ -616,9 +1345,11 @@ def compile_vartype(t):
         case _:
             raise Exception(f'Unhandled vartype: {t}')
 
-def compile_struct(codegen, cc):
+def compile_struct(codegen, cc, change_fields=None):
     struct_name = pick_child_token(cc, 'ID')
     with codegen.block(f'export interface {struct_name} {{') as cgn:
+        if change_fields is not None:
+            cgn.line('changes: ChangeMask;')
         for st in subtrees_of_type(cc, 'vardecl'):
             match st:
                 case lark.Tree(data='vardecl', children=[
@@ -647,13 +1378,176 @@ def compile_struct(codegen, cc):
                 case v: print(f'WARNING: Unexpected vardecl: {v}')
     codegen.line()
 
-def compile(codegen, t):
+    if change_fields is not None:
+        codegen.line(f'// Bits of {struct_name}.changes.')
+        with codegen.block(f'export enum {struct_name}Field {{') as cgn:
+            for name in change_fields:
+                cgn.line(f'{name},')
+        codegen.line(f'export const {struct_name.upper()}_FIELD_COUNT = {len(change_fields)};')
+        codegen.line()
+
+def struct_change_fields(cc):
+    """Returns the bits of the change mask of a struct: its fields, then its methods."""
+    return (
+        [pick_child_token(st.children, 'ID') for st in subtrees_of_type(cc, 'vardecl')] +
+        [pick_child_token(st.children, 'ID') for st in subtrees_of_type(cc, 'methoddecl')])
+
+# Struct snapshots.
+
+def snapshot_kind(t, struct_names):
+    """Returns how a struct field or map value of type `t` is snapshotted."""
+    match t:
+        case lark.Tree(data='vartype', children=[x]):
+            return snapshot_kind(x, struct_names)
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='uint'), _]):
+            return 'number'
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='bool')]):
+            return 'boolean'
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='tag')]):
+            return 'Rule'
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='str'), _]):
+            return 'RdsString'
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value=name)]) if name in struct_names:
+            return ('struct', name)
+        case lark.Tree(data='maptype', children=[k, v]) if snapshot_kind(k, struct_names) == 'number':
+            return ('map', snapshot_kind(v, struct_names))
+    raise Exception(f'Cannot snapshot values of type {t}')
+
+def struct_snapshot_fields(cc, struct_names):
+    """Returns the (name, kind) of the fields of a struct."""
+    return [
+        (pick_child_token(st.children, 'ID'), snapshot_kind(subtree_of_type(st.children, 'vartype'), struct_names))
+        for st in subtrees_of_type(cc, 'vardecl')]
+
+def compile_struct_snapshot(codegen, cc, struct_names):
+    name = pick_child_token(cc, 'ID')
+    fields = struct_snapshot_fields(cc, struct_names)
+    # Fields that may be undefined have a presence flag. Booleans are entirely
+    # stored as flags.
+    optional = [(n, k) for (n, k) in fields if k in ('number', 'boolean', 'Rule')]
+
+    with codegen.block(f'export function serialize_{name}(s: {name}, w: SnapshotWriter) {{') as cgn:
+        for (n, k) in optional:
+            cgn.line(f'w.flag(s.{n} != undefined);')
+            if k == 'boolean':
+                cgn.line(f'w.flag(s.{n} == true);')
+        for (n, k) in fields:
+            match k:
+                case 'number' | 'Rule':
+                    with cgn.block(f'if (s.{n} != undefined) {{') as blk:
+                        blk.line(f'w.varint(s.{n});')
+                case 'RdsString':
+                    cgn.line(f's.{n}.serialize(w);')
+                case ('struct', t):
+                    cgn.line(f'serialize_{t}(s.{n}, w);')
+                case ('map', v):
+                    cgn.line(f'w.varint(s.{n}.size);')
+                    with cgn.block(f'for (const [k, v] of s.{n}) {{') as blk:
+                        blk.line('w.varint(k);')
+                        blk.line(f'serialize_{v[1]}(v, w);' if isinstance(v, tuple) else 'w.varint(v);')
+    codegen.line()
+
+    with codegen.block(f'export function deserialize_{name}(s: {name}, r: SnapshotReader) {{') as cgn:
+        for (n, k) in optional:
+            cgn.line(f'const has_{n} = r.flag();')
+            if k == 'boolean':
+                cgn.line(f'const {n} = r.flag();')
+        for (n, k) in fields:
+            match k:
+                case 'number' | 'Rule':
+                    cgn.line(f's.{n} = has_{n} ? r.varint() : undefined;')
+                case 'boolean':
+                    cgn.line(f's.{n} = has_{n} ? {n} : undefined;')
+                case 'RdsString':
+                    cgn.line(f's.{n}.deserialize(r);')
+                case ('struct', t):
+                    cgn.line(f'deserialize_{t}(s.{n}, r);')
+                case ('map', v):
+                    cgn.line(f's.{n}.clear();')
+                    with cgn.block('for (let n = r.varint(); n > 0; n--) {') as blk:
+                        blk.line('const k = r.varint();')
+                        if isinstance(v, tuple):
+                            blk.line(f'const v = new {ts_element_class(v[1])}(k);')
+                            blk.line(f'deserialize_{v[1]}(v, r);')
+                            blk.line(f's.{n}.set(k, v);')
+                        else:
+                            blk.line(f's.{n}.set(k, r.varint());')
+    codegen.line()
+
+def snapshot_format(structs, rules):
+    """Returns an identifier of the snapshot layout, which changes along with it."""
+    # Rules are stored by ID.
+    digest = hashlib.sha256(repr((structs, rules)).encode('utf8')).hexdigest()
+    return int(digest[:7], 16)
+
+# Symbols that lazily loaded modules may import from other modules than the
+# main one.
+TS_RUNTIME_SYMBOLS = {
+    'formatAf': 'af',
+    'LogMessage': 'rds_types',
+    'RDS_CHARMAP': 'rds_types',
+}
+
+def compile_typescript(codegen, t, log_mode='eager', stats=False, memo=False, split=None):
+    """Compiles a protocol description to TypeScript.
+
+    If `split` is a Split, the rules that partition_rules assigns to other
+    modules than the main one are compiled to `split.modules`.
+    """
+    ctx = TsContext(log_mode, stats=stats)
+    # Rules get integer IDs, in declaration order, so that the dynamic
+    # dispatch from maps is a mere array lookup.
+    ctx.rules.extend(pick_child_token(c.children, 'ID') for c in subtrees_of_type(t.children, 'bitstruct'))
+    structs = struct_field_types(t)
+    bitstructs = {
+        pick_child_token(st.children, 'ID'): type_elements(
+            optimize(lower_bitstruct(st.children, ctx.rules, logs=log_mode != 'none')), structs)
+        for st in subtrees_of_type(t.children, 'bitstruct')}
+    element_classes = [ts_element_class(n) for n in map_element_structs(structs)]
+    # Source file of the rules of lazily loaded modules.
+    lazy_sources = {}
+    if split is not None:
+        lazy_sources = {
+            n: source for (n, source) in partition_rules(bitstructs, split.origins, split.main).items()
+            if source is not None}
+        ctx.lazy = len(lazy_sources) > 0
+    # Modules by source file, in declaration order.
+    modules = {source: io.StringIO() for source in lazy_sources.values()}
+
     codegen.line('// Generated file. DO NOT EDIT.')
     codegen.line()
     codegen.line('import { formatAf } from "./af";')
-    codegen.line('import { RDS_CHARMAP, LogMessage, RdsString, StationImpl } from "./rds_types";')
+    codegen.line('import { ChangeMask } from "./change_mask";')
+    if ctx.lazy:
+        codegen.line('import { LazyModule } from "./lazy_module";')
+    codegen.line('import { ParseMemo } from "./parse_memo";')
+    codegen.line('import { ParseStats } from "./parse_stats";')
+    codegen.line(f'import {{ {", ".join(["RDS_CHARMAP", "LogArg", "LogMessage", "RdsString"] + element_classes)} }} from "./rds_types";')
+    codegen.line('import { SnapshotReader, SnapshotWriter } from "./snapshot";')
     codegen.line()
 
+    with codegen.block('export enum Rule {') as blk:
+        for rule_id in ctx.rules:
+            blk.line(f'{rule_id},')
+    codegen.line()
+
+    struct_names = {pick_child_token(st.children, 'ID') for st in subtrees_of_type(t.children, 'struct')}
+    # Structs passed to parse functions record which of their fields change.
+    for st in subtrees_of_type(t.children, 'struct'):
+        name = pick_child_token(st.children, 'ID')
+        if any(name in b.arguments.values() for b in bitstructs.values()):
+            ctx.change_fields[name] = struct_change_fields(st.children)
+    if memo:
+        # Memoize the idempotent rules with a single argument, which is then
+        # part of the cache key along with the group.
+        ctx.effects = analyze_effects(bitstructs)
+        ctx.memoized = {
+            name for (name, e) in ctx.effects.items()
+            if e.idempotent and len(e.writes) > 0 and len(bitstructs[name].arguments) == 1}
+        ctx.memo_paths = sorted(set().union(*(ctx.effects[name].writes for name in ctx.memoized)))
+
+    imported_symbols = dict(TS_RUNTIME_SYMBOLS)
+    imported_symbols.update((c, 'rds_types') for c in element_classes)
     for c in t.children:
         match c:
             case lark.Tree(data='import', children=[
@@ -661,58 +1555,999 @@ def compile(codegen, t):
                 lark.Token(type='ID', value=symbol_name)]):
                 codegen.line(f'import {{ {symbol_name} }} from "./{module_name}";')
                 codegen.line('\n')
+                imported_symbols[symbol_name] = module_name
             case lark.Tree(data='struct', children=cc):
-                compile_struct(codegen, cc)
+                compile_struct(codegen, cc, ctx.change_fields.get(pick_child_token(cc, 'ID')))
+                compile_struct_snapshot(codegen, cc, struct_names)
             case lark.Tree(data='bitstruct', children=cc):
-                compile_bitstruct(codegen, cc)
+                name = pick_child_token(cc, 'ID')
+                if name in lazy_sources:
+                    compile_bitstruct(CodeGenerator(of=modules[lazy_sources[name]]), bitstructs[name], ctx)
+                else:
+                    compile_bitstruct(codegen, bitstructs[name], ctx)
             case lark.Tree(data=d, children=cc):
                 print(f'Unhandled {d}')
             case _:
                 print('z')
 
-    with codegen.block('export function get_parse_function(rule: string) {') as blk1:
-        with blk1.block('switch (rule) {') as blk2:
-            for (rule_id, ts_func) in rules.items():
-                blk2.line(f'case "{rule_id}": return {ts_func};')
-        blk2.line('throw new RangeError("Invalid rule: " + rule);')
+    # Lazily loaded modules use what the main module exports.
+    export = 'export ' if ctx.lazy else ''
+
+    # Scratch buffer for copying byte fields. A group holds at most 8 bytes.
+    codegen.line(f'{export}const BYTE_SCRATCH = new Uint8Array(8);')
+    codegen.line()
+
+    if ctx.lazy:
+        codegen.line('// Lazily loaded modules, by source file.')
+        codegen.line('export const PARSE_MODULES = {')
+        with codegen.non_block_indent() as blk1:
+            for source in modules:
+                key = split.key(source)
+                blk1.line(f'{key}: new LazyModule("{key}", () => import("./{split.module_name(source)}"), () => PARSE_FUNCTIONS),')
+        codegen.line('};')
+        codegen.line()
+        codegen.line('// Parse functions, indexed by rule ID. The rules of a lazily loaded module')
+        codegen.line('// have stubs of the module until it is loaded.')
+    codegen.line('export const PARSE_FUNCTIONS = [')
+    with codegen.non_block_indent() as blk1:
+        for rule_id in ctx.rules:
+            if rule_id in lazy_sources:
+                blk1.line(f'PARSE_MODULES.{split.key(lazy_sources[rule_id])}.stub(Rule.{rule_id}),')
+            else:
+                blk1.line(f'parse_{rule_id},')
+    codegen.line('];')
+    codegen.line()
+    with codegen.block('export function get_parse_function(rule: Rule) {') as blk1:
+        blk1.line('const f = PARSE_FUNCTIONS[rule];')
+        with blk1.block('if (f == undefined) {') as blk2:
+            blk2.line('throw new RangeError("Invalid rule: " + rule);')
+        blk1.line('return f;')
+
+    if ctx.lazy:
+        codegen.line()
+        codegen.line('// Module of each rule, undefined for the rules of this module.')
+        codegen.line('const RULE_MODULES = [')
+        with codegen.non_block_indent() as blk1:
+            for rule_id in ctx.rules:
+                if rule_id in lazy_sources:
+                    blk1.line(f'PARSE_MODULES.{split.key(lazy_sources[rule_id])},')
+                else:
+                    blk1.line('undefined,')
+        codegen.line('];')
+        codegen.line()
+        codegen.line('// Starts loading the module of `rule` if needed. Rules are loaded as soon as')
+        codegen.line('// they are mapped to a group type, so that they are ready for their groups.')
+        with codegen.block('export function load_rule(rule: Rule) {') as blk1:
+            blk1.line('RULE_MODULES[rule]?.load();')
+        codegen.line()
+        codegen.line('// Loads all the lazily loaded modules.')
+        with codegen.block('export function load_all_rules(): Promise<void> {') as blk1:
+            blk1.line('return Promise.all(Object.values(PARSE_MODULES).map((m) => m.load())).then(() => undefined);')
+
+    codegen.line()
+    codegen.line(f'// Decoding statistics{"" if stats else ", only updated if compiled with --stats"}.')
+    rule_names = 'PARSE_FUNCTIONS.map((_, rule) => Rule[rule])'
+    if stats:
+        codegen.line(f'export const PARSE_STATS = new ParseStats(true, {rule_names}, [')
+        with codegen.non_block_indent() as blk1:
+            for name in ctx.stats_fields:
+                blk1.line(f'"{name}",')
+        codegen.line(']);')
+    else:
+        codegen.line(f'export const PARSE_STATS = new ParseStats(false, {rule_names}, []);')
+    codegen.line()
+    if memo:
+        codegen.line('// Cache of the last groups parsed by idempotent rules, with one write counter')
+        codegen.line('// per path they write:')
+        for (i, p) in enumerate(ctx.memo_paths):
+            codegen.line(f'// {i}: {".".join(p)}')
+        codegen.line(f'export const PARSE_MEMO = new ParseMemo({len(ctx.memo_paths)});')
+    else:
+        codegen.line('// Cache of the groups parsed by idempotent rules, only used if compiled with --memo.')
+        codegen.line('export const PARSE_MEMO = new ParseMemo(0, 0);')
+    codegen.line()
+    structs = [
+        (pick_child_token(st.children, 'ID'), struct_snapshot_fields(st.children, struct_names))
+        for st in subtrees_of_type(t.children, 'struct')]
+    codegen.line('// Identifies the layout of snapshots, given to SnapshotWriter and SnapshotReader.')
+    codegen.line(f'export const SNAPSHOT_FORMAT = {snapshot_format(structs, ctx.rules):#x};')
+    codegen.line()
+    codegen.line('// Formats a log message recorded in deferred mode.')
+    with codegen.block('export function formatDeferredLog(format: number, args: ReadonlyArray<LogArg>, start: number): string {') as blk1:
+        with blk1.block('switch (format) {') as blk2:
+            for ((decls, logstr), format_id) in ctx.log_formats.items():
+                with blk2.block(f'case {format_id}: {{') as blk3:
+                    for (var, value) in decls:
+                        blk3.line(f'const {var} = {value};')
+                    blk3.line(f'return `{logstr}`;')
+        blk1.line('throw new RangeError("Invalid log format: " + format);')
 
     codegen.line()
-    with codegen.block('function formatRdsText(text: Array<number | null>): string {') as blk1:
+    with codegen.block(f'{export}function formatRdsText(text: Array<number | null>): string {{') as blk1:
         blk1.line('return text.map((c) => c == null ? "." : RDS_CHARMAP[c]).join("");')
 
     codegen.line()
-    with codegen.block('function formatBytes(bytes: Array<number | null>): string {') as blk1:
+    with codegen.block(f'{export}function formatBytes(bytes: Array<number | null>): string {{') as blk1:
         blk1.line('return bytes.map((b) => b == null ? ".." : b.toString(16).toUpperCase().padStart(2, "0")).join(" ");')
 
     codegen.line()
-    with codegen.block('function formatBcd(digit: number): string {') as blk1:
+    with codegen.block(f'{export}function formatBcd(digit: number): string {{') as blk1:
         blk1.line('return (digit >= 0 && digit <= 9) ? digit.toString() : " ";')
 
-l = Lark(grammar)
+    if split is not None:
+        main_symbols = (
+            {'Rule', 'BYTE_SCRATCH', 'PARSE_FUNCTIONS', 'PARSE_STATS', 'PARSE_MEMO', 'load_rule',
+             'formatRdsText', 'formatBytes', 'formatBcd'} |
+            struct_names | {f'{n}Field' for n in ctx.change_fields} |
+            {f'parse_{n}' for n in ctx.rules if n not in lazy_sources})
+        imported_symbols.update((s, split.module) for s in main_symbols)
+        for (source, body) in modules.items():
+            rules = [n for n in ctx.rules if lazy_sources.get(n) == source]
+            split.modules[split.module_name(source)] = ts_lazy_module(
+                split, source, body.getvalue(), rules, imported_symbols)
+        split.modules[f'{split.module}_eager'] = ts_eager_module(split, modules)
+
+def ts_lazy_module(split, source, body, rules, imported_symbols):
+    """Returns the code of the lazily loaded module of the rules of `source`."""
+    used = set(re.findall(r'[A-Za-z_][A-Za-z0-9_]*', body)) | {'PARSE_FUNCTIONS', 'Rule'}
+    imports = {}
+    for symbol in sorted(used & imported_symbols.keys()):
+        imports.setdefault(imported_symbols[symbol], []).append(symbol)
+    of = io.StringIO()
+    codegen = CodeGenerator(of=of)
+    codegen.line('// Generated file. DO NOT EDIT.')
+    codegen.line(f'// Rules of {os.path.basename(source)}, loaded on demand by {split.module}.ts.')
+    codegen.line()
+    for module in sorted(imports):
+        codegen.line(f'import {{ {", ".join(imports[module])} }} from "./{module}";')
+    codegen.line()
+    of.write(body)
+    codegen.line('// Replace the stubs of the rules of this module.')
+    for n in rules:
+        codegen.line(f'PARSE_FUNCTIONS[Rule.{n}] = parse_{n};')
+    return of.getvalue()
+
+def ts_eager_module(split, modules):
+    """Returns the code of a module loading all the lazily loaded modules upfront."""
+    of = io.StringIO()
+    codegen = CodeGenerator(of=of)
+    codegen.line('// Generated file. DO NOT EDIT.')
+    codegen.line(f'// Loads all the modules of {split.module}.ts upfront, for programs that decode')
+    codegen.line('// everything from the first group, such as tests.')
+    codegen.line()
+    for source in modules:
+        codegen.line(f'import "./{split.module_name(source)}";')
+    return of.getvalue()
+
+def numpy_element_expr(masks, shifts):
+    """Returns a NumPy expression extracting a field element from the (N, 4) `blocks` array."""
+    blocks = [b for b in range(4) if masks[b] != 0]
+    # Fields spanning several blocks need more than 16 bits for the shifts.
+    wide = len(blocks) > 1
+    ops = []
+    for b in blocks:
+        column = f'blocks[:, {b}].astype(np.uint32)' if wide else f'blocks[:, {b}]'
+        if masks[b] != 65535:
+            column = f'({column} & {bin(masks[b])})'
+        if shifts[b] < 0:
+            column = f'({column} << {-shifts[b]})'
+        elif shifts[b] > 0:
+            column = f'({column} >> {shifts[b]})'
+        ops.append(column)
+    return ' | '.join(ops)
+
+def numpy_mask_expr(masks):
+    """Returns a NumPy expression of the mask of a field element (True where a block is bad)."""
+    oks = [f'ok[:, {b}]' for b in range(4) if masks[b] != 0]
+    if len(oks) == 1:
+        return f'~{oks[0]}'
+    return f'~({" & ".join(oks)})'
+
+def compile_numpy_field(codegen, st, pos, fields):
+    cc = st.children
+    field = pick_child_token(cc, 'ID')
+    typ = parse_type(subtree_of_type(cc, 'type'))
+    codegen.line(f'# Field {field}: {typ} at +{pos}, width {typ.width}.')
+    end_pos = pos + typ.width
+    if typ.output and field != '_':
+        fields.append((field, str(typ)))
+        match typ:
+            case Byte():
+                values = []
+                masks = []
+                for i in range(typ.num):
+                    (m, s) = field_extent(pos + i * typ.elemwidth, typ.elemwidth)
+                    values.append(f'({numpy_element_expr(m, s)}).astype(np.uint8)')
+                    masks.append(numpy_mask_expr(m))
+                codegen.line(f"fields['{field}'] = np.ma.MaskedArray(")
+                with codegen.non_block_indent() as cgn:
+                    cgn.line(f'np.stack([{", ".join(values)}], axis=1),')
+                    cgn.line(f'mask=np.stack([{", ".join(masks)}], axis=1))')
+            case Bool():
+                (m, s) = field_extent(pos, typ.width)
+                codegen.line(f"fields['{field}'] = np.ma.MaskedArray(")
+                with codegen.non_block_indent() as cgn:
+                    cgn.line(f'({numpy_element_expr(m, s)}) == 1,')
+                    cgn.line(f'mask={numpy_mask_expr(m)})')
+            case _:
+                (m, s) = field_extent(pos, typ.width)
+                codegen.line(f"fields['{field}'] = np.ma.MaskedArray(")
+                with codegen.non_block_indent() as cgn:
+                    cgn.line(f'{numpy_element_expr(m, s)},')
+                    cgn.line(f'mask={numpy_mask_expr(m)})')
+    return end_pos
 
-infile = sys.argv[1]
-outfile = sys.argv[2]
-include_dir = os.path.dirname(infile)
+def compile_numpy_bitstruct(codegen, cc, extractors):
+    i = pick_child_token(cc, 'ID')
+    fields = []
+    codegen.line(f'def extract_{i}(blocks, ok):')
+    with codegen.non_block_indent() as cgn:
+        cgn.line(f'"""Extracts the fields of bitstruct {i} from N groups."""')
+        cgn.line('(blocks, ok) = _check_arrays(blocks, ok)')
+        cgn.line('fields = {}')
+        pos = 0
+        for st in subtrees_of_type(cc, 'decl'):
+            pos = compile_numpy_field(cgn, st, pos, fields)
+        if pos != 64:
+            raise Exception(f'Inconsistent group length: {pos}.')
+        cgn.line('return fields')
+    codegen.line()
+    codegen.line()
+    extractors[i] = fields
 
-f = open(infile, encoding="utf8")
-lines = f.readlines()
+def compile_numpy(codegen, t, log_mode=None, stats=False, memo=False):
+    # Actions are not compiled, so the other options are irrelevant here.
+    codegen.line('# Generated file. DO NOT EDIT.')
+    codegen.line()
+    codegen.line('"""Vectorized field extractors for the bitstructs of the RDS protocol.')
+    codegen.line()
+    codegen.line('Each extract_<bitstruct> function takes an (N, 4) array of blocks and an')
+    codegen.line('(N, 4) array of block validity flags, and returns a dict mapping field names')
+    codegen.line('to masked arrays with one entry per group (N x num for byte<num> fields).')
+    codegen.line('An entry is masked when one of the blocks it spans was bad. Actions are not')
+    codegen.line('executed: selecting the groups a bitstruct applies to is up to the caller.')
+    codegen.line('"""')
+    codegen.line()
+    codegen.line('import numpy as np')
+    codegen.line()
+    codegen.line()
+    codegen.line('def _check_arrays(blocks, ok):')
+    with codegen.non_block_indent() as cgn:
+        cgn.line('blocks = np.asarray(blocks, dtype=np.uint16)')
+        cgn.line('ok = np.asarray(ok, dtype=np.bool_)')
+        cgn.line('if blocks.ndim != 2 or blocks.shape[1] != 4 or ok.shape != blocks.shape:')
+        with cgn.non_block_indent() as cgn2:
+            cgn2.line("raise ValueError(f'Expected (N, 4) blocks and validity arrays, got {blocks.shape} and {ok.shape}.')")
+        cgn.line('return (blocks, ok)')
+    codegen.line()
+    codegen.line()
 
-preprocessed_lines = []
-# Preprocessor.
-for li in lines:
-    if li.startswith('#include '):
-        included_file = li.split(' ')[1].strip()
-        incl_f = open(os.path.join(include_dir, included_file), encoding='utf8')
-        incl_lines = incl_f.readlines()
-        preprocessed_lines.extend(incl_lines)
-    else:
-        preprocessed_lines.append(li)
+    extractors = {}
+    for c in t.children:
+        match c:
+            case lark.Tree(data='bitstruct', children=cc):
+                compile_numpy_bitstruct(codegen, cc, extractors)
+
+    codegen.line('# Fields output by each bitstruct, as (name, type) pairs.')
+    codegen.line('FIELDS = {')
+    with codegen.non_block_indent() as cgn:
+        for (rule, fields) in extractors.items():
+            cgn.line(f"'{rule}': {tuple(fields)!r},")
+    codegen.line('}')
+    codegen.line()
+    codegen.line('EXTRACTORS = {')
+    with codegen.non_block_indent() as cgn:
+        for rule in extractors:
+            cgn.line(f"'{rule}': extract_{rule},")
+    codegen.line('}')
+    codegen.line()
+    codegen.line()
+    codegen.line('def extract(rule, blocks, ok):')
+    with codegen.non_block_indent() as cgn:
+        cgn.line('"""Extracts the fields of the bitstruct named `rule` from N groups."""')
+        cgn.line('return EXTRACTORS[rule](blocks, ok)')
+
+# Python emission.
+#
+# The Python backend runs the actions too, for headless decoding. Its output
+# mirrors the TypeScript decoder: one parse_<bitstruct> function per rule, and
+# one class per struct. Decoding statistics, memoization and snapshots are
+# TypeScript-only.
+
+def py_expr(e):
+    match e:
+        case Var(name='true'):
+            return 'True'
+        case Var(name='false'):
+            return 'False'
+        case Var(name=n) | Element(var=n):
+            return n
+        case Const(value=v):
+            return str(v)
+        case RuleRef(name=n):
+            return f'Rule.{n}'
+        case Member(obj=o, name=n):
+            return f'{py_expr(o)}.{n}'
+        case Lookup(map=m, key=k, default=d):
+            return f'{py_expr(m)}.get({py_expr(k)}, {py_expr(d)})'
+        case BinOp(op='*', left=l, right=r):
+            return f'{py_operand(l)}*{py_operand(r)}'
+        case BinOp(op=op, left=l, right=r):
+            return f'{py_expr(l)} {op} {py_expr(r)}'
+
+def py_operand(e):
+    """Returns a Python expression usable as an operand of `*`."""
+    match e:
+        case BinOp(op='+'):
+            return f'({py_expr(e)})'
+        case _:
+            return py_expr(e)
+
+def py_tuple(items):
+    items = list(items)
+    return f'({items[0]},)' if len(items) == 1 else f'({", ".join(items)})'
+
+def py_guard(guard):
+    mask = ts_ok_mask(guard)
+    elements = sorted(a.var for a in guard if isinstance(a, Defined))
+    return ' and '.join(
+        ([f'(ok & {mask:#06b}) == {mask:#06b}'] if mask != 0 else []) +
+        [f'{v} is not None' for v in elements])
+
+def py_valid_mask(value_guards):
+    """Returns an expression of the mask of the valid values of a SetBytes action."""
+    masks = {}
+    for (i, g) in enumerate(value_guards):
+        masks[ts_ok_mask(g)] = masks.get(ts_ok_mask(g), 0) | (1 << i)
+    return ' | '.join(
+        f'({bin(value_mask)} if (ok & {ok_mask:#06b}) == {ok_mask:#06b} else 0)'
+        for (ok_mask, value_mask) in masks.items())
+
+def py_format_expr(var, fmt):
+    """Returns the replacement field of an f-string formatting `var` with a log format."""
+    # Nested string literals use double quotes, as f-strings use single quotes.
+    match fmt:
+        case 'bool':
+            return f'{{"1" if {var} else "0"}}'
+        case 'u':
+            return f'{{{var}}}'
+        case '02u':
+            return f'{{{var}:02d}}'
+        case '02x':
+            return f'{{{var}:02X}}'
+        case '04x':
+            return f'{{{var}:04X}}'
+        case 'bcd':
+            return f'{{format_bcd({var})}}'
+        case 'grouptype':
+            return f'{{{var} >> 1}}{{"A" if ({var} & 1) == 0 else "B"}}'
+        case 'freq':
+            return f'{{format_af({var})}}'
+        case 'rdschar':
+            return f'{{RDS_CHARMAP[{var}]}}'
+        case 'rdstext':
+            return f'{{format_rds_text({var})}}'
+        case 'bytes':
+            return f'{{format_bytes({var})}}'
+        case 'letter':
+            return f'{{"A" if {var} else "B"}}'
+        case 'sign':
+            return f'{{"+" if {var} else "-"}}'
+        case _:
+            raise Exception(f'Unknwon log format string: "{fmt}"')
+
+def py_log_string(parts):
+    logstr = ''
+    for p in parts:
+        match p:
+            case (var, fmt):
+                logstr += py_format_expr(var, fmt)
+            case _:
+                logstr += p.replace('\\', '\\\\').replace("'", "\\'").replace('{', '{{').replace('}', '}}')
+    # Plain string literals need no escaped braces.
+    if not any(isinstance(p, tuple) for p in parts):
+        return repr(''.join(parts))
+    return f"f'{logstr}'"
+
+@dataclass
+class PyContext:
+    """State of the compilation of a protocol description to Python."""
+    log_mode: str
+    change_fields: dict = dataclasses.field(default_factory=dict)
+    roots: dict = dataclasses.field(default_factory=dict)
+
+def py_mark_change(target, bitstruct, ctx, method=None):
+    """Returns the statement marking a change of `target`, or None. See ts_mark_change."""
+    bit = change_bit(target, bitstruct, ctx, method)
+    if bit is None:
+        return None
+    (arg, typ, name) = bit
+    return f'{arg}.changes |= {1 << ctx.change_fields[typ].index(name):#x}  # {name}'
+
+def emit_py_actions(codegen, actions, bitstruct, ctx):
+    arguments = bitstruct.arguments
+    for a in actions:
+        match a:
+            case Guarded(guard=g, actions=aa):
+                codegen.line(f'if {py_guard(g)}:')
+                emit_py_actions(codegen.non_block_indent(), aa, bitstruct, ctx)
+            case Assign(target=t, value=v):
+                mark = py_mark_change(t, bitstruct, ctx)
+                if mark is None:
+                    codegen.line(f'{py_expr(t)} = {py_expr(v)}')
+                else:
+                    codegen.line(f'if {py_expr(t)} != {py_expr(v)}:')
+                    with codegen.non_block_indent() as cgn:
+                        cgn.line(f'{py_expr(t)} = {py_expr(v)}')
+                        cgn.line(mark)
+            case SetBytes(target=t, index=i, values=values, value_guards=value_guards):
+                set_bytes = f'{py_expr(t)}.set_bytes({py_expr(i)}, {py_tuple(values)}, {py_valid_mask(value_guards)})'
+                mark = py_mark_change(t, bitstruct, ctx)
+                if mark is None:
+                    codegen.line(set_bytes)
+                else:
+                    codegen.line(f'if {set_bytes}:')
+                    codegen.non_block_indent().line(mark)
+            case Put(map=m, key=k, value=v):
+                mark = py_mark_change(m, bitstruct, ctx)
+                if mark is None:
+                    codegen.line(f'{py_expr(m)}[{py_expr(k)}] = {py_expr(v)}')
+                else:
+                    codegen.line(f'if {py_expr(m)}.get({py_expr(k)}) != {py_expr(v)}:')
+                    with codegen.non_block_indent() as cgn:
+                        cgn.line(f'{py_expr(m)}[{py_expr(k)}] = {py_expr(v)}')
+                        cgn.line(mark)
+            case Parse(rule=RuleRef(name=n)):
+                codegen.line(f'parse_{n}(block, ok, log{build_argument_list(arguments, with_types=False)})')
+            case Parse(rule=r):
+                codegen.line(f'PARSE_FUNCTIONS[{py_expr(r)}](block, ok, log{build_argument_list(arguments, with_types=False)})')
+            case Invoke(obj=o, method=method, args=args):
+                codegen.line(f'{py_expr(o)}.{method}({", ".join(map(py_expr, args))})')
+                mark = py_mark_change(o, bitstruct, ctx, method)
+                if mark is not None:
+                    codegen.line(mark)
+            case Log(parts=parts):
+                codegen.line(f'log.append({py_log_string(parts)})')
+            case Resolve(var=v, map=m, key=k):
+                codegen.line(f'{v} = {py_expr(m)}.get({py_expr(k)})')
+                codegen.line(f'if {v} is None:')
+                with codegen.non_block_indent() as b:
+                    # New elements share the call list of the argument they
+                    # are reached from.
+                    (struct, key_field) = bitstruct.element_structs[v]
+                    b.line(f'{v} = {struct}({member_path(m, ctx.roots)[0]}.calls)')
+                    b.line(f'{v}.{key_field} = {py_expr(k)}')
+                    b.line(f'{py_expr(m)}[{py_expr(k)}] = {v}')
+                    mark = py_mark_change(m, bitstruct, ctx)
+                    if mark is not None:
+                        b.line(mark)
+            case Switch(expr=e, cases=cases):
+                codegen.line(f'match {py_expr(e)}:')
+                with codegen.non_block_indent() as cgn:
+                    # The default case must come last.
+                    for (values, body) in sorted(cases, key=lambda c: c[0] is None):
+                        cgn.line(f'case {"_" if values is None else " | ".join(map(str, values))}:')
+                        with cgn.non_block_indent() as cgn2:
+                            if len(body) == 0:
+                                cgn2.line('pass')
+                            emit_py_actions(cgn2, body, bitstruct, ctx)
+
+def emit_py_field(codegen, f, live_vars, log_mode):
+    codegen.line(f'# Field {f.name}: {f.typ} at +{f.pos}, width {f.typ.width}.')
+    if not f.typ.output or f.name == '_':
+        return
+    elements = list(f.elements())
+    for (var, masks, shifts) in elements:
+        if var in live_vars or f.name in live_vars:
+            codegen.line(f'{var} = {f.typ.conv(field_element_expr(masks, shifts))}')
+    if f.typ.num > 1 and f.name in live_vars and log_mode != 'none':
+        codegen.line(
+            f'{f.name} = ' + py_tuple(
+                f'{var} if {py_guard(block_atoms(masks))} else None'
+                for (var, masks, _) in elements))
+
+def compile_py_bitstruct(codegen, bitstruct, ctx):
+    ctx.roots = {n: (n,) for n in bitstruct.arguments}
+    collect_effects(bitstruct.actions, ctx.roots, Effects())
+
+    codegen.line(f'def parse_{bitstruct.name}(block, ok, log{build_argument_list(bitstruct.arguments, with_types=False)}):')
+    with codegen.non_block_indent() as cgn:
+        for f in bitstruct.fields:
+            emit_py_field(cgn, f, bitstruct.live_vars, ctx.log_mode)
+        cgn.line()
+        cgn.line('# Actions.')
+        for v in bitstruct.elements:
+            cgn.line(f'{v} = None')
+        emit_py_actions(cgn, bitstruct.actions, bitstruct, ctx)
+        if len(bitstruct.elements) == 0 and len(bitstruct.actions) == 0:
+            cgn.line('pass')
+    codegen.line()
+    codegen.line()
+
+def py_field_default(t):
+    """Returns the expression of the initial value of a struct field of type `t`."""
+    match t:
+        case lark.Tree(data='vartype', children=[x]):
+            return py_field_default(x)
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='str'), lark.Token(value=n)]):
+            return f'RdsString({n})'
+        case lark.Tree(data='maptype'):
+            return '{}'
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value='uint' | 'bool' | 'tag'), *_]):
+            return 'None'
+        case lark.Tree(data='simplevartype', children=[lark.Token(type='ID', value=typename)]):
+            # Nested structs record their method calls along with their parent.
+            return f'{typename}(self.calls)'
+    raise Exception(f'Unhandled vartype: {t}')
+
+def compile_py_struct(codegen, cc, change_fields=None):
+    name = pick_child_token(cc, 'ID')
+    fields = [
+        (pick_child_token(st.children, 'ID'), py_field_default(subtree_of_type(st.children, 'vartype')))
+        for st in subtrees_of_type(cc, 'vardecl')]
+    slots = ['calls'] + (['changes'] if change_fields is not None else []) + [n for (n, _) in fields]
+
+    codegen.line(f'class {name}:')
+    with codegen.non_block_indent() as cgn:
+        cgn.line(f'"""Struct {name}. Fields are None until they are received.')
+        cgn.line()
+        cgn.line('Methods append (object, method name, arguments) tuples to `calls`, which')
+        cgn.line('is shared with nested structs. Override them to act on calls directly.')
+        if change_fields is not None:
+            cgn.line(f'Bit i of `changes` is set when {name}Field i changes.')
+        cgn.line('"""')
+        cgn.line()
+        cgn.line('__slots__ = (')
+        with cgn.non_block_indent() as cgn2:
+            for s in slots:
+                cgn2.line(f"'{s}',")
+        cgn.line(')')
+        cgn.line()
+        cgn.line('def __init__(self, calls=None):')
+        with cgn.non_block_indent() as cgn2:
+            cgn2.line('self.calls = [] if calls is None else calls')
+            if change_fields is not None:
+                cgn2.line('self.changes = 0')
+            for (n, default) in fields:
+                cgn2.line(f'self.{n} = {default}')
+        for st in subtrees_of_type(cc, 'methoddecl'):
+            method = pick_child_token(st.children, 'ID')
+            args = [pick_child_token(a.children, 'ID') for a in subtrees_of_type(st.children, 'vardecl')]
+            cgn.line()
+            cgn.line(f'def {method}(self, {", ".join(args)}):')
+            cgn.non_block_indent().line(f"self.calls.append((self, '{method}', {py_tuple(args)}))")
+    codegen.line()
+    codegen.line()
 
-p = l.parse("\n".join(preprocessed_lines))
-#print(p)
-#print(p.pretty())
+    if change_fields is not None:
+        codegen.line(f'class {name}Field(enum.IntEnum):')
+        with codegen.non_block_indent() as cgn:
+            cgn.line(f'"""Bits of {name}.changes."""')
+            for (i, n) in enumerate(change_fields):
+                cgn.line(f'{n} = {i}')
+        codegen.line()
+        codegen.line()
+        codegen.line(f'{name.upper()}_FIELD_COUNT = {len(change_fields)}')
+        codegen.line()
+        codegen.line()
+
+def compile_python(codegen, t, log_mode='eager', stats=False, memo=False):
+    # Deferred logs are a TypeScript optimization: logs are formatted eagerly
+    # unless disabled.
+    ctx = PyContext('none' if log_mode == 'none' else 'eager')
+    codegen.line('# Generated file. DO NOT EDIT.')
+    codegen.line()
+    codegen.line('"""RDS decoder: parse functions for the bitstructs of the protocol description.')
+    codegen.line()
+    codegen.line('Each parse_<bitstruct> function takes a group as a sequence of 4 blocks, a')
+    codegen.line('mask of their validity (bit i set if block i is valid), a list to which log')
+    codegen.line('messages are appended, and the structs it updates. Structs are plain classes')
+    codegen.line('with __slots__. See rds_stream.py for decoding RDS Spy hex logs.')
+    codegen.line('"""')
+    codegen.line()
+    codegen.line('import enum')
+    codegen.line()
+    codegen.line('from rds_runtime import RDS_CHARMAP, RdsString, format_af')
+    codegen.line()
+    codegen.line()
+
+    rules = [pick_child_token(c.children, 'ID') for c in subtrees_of_type(t.children, 'bitstruct')]
+    codegen.line('class Rule(enum.IntEnum):')
+    with codegen.non_block_indent() as cgn:
+        for (i, rule_id) in enumerate(rules):
+            cgn.line(f'{rule_id} = {i}')
+    codegen.line()
+    codegen.line()
+
+    structs = struct_field_types(t)
+    bitstructs = {
+        pick_child_token(st.children, 'ID'): type_elements(
+            optimize(lower_bitstruct(st.children, rules, logs=ctx.log_mode != 'none')), structs)
+        for st in subtrees_of_type(t.children, 'bitstruct')}
+    for st in subtrees_of_type(t.children, 'struct'):
+        name = pick_child_token(st.children, 'ID')
+        if any(name in b.arguments.values() for b in bitstructs.values()):
+            ctx.change_fields[name] = struct_change_fields(st.children)
 
-of = open(outfile, encoding="utf8", mode="w")
-codegen = CodeGenerator(of=of)
+    for c in t.children:
+        match c:
+            case lark.Tree(data='struct', children=cc):
+                compile_py_struct(codegen, cc, ctx.change_fields.get(pick_child_token(cc, 'ID')))
+            case lark.Tree(data='bitstruct', children=cc):
+                compile_py_bitstruct(codegen, bitstructs[pick_child_token(cc, 'ID')], ctx)
+
+    codegen.line('# Parse functions, indexed by rule ID.')
+    codegen.line('PARSE_FUNCTIONS = [')
+    with codegen.non_block_indent() as cgn:
+        for rule_id in rules:
+            cgn.line(f'parse_{rule_id},')
+    codegen.line(']')
+    codegen.line()
+    codegen.line()
+    codegen.line('def format_rds_text(text):')
+    codegen.non_block_indent().line("return ''.join('.' if c is None else RDS_CHARMAP[c] for c in text)")
+    codegen.line()
+    codegen.line()
+    codegen.line('def format_bytes(data):')
+    codegen.non_block_indent().line("return ' '.join('..' if b is None else f'{b:02X}' for b in data)")
+    codegen.line()
+    codegen.line()
+    codegen.line('def format_bcd(digit):')
+    codegen.non_block_indent().line("return str(digit) if 0 <= digit <= 9 else ' '")
+
+# The program backend compiles bitstructs to data rather than code: a JSON
+# "parse program" of field extents and action opcodes, which the interpreters
+# in parse_program.ts and parse_program.py run. Its size grows with the number
+# of descriptors rather than with lines of generated code.
+#
+# Expressions are integer constants, booleans, variable names (strings), or
+# lists starting with an opcode:
+#   ["rule", id]                      rule ID
+#   [".", obj, name]                  struct member
+#   ["get", map, key, default]        map lookup
+#   ["+" | "*", left, right]          arithmetic
+# Actions are lists starting with an opcode. `mark` is null, or the pair
+# [argument, bit] of the change mask bit to set when the action changes state:
+#   ["if", ok_mask, [defined vars], actions]
+#   ["set", target, value, mark]
+#   ["bytes", target, index, [vars], [ok masks], mark]
+#   ["put", map, key, value, mark]
+#   ["parse", rule]
+#   ["call", obj, method, [args], mark]
+#   ["log", [string | [var, format]]]
+#   ["resolve", var, map, key, root argument, struct, key field, mark]
+#   ["switch", expr, [[values | null, actions]]]
+# Bitstructs are objects, in rule ID order:
+#   {"name": ..., "args": [names], "fields": [[var, is_bool, masks, shifts]],
+#    "arrays": [[var, [element vars], [ok masks]]], "elements": [vars],
+#    "actions": actions}
+# where "arrays" are the summaries of byte array fields used in logs.
+
+PROGRAM_FORMAT = 'rds-parse-program/2'
+
+@dataclass
+class ProgramContext:
+    """State of the compilation of a protocol description to a parse program."""
+    log_mode: str
+    rules: list = dataclasses.field(default_factory=list)
+    change_fields: dict = dataclasses.field(default_factory=dict)
+    roots: dict = dataclasses.field(default_factory=dict)
+
+def program_expr(e, ctx):
+    match e:
+        case Var(name='true'):
+            return True
+        case Var(name='false'):
+            return False
+        case Var(name=n) | Element(var=n):
+            return n
+        case Const(value=v):
+            return v
+        case RuleRef(name=n):
+            return ['rule', ctx.rules.index(n)]
+        case Member(obj=o, name=n):
+            return ['.', program_expr(o, ctx), n]
+        case Lookup(map=m, key=k, default=d):
+            return ['get', program_expr(m, ctx), program_expr(k, ctx), program_expr(d, ctx)]
+        case BinOp(op=op, left=l, right=r):
+            return [op, program_expr(l, ctx), program_expr(r, ctx)]
+
+def program_mark(target, bitstruct, ctx, method=None):
+    """Returns the [argument, bit] pair marking a change of `target`, or None. See ts_mark_change."""
+    bit = change_bit(target, bitstruct, ctx, method)
+    if bit is None:
+        return None
+    (arg, typ, name) = bit
+    return [arg, ctx.change_fields[typ].index(name)]
+
+def program_actions(actions, bitstruct, ctx):
+    result = []
+    for a in actions:
+        match a:
+            case Guarded(guard=g, actions=aa):
+                result.append([
+                    'if', ts_ok_mask(g), sorted(x.var for x in g if isinstance(x, Defined)),
+                    program_actions(aa, bitstruct, ctx)])
+            case Assign(target=t, value=v):
+                result.append(['set', program_expr(t, ctx), program_expr(v, ctx), program_mark(t, bitstruct, ctx)])
+            case SetBytes(target=t, index=i, values=values, value_guards=value_guards):
+                result.append([
+                    'bytes', program_expr(t, ctx), program_expr(i, ctx), list(values),
+                    [ts_ok_mask(g) for g in value_guards], program_mark(t, bitstruct, ctx)])
+            case Put(map=m, key=k, value=v):
+                result.append([
+                    'put', program_expr(m, ctx), program_expr(k, ctx), program_expr(v, ctx),
+                    program_mark(m, bitstruct, ctx)])
+            case Parse(rule=r):
+                result.append(['parse', program_expr(r, ctx)])
+            case Invoke(obj=o, method=method, args=args):
+                result.append([
+                    'call', program_expr(o, ctx), method, [program_expr(x, ctx) for x in args],
+                    program_mark(o, bitstruct, ctx, method)])
+            case Log(parts=parts):
+                result.append(['log', [list(p) if isinstance(p, tuple) else p for p in parts]])
+            case Resolve(var=v, map=m, key=k):
+                result.append([
+                    'resolve', v, program_expr(m, ctx), program_expr(k, ctx),
+                    member_path(m, ctx.roots)[0], *bitstruct.element_structs[v], program_mark(m, bitstruct, ctx)])
+            case Switch(expr=e, cases=cases):
+                result.append([
+                    'switch', program_expr(e, ctx),
+                    [[values, program_actions(body, bitstruct, ctx)] for (values, body) in cases]])
+    return result
+
+def program_bitstruct(bitstruct, ctx):
+    ctx.roots = {n: (n,) for n in bitstruct.arguments}
+    collect_effects(bitstruct.actions, ctx.roots, Effects())
+
+    # Same live fields as in emit_py_field.
+    fields = []
+    arrays = []
+    for f in bitstruct.fields:
+        if not f.typ.output or f.name == '_':
+            continue
+        elements = list(f.elements())
+        for (var, masks, shifts) in elements:
+            if var in bitstruct.live_vars or f.name in bitstruct.live_vars:
+                fields.append([var, isinstance(f.typ, Bool), list(masks), list(shifts)])
+        if f.typ.num > 1 and f.name in bitstruct.live_vars and ctx.log_mode != 'none':
+            arrays.append([f.name, [var for (var, _, _) in elements],
+                           [ts_ok_mask(block_atoms(masks)) for (_, masks, _) in elements]])
+    return {
+        'name': bitstruct.name,
+        'args': list(bitstruct.arguments),
+        'fields': fields,
+        'arrays': arrays,
+        'elements': list(bitstruct.elements),
+        'actions': program_actions(bitstruct.actions, bitstruct, ctx),
+    }
+
+def compile_program(codegen, t, log_mode='eager', stats=False, memo=False):
+    # As in the Python backend, logs are formatted eagerly unless disabled.
+    # Statistics and memoization are TypeScript-only.
+    ctx = ProgramContext('none' if log_mode == 'none' else 'eager')
+    ctx.rules.extend(pick_child_token(c.children, 'ID') for c in subtrees_of_type(t.children, 'bitstruct'))
+    structs = struct_field_types(t)
+    bitstructs = [
+        type_elements(optimize(lower_bitstruct(st.children, ctx.rules, logs=ctx.log_mode != 'none')), structs)
+        for st in subtrees_of_type(t.children, 'bitstruct')]
+    for st in subtrees_of_type(t.children, 'struct'):
+        name = pick_child_token(st.children, 'ID')
+        if any(name in b.arguments.values() for b in bitstructs):
+            ctx.change_fields[name] = struct_change_fields(st.children)
+
+    # One bitstruct per line keeps diffs of the generated file readable.
+    codegen.line('{')
+    codegen.line(f'"format": {json.dumps(PROGRAM_FORMAT)},')
+    codegen.line(f'"rules": {json.dumps(ctx.rules)},')
+    codegen.line('"bitstructs": [')
+    for (i, b) in enumerate(bitstructs):
+        separator = ',' if i < len(bitstructs) - 1 else ''
+        codegen.line(json.dumps(program_bitstruct(b, ctx), separators=(',', ':')) + separator)
+    codegen.line(']')
+    codegen.line('}')
+
+@functools.cache
+def get_parser():
+    """Returns the parser of the protocol description language.
+
+    The LALR tables are cached by Lark in the temporary directory, keyed by a
+    hash of the grammar, so that they are only built once.
+    """
+    return Lark(grammar, parser='lalr', cache=True, propagate_positions=True)
+
+def includes(name, text):
+    """Returns (line number, file name) pairs for the #include directives of a file.
+
+    Included file names are relative to the directory of the including file.
+    """
+    result = []
+    for (i, li) in enumerate(text.splitlines()):
+        if li.startswith('#include '):
+            included_file = li.split(' ')[1].strip()
+            result.append((i + 1, os.path.normpath(os.path.join(os.path.dirname(name), included_file))))
+    return result
+
+def read_sources(main):
+    """Reads `main` and the files it includes, recursively. Returns a dict of file contents."""
+    sources = {}
+    pending = [main]
+    while len(pending) > 0:
+        name = pending.pop()
+        if name in sources:
+            continue
+        with open(name, encoding='utf8') as f:
+            sources[name] = f.read()
+        pending.extend(included for (_, included) in includes(name, sources[name]))
+    return sources
+
+BACKENDS = {
+    'typescript': (compile_typescript, '\t'),
+    'numpy': (compile_numpy, '    '),
+    'python': (compile_python, '    '),
+    'program': (compile_program, ''),
+}
+
+class Compiler:
+    """Compiles protocol descriptions.
+
+    Parse trees are cached per file, keyed by a hash of the file contents, so
+    recompiling after an edit only parses the files that changed.
+    """
+
+    def __init__(self):
+        # Maps file names to (content hash, parse tree).
+        self.trees = {}
+
+    def parse_file(self, name, text):
+        digest = hashlib.sha256(text.encode('utf8')).hexdigest()
+        cached = self.trees.get(name)
+        if cached is None or cached[0] != digest:
+            # #include directives are comments to the parser.
+            cached = (digest, get_parser().parse(text))
+            self.trees[name] = cached
+        return cached[1]
+
+    def declarations(self, sources, name, including=(), origins=None):
+        """Returns the top-level declarations of `name`, with included files spliced in.
+
+        If `origins` is given, it is filled with the file each struct and
+        bitstruct is declared in, by name.
+        """
+        if name in including:
+            raise Exception(f'Circular #include of {name}')
+        if name not in sources:
+            raise Exception(f'Missing source file: {name}')
+        text = sources[name]
+        included = includes(name, text)
+        result = []
+        for decl in self.parse_file(name, text).children:
+            while len(included) > 0 and included[0][0] < decl.meta.line:
+                result.extend(self.declarations(sources, included.pop(0)[1], including + (name,), origins))
+            result.append(decl)
+            if origins is not None and decl.data in ('struct', 'bitstruct'):
+                origins[pick_child_token(decl.children, 'ID')] = name
+        for (_, included_name) in included:
+            result.extend(self.declarations(sources, included_name, including + (name,), origins))
+        return result
+
+    def compile(self, sources, main, backend='typescript', log_mode='eager', stats=False, memo=False):
+        """Compiles `main` and returns the generated code.
+
+        `sources` maps file names to their contents. It must contain `main` and
+        all the files it includes, directly or not.
+        """
+        tree = lark.Tree('start', self.declarations(sources, main))
+        (emit, indent_unit) = BACKENDS[backend]
+        of = io.StringIO()
+        emit(CodeGenerator(of=of, indent_unit=indent_unit), tree, log_mode=log_mode, stats=stats, memo=memo)
+        return of.getvalue()
+
+    def compile_split(self, sources, main, module, log_mode='eager', stats=False, memo=False):
+        """Compiles `main` to TypeScript, with lazily loaded modules.
+
+        The rules that are only reached by dynamic dispatch go to one module
+        per source file, see partition_rules. `module` is the name of the main
+        module, e.g. 'base' for base.ts; the other modules are named after it
+        and their source file. Returns a dict mapping module names to code.
+        """
+        split = Split(module, main)
+        tree = lark.Tree('start', self.declarations(sources, main, origins=split.origins))
+        of = io.StringIO()
+        compile_typescript(CodeGenerator(of=of, indent_unit='\t'), tree, log_mode, stats, memo, split)
+        return {module: of.getvalue(), **split.modules}
+
+def compile(sources, main, backend='typescript', log_mode='eager', stats=False, memo=False):
+    """Compiles `main`, whose contents and includes are in `sources`. Returns the generated code."""
+    return Compiler().compile(sources, main, backend, log_mode, stats, memo)
+
+def write_output(path, output):
+    """Writes `output` to `path`, unless the file already has this contents."""
+    # Leaving the file untouched avoids triggering rebuilds downstream.
+    if os.path.exists(path):
+        with open(path, encoding='utf8') as f:
+            if f.read() == output:
+                return
+    with open(path, encoding='utf8', mode='w') as of:
+        of.write(output)
+
+def compile_outputs(compiler, sources, args):
+    """Compiles args.infile as the command line says. Returns a dict mapping output paths to code."""
+    if not args.split:
+        return {args.outfile: compiler.compile(sources, args.infile, args.backend, args.log, args.stats, args.memo)}
+    # Modules are named after the input file, and their code is written next
+    # to the output file, with the same suffixes.
+    module = os.path.splitext(os.path.basename(args.infile))[0]
+    (stem, ext) = os.path.splitext(args.outfile)
+    return {
+        stem + name[len(module):] + ext: code
+        for (name, code) in compiler.compile_split(sources, args.infile, module, args.log, args.stats, args.memo).items()}
+
+def mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def watch(compiler, args):
+    """Recompiles whenever a file of the #include graph changes, until interrupted."""
+    # Modification times of the files of the last compilation.
+    watched = {}
+    while True:
+        if len(watched) == 0 or any(mtime(name) != t for (name, t) in watched.items()):
+            start = time.monotonic()
+            try:
+                sources = read_sources(args.infile)
+                for (path, output) in compile_outputs(compiler, sources, args).items():
+                    write_output(path, output)
+                print(f'Compiled {args.infile} in {(time.monotonic() - start) * 1000:.0f} ms.', file=sys.stderr)
+                names = sources.keys()
+            except Exception as e:
+                print(f'Error: {e}', file=sys.stderr)
+                # Keep watching the files of the last successful compilation.
+                names = set(watched) | {args.infile}
+            watched = {name: mtime(name) for name in names}
+        time.sleep(args.interval)
+
+def main():
+    argparser = argparse.ArgumentParser(description='Compiles RDS protocol descriptions.')
+    argparser.add_argument('--backend', choices=BACKENDS.keys(), default='typescript',
+                           help='Output language: TypeScript decoder (default), NumPy batch field extractors, '
+                           'Python decoder, or JSON parse program for parse_program.ts and parse_program.py.')
+    argparser.add_argument('--log', choices=['eager', 'deferred', 'none'], default='eager',
+                           help='How log actions are compiled: formatted immediately (default), '
+                           'recorded as a format id and raw values to be formatted on display, or removed.')
+    argparser.add_argument('--stats', action='store_true',
+                           help='Make parse functions count their calls, time themselves and count '
+                           'null fields in PARSE_STATS. Off by default, as it slows decoding down.')
+    argparser.add_argument('--memo', action='store_true',
+                           help='Make the parse functions of idempotent rules skip a group they have '
+                           'already parsed, if nothing they wrote has changed since. Logging is not '
+                           'idempotent, so this is mostly useful with --log=none.')
+    argparser.add_argument('--split', action='store_true',
+                           help='TypeScript only: compile the rules that are only reached by dynamic dispatch, '
+                           'such as ODAs, to lazily loaded modules, one per source file. Module X.p of base.p '
+                           'goes to outfile_X.ts next to outfile, and imports "./base".')
+    argparser.add_argument('--watch', action='store_true',
+                           help='Keep running, and recompile when infile or a file it includes changes.')
+    argparser.add_argument('--interval', type=float, default=0.2,
+                           help='Polling interval of --watch, in seconds.')
+    argparser.add_argument('infile')
+    argparser.add_argument('outfile')
+    args = argparser.parse_args()
+    if args.split and args.backend != 'typescript':
+        argparser.error('--split requires the TypeScript backend')
+
+    compiler = Compiler()
+    if args.watch:
+        try:
+            watch(compiler, args)
+        except KeyboardInterrupt:
+            pass
+    else:
+        sources = read_sources(args.infile)
+        for (path, output) in compile_outputs(compiler, sources, args).items():
+            write_output(path, output)
 
-compile(codegen, p)
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+import {
+  benchArgs, compileSeconds, corpusName, heapGrowth, listDir, logLines, measure, printResults, readText, silenceConsole,
+} from "../bench/bench_util";
+import { parseHexGroup, RdsReportEventType } from "../drivers/input";
+// Decode groups synchronously, with all the decoders loaded.
+import "./base_eager";
+import { ParseProgram, ParseProgramDescriptor } from "./parse_program";
+import { LogMessage, StationImpl, parse_blocks } from "./rds_types";
+
+// Benchmark of the decoder on recorded group logs. Prints, as JSON, for each
+// decoder (the generated code, and the parse program interpreter if given)
+// and corpus:
+// - groups_per_second: decoding throughput, logs being recorded but not
+//   formatted;
+// - log_format_share: share of the time spent formatting the logs, when they
+//   are all displayed;
+// - allocated_bytes_per_group: heap growth per group, see heapGrowth.
+// It also prints the cost of loading each decoder, which grows with its size
+// rather than with the traffic: the bytes of the compiled base*.js modules
+// and the time V8 takes to parse and compile them, against the bytes of the
+// parse program and the time to parse its JSON and link it.
+//
+// Usage: decoder_bench [--program=base_program.json] [--min-seconds=S] corpus.spy...
+//
+// run_benchmarks.py runs it, and checks the results against thresholds.
+
+declare const __dirname: string;
+
+const MAX_ERRORS = 0;
+
+// Number of groups decoded to measure allocations.
+const ALLOCATION_GROUPS = 2000;
+
+interface ParsedGroup {
+  stream: number;
+  blocks: Uint16Array;
+  ok: number;
+}
+
+interface Corpus {
+  name: string;
+  groups: ParsedGroup[];
+}
+
+type Decode = (g: ParsedGroup, log: LogMessage, station: StationImpl) => void;
+
+interface CorpusResult {
+  groups: number;
+  groups_per_second: number;
+  log_format_share: number | null;
+  allocated_bytes_per_group: number | null;
+}
+
+function readCorpus(path: string): Corpus {
+  const groups: ParsedGroup[] = [];
+  for (const line of logLines(readText(path))) {
+    const evt = parseHexGroup(line);
+    if (evt == undefined || evt.type != RdsReportEventType.GROUP ||
+        evt.stream == undefined || evt.group == undefined) {
+      continue;
+    }
+    let ok = 0;
+    const blocks = new Uint16Array(4);
+    evt.group.blocks.forEach((b, i) => {
+      blocks[i] = b.value;
+      if (b.errorCount <= MAX_ERRORS) ok |= 1 << i;
+    });
+    groups.push({stream: evt.stream, blocks, ok});
+  }
+  return {name: corpusName(path), groups};
+}
+
+interface LoadResult {
+  bytes: number;
+  seconds: number;
+}
+
+function utf8Length(s: string): number {
+  return new TextEncoder().encode(s).length;
+}
+
+// Returns the compiled generated decoder: the base*.js modules next to this
+// benchmark.
+function generatedSources(): string[] {
+  return listDir(__dirname).filter((f) => /^base.*\.js$/.test(f)).sort().map((f) => readText(`${__dirname}/${f}`));
+}
+
+function benchGeneratedLoad(minSeconds: number): LoadResult {
+  const sources = generatedSources();
+  return {
+    bytes: sources.reduce((n, s) => n + utf8Length(s), 0),
+    seconds: compileSeconds(sources, minSeconds),
+  };
+}
+
+function benchProgramLoad(text: string, minSeconds: number): LoadResult {
+  const load = measure(() => new ParseProgram(JSON.parse(text) as ParseProgramDescriptor), minSeconds);
+  return {bytes: utf8Length(text), seconds: load.seconds / load.runs};
+}
+
+// Decodes the groups of `corpus` into `station`, formatting the logs if
+// `format` is set.
+function decodeAll(corpus: Corpus, decode: Decode, station: StationImpl, log: LogMessage, format: boolean) {
+  for (const g of corpus.groups) {
+    log.clear();
+    decode(g, log, station);
+    if (format) {
+      log.toString();
+    }
+  }
+}
+
+function benchCorpus(corpus: Corpus, decode: Decode, minSeconds: number, deferredLogs: boolean): CorpusResult {
+  // The station is reused, as when listening to a station for a while.
+  const station = new StationImpl();
+  const log = new LogMessage();
+  const n = corpus.groups.length;
+  const parse = measure(() => decodeAll(corpus, decode, station, log, false), minSeconds);
+  const secondsPerGroup = parse.seconds / (parse.runs * n);
+  let logFormatShare: number | null = null;
+  if (deferredLogs) {
+    const all = measure(() => decodeAll(corpus, decode, station, log, true), minSeconds);
+    const allPerGroup = all.seconds / (all.runs * n);
+    logFormatShare = Math.max(0, (allPerGroup - secondsPerGroup) / allPerGroup);
+  }
+  const passes = Math.ceil(ALLOCATION_GROUPS / n);
+  const growth = heapGrowth(() => {
+    for (let i = 0; i < passes; i++) decodeAll(corpus, decode, station, log, false);
+  });
+  return {
+    groups: n,
+    groups_per_second: 1 / secondsPerGroup,
+    log_format_share: logFormatShare,
+    allocated_bytes_per_group: growth == null ? null : growth / (passes * n),
+  };
+}
+
+// Aggregates the results of the corpora, weighting them by their number of
+// groups.
+function aggregate(results: Record<string, CorpusResult>) {
+  let groups = 0;
+  let seconds = 0;
+  let share = 0;
+  let allocated = 0;
+  let hasShare = true;
+  let hasAllocated = true;
+  for (const r of Object.values(results)) {
+    const s = r.groups / r.groups_per_second;
+    groups += r.groups;
+    seconds += s;
+    if (r.log_format_share == null) hasShare = false; else share += r.log_format_share * s;
+    if (r.allocated_bytes_per_group == null) hasAllocated = false; else allocated += r.allocated_bytes_per_group * r.groups;
+  }
+  return {
+    groups_per_second: groups / seconds,
+    log_format_share: hasShare ? share / seconds : null,
+    allocated_bytes_per_group: hasAllocated ? allocated / groups : null,
+    corpora: results,
+  };
+}
+
+function main() {
+  silenceConsole();
+  let minSeconds = 0.5;
+  let programText: string | null = null;
+  const corpora: Corpus[] = [];
+  for (const arg of benchArgs()) {
+    if (arg.startsWith("--program=")) {
+      programText = readText(arg.substring(10));
+    } else if (arg.startsWith("--min-seconds=")) {
+      minSeconds = Number.parseFloat(arg.substring(14));
+    } else {
+      corpora.push(readCorpus(arg));
+    }
+  }
+
+  const decoders: Record<string, [Decode, boolean]> = {
+    "generated": [(g, log, station) => parse_blocks(g.stream, g.blocks, g.ok, log, station), true],
+  };
+  const load: Record<string, LoadResult> = {"generated": benchGeneratedLoad(minSeconds)};
+  if (programText != null) {
+    const program = new ParseProgram(JSON.parse(programText) as ParseProgramDescriptor);
+    load["program"] = benchProgramLoad(programText, minSeconds);
+    const ab = program.parseFunction("group_ab");
+    const c = program.parseFunction("group_c");
+    // The interpreter formats its logs eagerly.
+    decoders["program"] = [(g, log, station) => (g.stream == 0 ? ab : c)(g.blocks, g.ok, log, station), false];
+  }
+
+  const results: Record<string, unknown> = {};
+  for (const [name, [decode, deferredLogs]] of Object.entries(decoders)) {
+    const byCorpus: Record<string, CorpusResult> = {};
+    for (const corpus of corpora) {
+      byCorpus[corpus.name] = benchCorpus(corpus, decode, minSeconds, deferredLogs);
+    }
+    results[name] = aggregate(byCorpus);
+  }
+  printResults({decoders: results, load});
+}
+
+main();
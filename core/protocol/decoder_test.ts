@@ -1,5 +1,9 @@
-import { LogMessage, StationImpl, parse_group } from './rds_types';
-import { Station } from './base';
+import { LogMessage, LogRing, RdsStringInRdsEncoding, StationImpl, parse_blocks, parse_group } from './rds_types';
+import { PARSE_MODULES, Station, StationField } from './base';
+import { LazyModule } from './lazy_module';
+// Groups are decoded synchronously: load the decoders of ODAs, EON, etc.
+// upfront rather than on demand.
+import './base_eager';
 import { parseHexGroup, RdsReportEventType } from '../drivers/input';
 
 
@@ -311,3 +315,164 @@ describe('RDS-2 tunnelling of PS', () => {
     expect(station.getPS()).toBe("RDS2 PS!");
   });
 });
+
+// Log messages are recorded in deferred mode and formatted on display.
+describe('Group log', () => {
+  const station = new StationImpl();
+  const log = station.log.next();
+  log.add('0:[F201 0408 2037 2020] ', false);
+  parse_group(0, parseHexGroup('F201 0408 2037 2020')!.group!, MAX_ERRORS, log, station);
+  it('should format the recorded values', () => {
+    expect(log.toString()).toMatch(/^0:\[F201 0408 2037 2020\] PI=F201, Group 0A, /);
+    expect(log.toString()).toContain('PS seg @0 "  "');
+  });
+
+  it('should keep only the most recent messages', () => {
+    const ring = new LogRing(2);
+    for (const s of ['a', 'b', 'c']) {
+      ring.next().add(s);
+    }
+    expect(Array.from(ring).map((m) => m.toString())).toEqual(['b', 'c']);
+  });
+});
+
+// Groups given as a caller-owned block buffer and a validity mask. Block D,
+// which holds the PS characters, is invalid in the second group.
+describe('Block buffer and validity mask', () => {
+  const station = new StationImpl();
+  const blocks = new Uint16Array([0xF201, 0x0408, 0x2037, 0x4142]);
+  parse_blocks(0, blocks, 0b1111, new LogMessage(), station);
+  blocks.set([0xF201, 0x0408, 0x2037, 0x4344]);
+  parse_blocks(0, blocks, 0b0111, new LogMessage(), station);
+  it('should skip bytes from invalid blocks', () => {
+    expect(station.pi).toBe(0xF201);
+    expect(station.getPS()).toBe("AB      ");
+  });
+});
+
+// A snapshot taken in the middle of a capture resumes decoding as if the
+// groups before it had been decoded again.
+describe('Station snapshot', () => {
+  const station = new StationImpl();
+  send(`F201 0408 2037 2020
+        F201 0409 383B 494E
+        F201 1480 00E2 0000
+        F201 E410 4E45 5746
+        F201 E413 CDCD F202`, station);
+  const snapshot = station.snapshot();
+  const restored = new StationImpl();
+  restored.restore(snapshot);
+  send(`F201 040A 3D45 5445
+        F201 040F 474E 5220`, station);
+  send(`F201 040A 3D45 5445
+        F201 040F 474E 5220`, restored);
+
+  it('should restore the declared fields', () => {
+    expect(restored.pi).toBe(0xF201);
+    expect(restored.ecc).toBe(station.ecc);
+    expect(restored.getPS()).toBe("  INTER ");
+    expect(restored.ps.getPastMessages(true)).toEqual(station.ps.getPastMessages(true));
+    expect(Array.from(restored.app_mapping)).toEqual(Array.from(station.app_mapping));
+    expect(Array.from(restored.other_networks.keys())).toEqual(Array.from(station.other_networks.keys()));
+  });
+
+  it('should be compact', () => {
+    expect(snapshot.length).toBeLessThan(1024);
+  });
+
+  it('should reject snapshots of other decoders', () => {
+    const other = snapshot.slice();
+    other[0] ^= 0x02;
+    expect(() => new StationImpl().restore(other)).toThrowError(/format/);
+  });
+});
+
+// Parse functions mark the station fields that actually change.
+describe('Station changes', () => {
+  const station = new StationImpl();
+  station.changes.clear();
+  send('F201 0408 2037 2020', station);
+  const first = station.changes.fields();
+  station.changes.clear();
+  send('F201 0408 2037 2020', station);
+  const second = station.changes.fields();
+
+  it('should mark changed fields', () => {
+    expect(first).toContain(StationField.pi);
+    expect(first).toContain(StationField.ps);
+    expect(first).toContain(StationField.addToGroupStats);
+  });
+
+  it('should not mark fields set to the same value', () => {
+    expect(second).not.toContain(StationField.pi);
+    expect(second).not.toContain(StationField.ps);
+    expect(second).toContain(StationField.addToGroupStats);
+  });
+
+  it('should mark all fields on reset', () => {
+    station.changes.clear();
+    station.reset();
+    expect(station.changes.has(StationField.other_networks)).toBeTrue();
+  });
+});
+
+// The history of texts is bounded, and repeated texts share one instance.
+describe('RdsString history', () => {
+  const text = new RdsStringInRdsEncoding(2, 4);
+  for (let i = 0; i < 10; i++) {
+    // Alternates between "AB" and "CD".
+    const c = i % 2 == 0 ? 0x41 : 0x43;
+    text.setBytes(0, [c, c + 1], 0b11);
+  }
+
+  it('should keep the most recent texts', () => {
+    expect(text.historyLength).toBe(4);
+    expect(text.getPastMessages(true).map((e) => e.message)).toEqual(["CD", "AB", "CD", "AB", "CD"]);
+    expect(text.historyEntry(0).id).toBe(text.getCurrentId() - 1);
+    expect(() => text.historyEntry(4)).toThrowError(RangeError);
+  });
+
+  it('should iterate without copying', () => {
+    const entries = Array.from(text.pastMessages(false));
+    expect(entries[0]).toBe(text.historyEntry(0));
+    expect(entries.length).toBe(4);
+  });
+
+  it('should count characters of dropped texts', () => {
+    expect(text.getMostFrequentText()).toBe("AB");
+  });
+});
+
+describe('Default group mapping', () => {
+  it('should start loading the modules of its rules', () => {
+    const load = spyOn(PARSE_MODULES.eon, 'load').and.callThrough();
+    new StationImpl();
+    expect(load).toHaveBeenCalled();
+  });
+});
+
+describe('Lazily loaded modules', () => {
+  it('should parse the groups received while loading', async () => {
+    const parsed: number[] = [];
+    const logs: LogMessage[] = [];
+    const functions = [(block: Uint16Array, _ok: number, log: LogMessage) => {
+      parsed.push(block[3]);
+      logs.push(log);
+    }];
+    const module = new LazyModule("test", () => Promise.resolve(), () => functions);
+    const stub = module.stub(0);
+    const station = new StationImpl();
+    const block = new Uint16Array(4);
+    const recycled = new LogMessage();
+    for (let i = 0; i < 3; i++) {
+      block[3] = i;
+      stub(block, 0b1111, i == 0 ? recycled : new LogMessage(), station);
+    }
+    recycled.clear();
+    expect(parsed).toEqual([]);
+    await module.load();
+    expect(parsed).toEqual([0, 1, 2]);
+    // Groups are not logged to messages reused since.
+    expect(logs[0]).not.toBe(recycled);
+  });
+});
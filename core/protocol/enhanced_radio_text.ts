@@ -14,6 +14,10 @@ export class ERtAppImpl implements Oda, ERtApp {
     this.ert.encoding = utf8_enabled ? "utf-8" : "utf-16le";
   }
 
+  get utf8_encoding(): boolean {
+    return this.ert.encoding == "utf-8";
+  }
+
   getName(): string {
     throw new Error('Enhanced Radio Text');
   }
@@ -0,0 +1,279 @@
+"""Compact binary archives of RDS groups, with an index by PI, group type and time.
+
+An archive is a 16-byte header followed by fixed-width 14-byte records, all
+little-endian:
+
+    header: magic b'RDSGARC1', start time (int64, ms since the Unix epoch, 0 if
+            unknown)
+    record: 4 blocks (uint16 each), info (uint16: error count of block i in
+            bits 3i to 3i+2, stream in bits 12-13), time (uint32, in
+            centiseconds since the start time)
+
+Records are in time order. Archives are read through np.memmap: slicing them
+by record number or by time returns views of the file, and queries only touch
+the records they return.
+
+The sidecar index (`<archive>.idx`) lists the stream 0 groups whose blocks A
+and B were received (possibly with corrected errors), sorted by PI, group
+type, then time:
+
+    header: magic b'RDSGIDX1', number of entries (uint64)
+    keys: uint32 per entry, PI << 5 | group type
+    records: uint32 per entry, record number
+    times: uint32 per entry, time of the record
+
+PIs and group types are the `pi` and `type` fields of the group_ab and
+group_ab_without_pi bitstructs, extracted with base_numpy.
+
+    python group_archive.py convert recording.spy recording.rdsa
+    python group_archive.py query recording.rdsa --pi=F201 --type=3A \\
+        --since='2024-05-07 00:00' --until='2024-05-08 00:00'
+"""
+
+import argparse
+import datetime
+import os
+import re
+import sys
+
+import numpy as np
+
+import base_numpy
+import rds_stream
+
+MAGIC = b'RDSGARC1'
+INDEX_MAGIC = b'RDSGIDX1'
+HEADER_SIZE = 16
+
+RECORD = np.dtype([
+    ('blocks', '<u2', (4,)),
+    ('info', '<u2'),
+    ('time', '<u4'),
+])
+
+# Duration of a group, in centiseconds: 104 bits at 1187.5 bit/s. Used as the
+# interval between stream 0 groups of logs without timestamps.
+GROUP_DURATION = 100 * 104 / 1187.5
+
+# Records are converted and indexed by chunks, to bound memory use.
+CHUNK_SIZE = 1 << 16
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def parse_timestamp(line):
+    """Returns the timestamp of a line of an RDS Spy hex log, in ms since the epoch, or None.
+
+    RDS Spy writes timestamps as `@yyyy/mm/dd hh:mm:ss.cc` after the blocks.
+    Timestamps are assumed to be UTC.
+    """
+    m = re.search(r'@\s*(\d{4})[/-](\d{2})[/-](\d{2})[ T](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,3}))?', line)
+    if m is None:
+        return None
+    t = datetime.datetime(*map(int, m.groups()[:6]))
+    fraction = m[7] or '0'
+    return (t - EPOCH) // datetime.timedelta(milliseconds=1) + int(fraction.ljust(3, '0'))
+
+
+def to_ms(t):
+    """Converts a datetime (naive ones are UTC) to ms since the epoch."""
+    if t.tzinfo is not None:
+        t = t.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (t - EPOCH) // datetime.timedelta(milliseconds=1)
+
+
+def convert(lines, path):
+    """Writes the groups of an iterable of RDS Spy hex lines to an archive. Returns the number of groups."""
+    start = None
+    time = 0.0
+    count = 0
+    chunk = np.zeros(CHUNK_SIZE, dtype=RECORD)
+    n = 0
+    with open(path, 'wb') as f:
+        f.write(MAGIC + bytes(8))
+        for line in lines:
+            group = rds_stream.parse_hex_line(line)
+            if group is None:
+                continue
+            (stream, blocks, error_counts) = group
+            timestamp = parse_timestamp(line)
+            if timestamp is not None:
+                if start is None:
+                    start = timestamp
+                # Times never decrease, so that archives can be sliced by time.
+                time = max(time, (timestamp - start) / 10)
+            elif count > 0 and stream == 0:
+                time += GROUP_DURATION
+            if time >= 1 << 32:
+                raise ValueError(f'{path}: recording longer than {(1 << 32) // 8640000} days')
+            chunk[n] = (blocks, sum(e << (3 * i) for (i, e) in enumerate(error_counts)) | (stream << 12), int(time))
+            n += 1
+            count += 1
+            if n == CHUNK_SIZE:
+                f.write(chunk.tobytes())
+                n = 0
+        f.write(chunk[:n].tobytes())
+        f.seek(len(MAGIC))
+        f.write(np.array(start or 0, dtype='<i8').tobytes())
+    return count
+
+
+def build_index(path, max_errors=rds_stream.UNCORRECTABLE_ERRORS - 1):
+    """Writes the sidecar index of an archive.
+
+    Blocks A and B of indexed groups have at most `max_errors` errors.
+    """
+    records = GroupArchive(path, index=False).records
+    keys = []
+    numbers = []
+    for start in range(0, len(records), CHUNK_SIZE):
+        chunk = records[start:start + CHUNK_SIZE]
+        ok = errors(chunk) <= max_errors
+        pi = base_numpy.extract('group_ab', chunk['blocks'], ok)['pi']
+        group_type = base_numpy.extract('group_ab_without_pi', chunk['blocks'], ok)['type']
+        valid = ~(np.ma.getmaskarray(pi) | np.ma.getmaskarray(group_type)) & (streams(chunk) == 0)
+        keys.append((pi.data[valid].astype(np.uint32) << 5) | group_type.data[valid])
+        numbers.append(np.flatnonzero(valid).astype(np.uint32) + start)
+    keys = np.concatenate(keys) if keys else np.zeros(0, np.uint32)
+    numbers = np.concatenate(numbers) if numbers else np.zeros(0, np.uint32)
+    # A stable sort keeps the records of a key in time order.
+    order = np.argsort(keys, kind='stable')
+    with open(path + '.idx', 'wb') as f:
+        f.write(INDEX_MAGIC + np.array(len(keys), dtype='<u8').tobytes())
+        f.write(keys[order].astype('<u4').tobytes())
+        f.write(numbers[order].astype('<u4').tobytes())
+        f.write(records['time'][numbers[order]].astype('<u4').tobytes())
+
+
+def errors(records):
+    """Returns the (N, 4) array of the error counts of the blocks of records."""
+    return (records['info'][:, np.newaxis] >> np.array([0, 3, 6, 9], dtype=np.uint16)) & 0b111
+
+
+def streams(records):
+    return (records['info'] >> 12) & 0b11
+
+
+def group_type_code(name):
+    """Returns the 5-bit code of a group type name such as '3A'."""
+    m = re.fullmatch(r'(\d{1,2})([AB])', name.upper())
+    if m is None or int(m[1]) > 15:
+        raise ValueError(f'Invalid group type: {name}')
+    return 2 * int(m[1]) + (m[2] == 'B')
+
+
+class GroupArchive:
+    """Memory-mapped group archive."""
+
+    def __init__(self, path, index=True):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a group archive')
+        # Start time, in ms since the epoch.
+        self.start = int(np.frombuffer(header, dtype='<i8', offset=len(MAGIC))[0])
+        size = os.path.getsize(path) - HEADER_SIZE
+        if size % RECORD.itemsize != 0:
+            raise ValueError(f'{path} is truncated')
+        if size == 0:
+            self.records = np.zeros(0, dtype=RECORD)
+        else:
+            self.records = np.memmap(path, dtype=RECORD, mode='r', offset=HEADER_SIZE)
+        self.keys = self.numbers = self.times = None
+        if index:
+            self.load_index(path + '.idx')
+
+    def load_index(self, path):
+        with open(path, 'rb') as f:
+            header = f.read(16)
+        if header[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            raise ValueError(f'{path} is not a group archive index')
+        n = int(np.frombuffer(header, dtype='<u8', offset=len(INDEX_MAGIC))[0])
+        if n == 0:
+            self.keys = self.numbers = self.times = np.zeros(0, dtype='<u4')
+            return
+        entries = np.memmap(path, dtype='<u4', mode='r', offset=16, shape=(3, n))
+        (self.keys, self.numbers, self.times) = entries
+
+    def __len__(self):
+        return len(self.records)
+
+    def time_offset(self, t):
+        """Converts a datetime to a record time."""
+        return max(0, -(-(to_ms(t) - self.start) // 10))
+
+    def time_slice(self, since=None, until=None):
+        """Returns a view of the records received from `since` (included) to `until` (excluded)."""
+        times = self.records['time']
+        lo = 0 if since is None else np.searchsorted(times, self.time_offset(since), 'left')
+        hi = len(times) if until is None else np.searchsorted(times, self.time_offset(until), 'left')
+        return self.records[lo:hi]
+
+    def query(self, pi=None, group_type=None, since=None, until=None):
+        """Returns the numbers of the indexed records matching all the given criteria, in time order.
+
+        `group_type` is a 5-bit code, see group_type_code.
+        """
+        if self.keys is None:
+            raise ValueError('Queries need the index: see build_index')
+        if pi is not None:
+            first = pi << 5 if group_type is None else (pi << 5) | group_type
+            last = first + (32 if group_type is None else 1)
+            lo = np.searchsorted(self.keys, first, 'left')
+            hi = np.searchsorted(self.keys, last, 'left')
+        else:
+            (lo, hi) = (0, len(self.keys))
+        numbers = self.numbers[lo:hi]
+        times = self.times[lo:hi]
+        if pi is not None and group_type is not None:
+            # Entries of a single key are in time order.
+            t0 = 0 if since is None else np.searchsorted(times, self.time_offset(since), 'left')
+            t1 = len(times) if until is None else np.searchsorted(times, self.time_offset(until), 'left')
+            return np.asarray(numbers[t0:t1])
+        match = np.ones(len(numbers), dtype=bool)
+        if group_type is not None:
+            match &= (self.keys[lo:hi] & 0b11111) == group_type
+        if since is not None:
+            match &= times >= self.time_offset(since)
+        if until is not None:
+            match &= times < self.time_offset(until)
+        return np.sort(numbers[match])
+
+    def to_hex(self, number):
+        """Returns record `number` as a line of an RDS Spy hex log."""
+        r = self.records[number]
+        e = errors(r[np.newaxis])[0]
+        blocks = ' '.join(f'{b:04X}' if n == 0 else f'{b:04X}/{n}' for (b, n) in zip(r['blocks'], e))
+        stream = int(streams(r))
+        t = EPOCH + datetime.timedelta(milliseconds=self.start + 10 * int(r['time']))
+        prefix = f'#S{stream} ' if stream != 0 else ''
+        return f'{prefix}{blocks} @{t:%Y/%m/%d %H:%M:%S}.{t.microsecond // 10000:02d}'
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Converts RDS Spy hex logs to indexed group archives, and queries them.')
+    commands = argparser.add_subparsers(dest='command', required=True)
+    c = commands.add_parser('convert', help='Converts a hex log to an archive, and indexes it.')
+    c.add_argument('infile')
+    c.add_argument('outfile')
+    q = commands.add_parser('query', help='Prints the matching groups of an archive as a hex log.')
+    q.add_argument('archive')
+    q.add_argument('--pi', type=lambda s: int(s, 16))
+    q.add_argument('--type', type=group_type_code, help='Group type, e.g. 3A.')
+    q.add_argument('--since', type=datetime.datetime.fromisoformat, help='UTC time, e.g. "2024-05-07 00:00".')
+    q.add_argument('--until', type=datetime.datetime.fromisoformat)
+    args = argparser.parse_args()
+
+    if args.command == 'convert':
+        with open(args.infile, encoding='utf8', errors='replace') as f:
+            n = convert(f, args.outfile)
+        build_index(args.outfile)
+        print(f'Converted {n} groups.', file=sys.stderr)
+    else:
+        archive = GroupArchive(args.archive)
+        for number in archive.query(args.pi, args.type, args.since, args.until):
+            print(archive.to_hex(number))
+
+
+if __name__ == '__main__':
+    main()
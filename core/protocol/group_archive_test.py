@@ -0,0 +1,77 @@
+"""Tests for group archives."""
+
+import datetime
+import os
+import tempfile
+import unittest
+
+import group_archive
+
+LOG = '''F201 0408 2037 2020 @2024/05/07 10:00:00.00
+F201 0409 383B 494E @2024/05/07 10:00:00.09
+#S1 1234 5678 9ABC DEF0 @2024/05/07 10:00:00.10
+F201 3410 4BD7 0000 @2024/05/07 10:00:00.18
+F202/2 3410 4BD7 0000 @2024/05/08 10:00:00.18
+---- 3410 4BD7 0000 @2024/05/08 10:00:00.30
+F201 3410 4BD7 0000 @2024/05/08 10:00:00.40
+'''.splitlines()
+
+
+class GroupArchiveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, 'log.rdsa')
+        cls.count = group_archive.convert(LOG, cls.path)
+        group_archive.build_index(cls.path)
+        cls.archive = group_archive.GroupArchive(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.archive
+        cls.tmp.cleanup()
+
+    def test_layout(self):
+        self.assertEqual(self.count, 7)
+        self.assertEqual(os.path.getsize(self.path), 16 + 7 * 14)
+        self.assertEqual(len(self.archive), 7)
+
+    def test_round_trip(self):
+        self.assertEqual(self.archive.to_hex(0), LOG[0])
+        self.assertEqual(self.archive.to_hex(2), LOG[2])
+        self.assertEqual(self.archive.to_hex(4), LOG[4])
+        self.assertEqual(self.archive.to_hex(5), '0000/6 3410 4BD7 0000 @2024/05/08 10:00:00.30')
+
+    def test_query(self):
+        t3a = group_archive.group_type_code('3A')
+        self.assertEqual(list(self.archive.query(pi=0xF201, group_type=t3a)), [3, 6])
+        self.assertEqual(list(self.archive.query(pi=0xF201, until=datetime.datetime(2024, 5, 8))), [0, 1, 3])
+        # Block A with corrected errors is indexed, not uncorrectable ones.
+        self.assertEqual(list(self.archive.query(group_type=t3a)), [3, 4, 6])
+        self.assertEqual(
+            list(self.archive.query(pi=0xF201, group_type=t3a, since=datetime.datetime(2024, 5, 8))), [6])
+        self.assertEqual(list(self.archive.query(pi=0x1234)), [])
+
+    def test_time_slice(self):
+        s = self.archive.time_slice(datetime.datetime(2024, 5, 7, 10, 0, 0, 100000), datetime.datetime(2024, 5, 8))
+        self.assertEqual(len(s), 2)
+        # Slices are views of the mapped file.
+        self.assertIsNotNone(s.base)
+
+    def test_untimed_log(self):
+        path = os.path.join(self.tmp.name, 'untimed.rdsa')
+        group_archive.convert([line.split('@')[0] for line in LOG], path)
+        times = group_archive.GroupArchive(path, index=False).records['time']
+        # Stream 0 groups are one group duration apart.
+        self.assertEqual(list(times[:4]), [0, 8, 8, 17])
+
+    def test_bad_files(self):
+        path = os.path.join(self.tmp.name, 'bad')
+        with open(path, 'wb') as f:
+            f.write(b'F201 0408 2037 2020\n')
+        with self.assertRaises(ValueError):
+            group_archive.GroupArchive(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
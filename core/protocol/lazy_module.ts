@@ -0,0 +1,78 @@
+import { Station } from "./base";
+import { LogMessage } from "./rds_types";
+
+// A module of parse functions compiled separately by `compiler.py --split`,
+// such as the decoder of an ODA, and loaded on demand.
+//
+// Until the module is loaded, its rules have stubs as parse functions. When
+// loaded, the module replaces the stubs with its parse functions in
+// PARSE_FUNCTIONS, and the groups the stubs received meanwhile are parsed.
+export class LazyModule {
+  private loading: Promise<void> | null = null;
+  // Groups received while loading, in order.
+  private queued: QueuedGroup[] = [];
+
+  public constructor(
+      readonly name: string,
+      private readonly importModule: () => Promise<unknown>,
+      private readonly parseFunctions: () => ReadonlyArray<ParseFunction>) {}
+
+  // Starts loading the module, unless it is already loaded or loading.
+  public load(): Promise<void> {
+    if (this.loading == null) {
+      this.loading = this.importModule().then(
+        () => this.replay(),
+        (e) => {
+          // Try again with the next group.
+          this.loading = null;
+          console.error(`Cannot load the ${this.name} decoder:`, e);
+        });
+    }
+    return this.loading;
+  }
+
+  // Returns the parse function of `rule` until the module is loaded: it
+  // starts loading the module, and queues the group.
+  public stub(rule: number): ParseFunction {
+    return (block, ok, log, station) => {
+      this.load();
+      if (this.queued.length >= MAX_QUEUED_GROUPS) {
+        log.add(`(${this.name} decoder not loaded yet, group skipped)`);
+        return;
+      }
+      // Parse functions get reused blocks.
+      this.queued.push({rule, block: block.slice(), ok, log, logGeneration: log.generation, station});
+      log.add(`(loading the ${this.name} decoder)`);
+    };
+  }
+
+  // Drops the groups queued for `station`, e.g. when it is reset.
+  public dropQueued(station: Station) {
+    this.queued = this.queued.filter((g) => g.station !== station);
+  }
+
+  private replay() {
+    const queued = this.queued;
+    this.queued = [];
+    const functions = this.parseFunctions();
+    for (const g of queued) {
+      // The log message may have been recycled for a later group since.
+      const log = g.log.generation == g.logGeneration ? g.log : new LogMessage();
+      functions[g.rule](g.block, g.ok, log, g.station);
+    }
+  }
+}
+
+export type ParseFunction = (block: Uint16Array, ok: number, log: LogMessage, station: Station) => void;
+
+interface QueuedGroup {
+  rule: number;
+  block: Uint16Array;
+  ok: number;
+  log: LogMessage;
+  logGeneration: number;
+  station: Station;
+}
+
+// Groups queued per module while it loads: about 3 minutes of groups.
+const MAX_QUEUED_GROUPS = 2048;
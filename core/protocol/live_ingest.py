@@ -0,0 +1,311 @@
+"""Live decoding of the group streams of many receivers, publishing station changes.
+
+Receivers connect over TCP or Unix sockets and send RDS Spy hex lines, as
+read by parseHexGroup in input.ts. Each connection is decoded with the
+generated Python decoder (base_py.py), or with a parse program, into one
+station per PI, routed by rds_stream.StationRouter like in bulk_decode.py.
+
+Subscribers connect to another socket, and receive JSON lines: the fields of
+each station that changed, with their new values, and receiver connections
+and disconnections:
+
+    {"receiver": 3, "connected": "127.0.0.1:50422"}
+    {"receiver": 3, "pi": "F201", "fields": {"pi": 61953, "ps": "  INTER "}}
+
+Everything runs on one event loop. Receivers are read in batches of whatever
+has arrived, decoded, and their changes published once per batch. A receiver
+is only read again once its batch is decoded, so that one sending faster than
+it can be decoded is slowed down by TCP flow control. A subscriber that reads
+slowly does not hold up decoding: its pending changes are merged by station,
+newer values replacing older ones, until it catches up.
+
+    python live_ingest.py serve --receivers=tcp:0.0.0.0:7373 --subscribers=unix:/run/rds.sock
+    python live_ingest.py fake tcp:localhost:7373 recording.spy --rate=11.4
+
+The fake receiver plays a hex log at the RDS group rate, for tests.
+"""
+
+import argparse
+import asyncio
+import enum
+import json
+import sys
+
+import rds_stream
+from rds_runtime import RdsString
+
+# Groups per second of an RDS stream: 1187.5 bits/s, 104 bits per group.
+GROUP_RATE = 1187.5 / 104
+
+# Bytes read from a receiver at once, and maximum length of a line.
+READ_SIZE = 1 << 16
+
+# Stations kept per receiver. The least recently received is dropped first.
+MAX_STATIONS = 64
+
+
+def parse_address(address):
+    """Returns ('tcp', host, port) or ('unix', path) for 'tcp:HOST:PORT' or 'unix:PATH'.
+
+    IPv6 hosts are written in brackets, e.g. 'tcp:[::1]:7373'.
+    """
+    (kind, _, rest) = address.partition(':')
+    if kind == 'tcp':
+        (host, _, port) = rest.rpartition(':')
+        if host.startswith('[') and host.endswith(']'):
+            host = host[1:-1]
+        if host and port.isdigit():
+            return ('tcp', host, int(port))
+    elif kind == 'unix' and rest:
+        return ('unix', rest)
+    raise ValueError(f'Invalid address: {address} (expected tcp:HOST:PORT or unix:PATH)')
+
+
+async def start_server(address, handler):
+    """Starts serving connections at an address (see parse_address) with `handler`."""
+    match parse_address(address):
+        case ('tcp', host, port):
+            return await asyncio.start_server(handler, host, port, limit=READ_SIZE)
+        case ('unix', path):
+            return await asyncio.start_unix_server(handler, path, limit=READ_SIZE)
+
+
+async def open_connection(address):
+    match parse_address(address):
+        case ('tcp', host, port):
+            return await asyncio.open_connection(host, port)
+        case ('unix', path):
+            return await asyncio.open_unix_connection(path)
+
+
+def json_value(v):
+    """Returns a JSON-compatible form of a struct field value."""
+    match v:
+        case RdsString():
+            return str(v)
+        case enum.Enum():
+            return v.name
+        case dict():
+            return {str(json_value(k)): json_value(x) for (k, x) in v.items()}
+        case None | bool() | int() | str():
+            return v
+        case _ if hasattr(v, '__slots__'):
+            # Nested structs, e.g. ODA states and other networks.
+            return {s: json_value(getattr(v, s)) for s in v.__slots__ if s not in ('calls', 'changes')}
+    return repr(v)
+
+
+class ReceiverDecoder:
+    """Decodes the groups of one receiver into one station per PI (see rds_stream.StationRouter)."""
+
+    def __init__(self, max_errors=0, parsers=rds_stream.PARSERS, max_stations=MAX_STATIONS):
+        self.max_errors = max_errors
+        self.router = rds_stream.StationRouter(max_stations, parsers)
+        self.groups = 0
+
+    def decode(self, lines):
+        """Decodes hex lines. Returns the mask of the changed StationFields of each PI."""
+        changes = {}
+        for line in lines:
+            group = rds_stream.parse_hex_line(line)
+            if group is None:
+                continue
+            (stream, blocks, errors) = group
+            decoded = self.router.decode_group(stream, blocks, rds_stream.validity_mask(errors, self.max_errors))
+            if decoded is None:
+                continue
+            (pi, event) = decoded
+            self.groups += 1
+            if event.changes != 0:
+                changes[pi] = changes.get(pi, 0) | event.changes
+        return changes
+
+    def delta(self, pi, changes):
+        """Returns the current values of the fields set in a change mask, by name."""
+        station = self.router.stations.get(pi)
+        if station is None:
+            return {}
+        return {f.name: json_value(getattr(station, f.name)) for f in rds_stream.changed_fields(changes)}
+
+
+class Subscriber:
+    """Connection receiving changes, which are merged while it is busy."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        # Messages to send, in order, keyed by (receiver, PI) for station
+        # changes, which are merged, and by a serial number for other events.
+        self.pending = {}
+        self.serial = 0
+        self.wakeup = asyncio.Event()
+
+    def publish(self, receiver, pi, fields):
+        message = self.pending.get((receiver, pi))
+        if message is None:
+            self.pending[(receiver, pi)] = {'receiver': receiver, 'pi': f'{pi:04X}', 'fields': dict(fields)}
+        else:
+            message['fields'].update(fields)
+        self.wakeup.set()
+
+    def publish_event(self, message):
+        self.pending[self.serial] = message
+        self.serial += 1
+        self.wakeup.set()
+
+    async def run(self):
+        try:
+            await self.send()
+        except ConnectionError:
+            pass
+
+    async def send(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            (messages, self.pending) = (self.pending.values(), {})
+            self.writer.write(b''.join(json.dumps(m, ensure_ascii=False).encode('utf8') + b'\n' for m in messages))
+            await self.writer.drain()
+
+
+class IngestServer:
+    """Decodes receiver connections, and publishes their changes to subscribers."""
+
+    def __init__(self, max_errors=0, parsers=rds_stream.PARSERS, max_receivers=1024):
+        self.max_errors = max_errors
+        self.parsers = parsers
+        self.max_receivers = max_receivers
+        self.receivers = {}
+        self.subscribers = set()
+        self.servers = []
+        self.next_receiver = 0
+
+    async def listen(self, receivers=(), subscribers=()):
+        """Starts serving receivers and subscribers at the given addresses."""
+        for address in receivers:
+            self.servers.append(await start_server(address, self.handle_receiver))
+        for address in subscribers:
+            self.servers.append(await start_server(address, self.handle_subscriber))
+
+    def close(self):
+        for server in self.servers:
+            server.close()
+
+    def publish_event(self, message):
+        for s in self.subscribers:
+            s.publish_event(message)
+
+    async def handle_receiver(self, reader, writer):
+        if len(self.receivers) >= self.max_receivers:
+            writer.close()
+            return
+        receiver = self.next_receiver
+        self.next_receiver += 1
+        decoder = self.receivers[receiver] = ReceiverDecoder(self.max_errors, self.parsers)
+        self.publish_event({'receiver': receiver, 'connected': peer_name(writer)})
+        partial = b''
+        try:
+            while data := await reader.read(READ_SIZE):
+                lines = (partial + data).split(b'\n')
+                partial = lines.pop()
+                self.decode(receiver, decoder, lines)
+                if len(partial) > READ_SIZE:
+                    # Not hex lines, e.g. with CR line endings: disconnect.
+                    partial = b''
+                    break
+            self.decode(receiver, decoder, [partial])
+        except ConnectionError:
+            pass
+        finally:
+            del self.receivers[receiver]
+            self.publish_event({'receiver': receiver, 'disconnected': decoder.groups})
+            writer.close()
+
+    def decode(self, receiver, decoder, lines):
+        changes = decoder.decode(line.decode('utf8', errors='replace') for line in lines)
+        for (pi, mask) in changes.items():
+            fields = decoder.delta(pi, mask)
+            for s in self.subscribers:
+                s.publish(receiver, pi, fields)
+
+    async def handle_subscriber(self, reader, writer):
+        subscriber = Subscriber(writer)
+        self.subscribers.add(subscriber)
+        task = asyncio.create_task(subscriber.run())
+        try:
+            # Subscribers send nothing: wait for them to disconnect.
+            while await reader.read(READ_SIZE):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            task.cancel()
+            writer.close()
+
+
+def peer_name(writer):
+    peer = writer.get_extra_info('peername')
+    return f'{peer[0]}:{peer[1]}' if isinstance(peer, tuple) else str(peer or 'unix')
+
+
+async def fake_receiver(address, lines, rate=GROUP_RATE, repeat=1):
+    """Sends hex lines to a server like a receiver would, `rate` lines per second.
+
+    If `rate` is None, lines are sent as fast as the server reads them.
+    """
+    (_, writer) = await open_connection(address)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    n = 0
+    for _ in range(repeat):
+        for line in lines:
+            writer.write(line.rstrip('\n').encode('utf8') + b'\n')
+            n += 1
+            if rate is not None:
+                await asyncio.sleep(max(0, start + n / rate - loop.time()))
+            await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def serve(args):
+    parsers = rds_stream.PARSERS
+    if args.program:
+        import parse_program
+        parsers = parse_program.load(args.program).parsers
+    server = IngestServer(args.max_errors, parsers, args.max_receivers)
+    await server.listen(args.receivers, args.subscribers)
+    await asyncio.gather(*(s.serve_forever() for s in server.servers))
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description='Decodes live RDS Spy hex streams of many receivers, and publishes station changes.')
+    commands = argparser.add_subparsers(dest='command', required=True)
+    s = commands.add_parser('serve', help='Decodes receiver connections, publishing changes to subscribers.')
+    s.add_argument('--receivers', action='append', required=True, help='Address of receivers, e.g. tcp:0.0.0.0:7373.')
+    s.add_argument('--subscribers', action='append', default=[], help='Address of subscribers, e.g. unix:/run/rds.sock.')
+    s.add_argument('--max-errors', type=int, default=0,
+                   help='Maximum number of corrected errors of a valid block.')
+    s.add_argument('--max-receivers', type=int, default=1024, help='Maximum number of simultaneous receivers.')
+    s.add_argument('--program', help='Parse program to decode with (see parse_program.py), rather than base_py.')
+    f = commands.add_parser('fake', help='Plays a hex log to a server, like a receiver.')
+    f.add_argument('address')
+    f.add_argument('infile')
+    f.add_argument('--rate', type=float, default=GROUP_RATE, help='Groups per second, 0 for as fast as possible.')
+    f.add_argument('--repeat', type=int, default=1)
+    args = argparser.parse_args()
+
+    try:
+        if args.command == 'serve':
+            asyncio.run(serve(args))
+        else:
+            with open(args.infile, encoding='utf8', errors='replace') as f:
+                lines = f.readlines()
+            asyncio.run(fake_receiver(args.address, lines, args.rate or None, args.repeat))
+    except KeyboardInterrupt:
+        print('Interrupted.', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Tests for the live decoding service."""
+
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import live_ingest
+
+FRANCE_INTER = '''F201 0408 2037 2020
+F201 0409 383B 494E
+F201 040A 3D45 5445
+F201 040F 474E 5220
+'''
+
+RADIO_1 = '''F202 0408 2037 5241
+F202 0409 383B 4449
+F202 040A 3D45 4F20
+F202 040F 474E 2031
+'''
+
+
+class ReceiverDecoderTest(unittest.TestCase):
+    def test_decode(self):
+        decoder = live_ingest.ReceiverDecoder()
+        # Groups without PI go to the last station, or nowhere before it.
+        changes = decoder.decode(['---- 0408 2037 2020'] + FRANCE_INTER.splitlines() + ['---- 0409 383B 494E'])
+        self.assertEqual(list(changes), [0xF201])
+        self.assertEqual(decoder.groups, 5)
+        self.assertEqual(decoder.delta(0xF201, changes[0xF201])['ps'], '  INTER ')
+
+    def test_max_stations(self):
+        decoder = live_ingest.ReceiverDecoder(max_stations=1)
+        decoder.decode(FRANCE_INTER.splitlines() + RADIO_1.splitlines())
+        self.assertEqual(list(decoder.router.stations), [0xF202])
+        self.assertEqual(decoder.delta(0xF201, ~0), {})
+
+    def test_parse_address(self):
+        self.assertEqual(live_ingest.parse_address('tcp:[::1]:7373'), ('tcp', '::1', 7373))
+        self.assertEqual(live_ingest.parse_address('unix:/run/rds.sock'), ('unix', '/run/rds.sock'))
+        for address in ('tcp:7373', 'tcp:[]:7373', 'udp:localhost:7373', 'unix:'):
+            with self.assertRaises(ValueError):
+                live_ingest.parse_address(address)
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b''
+        self.resume = asyncio.Event()
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        await self.resume.wait()
+        self.resume.clear()
+
+
+class IngestServerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_merge_pending(self):
+        writer = FakeWriter()
+        subscriber = live_ingest.Subscriber(writer)
+        task = asyncio.create_task(subscriber.run())
+        subscriber.publish(0, 0xF201, {'pi': 0xF201})
+        await asyncio.sleep(0)
+        # The first message is being sent: later ones are merged meanwhile.
+        subscriber.publish_event({'receiver': 1, 'connected': 'a'})
+        subscriber.publish(0, 0xF201, {'ps': 'A'})
+        subscriber.publish(0, 0xF201, {'ps': 'B', 'tp': True})
+        writer.resume.set()
+        await asyncio.sleep(0)
+        task.cancel()
+        self.assertEqual([json.loads(l) for l in writer.data.splitlines()], [
+            {'receiver': 0, 'pi': 'F201', 'fields': {'pi': 0xF201}},
+            {'receiver': 1, 'connected': 'a'},
+            {'receiver': 0, 'pi': 'F201', 'fields': {'ps': 'B', 'tp': True}},
+        ])
+
+    async def test_serve(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        subscribers = 'unix:' + os.path.join(tmp.name, 'rds.sock')
+        server = live_ingest.IngestServer()
+        await server.listen(['tcp:127.0.0.1:0'], [subscribers])
+        self.addCleanup(server.close)
+        receivers = f'tcp:127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}'
+
+        (reader, writer) = await live_ingest.open_connection(subscribers)
+        self.addCleanup(writer.close)
+        while not server.subscribers:
+            await asyncio.sleep(0)
+        await asyncio.gather(
+            live_ingest.fake_receiver(receivers, FRANCE_INTER.splitlines(), rate=None, repeat=3),
+            live_ingest.fake_receiver(receivers, RADIO_1.splitlines(), rate=None))
+
+        ps = {}
+        disconnected = {}
+        while len(disconnected) < 2:
+            message = json.loads(await asyncio.wait_for(reader.readline(), 5))
+            if 'disconnected' in message:
+                disconnected[message['receiver']] = message['disconnected']
+            elif 'ps' in message.get('fields', {}):
+                ps[message['pi']] = message['fields']['ps']
+        self.assertEqual(ps, {'F201': '  INTER ', 'F202': 'RADIO  1'})
+        self.assertEqual(sorted(disconnected.values()), [4, 12])
+        self.assertEqual(server.receivers, {})
+
+    async def test_disconnect_without_line_feeds(self):
+        server = live_ingest.IngestServer()
+        await server.listen(['tcp:127.0.0.1:0'])
+        self.addCleanup(server.close)
+        (reader, writer) = await live_ingest.open_connection(
+            f'tcp:127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}')
+        self.addCleanup(writer.close)
+        writer.write(b'F201 0408 2037 2020\r' * (live_ingest.READ_SIZE // 10))
+        try:
+            self.assertEqual(await asyncio.wait_for(reader.read(), 5), b'')
+        except ConnectionResetError:
+            # The server closed the connection with data left unread.
+            pass
+        self.assertEqual(server.receivers, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
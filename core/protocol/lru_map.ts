@@ -0,0 +1,36 @@
+// Map holding at most `capacity` entries, which evicts its least recently used
+// entry to make room for a new one. Getting or setting an entry makes it the
+// most recently used; has() does not. Iteration goes from the least to the
+// most recently used entry, so that a copy made by iterating over an LruMap
+// evicts in the same order.
+export class LruMap<K, V> extends Map<K, V> {
+  // Called with each entry evicted to make room for a new one.
+  onEvict: ((key: K, value: V) => void) | null = null;
+
+  public constructor(readonly capacity: number) {
+    super();
+    if (!(capacity >= 1)) {
+      throw new RangeError("Invalid LruMap capacity: " + capacity);
+    }
+  }
+
+  override get(key: K): V | undefined {
+    const value = super.get(key);
+    if (value !== undefined) {
+      super.delete(key);
+      super.set(key, value);
+    }
+    return value;
+  }
+
+  override set(key: K, value: V): this {
+    super.delete(key);
+    super.set(key, value);
+    while (this.size > this.capacity) {
+      const [oldestKey, oldestValue] = this.entries().next().value as [K, V];
+      super.delete(oldestKey);
+      this.onEvict?.(oldestKey, oldestValue);
+    }
+    return this;
+  }
+}
@@ -0,0 +1,57 @@
+# ETSI standard EN 301700 describes a way to cross-reference DAB (aka Eureka
+# 147) services from their FM/RDS counterparts. This is achieved through the
+# use of an ODA, of AID 0x0093 (dec 147).
+struct DabCrossRefApp {
+  addEnsemble(mode: uint<2>, frequency: uint<18>, eid: uint<16>)
+  addServiceEnsembleInfo(eid: uint<16>, sid: uint<16>)
+  addServiceLinkageInfo(linkageInfo: uint<16>, sid: uint<16>)
+}
+
+bitstruct group_dabxref(station: Station) {
+  group_common: unparsed<27>
+
+  es: uint<1>
+
+  _: unparsed<36>
+} action {
+  switch es {
+    case 0 {
+      parse _ "group_dabxref_ensemble"
+    }
+    case 1 {
+      parse _ "group_dabxref_service"
+    }
+  }
+}
+
+bitstruct group_dabxref_ensemble(station: Station) {
+  _: unparsed<28>
+
+  mode: uint<2>
+  frequency: uint<18>
+  eid: uint<16>
+} action {
+  station.dab_cross_ref_app.addEnsemble(mode, frequency, eid)
+}
+
+bitstruct group_dabxref_service(station: Station) {
+  _: unparsed<28>
+
+  variant: uint<4>
+  info: uint<16>
+  sid: uint<16>
+} action {
+  log "DAB xref"
+  log "v={variant:u}"
+  log "info={info:04x}"
+  log "sid={sid:04x}"
+
+  switch variant {
+    case 0 {
+      station.dab_cross_ref_app.addServiceEnsembleInfo(info, sid)
+    }
+    case 1 {
+      station.dab_cross_ref_app.addServiceLinkageInfo(info, sid)
+    }
+  }
+}
@@ -1,163 +1,6 @@
-struct RtPlusApp {
-  setTag(content_type: uint<6>, start: uint<6>, length: uint<6>)
-}
-
-bitstruct group_rtplus(station: Station) {
-  group_common: unparsed<27>
-
-  # After PTY, the ODA-specific part of the RT+ groups is not aligned with
-  # block boundaries.
-  item_toggle: bool
-  item_running: bool
-
-  # Tag 1.
-  content_type_1: uint<6>
-  start_1: uint<6>
-  length_1: uint<6>
-
-  # Tag 2.
-  content_type_2: uint<6>
-  start_2: uint<6>
-  length_2: uint<5>
-} action {
-  log "RT+ item_toggle={item_toggle:bool} item_running={item_running:bool}"
-  log "Tag 1: type={content_type_1:u}, start={start_1:u}, length={length_1:u}"
-  log "Tag 2: type={content_type_2:u}, start={start_2:u}, length={length_2:u}"
-
-  station.rt_plus_app.setTag(content_type_1, start_1, length_1)
-  station.rt_plus_app.setTag(content_type_2, start_2, length_2)
-}
-
-# ETSI standard EN 301700 describes a way to cross-reference DAB (aka Eureka
-# 147) services from their FM/RDS counterparts. This is achieved through the
-# use of an ODA, of AID 0x0093 (dec 147).
-struct DabCrossRefApp {
-  addEnsemble(mode: uint<2>, frequency: uint<18>, eid: uint<16>)
-  addServiceEnsembleInfo(eid: uint<16>, sid: uint<16>)
-  addServiceLinkageInfo(linkageInfo: uint<16>, sid: uint<16>)
-}
-
-bitstruct group_dabxref(station: Station) {
-  group_common: unparsed<27>
-
-  es: uint<1>
-
-  _: unparsed<36>
-} action {
-  switch es {
-    case 0 {
-      parse _ "group_dabxref_ensemble"
-    }
-    case 1 {
-      parse _ "group_dabxref_service"
-    }
-  }
-}
-
-bitstruct group_dabxref_ensemble(station: Station) {
-  _: unparsed<28>
-
-  mode: uint<2>
-  frequency: uint<18>
-  eid: uint<16>
-} action {
-  station.dab_cross_ref_app.addEnsemble(mode, frequency, eid)
-}
-
-bitstruct group_dabxref_service(station: Station) {
-  _: unparsed<28>
-
-  variant: uint<4>
-  info: uint<16>
-  sid: uint<16>
-} action {
-  log "DAB xref"
-  log "v={variant:u}"
-  log "info={info:04x}"
-  log "sid={sid:04x}"
-
-  switch variant {
-    case 0 {
-      station.dab_cross_ref_app.addServiceEnsembleInfo(info, sid)
-    }
-    case 1 {
-      station.dab_cross_ref_app.addServiceLinkageInfo(info, sid)
-    }
-  }
-}
-
-# Extended Radiotext (eRT).
-struct ERtApp {
-  ert: str<128>
-  utf8_encoding: bool
-  enabled: bool
-}
-
-bitstruct group_ert_declaration(station: Station) {
-  # Blocks A and B.
-  group_3A_common: unparsed<32>
-
-  # Block C.
-  rfu: unparsed<15>
-  utf8_encoding: bool
-
-  # Block D.
-  ert_aid: unparsed<16>
-} action {
-  log "eRT utf8 encoding? {utf8_encoding:bool}"
-
-  station.ert_app.utf8_encoding = utf8_encoding
-  station.ert_app.enabled = true
-}
-
-bitstruct group_ert(station: Station) {
-  group_common: unparsed<27>
-
-  # Rest of Block B.
-  addr: uint<5>
-  
-  # Blocks C and D.
-  ert_seg: byte<4>
-} action {
-  log "eRT seg @{addr:u} \"{ert_seg:bytes}\""
-
-  copy station.ert_app.ert, addr, 4, ert_seg
-}
-
-# Internet Connection.
-struct InternetConnectionApp {
-  url: str<128>
-  enabled: bool
-}
-
-bitstruct group_internet_connection(station: Station) {
-  # Block A.
-  header: unparsed<8>
-  type: uint<1>
-  
-  # The rest depends on the type.
-  _: unparsed<55>
-} action {
-  log "Internet connection"
-
-  switch type {
-    case 0, 1 {
-      parse _ "group_internet_connection_url"
-    }
-  }
-  station.internet_connection_app.enabled = true
-}
-
-bitstruct group_internet_connection_url(station: Station) {
-  # Block A.
-  header: unparsed<8>
-  type: unparsed<1>
-  addr: uint<7>
-
-  # Blocks B, C, D.
-  url_seg: byte<6>
-} action {
-  log "URL seg @{addr:u} \"{url_seg:bytes}\""
-
-  copy station.internet_connection_app.url, addr, 6, url_seg
-}
+# Open Data Applications, one per file, so that `compiler.py --split` compiles
+# each to its own lazily loaded module.
+#include oda_rtplus.p
+#include oda_dabxref.p
+#include oda_ert.p
+#include oda_internet_connection.p
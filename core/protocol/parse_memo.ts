@@ -0,0 +1,84 @@
+// Cache of the groups parsed by idempotent rules.
+//
+// A rule is idempotent if parsing the same group again leaves the decoder
+// state unchanged, as long as nothing else wrote what the rule writes in the
+// meantime. Transmitters repeat many such groups, so when compiled with
+// `compiler.py --memo`, the parse functions of idempotent rules look up the
+// group in this cache first, and return immediately on a hit.
+//
+// The generated code keeps one write counter per path (e.g. `Station.ecc`)
+// written by idempotent rules, and increments it on every parse that may
+// write at this path. An entry records the sum of the counters of its rule
+// when it was stored: if the sum is still the same, the rule's writes have
+// not been overwritten.
+//
+// The cache is direct-mapped: a new entry evicts the one in its slot.
+export class ParseMemo {
+  // Write counters, indexed by path. Float64Array so that they never wrap.
+  readonly writes: Float64Array;
+  public hits = 0;
+  public misses = 0;
+
+  private readonly rules: Int32Array;
+  private readonly oks: Uint8Array;
+  private readonly blocks: Uint16Array;
+  private readonly versions: Float64Array;
+  private readonly stations: Array<object | undefined>;
+  private readonly mask: number;
+
+  // `size` must be a power of two.
+  public constructor(numPaths: number, size = 256) {
+    this.writes = new Float64Array(numPaths);
+    this.rules = new Int32Array(size).fill(-1);
+    this.oks = new Uint8Array(size);
+    this.blocks = new Uint16Array(4 * size);
+    this.versions = new Float64Array(size);
+    this.stations = new Array<object | undefined>(size);
+    this.mask = size - 1;
+  }
+
+  // Returns the slot of a group parsed by a rule.
+  public slot(rule: number, block: Uint16Array, ok: number): number {
+    let h = Math.imul(rule + 1, 0x9e3779b1) ^ ok;
+    h = Math.imul(h ^ block[0], 0x85ebca6b);
+    h = Math.imul(h ^ block[1], 0xc2b2ae35);
+    h = Math.imul(h ^ block[2], 0x85ebca6b);
+    h = Math.imul(h ^ block[3], 0xc2b2ae35);
+    return (h ^ (h >>> 16)) & this.mask;
+  }
+
+  // Returns whether the group was the last one parsed by `rule` for `station`
+  // in `slot`, and whether the rule's writes are still current.
+  public matches(slot: number, rule: number, block: Uint16Array, ok: number, station: object, version: number): boolean {
+    const b = 4 * slot;
+    if (this.rules[slot] == rule && this.oks[slot] == ok &&
+        this.stations[slot] === station && this.versions[slot] == version &&
+        this.blocks[b] == block[0] && this.blocks[b + 1] == block[1] &&
+        this.blocks[b + 2] == block[2] && this.blocks[b + 3] == block[3]) {
+      this.hits++;
+      return true;
+    }
+    this.misses++;
+    return false;
+  }
+
+  public store(slot: number, rule: number, block: Uint16Array, ok: number, station: object, version: number) {
+    this.rules[slot] = rule;
+    this.oks[slot] = ok;
+    const b = 4 * slot;
+    this.blocks[b] = block[0];
+    this.blocks[b + 1] = block[1];
+    this.blocks[b + 2] = block[2];
+    this.blocks[b + 3] = block[3];
+    this.versions[slot] = version;
+    this.stations[slot] = station;
+  }
+
+  // Drops all entries. Must be called when station state is changed outside
+  // of parse functions, e.g. when a station is reset, or when a bounded map
+  // evicts an element that a parse function created.
+  public clear() {
+    this.rules.fill(-1);
+    this.stations.fill(undefined);
+  }
+}
@@ -0,0 +1,321 @@
+"""Interpreter of parse programs, the table-driven form of the RDS decoder.
+
+`compiler.py --backend=program base.p base_program.json` compiles the protocol
+description to a JSON parse program: a descriptor per bitstruct, with the
+extents of its fields and its actions as opcodes (see compiler.py for the
+format). ParseProgram links the descriptors into parse functions that behave
+like those of base_py.py, and take the same structs:
+
+    program = parse_program.load()
+    parse_group_ab = program.parse_function('group_ab')
+    parse_group_ab(blocks, ok, log, station)
+
+Linking turns every expression and action into a closure over slots of an
+environment list, so that the JSON is only walked once. parse_program.ts is
+the TypeScript counterpart.
+"""
+
+import json
+import os
+
+from rds_runtime import RDS_CHARMAP, format_af
+
+FORMAT = 'rds-parse-program/2'
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'base_program.json')
+
+# Slots of the environment of a parse function, followed by its arguments.
+BLOCK, OK, LOG = range(3)
+
+
+def format_rds_text(text):
+    return ''.join('.' if c is None else RDS_CHARMAP[c] for c in text)
+
+
+def format_bytes(data):
+    return ' '.join('..' if b is None else f'{b:02X}' for b in data)
+
+
+def format_bcd(digit):
+    return str(digit) if 0 <= digit <= 9 else ' '
+
+
+# Log formats, as in py_format_expr.
+LOG_FORMATS = {
+    'bool': lambda v: '1' if v else '0',
+    'u': str,
+    '02u': lambda v: f'{v:02d}',
+    '02x': lambda v: f'{v:02X}',
+    '04x': lambda v: f'{v:04X}',
+    'bcd': format_bcd,
+    'grouptype': lambda v: f'{v >> 1}{"A" if (v & 1) == 0 else "B"}',
+    'freq': format_af,
+    'rdschar': lambda v: RDS_CHARMAP[v],
+    'rdstext': format_rds_text,
+    'bytes': format_bytes,
+    'letter': lambda v: 'A' if v else 'B',
+    'sign': lambda v: '+' if v else '-',
+}
+
+
+class ParseProgram:
+    """Parse functions linked from a parse program, indexed by rule ID.
+
+    `structs` holds the struct classes by name as attributes, e.g. the
+    base_py module. Map elements that do not exist yet are created from them.
+    Like in base_py.py, new elements share the call list of the argument they
+    are reached from.
+    """
+
+    def __init__(self, program, structs):
+        if program.get('format') != FORMAT:
+            raise ValueError(f'Unsupported parse program format: {program.get("format")}')
+        self.rules = program['rules']
+        self.structs = structs
+        self.parse_functions = [None] * len(self.rules)
+        for (rule, bitstruct) in enumerate(program['bitstructs']):
+            self.parse_functions[rule] = BitstructLinker(self, bitstruct).link()
+
+    def parse_function(self, rule):
+        """Returns the parse function of a rule, given by name."""
+        return self.parse_functions[self.rules.index(rule)]
+
+    @property
+    def parsers(self):
+        """Parse functions of type A/B and type C groups, as taken by rds_stream.decode."""
+        return (self.parse_function('group_ab'), self.parse_function('group_c'))
+
+
+def load(path=DEFAULT_PATH, structs=None):
+    """Loads and links a parse program, by default the one of base.p with base_py structs."""
+    if structs is None:
+        import base_py
+        structs = base_py
+    with open(path, encoding='utf8') as f:
+        return ParseProgram(json.load(f), structs)
+
+
+def field_extractor(is_bool, masks, shifts):
+    """Returns a function extracting a field element from a group, like field_element_expr."""
+    parts = [(b, masks[b], shifts[b]) for b in range(4) if masks[b] != 0]
+    if len(parts) == 1 and parts[0][2] >= 0:
+        [(b, mask, shift)] = parts
+        extract = lambda block: (block[b] & mask) >> shift
+    else:
+        def extract(block):
+            value = 0
+            for (b, mask, shift) in parts:
+                value |= (block[b] & mask) >> shift if shift >= 0 else (block[b] & mask) << -shift
+            return value
+    if is_bool:
+        return lambda block: extract(block) == 1
+    return extract
+
+
+def run_all(actions, env):
+    for a in actions:
+        a(env)
+
+
+class BitstructLinker:
+    """Links the descriptor of a bitstruct into a parse function."""
+
+    def __init__(self, program, bitstruct):
+        self.program = program
+        self.bitstruct = bitstruct
+        self.slots = {}
+        for name in bitstruct['args']:
+            self.slot(name)
+
+    def slot(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots) + 3
+        return self.slots[name]
+
+    def link(self):
+        b = self.bitstruct
+        fields = [(self.slot(var), field_extractor(is_bool, masks, shifts))
+                  for (var, is_bool, masks, shifts) in b['fields']]
+        arrays = [(self.slot(var), [(self.slot(v), m) for (v, m) in zip(elements, ok_masks)])
+                  for (var, elements, ok_masks) in b['arrays']]
+        for var in b['elements']:
+            self.slot(var)
+        actions = self.actions(b['actions'])
+        num_args = 3 + len(b['args'])
+        padding = [None] * (len(self.slots) + 3 - num_args)
+
+        def parse(*args):
+            if len(args) != num_args:
+                raise TypeError(f'parse_{b["name"]} takes {num_args} arguments, got {len(args)}')
+            env = [*args, *padding]
+            block = args[BLOCK]
+            for (slot, extract) in fields:
+                env[slot] = extract(block)
+            ok = args[OK]
+            for (slot, elements) in arrays:
+                env[slot] = tuple(env[v] if (ok & m) == m else None for (v, m) in elements)
+            for a in actions:
+                a(env)
+
+        parse.__name__ = f'parse_{b["name"]}'
+        return parse
+
+    def expr(self, e):
+        match e:
+            case bool() | int():
+                return lambda env: e
+            case str():
+                slot = self.slot(e)
+                return lambda env: env[slot]
+            case ['rule', rule]:
+                return lambda env: rule
+            case ['.', str() as var, name]:
+                slot = self.slot(var)
+                return lambda env: getattr(env[slot], name)
+            case ['.', obj, name]:
+                obj = self.expr(obj)
+                return lambda env: getattr(obj(env), name)
+            case ['get', m, key, default]:
+                (m, key, default) = (self.expr(m), self.expr(key), self.expr(default))
+                return lambda env: m(env).get(key(env), default(env))
+            case ['+', left, right]:
+                (left, right) = (self.expr(left), self.expr(right))
+                return lambda env: left(env) + right(env)
+            case ['*', left, right]:
+                (left, right) = (self.expr(left), self.expr(right))
+                return lambda env: left(env) * right(env)
+        raise ValueError(f'Invalid expression in {self.bitstruct["name"]}: {e}')
+
+    def mark(self, mark):
+        """Returns a function setting a change mask bit, or None."""
+        if mark is None:
+            return None
+        (arg, bit) = mark
+        (slot, bit) = (self.slot(arg), 1 << bit)
+
+        def mark_change(env):
+            env[slot].changes |= bit
+        return mark_change
+
+    def actions(self, actions):
+        return [self.action(a) for a in actions]
+
+    def action(self, a):
+        match a:
+            case ['if', ok_mask, defined, body]:
+                body = self.actions(body)
+                defined = [self.slot(v) for v in defined]
+                if len(defined) == 0:
+                    def guarded(env):
+                        if (env[OK] & ok_mask) == ok_mask:
+                            run_all(body, env)
+                else:
+                    def guarded(env):
+                        if (env[OK] & ok_mask) == ok_mask and all(env[s] is not None for s in defined):
+                            run_all(body, env)
+                return guarded
+            case ['set', target, value, mark]:
+                return self.assign(target, self.expr(value), self.mark(mark))
+            case ['bytes', target, index, values, ok_masks, mark]:
+                (target, index, mark) = (self.expr(target), self.expr(index), self.mark(mark))
+                values = [self.slot(v) for v in values]
+
+                def set_bytes(env):
+                    ok = env[OK]
+                    valid = 0
+                    for (i, m) in enumerate(ok_masks):
+                        if (ok & m) == m:
+                            valid |= 1 << i
+                    changed = target(env).set_bytes(index(env), tuple(env[s] for s in values), valid)
+                    if changed and mark is not None:
+                        mark(env)
+                return set_bytes
+            case ['put', m, key, value, mark]:
+                (m, key, value, mark) = (self.expr(m), self.expr(key), self.expr(value), self.mark(mark))
+
+                def put(env):
+                    (d, k, v) = (m(env), key(env), value(env))
+                    if mark is None:
+                        d[k] = v
+                    elif d.get(k) != v:
+                        d[k] = v
+                        mark(env)
+                return put
+            case ['parse', rule]:
+                functions = self.program.parse_functions
+                num_args = 3 + len(self.bitstruct['args'])
+                # Rules may not be linked yet: look them up at run time.
+                rule = self.expr(rule)
+                return lambda env: functions[rule(env)](*env[:num_args])
+            case ['call', obj, method, args, mark]:
+                (obj, mark) = (self.expr(obj), self.mark(mark))
+                args = [self.expr(x) for x in args]
+
+                def call(env):
+                    getattr(obj(env), method)(*(x(env) for x in args))
+                    if mark is not None:
+                        mark(env)
+                return call
+            case ['log', parts]:
+                parts = [self.log_part(p) for p in parts]
+                return lambda env: env[LOG].append(''.join(p(env) for p in parts))
+            case ['resolve', var, m, key, root, struct, key_field, mark]:
+                (slot, root) = (self.slot(var), self.slot(root))
+                (m, key, mark) = (self.expr(m), self.expr(key), self.mark(mark))
+                element_type = getattr(self.program.structs, struct)
+
+                def resolve(env):
+                    (d, k) = (m(env), key(env))
+                    element = d.get(k)
+                    if element is None:
+                        element = element_type(env[root].calls)
+                        setattr(element, key_field, k)
+                        d[k] = element
+                        if mark is not None:
+                            mark(env)
+                    env[slot] = element
+                return resolve
+            case ['switch', e, cases]:
+                e = self.expr(e)
+                table = {}
+                default = []
+                for (values, body) in cases:
+                    body = self.actions(body)
+                    if values is None:
+                        default = body
+                    else:
+                        for v in values:
+                            table.setdefault(v, body)
+                return lambda env: run_all(table.get(e(env), default), env)
+        raise ValueError(f'Invalid action in {self.bitstruct["name"]}: {a}')
+
+    def assign(self, target, value, mark):
+        match target:
+            case str():
+                slot = self.slot(target)
+
+                def assign_var(env):
+                    env[slot] = value(env)
+                return assign_var
+            case ['.', obj, name]:
+                obj = self.expr(obj)
+                if mark is None:
+                    def assign_member(env):
+                        setattr(obj(env), name, value(env))
+                else:
+                    def assign_member(env):
+                        (o, v) = (obj(env), value(env))
+                        if getattr(o, name) != v:
+                            setattr(o, name, v)
+                            mark(env)
+                return assign_member
+        raise ValueError(f'Invalid assignment target in {self.bitstruct["name"]}: {target}')
+
+    def log_part(self, part):
+        match part:
+            case str():
+                return lambda env: part
+            case [var, fmt]:
+                (slot, fmt) = (self.slot(var), LOG_FORMATS[fmt])
+                return lambda env: fmt(env[slot])
+        raise ValueError(f'Invalid log part in {self.bitstruct["name"]}: {part}')
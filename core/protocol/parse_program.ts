@@ -0,0 +1,415 @@
+import { formatAf } from "./af";
+import { formatBcd, formatBytes, formatRdsText } from "./base";
+import { ChangeMask } from "./change_mask";
+import { LogMessage, OtherNetworkImpl, RDS_CHARMAP, RdsString, StationImpl } from "./rds_types";
+
+// Interpreter of parse programs, the table-driven form of the decoder.
+//
+// `compiler.py --backend=program base.p base_program.json` compiles the
+// protocol description to a JSON parse program: a descriptor per bitstruct,
+// with the extents of its fields and its actions as opcodes (see compiler.py
+// for the format). ParseProgram links the descriptors into parse functions
+// that behave like those of base.ts compiled with --log=eager, so that the
+// decoder can be shipped as data rather than code:
+//
+//   const program = new ParseProgram(await (await fetch("base_program.json")).json());
+//   program.parseFunction("group_ab")(blocks, ok, log, station);
+//
+// Linking turns every expression and action into a closure over slots of an
+// environment array, so that descriptors are only walked once.
+// parse_program.py is the Python counterpart.
+
+export const PARSE_PROGRAM_FORMAT = "rds-parse-program/2";
+
+export type ProgramExpr =
+  number | boolean | string |
+  ["rule", number] |
+  [".", ProgramExpr, string] |
+  ["get", ProgramExpr, ProgramExpr, ProgramExpr] |
+  ["+" | "*", ProgramExpr, ProgramExpr];
+
+// Argument and bit of the change mask bit set by an action, if any.
+export type ProgramMark = [string, number] | null;
+
+export type ProgramAction =
+  ["if", number, string[], ProgramAction[]] |
+  ["set", ProgramExpr, ProgramExpr, ProgramMark] |
+  ["bytes", ProgramExpr, ProgramExpr, string[], number[], ProgramMark] |
+  ["put", ProgramExpr, ProgramExpr, ProgramExpr, ProgramMark] |
+  ["parse", ProgramExpr] |
+  ["call", ProgramExpr, string, ProgramExpr[], ProgramMark] |
+  ["log", Array<string | [string, string]>] |
+  // Element variable, map, key, root argument, struct and key field.
+  ["resolve", string, ProgramExpr, ProgramExpr, string, string, string, ProgramMark] |
+  ["switch", ProgramExpr, Array<[number[] | null, ProgramAction[]]>];
+
+export interface BitstructDescriptor {
+  name: string;
+  args: string[];
+  // Variable, whether it is a bool, and masks and shifts of each block.
+  fields: Array<[string, boolean, number[], number[]]>;
+  // Summaries of byte array fields for logs: variable, element variables,
+  // and the mask of the blocks each element depends on.
+  arrays: Array<[string, string[], number[]]>;
+  elements: string[];
+  actions: ProgramAction[];
+}
+
+export interface ParseProgramDescriptor {
+  format: string;
+  rules: string[];
+  bitstructs: BitstructDescriptor[];
+}
+
+// Classes of map elements, by struct name, created with their key as in the
+// generated code.
+export type ElementTypes = Record<string, new (key: number) => object>;
+
+export const ELEMENT_TYPES: ElementTypes = {
+  OtherNetwork: OtherNetworkImpl,
+  Station: StationImpl,
+};
+
+export type ParseFunction = (block: Uint16Array, ok: number, log: LogMessage, ...args: unknown[]) => void;
+
+// Slots of the environment of a parse function, followed by its arguments.
+const BLOCK = 0;
+const OK = 1;
+const LOG = 2;
+const FIRST_ARG = 3;
+
+type Env = unknown[];
+type Eval = (env: Env) => unknown;
+type Run = (env: Env) => void;
+type Struct = Record<string, unknown>;
+
+// Log formats, as in format_expr in compiler.py.
+const LOG_FORMATS: Record<string, (v: unknown) => string> = {
+  "bool": (v) => v ? "1" : "0",
+  "u": (v) => `${v}`,
+  "02u": (v) => (v as number).toString().padStart(2, "0"),
+  "02x": (v) => (v as number).toString(16).toUpperCase().padStart(2, "0"),
+  "04x": (v) => (v as number).toString(16).toUpperCase().padStart(4, "0"),
+  "bcd": (v) => formatBcd(v as number),
+  "grouptype": (v) => ((v as number) >> 1).toString() + (((v as number) & 1) == 0 ? "A" : "B"),
+  "freq": (v) => formatAf(v as number),
+  "rdschar": (v) => RDS_CHARMAP[v as number],
+  "rdstext": (v) => formatRdsText(v as Array<number | null>),
+  "bytes": (v) => formatBytes(v as Array<number | null>),
+  "letter": (v) => v ? "A" : "B",
+  "sign": (v) => v ? "+" : "-",
+};
+
+function runAll(actions: Run[], env: Env) {
+  for (const a of actions) {
+    a(env);
+  }
+}
+
+// Returns a function extracting a field element from a group, like
+// field_element_expr in compiler.py.
+function fieldExtractor(isBool: boolean, masks: number[], shifts: number[]): (block: Uint16Array) => number | boolean {
+  const blocks: number[] = [];
+  for (let b = 0; b < 4; b++) {
+    if (masks[b] != 0) blocks.push(b);
+  }
+  let extract: (block: Uint16Array) => number;
+  if (blocks.length == 1 && shifts[blocks[0]] >= 0) {
+    const [b] = blocks;
+    const mask = masks[b];
+    const shift = shifts[b];
+    extract = (block) => (block[b] & mask) >> shift;
+  } else {
+    extract = (block) => {
+      let value = 0;
+      for (const b of blocks) {
+        const v = block[b] & masks[b];
+        value |= shifts[b] >= 0 ? v >> shifts[b] : v << -shifts[b];
+      }
+      return value;
+    };
+  }
+  return isBool ? (block) => extract(block) == 1 : extract;
+}
+
+// Parse functions linked from a parse program, indexed by rule ID.
+export class ParseProgram {
+  readonly rules: string[];
+  readonly parseFunctions: ParseFunction[] = [];
+
+  public constructor(program: ParseProgramDescriptor, elementTypes: ElementTypes = ELEMENT_TYPES) {
+    if (program.format != PARSE_PROGRAM_FORMAT) {
+      throw new RangeError("Unsupported parse program format: " + program.format);
+    }
+    this.rules = program.rules;
+    for (const bitstruct of program.bitstructs) {
+      this.parseFunctions.push(new BitstructLinker(this.parseFunctions, elementTypes, bitstruct).link());
+    }
+  }
+
+  // Returns the parse function of a rule, given by name.
+  public parseFunction(rule: string): ParseFunction {
+    const f = this.parseFunctions[this.rules.indexOf(rule)];
+    if (f == undefined) {
+      throw new RangeError("Invalid rule: " + rule);
+    }
+    return f;
+  }
+}
+
+// Links the descriptor of a bitstruct into a parse function.
+class BitstructLinker {
+  private readonly slots = new Map<string, number>();
+  // Scratch buffer for copying byte fields, as BYTE_SCRATCH in base.ts.
+  private readonly byteScratch = new Uint8Array(8);
+
+  public constructor(
+      private readonly functions: ParseFunction[],
+      private readonly elementTypes: ElementTypes,
+      private readonly bitstruct: BitstructDescriptor) {
+    for (const name of bitstruct.args) {
+      this.slot(name);
+    }
+  }
+
+  private slot(name: string): number {
+    let slot = this.slots.get(name);
+    if (slot == undefined) {
+      slot = this.slots.size + FIRST_ARG;
+      this.slots.set(name, slot);
+    }
+    return slot;
+  }
+
+  public link(): ParseFunction {
+    const b = this.bitstruct;
+    const fields = b.fields.map(([v, isBool, masks, shifts]) =>
+      ({slot: this.slot(v), extract: fieldExtractor(isBool, masks, shifts)}));
+    const arrays = b.arrays.map(([v, elements, okMasks]) =>
+      ({slot: this.slot(v), elements: elements.map((e) => this.slot(e)), okMasks}));
+    for (const v of b.elements) {
+      this.slot(v);
+    }
+    const actions = this.actions(b.actions);
+    const numArgs = FIRST_ARG + b.args.length;
+    const size = FIRST_ARG + this.slots.size;
+
+    return (block: Uint16Array, ok: number, log: LogMessage, ...args: unknown[]) => {
+      if (FIRST_ARG + args.length != numArgs) {
+        throw new RangeError(`parse_${b.name} takes ${numArgs} arguments, got ${FIRST_ARG + args.length}`);
+      }
+      const env: Env = new Array(size);
+      env[BLOCK] = block;
+      env[OK] = ok;
+      env[LOG] = log;
+      for (let i = 0; i < args.length; i++) {
+        env[FIRST_ARG + i] = args[i];
+      }
+      for (const f of fields) {
+        env[f.slot] = f.extract(block);
+      }
+      for (const a of arrays) {
+        env[a.slot] = a.elements.map((e, i) => (ok & a.okMasks[i]) == a.okMasks[i] ? env[e] : null);
+      }
+      runAll(actions, env);
+    };
+  }
+
+  private fail(what: string, x: unknown): never {
+    throw new RangeError(`Invalid ${what} in ${this.bitstruct.name}: ${JSON.stringify(x)}`);
+  }
+
+  private expr(e: ProgramExpr): Eval {
+    if (typeof e == "number" || typeof e == "boolean") {
+      return () => e;
+    }
+    if (typeof e == "string") {
+      const slot = this.slot(e);
+      return (env) => env[slot];
+    }
+    switch (e[0]) {
+      case "rule": {
+        const rule = e[1];
+        return () => rule;
+      }
+      case ".": {
+        const obj = this.expr(e[1]);
+        const name = e[2];
+        return (env) => (obj(env) as Struct)[name];
+      }
+      case "get": {
+        const m = this.expr(e[1]);
+        const key = this.expr(e[2]);
+        const dflt = this.expr(e[3]);
+        return (env) => (m(env) as Map<unknown, unknown>).get(key(env)) ?? dflt(env);
+      }
+      case "+": {
+        const left = this.expr(e[1]);
+        const right = this.expr(e[2]);
+        return (env) => (left(env) as number) + (right(env) as number);
+      }
+      case "*": {
+        const left = this.expr(e[1]);
+        const right = this.expr(e[2]);
+        return (env) => (left(env) as number) * (right(env) as number);
+      }
+    }
+    return this.fail("expression", e);
+  }
+
+  // Returns a function setting a change mask bit, or null.
+  private mark(mark: ProgramMark): Run | null {
+    if (mark == null) {
+      return null;
+    }
+    const slot = this.slot(mark[0]);
+    const bit = mark[1];
+    return (env) => (env[slot] as {changes: ChangeMask}).changes.mark(bit);
+  }
+
+  private actions(actions: ProgramAction[]): Run[] {
+    return actions.map((a) => this.action(a));
+  }
+
+  private action(a: ProgramAction): Run {
+    switch (a[0]) {
+      case "if": {
+        const okMask = a[1];
+        const defined = a[2].map((v) => this.slot(v));
+        const body = this.actions(a[3]);
+        return (env) => {
+          if (((env[OK] as number) & okMask) != okMask) return;
+          for (const s of defined) {
+            if (env[s] == undefined) return;
+          }
+          runAll(body, env);
+        };
+      }
+      case "set":
+        return this.assign(a[1], this.expr(a[2]), this.mark(a[3]));
+      case "bytes": {
+        const target = this.expr(a[1]);
+        const index = this.expr(a[2]);
+        const values = a[3].map((v) => this.slot(v));
+        const okMasks = a[4];
+        const mark = this.mark(a[5]);
+        const scratch = this.byteScratch;
+        return (env) => {
+          const ok = env[OK] as number;
+          let valid = 0;
+          for (let i = 0; i < values.length; i++) {
+            scratch[i] = env[values[i]] as number;
+            if ((ok & okMasks[i]) == okMasks[i]) valid |= 1 << i;
+          }
+          if ((target(env) as RdsString).setBytes(index(env) as number, scratch, valid) && mark != null) {
+            mark(env);
+          }
+        };
+      }
+      case "put": {
+        const m = this.expr(a[1]);
+        const key = this.expr(a[2]);
+        const value = this.expr(a[3]);
+        const mark = this.mark(a[4]);
+        return (env) => {
+          const map = m(env) as Map<unknown, unknown>;
+          const k = key(env);
+          const v = value(env);
+          if (mark == null) {
+            map.set(k, v);
+          } else if (map.get(k) !== v) {
+            map.set(k, v);
+            mark(env);
+          }
+        };
+      }
+      case "parse": {
+        // Rules may not be linked yet: look them up at run time.
+        const functions = this.functions;
+        const rule = this.expr(a[1]);
+        const numArgs = FIRST_ARG + this.bitstruct.args.length;
+        return (env) => functions[rule(env) as number](
+          env[BLOCK] as Uint16Array, env[OK] as number, env[LOG] as LogMessage,
+          ...env.slice(FIRST_ARG, numArgs));
+      }
+      case "call": {
+        const obj = this.expr(a[1]);
+        const method = a[2];
+        const args = a[3].map((x) => this.expr(x));
+        const mark = this.mark(a[4]);
+        return (env) => {
+          (obj(env) as Record<string, (...args: unknown[]) => void>)[method](...args.map((x) => x(env)));
+          if (mark != null) mark(env);
+        };
+      }
+      case "log": {
+        const parts = a[1].map((p): Eval => {
+          if (typeof p == "string") return () => p;
+          const slot = this.slot(p[0]);
+          const format = LOG_FORMATS[p[1]] ?? this.fail("log format", p);
+          return (env) => format(env[slot]);
+        });
+        return (env) => (env[LOG] as LogMessage).add(parts.map((p) => p(env)).join(""));
+      }
+      case "resolve": {
+        const slot = this.slot(a[1]);
+        const m = this.expr(a[2]);
+        const key = this.expr(a[3]);
+        const elementType = this.elementTypes[a[5]] ?? this.fail("element type", a);
+        const mark = this.mark(a[7]);
+        return (env) => {
+          const map = m(env) as Map<unknown, unknown>;
+          const k = key(env) as number;
+          let element = map.get(k);
+          if (element == undefined) {
+            element = new elementType(k);
+            map.set(k, element);
+            if (mark != null) mark(env);
+          }
+          env[slot] = element;
+        };
+      }
+      case "switch": {
+        const e = this.expr(a[1]);
+        const table = new Map<unknown, Run[]>();
+        let dflt: Run[] = [];
+        for (const [values, body] of a[2]) {
+          const actions = this.actions(body);
+          if (values == null) {
+            dflt = actions;
+          } else {
+            for (const v of values) {
+              if (!table.has(v)) table.set(v, actions);
+            }
+          }
+        }
+        return (env) => runAll(table.get(e(env)) ?? dflt, env);
+      }
+    }
+    return this.fail("action", a);
+  }
+
+  private assign(target: ProgramExpr, value: Eval, mark: Run | null): Run {
+    if (typeof target == "string") {
+      const slot = this.slot(target);
+      return (env) => {
+        env[slot] = value(env);
+      };
+    }
+    if (Array.isArray(target) && target[0] == ".") {
+      const obj = this.expr(target[1]);
+      const name = target[2];
+      return (env) => {
+        const o = obj(env) as Struct;
+        const v = value(env);
+        if (mark == null) {
+          o[name] = v;
+        } else if (o[name] !== v) {
+          o[name] = v;
+          mark(env);
+        }
+      };
+    }
+    return this.fail("assignment target", target);
+  }
+}
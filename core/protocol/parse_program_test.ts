@@ -0,0 +1,107 @@
+import { StationField } from './base';
+import { ParseProgram, ParseProgramDescriptor } from './parse_program';
+import { LogMessage, StationImpl } from './rds_types';
+
+// A parse program as compiled from:
+//
+//   bitstruct group_pi(station: Station) {
+//     pi: uint<16> = 0..15
+//   } action {
+//     log "PI={pi:04x}"
+//     station.pi = pi
+//     parse "group_type"
+//   }
+//
+//   bitstruct group_type(station: Station) {
+//     _: unparsed<16>
+//     type: uint<5>
+//     tp: bool
+//     _: unparsed<5>
+//     ps_seg: byte<8>[2]
+//   } action {
+//     log "Group {type:grouptype}"
+//     station.tp = tp
+//     switch type {
+//       0: copy station.ps[0, 2] = ps_seg
+//       _: log "Other"
+//     }
+//   }
+const PROGRAM: ParseProgramDescriptor = {
+  format: "rds-parse-program/2",
+  rules: ["group_pi", "group_type"],
+  bitstructs: [
+    {
+      name: "group_pi", args: ["station"],
+      fields: [["pi", false, [65535, 0, 0, 0], [0, 0, 0, 0]]],
+      arrays: [], elements: [],
+      actions: [
+        ["if", 1, [], [
+          ["log", ["PI=", ["pi", "04x"]]],
+          ["set", [".", "station", "pi"], "pi", ["station", StationField.pi]]]],
+        ["parse", ["rule", 1]],
+      ],
+    },
+    {
+      name: "group_type", args: ["station"],
+      fields: [
+        ["type", false, [0, 63488, 0, 0], [0, 11, 0, 0]],
+        ["tp", true, [0, 1024, 0, 0], [0, 10, 0, 0]],
+        ["ps_seg__0", false, [0, 0, 0, 65280], [0, 0, 0, 8]],
+        ["ps_seg__1", false, [0, 0, 0, 255], [0, 0, 0, 0]],
+      ],
+      arrays: [], elements: [],
+      actions: [
+        ["if", 2, [], [
+          ["log", ["Group ", ["type", "grouptype"]]],
+          ["set", [".", "station", "tp"], "tp", ["station", StationField.tp]],
+          ["switch", "type", [
+            [[0], [["bytes", [".", "station", "ps"], 0, ["ps_seg__0", "ps_seg__1"], [8, 8], ["station", StationField.ps]]]],
+            [null, [["log", ["Other"]]]],
+          ]],
+        ]],
+      ],
+    },
+  ],
+};
+
+describe('ParseProgram', () => {
+  const program = new ParseProgram(PROGRAM);
+  const parse = program.parseFunction("group_pi");
+
+  it('should decode valid blocks', () => {
+    const station = new StationImpl();
+    // A new station has all its fields marked as changed.
+    station.changes.clear();
+    const log = new LogMessage();
+    parse(new Uint16Array([0xF201, 0x0408, 0x2037, 0x2049]), 0b1111, log, station);
+    expect(station.pi).toBe(0xF201);
+    expect(station.tp).toBe(true);
+    expect(station.ps.toString().substring(0, 2)).toBe(" I");
+    expect(log.text).toBe("PI=F201, Group 0A");
+    expect(station.changes.fields()).toEqual([StationField.pi, StationField.tp, StationField.ps]);
+  });
+
+  it('should skip actions on invalid blocks', () => {
+    const station = new StationImpl();
+    // A new station has all its fields marked as changed.
+    station.changes.clear();
+    const log = new LogMessage();
+    parse(new Uint16Array([0xF201, 0x2408, 0x2037, 0x2049]), 0b1110, log, station);
+    expect(station.pi).toBe(-1);
+    expect(log.text).toBe("Group 2A, Other");
+    expect(station.changes.has(StationField.pi)).toBe(false);
+  });
+
+  it('should only mark changed fields', () => {
+    const station = new StationImpl();
+    const group = new Uint16Array([0xF201, 0x2408, 0, 0]);
+    parse(group, 0b1111, new LogMessage(), station);
+    station.changes.clear();
+    parse(group, 0b1111, new LogMessage(), station);
+    expect(station.changes.any()).toBe(false);
+  });
+
+  it('should reject other formats', () => {
+    expect(() => new ParseProgram({...PROGRAM, format: "rds-parse-program/0"})).toThrowError(RangeError);
+  });
+});
@@ -0,0 +1,65 @@
+// Decoding statistics of the generated parse functions.
+//
+// The counters are only updated if the decoder was generated with
+// `compiler.py --stats`. Otherwise `instrumented` is false and they stay at
+// zero.
+export class ParseStats {
+  // Number of calls of each parse function, indexed by rule ID.
+  readonly hits: Uint32Array;
+  // Cumulative time spent in each parse function, including the parse
+  // functions it calls, in units of `clock`.
+  readonly time: Float64Array;
+  // Number of times each field was null because (one of) its block(s) failed,
+  // indexed like `fields`.
+  readonly nullFields: Uint32Array;
+
+  // Clock used to time the parse functions. Timing is off by default, as it
+  // can cost more than parsing itself. Set it to e.g. `() => performance.now()`
+  // to enable it.
+  public clock: () => number = () => 0;
+
+  public constructor(
+      readonly instrumented: boolean,
+      readonly rules: ReadonlyArray<string>,
+      readonly fields: ReadonlyArray<string>) {
+    this.hits = new Uint32Array(rules.length);
+    this.time = new Float64Array(rules.length);
+    this.nullFields = new Uint32Array(fields.length);
+  }
+
+  public reset() {
+    this.hits.fill(0);
+    this.time.fill(0);
+    this.nullFields.fill(0);
+  }
+
+  // Returns the statistics of the rules that were hit, by decreasing time,
+  // then decreasing number of hits.
+  public ruleSummary(): Array<RuleStats> {
+    const result: Array<RuleStats> = [];
+    this.rules.forEach((rule, i) => {
+      if (this.hits[i] > 0) {
+        result.push({rule: rule, hits: this.hits[i], time: this.time[i]});
+      }
+    });
+    return result.sort((a, b) => (b.time - a.time) || (b.hits - a.hits));
+  }
+
+  // Returns the fields that were null at least once, with their counts. Field
+  // names are of the form `rule.field`.
+  public nullFieldSummary(): Map<string, number> {
+    const result = new Map<string, number>();
+    this.fields.forEach((field, i) => {
+      if (this.nullFields[i] > 0) {
+        result.set(field, this.nullFields[i]);
+      }
+    });
+    return result;
+  }
+}
+
+export interface RuleStats {
+  rule: string;
+  hits: number;
+  time: number;
+}
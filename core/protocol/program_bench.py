@@ -0,0 +1,117 @@
+"""Benchmarks the parse program interpreter against the generated decoder.
+
+Decodes the same synthetic groups with base_py.py, the straight-line Python
+decoder, and with parse_program.py running base_program.json, then reports
+the decoding time per group of both, and the size of the generated TypeScript
+decoder (base*.ts) against the size of the parse program, raw and gzipped.
+The size is what matters to the web app: it downloads and parses one or the
+other.
+
+This compares the Python decoders. The web app runs the TypeScript ones:
+decoder_bench.ts, run by core/bench/run_benchmarks.py, compares parse_group
+with parse_program.ts on recorded group logs, and the time V8 takes to
+compile base*.js with the time to parse and link base_program.json.
+
+    python3 program_bench.py --groups 100000
+"""
+
+import argparse
+import glob
+import gzip
+import os
+import random
+import time
+
+import parse_program
+import rds_stream
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Group types of the synthetic corpus, with their weights: mostly 0A, 2A
+# and 4A, as on air, and some of the other types.
+GROUP_TYPES = [(0, 30), (1, 2), (2, 2), (3, 3), (4, 20), (5, 2), (6, 5), (8, 2), (14, 2), (20, 2),
+               (22, 5), (24, 5), (26, 3), (28, 5), (29, 1), (30, 1), (31, 1)]
+
+# ODA AIDs announced in 3A groups.
+AIDS = [0x0093, 0x4BD7, 0x6552, 0xFF70, 0xCD46]
+
+
+def synthetic_groups(count, seed=0, error_rate=0.05):
+    """Returns `count` random groups as (stream, blocks, ok) tuples.
+
+    Blocks are random, but for a few stations' PI and a realistic mix of
+    group types, so that most rules are exercised. 3A groups announce ODAs on
+    random group types, so that ODA groups follow. Each block is invalid
+    with probability `error_rate`. One group in 20 is a type C group.
+    """
+    rnd = random.Random(seed)
+    pis = [rnd.getrandbits(16) for _ in range(4)]
+    types = [t for (t, _) in GROUP_TYPES]
+    weights = [w for (_, w) in GROUP_TYPES]
+    groups = []
+    for _ in range(count):
+        ok = 0
+        for i in range(4):
+            if rnd.random() >= error_rate:
+                ok |= 1 << i
+        if rnd.random() < 0.05:
+            blocks = tuple(rnd.getrandbits(16) for _ in range(4))
+            groups.append((rnd.randint(1, 3), blocks, ok))
+            continue
+        group_type = rnd.choices(types, weights)[0]
+        block1 = (group_type << 11) | rnd.getrandbits(11)
+        block2 = rnd.getrandbits(16)
+        block3 = rnd.getrandbits(16)
+        if group_type == 6:
+            block3 = rnd.choice(AIDS)
+        groups.append((0, (rnd.choice(pis), block1, block2, block3), ok))
+    return groups
+
+
+def time_decoding(groups, parsers, repeat):
+    """Returns the best time, in seconds, to decode `groups` into a new station."""
+    best = None
+    for _ in range(repeat):
+        station = rds_stream.new_station()
+        start = time.perf_counter()
+        for (stream, blocks, ok) in groups:
+            rds_stream.decode_group(station, stream, blocks, ok, parsers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def sizes(paths):
+    """Returns the total (raw, gzipped) size of files."""
+    raw = b''.join(open(p, 'rb').read() for p in sorted(paths))
+    return (len(raw), len(gzip.compress(raw, mtime=0)))
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Benchmarks the parse program interpreter.')
+    argparser.add_argument('--groups', type=int, default=20000, help='Number of synthetic groups.')
+    argparser.add_argument('--repeat', type=int, default=3, help='Runs per decoder; the best is kept.')
+    argparser.add_argument('--seed', type=int, default=0)
+    args = argparser.parse_args()
+
+    groups = synthetic_groups(args.groups, args.seed)
+    start = time.perf_counter()
+    program = parse_program.load()
+    link_time = time.perf_counter() - start
+
+    generated = time_decoding(groups, rds_stream.PARSERS, args.repeat)
+    interpreted = time_decoding(groups, program.parsers, args.repeat)
+    print(f'{"decoder":<24}{"us/group":>10}')
+    print(f'{"base_py.py":<24}{generated / len(groups) * 1e6:>10.2f}')
+    print(f'{"parse_program.py":<24}{interpreted / len(groups) * 1e6:>10.2f}'
+          f'  ({interpreted / generated:.2f}x, linked in {link_time * 1000:.1f} ms)')
+    print()
+    print(f'{"size":<24}{"bytes":>10}{"gzipped":>10}')
+    ts = glob.glob(os.path.join(HERE, 'base*.ts'))
+    for (name, paths) in [('base*.ts', ts), ('base_program.json', [parse_program.DEFAULT_PATH])]:
+        (raw, compressed) = sizes(paths)
+        print(f'{name:<24}{raw:>10}{compressed:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""Runtime support of the Python decoder generated by `compiler.py --backend=python`.
+
+Python counterparts of the helpers the TypeScript decoder gets from af.ts and
+rds_types.ts: the RDS character set, AF formatting, and RdsString, which
+accumulates texts received piecewise. Unlike its TypeScript counterpart,
+RdsString keeps a bounded history, so that long-running decoders use bounded
+memory.
+"""
+
+import collections
+
+CTRLCHAR = '\u2423'
+
+RDS_CHARMAP = (
+    CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR,
+    CTRLCHAR, CTRLCHAR, '\u240A', '\u240B', CTRLCHAR, '\u21B5', CTRLCHAR, CTRLCHAR,
+    CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR,
+    CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, CTRLCHAR, '\u241F',
+    '\u0020', '\u0021', '\u0022', '\u0023', '\u00A4', '\u0025', '\u0026', "'",
+    '\u0028', '\u0029', '\u002A', '\u002B', '\u002C', '\u002D', '\u002E', '\u002F',
+    '\u0030', '\u0031', '\u0032', '\u0033', '\u0034', '\u0035', '\u0036', '\u0037',
+    '\u0038', '\u0039', '\u003A', '\u003B', '\u003C', '\u003D', '\u003E', '\u003F',
+    '\u0040', '\u0041', '\u0042', '\u0043', '\u0044', '\u0045', '\u0046', '\u0047',
+    '\u0048', '\u0049', '\u004A', '\u004B', '\u004C', '\u004D', '\u004E', '\u004F',
+    '\u0050', '\u0051', '\u0052', '\u0053', '\u0054', '\u0055', '\u0056', '\u0057',
+    '\u0058', '\u0059', '\u005A', '\u005B', '\\', '\u005D', '\u2015', '\u005F',
+    '\u2551', '\u0061', '\u0062', '\u0063', '\u0064', '\u0065', '\u0066', '\u0067',
+    '\u0068', '\u0069', '\u006A', '\u006B', '\u006C', '\u006D', '\u006E', '\u006F',
+    '\u0070', '\u0071', '\u0072', '\u0073', '\u0074', '\u0075', '\u0076', '\u0077',
+    '\u0078', '\u0079', '\u007A', '\u007B', '\u007C', '\u007D', '\u00AF', '\u007F',
+    '\u00E1', '\u00E0', '\u00E9', '\u00E8', '\u00ED', '\u00EC', '\u00F3', '\u00F2',
+    '\u00FA', '\u00F9', '\u00D1', '\u00C7', '\u015E', '\u00DF', '\u00A1', '\u0132',
+    '\u00E2', '\u00E4', '\u00EA', '\u00EB', '\u00EE', '\u00EF', '\u00F4', '\u00F6',
+    '\u00FB', '\u00FC', '\u00F1', '\u00E7', '\u015F', '\u011F', '\u0131', '\u0133',
+    '\u00AA', '\u03B1', '\u00A9', '\u2030', '\u011E', '\u011B', '\u0148', '\u0151',
+    '\u03C0', '\u20AC', '\u00A3', '\u0024', '\u2190', '\u2191', '\u2192', '\u2193',
+    '\u00BA', '\u00B9', '\u00B2', '\u00B3', '\u00B1', '\u0130', '\u0144', '\u0171',
+    '\u00B5', '\u00BF', '\u00F7', '\u00B0', '\u00BC', '\u00BD', '\u00BE', '\u00A7',
+    '\u00C1', '\u00C0', '\u00C9', '\u00C8', '\u00CD', '\u00CC', '\u00D3', '\u00D2',
+    '\u00DA', '\u00D9', '\u0158', '\u010C', '\u0160', '\u017D', '\u0110', '\u013F',
+    '\u00C2', '\u00C4', '\u00CA', '\u00CB', '\u00CE', '\u00CF', '\u00D4', '\u00D6',
+    '\u00DB', '\u00DC', '\u0159', '\u010D', '\u0161', '\u017E', '\u0111', '\u0140',
+    '\u00C3', '\u00C5', '\u00C6', '\u0152', '\u0177', '\u00DD', '\u00D5', '\u00D8',
+    '\u00DE', '\u014A', '\u0154', '\u0106', '\u015A', '\u0179', '\u0166', '\u00F0',
+    '\u00E3', '\u00E5', '\u00E6', '\u0153', '\u0175', '\u00FD', '\u00F5', '\u00F8',
+    '\u00FE', '\u014B', '\u0155', '\u0107', '\u015B', '\u017A', '\u0167', CTRLCHAR,
+)
+
+
+def format_af(af):
+    """Formats an AF code, like formatAf in af.ts."""
+    if 1 <= af <= 204:
+        return f'{(875 + af) / 10:.1f}'
+    if af == 205:
+        return 'Filler'
+    if 224 <= af <= 249:
+        return f'ListLength({af - 224})'
+    if af == 250:
+        return 'AM_Ind'
+    return f'Invalid({af})'
+
+
+class RdsString:
+    """Text received piecewise, e.g. PS or RadioText.
+
+    Like RdsString in rds_types.ts, a new text starts when a received
+    character differs from the one already at its position. Previous texts are
+    kept in `history`, most recent first, and the number of characters received
+    for each of them in `tick_history`. Both are bounded by `history_size`:
+    the oldest texts, respectively the least received ones, are dropped first.
+    """
+
+    __slots__ = (
+        'text', 'unicode', 'flags', 'latest', 'empty', 'ticks', 'history',
+        'tick_history', 'history_size', 'current_id')
+
+    def __init__(self, size, unicode=False, history_size=64):
+        self.text = bytearray(size)
+        # Whether the text is in UTF-8 rather than in the RDS character set.
+        self.unicode = unicode
+        self.history_size = history_size
+        self.current_id = 42
+        self.history = collections.deque(maxlen=history_size)
+        self.tick_history = {}
+        self.reset()
+
+    def reset(self):
+        self.text[:] = bytes(len(self.text))
+        self.flags = 0
+        self.latest = -1
+        self.empty = True
+        self.ticks = 0
+        self.history.clear()
+        self.tick_history.clear()
+
+    def set_byte(self, position, c):
+        """Sets the character at `position`. Returns whether the text changed.
+
+        Positions past the end, e.g. from corrupted address fields, are ignored.
+        """
+        if position >= len(self.text):
+            return False
+        changed = self.empty or (c != 0 and c != self.text[position])
+        if c != 0 and self.text[position] != 0 and c != self.text[position] and not self.empty:
+            # This is a new text: save the previous one.
+            message = str(self)
+            self.history.appendleft((message, self.current_id))
+            self.current_id += 1
+            self.tick_history[message] = self.tick_history.get(message, 0) + self.ticks
+            if len(self.tick_history) > self.history_size:
+                del self.tick_history[min(self.tick_history, key=self.tick_history.get)]
+            self.text[:] = bytes(len(self.text))
+            self.ticks = 0
+        if c != 0:
+            self.text[position] = c
+        self.ticks += 1
+        self.empty = False
+        return changed
+
+    def set_bytes(self, position, values, valid_mask):
+        """Sets characters from `position`, skipping values[i] if bit i of `valid_mask` is not set.
+
+        Returns whether the text changed.
+        """
+        changed = False
+        for (i, c) in enumerate(values):
+            if (valid_mask >> i) & 1:
+                changed = self.set_byte(position + i, c) or changed
+        return changed
+
+    def set_flag(self, ab_flag):
+        self.flags |= 1 << ab_flag
+        self.latest = ab_flag
+
+    def is_complete(self):
+        return 0 not in self.text
+
+    def most_frequent_text(self):
+        """Returns the text received the most, or the current one if complete and nothing was."""
+        if len(self.tick_history) == 0:
+            return str(self) if self.is_complete() else ''
+        return max(self.tick_history, key=self.tick_history.get)
+
+    def __str__(self):
+        if self.empty:
+            return ''
+        if self.unicode:
+            text = self.text.decode('utf-8', errors='replace')
+            for end in ('\r', '\0'):
+                if end in text:
+                    text = text[:text.index(end)]
+            return text
+        result = []
+        for c in self.text:
+            if c == 0x0D:
+                break
+            result.append(' ' if c == 0 else RDS_CHARMAP[c])
+        return ''.join(result)
+
+    def __repr__(self):
+        return f'RdsString({str(self)!r})'
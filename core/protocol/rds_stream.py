@@ -0,0 +1,219 @@
+"""Incremental decoding of RDS Spy hex logs with the generated Python decoder.
+
+`decode` reads lines lazily and yields one GroupEvent per group, so that logs
+of any length, or endless streams such as sockets and pipes, are decoded in
+bounded memory: an event only holds what its group changed, and the station
+state only grows with the number of distinct other networks (EON), while
+RdsString histories are bounded.
+
+    with open('recording.spy') as f:
+        for event in rds_stream.decode(f):
+            if event.changes & (1 << StationField.ps):
+                print(event.station.ps)
+
+base_py.py is generated from the protocol description by
+`compiler.py --backend=python base.p base_py.py`.
+"""
+
+import argparse
+import collections
+import re
+import sys
+
+from base_py import Rule, Station, StationField, parse_group_ab, parse_group_c
+from rds_runtime import RdsString
+
+# Error count of blocks that could not be corrected, or parsed.
+UNCORRECTABLE_ERRORS = 6
+
+GroupEvent = collections.namedtuple('GroupEvent', [
+    # Stream number (0 for groups of type A and B, 1 to 3 for type C groups),
+    # blocks and block validity mask of the group.
+    'stream', 'blocks', 'ok',
+    # Station the group was decoded into.
+    'station',
+    # Mask of the StationFields changed by the group.
+    'changes',
+    # (object, method name, arguments) tuples of the struct methods called.
+    'calls',
+    # Log messages.
+    'log',
+])
+
+
+def changed_fields(changes):
+    """Returns the StationFields set in a change mask."""
+    return [f for f in StationField if (changes >> f) & 1]
+
+
+def parse_hex_block(s):
+    """Returns the (value, error count) of a block, like parseHexBlock in input.ts."""
+    if re.fullmatch('[0-9A-F]{4}', s):
+        return (int(s, 16), 0)
+    m = re.fullmatch('([0-9A-F]{4})/([0-9])', s)
+    if m:
+        return (int(m[1], 16), min(int(m[2]), UNCORRECTABLE_ERRORS))
+    # Placeholder for any unrecognized block.
+    return (0, UNCORRECTABLE_ERRORS)
+
+
+def parse_hex_line(line):
+    """Parses a line of an RDS Spy hex log, like parseHexGroup in input.ts.
+
+    Returns (stream, blocks, error counts), or None if the line is not a group.
+    """
+    stream = 0
+    # Remove the optional timestamp on the right.
+    line = re.split('[@%]', line, maxsplit=1)[0].strip()
+    m = re.match(r'#S(\d) ', line)
+    if m:
+        stream = int(m[1])
+        line = line[4:]
+    parts = line.strip().split(' ')
+    if len(parts) < 4:
+        return None
+    blocks = [parse_hex_block(p) for p in parts[:4]]
+    return (stream, tuple(v for (v, _) in blocks), tuple(e for (_, e) in blocks))
+
+
+def new_station():
+    """Returns a station with the default ODAs and group mappings, like StationImpl.reset()."""
+    station = Station()
+    station.lps = RdsString(32, unicode=True)
+    station.odas = {
+        0x0093: Rule.group_dabxref,
+        0x4BD7: Rule.group_rtplus,
+        0x6552: Rule.group_ert,
+        0xFF70: Rule.group_internet_connection,
+    }
+    station.oda_3A_mapping = {
+        0x6552: Rule.group_ert_declaration,
+    }
+    # Keys are group types: 2 * number, plus 1 for version B.
+    station.app_mapping = {
+        0: Rule.group_0A,
+        1: Rule.group_0B_0_common,
+        2: Rule.group_1A,
+        3: Rule.group_1B_1_common,
+        4: Rule.group_2A,
+        5: Rule.group_2B,
+        6: Rule.group_3A,
+        8: Rule.group_4A,
+        14: Rule.group_7A,
+        20: Rule.group_10A,
+        28: Rule.group_14A,
+        29: Rule.group_14B,
+        30: Rule.group_15A,
+        31: Rule.group_15B,
+    }
+    return station
+
+
+def validity_mask(errors, max_errors):
+    """Returns the mask of the blocks with at most `max_errors` errors (bit i for block i)."""
+    ok = 0
+    for (i, e) in enumerate(errors):
+        if e <= max_errors:
+            ok |= 1 << i
+    return ok
+
+
+# Parse functions of type A/B groups and of type C groups.
+PARSERS = (parse_group_ab, parse_group_c)
+
+
+def decode_group(station, stream, blocks, ok, parsers=PARSERS):
+    """Decodes a group into `station`, and returns its GroupEvent.
+
+    `parsers` are the parse functions of type A/B and type C groups, e.g.
+    those of a parse_program.ParseProgram rather than of base_py.
+    """
+    log = []
+    # The call list is shared with nested structs: clear it in place.
+    station.changes = 0
+    station.calls.clear()
+    parsers[0 if stream == 0 else 1](blocks, ok, log, station)
+    return GroupEvent(stream, blocks, ok, station, station.changes, list(station.calls), log)
+
+
+def group_pi(stream, blocks, ok):
+    """Returns the PI of a group, like groupPi in station_registry.ts.
+
+    The PI is in block A, or in block C' of type B groups. Returns None if
+    neither is valid, and for type C groups, which carry no PI.
+    """
+    if stream != 0:
+        return None
+    if ok & 0b0001:
+        return blocks[0]
+    if (ok & 0b0110) == 0b0110 and (blocks[1] & 0x800) != 0:
+        return blocks[2]
+    return None
+
+
+class StationRouter:
+    """Decodes groups interleaving several transmitters into one station per PI.
+
+    Like StationRegistry in station_registry.ts, a group goes to the station
+    of its PI (see group_pi), or if it has none, to that of the last group
+    that had one. At most `max_stations` stations are kept, the least
+    recently received being dropped first; all of them if None.
+    """
+
+    def __init__(self, max_stations=None, parsers=PARSERS):
+        self.max_stations = max_stations
+        self.parsers = parsers
+        # Stations by PI, least recently received first.
+        self.stations = collections.OrderedDict()
+        self.current = None
+
+    def station(self, pi):
+        station = self.stations.get(pi)
+        if station is None:
+            station = self.stations[pi] = new_station()
+            if self.max_stations is not None and len(self.stations) > self.max_stations:
+                self.stations.popitem(last=False)
+        else:
+            self.stations.move_to_end(pi)
+        return station
+
+    def decode_group(self, stream, blocks, ok):
+        """Decodes a group. Returns its PI and GroupEvent, or None if no group had a PI yet."""
+        pi = group_pi(stream, blocks, ok)
+        if pi is not None:
+            self.current = pi
+        elif self.current is None:
+            return None
+        return (self.current, decode_group(self.station(self.current), stream, blocks, ok, self.parsers))
+
+
+def decode(lines, station=None, max_errors=0, parsers=PARSERS):
+    """Decodes the groups of an iterable of RDS Spy hex lines, yielding a GroupEvent per group.
+
+    Blocks with more than `max_errors` errors are invalid. Groups are decoded
+    into `station`, or into a new station if None.
+    """
+    if station is None:
+        station = new_station()
+    for line in lines:
+        group = parse_hex_line(line)
+        if group is None:
+            continue
+        (stream, blocks, errors) = group
+        yield decode_group(station, stream, blocks, validity_mask(errors, max_errors), parsers)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Decodes RDS Spy hex logs, printing the log of each group.')
+    argparser.add_argument('--max-errors', type=int, default=0,
+                           help='Maximum number of corrected errors of a valid block.')
+    argparser.add_argument('infile', nargs='?', help='Log file. Standard input if omitted.')
+    args = argparser.parse_args()
+
+    with (open(args.infile, encoding='utf8') if args.infile else sys.stdin) as f:
+        for event in decode(f, max_errors=args.max_errors):
+            print(', '.join(event.log))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,26 +1,35 @@
-import { AFList, parseAfCode, formatAf } from './af';
-import { parse_group_ab, parse_group_c, Station } from "./base";
+import { AFList, AlternativeFrequencies } from './af';
+import { deserialize_Station, formatDeferredLog, load_rule, OtherNetwork, parse_group_ab, parse_group_c, PARSE_MEMO, PARSE_MODULES, Rule, serialize_Station, SNAPSHOT_FORMAT, Station, STATION_FIELD_COUNT } from "./base";
+import { ChangeMask } from "./change_mask";
 import { DabCrossRefAppImpl } from "./dab_cross_ref";
 import { Diagnostics } from "./diagnostics";
 import { ERtAppImpl } from "./enhanced_radio_text";
 import { InternetConnectionAppImpl } from './internet_connection';
+import { LruMap } from "./lru_map";
 import { RtPlusAppImpl } from "./radio_text_plus";
 import { callsign } from "./rbds_callsigns";
 import { RftPipe } from "./rft";
 import { RpAppImpl } from './rp';
+import { SnapshotReader, SnapshotWriter } from "./snapshot";
 import { Block, Group } from "../drivers/input";
 
+// Block buffer reused by parse_group, so that parsing does not allocate.
+const groupBlocks = new Uint16Array(4);
+
 export function parse_group(stream: number, group: Group, maxErrors: number, log: LogMessage, station: Station) {
-  const blocks = new Uint16Array([
-    group.blocks[0].value,
-    group.blocks[1].value,
-    group.blocks[2].value,
-    group.blocks[3].value]);
-  const ok = [
-    group.blocks[0].errorCount <= maxErrors,
-    group.blocks[1].errorCount <= maxErrors,
-    group.blocks[2].errorCount <= maxErrors,
-    group.blocks[3].errorCount <= maxErrors];
+  let ok = 0;
+  for (let i = 0; i < 4; i++) {
+    groupBlocks[i] = group.blocks[i].value;
+    if (group.blocks[i].errorCount <= maxErrors) {
+      ok |= 1 << i;
+    }
+  }
+  parse_blocks(stream, groupBlocks, ok, log, station);
+}
+
+// Parses a group held in a caller-owned buffer of 4 blocks. Bit i of `ok` is
+// set if block i is valid.
+export function parse_blocks(stream: number, blocks: Uint16Array, ok: number, log: LogMessage, station: Station) {
   if (stream == 0) {
     parse_group_ab(blocks, ok, log, station);
   } else {
@@ -42,21 +51,19 @@ export class StationImpl implements Station {
 	di_compressed?: boolean;
 	di_artificial_head?: boolean;
 	di_stereo?: boolean;
-  afLists = new Map<number, AFList>();
-  currentAfList: AFList | null = null;
-  mappedAFs = new Map<number, Set<number>>();
-  odas: Map<number, string> = new Map<number, string>([
-    [0x0093, "group_dabxref"],
-    [0x4BD7, "group_rtplus"],
-    [0x6552, "group_ert"],
-    [0xFF70, "group_internet_connection"]
+  readonly afs = new AlternativeFrequencies();
+  odas: Map<number, Rule> = new Map<number, Rule>([
+    [0x0093, Rule.group_dabxref],
+    [0x4BD7, Rule.group_rtplus],
+    [0x6552, Rule.group_ert],
+    [0xFF70, Rule.group_internet_connection]
   ]);
-  oda_3A_mapping: Map<number, string> = new Map<number, string>([
-    [0x6552, "group_ert_declaration"],
+  oda_3A_mapping: Map<number, Rule> = new Map<number, Rule>([
+    [0x6552, Rule.group_ert_declaration],
   ]);
 	transmitted_odas: Map<number, number> = new Map<number, number>();
-  app_mapping: Map<number, string> = new Map<number, string>();
-  channel_app_mapping: Map<number, string> = new Map<number, string>();
+  app_mapping: Map<number, Rule> = new Map<number, Rule>();
+  channel_app_mapping: Map<number, Rule> = new Map<number, Rule>();
   transmitted_channel_odas: Map<number, number> = new Map<number, number>();
   datetime: string = "";
   group_stats: number[] = new Array<number>(32);
@@ -66,11 +73,15 @@ export class StationImpl implements Station {
 	pin_minute?: number;
   ecc?: number;
   language_code?: number;
-  other_networks = new Map<number, StationImpl>();
+  // Bounded, as EON may announce any number of networks over time.
+  other_networks = new LruMap<number, OtherNetworkImpl>(MAX_OTHER_NETWORKS);
   rftPipes = new Map<number, RftPipe>();
   stationLogoPipe: RftPipe | null = null;
   stationLogoUrl: string | null = null;
-  log = new Array<LogMessage>();
+  log = new LogRing(MAX_LOG_SIZE);
+  // Fields changed by parse functions, indexed by StationField. Consumers
+  // clear it once they have taken the changes into account.
+  readonly changes = new ChangeMask(STATION_FIELD_COUNT);
   rp_app = new RpAppImpl(this);
 
   // ODAs.
@@ -112,6 +123,14 @@ export class StationImpl implements Station {
     return this.ps.toString();
   }
 
+  get afLists(): Map<number, AFList> {
+    return this.afs.lists;
+  }
+
+  get mappedAFs(): Map<number, Set<number>> {
+    return this.afs.mapped;
+  }
+
   getStationName(): string {
     return this.ps.getMostFrequentOrPartialText();
   }
@@ -155,15 +174,10 @@ export class StationImpl implements Station {
    * @return the reconstructed message, limited to 80 characters in length
    */
   getDynamicPSmessage(): string {
-    const msg = this.ps.getPastMessages(true);
-    
-    // Trivial case when there is no message.
-    if (msg.length == 0) return "";
-    
     let res = "";
     let prev: string|null = null;
-    for (let i=0; i<msg.length && res.length < 80; i++) {
-      const current = msg[i];
+    for (const current of this.ps.pastMessages(true)) {
+      if (res.length >= 80) break;
       let done = false;
       if (prev != null && prev.length == 8 && current.message.length == 8) {
         // if the 7 rightmost characters of the current PS correspond
@@ -213,6 +227,9 @@ export class StationImpl implements Station {
   }
 
   constructor(pi?: number) {
+    // Parse functions that found an other network may skip its groups, but
+    // an evicted network must be created again.
+    this.other_networks.onEvict = () => PARSE_MEMO.clear();
     this.reset();
     if (pi != undefined) {
       this.pi = pi;
@@ -237,9 +254,7 @@ export class StationImpl implements Station {
     this.di_compressed = undefined;
     this.di_artificial_head = undefined;
     this.di_stereo = undefined;
-    this.afLists = new Map<number, AFList>();
-    this.mappedAFs.clear();
-    this.currentAfList = null;
+    this.afs.clear();
     this.linkage_actuator = undefined;
     this.pin_day = undefined;
     this.pin_hour = undefined;
@@ -253,21 +268,30 @@ export class StationImpl implements Station {
 
     // Reset ODAs and group mappings.
     this.transmitted_odas.clear();
-    this.app_mapping = new Map<number, string>([
-      [GROUP_0A, "group_0A"],
-      [GROUP_0B, "group_0B_0_common"],
-      [GROUP_1A, "group_1A"],
-      [GROUP_1B, "group_1B_1_common"],
-      [GROUP_2A, "group_2A"],
-      [GROUP_2B, "group_2B"],
-      [GROUP_3A, "group_3A"],
-      [GROUP_4A, "group_4A"],
-      [GROUP_7A, "group_7A"],
-      [GROUP_10A, "group_10A"],
-      [GROUP_14A, "group_14A"],
-      [GROUP_14B, "group_14B"],
-      [GROUP_15A, "group_15A"],
-      [GROUP_15B, "group_15B"]]);
+    this.app_mapping = new Map<number, Rule>([
+      [GROUP_0A, Rule.group_0A],
+      [GROUP_0B, Rule.group_0B_0_common],
+      [GROUP_1A, Rule.group_1A],
+      [GROUP_1B, Rule.group_1B_1_common],
+      [GROUP_2A, Rule.group_2A],
+      [GROUP_2B, Rule.group_2B],
+      [GROUP_3A, Rule.group_3A],
+      [GROUP_4A, Rule.group_4A],
+      [GROUP_7A, Rule.group_7A],
+      [GROUP_10A, Rule.group_10A],
+      [GROUP_14A, Rule.group_14A],
+      [GROUP_14B, Rule.group_14B],
+      [GROUP_15A, Rule.group_15A],
+      [GROUP_15B, Rule.group_15B]]);
+    // Rules of lazily loaded modules (EON, RP) must be ready for their first
+    // groups, which would be queued while loading. Groups queued for the
+    // previous station must not be parsed into this one.
+    for (const rule of this.app_mapping.values()) {
+      load_rule(rule);
+    }
+    for (const module of Object.values(PARSE_MODULES)) {
+      module.dropQueued(this);
+    }
     this.transmitted_channel_odas.clear();
     this.channel_app_mapping.clear();
 
@@ -282,78 +306,52 @@ export class StationImpl implements Station {
     this.internet_connection_app.reset();
     this.rp_app.reset();
 
-    this.log = [];
+    this.log.clear();
     this.diagnostics.reset();
-  }
 
-	public addAfPair(codeA: number, codeB: number) {
-    const a = parseAfCode(codeA);
-    const b = parseAfCode(codeB);
-    // If two filler codes, we cannot do anything.
-    if (a.kind == "AfFiller" && b.kind == "AfFiller") {
-      this.diagnostics.addFinding(
-        "Waste of capacity by transmitting groups with two AF fillers.", GROUP_0A);
-      return;
+    // Parse functions may skip groups they have already parsed, based on what
+    // they wrote to stations.
+    PARSE_MEMO.clear();
+
+    // Everything may have changed.
+    for (let f = 0; f < STATION_FIELD_COUNT; f++) {
+      this.changes.mark(f);
     }
-		if (a.kind == "AfListLength") {
-			if (b.kind == "AfFrequency") {
-				const afList = this.afLists.get(b.freq);
-				if (afList == undefined) {
-					this.currentAfList = new AFList(b.freq, a.length);
-					this.afLists.set(b.freq, this.currentAfList);
-				} else {
-          this.currentAfList = afList;
-        }
-        return;
-			}
-		} else {
-			if (a.kind == "AfFrequency" || b.kind == "AfFrequency") {
-        if (this.currentAfList == null || !this.currentAfList.addPair(a, b)) {
-					// This means that the method addPair has determined that
-					// the new AF pair cannot belong to the existing list.
-					// So create a new list. Use one of (a, b) that is not the
-          // filler code. There is always one that is not the filler, as the
-          // case where both a and b are the filler code has been proceeded at
-          // the beginning of the method.
-					this.currentAfList = new AFList(
-            a.kind == "AfFrequency" ? a.freq : b.kind == "AfFrequency" ? b.freq : 0);
-					this.currentAfList.addPair(a, b);
-				}
-        return;
-			}
-		}
-    // If we reach this point, then the pair could not be processed.
-    this.diagnostics.addFinding(`Invalid AF pair: ${formatAf(codeA)}, ${formatAf(codeB)}`, GROUP_0A);
-	}
+  }
 
   /**
-   * @brief Adds a mapped frequency.
-   * 
-   * @param channel The tuned (current) frequency, represented as a channel number
-   * @param mappedChannel The mapped (other) frequency, represented as a channel number
-   * 
-   * @return A textual representation of the mapping
+   * Returns a snapshot of the station fields declared in the protocol
+   * description, from which `restore` can resume decoding. State held only by
+   * the hand-written classes (AF lists, group statistics, clock time, ODA
+   * internals, log) is not included.
    */
-  public addMappedAF(tunedCode: number, mappedCode: number) {
-    const tuned = parseAfCode(tunedCode);
-    const mapped = parseAfCode(mappedCode);
+  snapshot(): Uint8Array {
+    const w = new SnapshotWriter(SNAPSHOT_FORMAT);
+    serialize_Station(this, w);
+    return w.toBytes();
+  }
 
-    if (tuned.kind != "AfFrequency" || mapped.kind != "AfFrequency") {
-      // TODO: Report error.
-      return;
+  /**
+   * Resets the station, then restores a snapshot taken by `snapshot`.
+   */
+  restore(snapshot: Uint8Array) {
+    this.reset();
+    const r = new SnapshotReader(snapshot, SNAPSHOT_FORMAT);
+    deserialize_Station(this, r);
+    if (!r.done) {
+      throw new RangeError('Trailing data in station snapshot');
     }
-    
-    // Get the set of AFs mapped to the frequency "freq".
-    let listOfMappedFreqs = this.mappedAFs.get(tuned.freq);
+  }
 
-    // If no such set, create it.
-    if(listOfMappedFreqs == undefined) {
-      listOfMappedFreqs = new Set<number>();
-      this.mappedAFs.set(tuned.freq, listOfMappedFreqs);
+  public addAfPair(codeA: number, codeB: number) {
+    const finding = this.afs.addPair(codeA, codeB);
+    if (finding != null) {
+      this.diagnostics.addFinding(finding, GROUP_0A);
     }
-    
-    // Add the new mapped frequency.
-    listOfMappedFreqs.add(mapped.freq);
+  }
+
+  public addMappedAF(tunedCode: number, mappedCode: number) {
+    this.afs.addMapped(tunedCode, mappedCode);
   }
 
   public set ta(ta: boolean) {
@@ -493,21 +491,55 @@ export class StationImpl implements Station {
   }
 
   reportRftMetadata(pipe: number, fileSize: number, fileId: number, fileVersion: number, crcPresent: boolean) {
-    const p = this.getRftPipe(pipe);
-    p.size = fileSize;
-    p.fileId = fileId;
-    p.fileVersion = fileVersion;
-    p.crcPresent = crcPresent;
+    this.getRftPipe(pipe).setMetadata(fileSize, fileId, fileVersion, crcPresent);
   }
 
   public addLogMessage(logMessage: LogMessage) {
-    if (this.log.length >= MAX_LOG_SIZE) {
-      this.log.shift();
-    }
     this.log.push(logMessage);
   }
 }
 
+/**
+ * Other network announced by EON, held in Station.other_networks. Only has
+ * the fields that EON transmits.
+ */
+export class OtherNetworkImpl implements OtherNetwork {
+  pi?: number;
+  pty?: number;
+  tp?: boolean;
+  ta?: boolean;
+  ps: RdsString = new RdsStringInRdsEncoding(8, OTHER_NETWORK_HISTORY_SIZE);
+  pin_day?: number;
+  pin_hour?: number;
+  pin_minute?: number;
+  readonly afs = new AlternativeFrequencies();
+
+  constructor(pi?: number) {
+    this.pi = pi;
+  }
+
+  getPS(): string {
+    return this.ps.toString();
+  }
+
+  get afLists(): Map<number, AFList> {
+    return this.afs.lists;
+  }
+
+  get mappedAFs(): Map<number, Set<number>> {
+    return this.afs.mapped;
+  }
+
+  addAfPair(codeA: number, codeB: number) {
+    // Unlike for the tuned station, invalid pairs are not reported.
+    this.afs.addPair(codeA, codeB);
+  }
+
+  addMappedAF(tunedCode: number, mappedCode: number) {
+    this.afs.addMapped(tunedCode, mappedCode);
+  }
+}
+
 function padNumber(num: number, width: number) {
   return num.toString().padStart(width, "0");
 }
@@ -516,44 +548,102 @@ export class RdsStringHistoryEntry {
   public constructor(public message: string, public id: number) {}
 }
 
+// Default number of previous texts kept by an RdsString, as in rds_runtime.py.
+export const RDS_STRING_HISTORY_SIZE = 64;
+
+// Number of characters received for a previous text. `message` is the one
+// instance of the text shared by its history entries.
+class MessageTicks {
+  public constructor(public message: string, public ticks: number) {}
+}
+
 export abstract class RdsString {
   currentText: Uint8Array;
   currentFlags: number = 0;
-  history = new Array<RdsStringHistoryEntry>();
   latest: number = -1;
   empty: boolean = true;
   currentTicks: number = 0;
-  tickHistory = new Map<string, number>();
   currentId = 42;  // Start at arbitrary value. Could be 0.
 
-  constructor(size: number) {
+  // Previous texts, in a ring buffer: the most recent one is at index
+  // `newest`, and the oldest ones are overwritten once `history` is full.
+  private history: Array<RdsStringHistoryEntry | undefined>;
+  private newest = -1;
+  private historyCount = 0;
+  // Characters received per previous text, bounded by the history size: the
+  // least received texts are dropped first.
+  private tickHistory = new Map<string, MessageTicks>();
+
+  constructor(size: number, historySize: number = RDS_STRING_HISTORY_SIZE) {
     this.currentText = new Uint8Array(size);
+    this.history = new Array<RdsStringHistoryEntry | undefined>(historySize);
     this.reset();
   }
   
-  public setByte(position: number, c: number): void {
+  // Returns whether the text changed.
+  public setByte(position: number, c: number): boolean {
+    const changed = this.empty || (c != 0 && c != this.currentText[position]);
     if (c != 0 && this.currentText[position] != 0 && c != this.currentText[position]) {
       // This is a new text: save the previous message...
       if (!this.empty) {
-        const message = this.toString();
-        // Add newest message on top.
-        this.history.unshift(new RdsStringHistoryEntry(message, this.currentId));
+        const message = this.addTicks(this.toString(), this.currentTicks);
+        this.pushHistory(new RdsStringHistoryEntry(message, this.currentId));
         this.currentId++;
-                  
-        const prev = this.tickHistory.get(message);
-        this.tickHistory.set(message, this.currentTicks + (prev ? prev : 0));
 
         // ... And reset the message buffer.
         this.currentText.fill(0);
         this.currentTicks = 0;
-
-        //console.log(this.tickHistory);
       }
     }
     
     this.setByteInArray(this.currentText, position, c);
+    return changed;
+  }
+
+  // Adds the history entry of a previous text, overwriting the oldest one if
+  // the history is full.
+  private pushHistory(entry: RdsStringHistoryEntry) {
+    if (this.history.length == 0) return;
+    this.newest = (this.newest + 1) % this.history.length;
+    this.history[this.newest] = entry;
+    this.historyCount = Math.min(this.historyCount + 1, this.history.length);
+  }
+
+  // Counts `ticks` characters received for `message`, and returns the
+  // instance of `message` shared by its history entries.
+  private addTicks(message: string, ticks: number): string {
+    const known = this.tickHistory.get(message);
+    if (known != undefined) {
+      known.ticks += ticks;
+      return known.message;
+    }
+    this.tickHistory.set(message, new MessageTicks(message, ticks));
+    if (this.tickHistory.size > this.history.length) {
+      let least = message;
+      let leastTicks = ticks;
+      for (const t of this.tickHistory.values()) {
+        if (t.ticks < leastTicks) {
+          least = t.message;
+          leastTicks = t.ticks;
+        }
+      }
+      this.tickHistory.delete(least);
+    }
+    return message;
   }
   
+  // Sets bytes from `position`, skipping those whose bit is not set in
+  // `validMask` (bit i for values[i]). Returns whether the text changed.
+  public setBytes(position: number, values: ArrayLike<number>, validMask: number): boolean {
+    let changed = false;
+    for (let i = 0; (validMask >> i) != 0; i++) {
+      if ((validMask & (1 << i)) != 0) {
+        changed = this.setByte(position + i, values[i]) || changed;
+      }
+    }
+    return changed;
+  }
+
   public setFlag(abFlag: number): void {
     this.currentFlags |= (1 << abFlag);   // Set a bit corresponding to the current flag.
     this.latest = abFlag;		
@@ -562,7 +652,9 @@ export abstract class RdsString {
   public reset(): void {
     this.currentText.fill(0);
     this.currentFlags = 0;
-    this.history = [];
+    this.history.fill(undefined);
+    this.newest = -1;
+    this.historyCount = 0;
     this.latest = -1;
     this.empty = true;
     this.currentTicks = 0;
@@ -571,17 +663,98 @@ export abstract class RdsString {
   
   public abstract toString(): string;
 
+  public serialize(w: SnapshotWriter) {
+    w.flag(this.empty);
+    // Trailing zeros (characters not received yet) are implied.
+    let end = this.currentText.length;
+    while (end > 0 && this.currentText[end - 1] == 0) {
+      end--;
+    }
+    w.bytes(this.currentText.subarray(0, end));
+    w.varint(this.currentFlags);
+    w.varint(this.latest);
+    w.varint(this.currentTicks);
+    w.varint(this.currentId);
+    w.varint(this.historyCount);
+    for (const e of this.pastMessages(false)) {
+      w.string(e.message);
+      w.varint(e.id);
+    }
+    w.varint(this.tickHistory.size);
+    for (const t of this.tickHistory.values()) {
+      w.string(t.message);
+      w.varint(t.ticks);
+    }
+  }
+
+  public deserialize(r: SnapshotReader) {
+    this.empty = r.flag();
+    const text = r.bytes();
+    if (text.length > this.currentText.length) {
+      throw new RangeError(`Snapshot has a string of length ${text.length}, expected at most ${this.currentText.length}`);
+    }
+    this.currentText.fill(0);
+    this.currentText.set(text);
+    this.currentFlags = r.varint();
+    this.latest = r.varint();
+    this.currentTicks = r.varint();
+    this.currentId = r.varint();
+    // Texts are read most recent first, and pushed oldest first. Those that
+    // do not fit in the history are dropped.
+    const entries: RdsStringHistoryEntry[] = [];
+    for (let n = r.varint(); n > 0; n--) {
+      const message = r.string();
+      entries.push(new RdsStringHistoryEntry(message, r.varint()));
+    }
+    this.history.fill(undefined);
+    this.newest = -1;
+    this.historyCount = 0;
+    for (const e of entries.slice(0, this.history.length).reverse()) {
+      this.pushHistory(e);
+    }
+    this.tickHistory.clear();
+    for (let n = r.varint(); n > 0; n--) {
+      const message = r.string();
+      this.addTicks(message, r.varint());
+    }
+    // Share the text instances, as when received.
+    for (const e of entries) {
+      e.message = this.tickHistory.get(e.message)?.message ?? e.message;
+    }
+  }
+
   public getFlags(): number {
     return this.latest;
   }
   
-  public getPastMessages(includingCurrent: boolean): Array<RdsStringHistoryEntry> {
-    if (!includingCurrent || this.empty) {
-      return this.history;
+  // Number of previous texts in the history.
+  public get historyLength(): number {
+    return this.historyCount;
+  }
+
+  // Returns the i-th previous text, 0 being the most recent one.
+  public historyEntry(i: number): RdsStringHistoryEntry {
+    if (i < 0 || i >= this.historyCount) {
+      throw new RangeError(`No history entry ${i}, there are ${this.historyCount}`);
     }
+    const n = this.history.length;
+    return this.history[(this.newest - i + n) % n] as RdsStringHistoryEntry;
+  }
 
-    const l = [new RdsStringHistoryEntry(this.toString(), this.currentId), ...this.history];
-    return l;
+  // Iterates over the previous texts, most recent first, preceded by the
+  // current one if `includingCurrent` is set and it is not empty. Unlike
+  // getPastMessages, it does not copy the history.
+  public *pastMessages(includingCurrent: boolean): IterableIterator<RdsStringHistoryEntry> {
+    if (includingCurrent && !this.empty) {
+      yield new RdsStringHistoryEntry(this.toString(), this.currentId);
+    }
+    for (let i = 0; i < this.historyCount; i++) {
+      yield this.historyEntry(i);
+    }
+  }
+
+  public getPastMessages(includingCurrent: boolean): Array<RdsStringHistoryEntry> {
+    return Array.from(this.pastMessages(includingCurrent));
   }
 
   private setByteInArray(text: Uint8Array, position: number, c: number): void {
@@ -603,10 +776,10 @@ export abstract class RdsString {
     let mft = this.isComplete() ? this.toString() : "";
     let mftOcc = 0;
     
-    this.tickHistory.forEach((value: number, key: string) => {
-      if(value > mftOcc) {
-        mftOcc = value;
-        mft = key;
+    this.tickHistory.forEach((t: MessageTicks) => {
+      if(t.ticks > mftOcc) {
+        mftOcc = t.ticks;
+        mft = t.message;
       }
     });
     
@@ -629,8 +802,8 @@ export abstract class RdsString {
   public getLatestCompleteOrPartialText(): string {
     if (this.isComplete()) {
       return this.toString();
-    } else if (this.history.length > 0) {
-      return this.history[0].message;
+    } else if (this.historyCount > 0) {
+      return this.historyEntry(0).message;
     } else {
       const t = this.toString();
       if (t != null) return t; else return "";
@@ -721,9 +894,9 @@ class TrafficAnnouncement extends TrafficEvent {
 }
 
 class OtherNetworkSwitch extends TrafficEvent {
-  otherNetwork: StationImpl;
+  otherNetwork: OtherNetworkImpl;
 
-  constructor(date: Date | null, eventType: TrafficEventType, otherNetwork: StationImpl) {
+  constructor(date: Date | null, eventType: TrafficEventType, otherNetwork: OtherNetworkImpl) {
     super(date, eventType);
     this.otherNetwork = otherNetwork;
   }
@@ -745,28 +918,168 @@ class OtherNetworkSwitch extends TrafficEvent {
   }
 }
 
+// Raw value recorded in a log message.
+export type LogArg = number | boolean | string | null;
+
+// Format id of plain text entries.
+const LITERAL_LOG_FORMAT = -1;
+
+// Unformatted entries of a LogMessage, as plain data that can be posted
+// between threads (see LogMessage.entries).
+export interface LogEntries {
+  formats: number[];
+  starts: number[];
+  separators: boolean[];
+  args: LogArg[];
+}
+
 export class LogMessage {
-  text = "";
-  addSeparator = false;
+  // Entries: format id, index of the first argument in `args`, and whether a
+  // separator is added before the next entry. Arrays are reused when the
+  // message is cleared, so recording does not allocate in steady state.
+  private formats: number[] = [];
+  private starts: number[] = [];
+  private separators: boolean[] = [];
+  private args: LogArg[] = [];
+  private numEntries = 0;
+  private numArgs = 0;
+  private formatted: string | null = "";
+  // Incremented when the message is cleared for reuse.
+  generation = 0;
 
   add(message: string, addSeparator=true) {
-    if (this.addSeparator) {
-      this.text += ", ";
-    }
-    this.text += message;
-    // Record if we want to start with a separator next time. (The separator is
-    // added if and when there is a next message.)
-    this.addSeparator = addSeparator;
+    this.record(LITERAL_LOG_FORMAT, addSeparator).arg(message);
+  }
+
+  // Records an entry whose text is built from `format` and the arguments
+  // that follow, only when the message is displayed.
+  record(format: number, addSeparator=true): this {
+    this.formats[this.numEntries] = format;
+    this.starts[this.numEntries] = this.numArgs;
+    this.separators[this.numEntries] = addSeparator;
+    this.numEntries++;
+    this.formatted = null;
+    return this;
+  }
+
+  arg(value: LogArg): this {
+    this.args[this.numArgs++] = value;
+    return this;
+  }
+
+  clear() {
+    this.numEntries = 0;
+    this.numArgs = 0;
+    this.formatted = "";
+    this.generation++;
+  }
+
+  // Returns a copy of the entries, which are only formatted by the message
+  // that fromEntries makes of them, when it is displayed.
+  entries(): LogEntries {
+    return {
+      formats: this.formats.slice(0, this.numEntries),
+      starts: this.starts.slice(0, this.numEntries),
+      separators: this.separators.slice(0, this.numEntries),
+      args: this.args.slice(0, this.numArgs),
+    };
+  }
+
+  static fromEntries(entries: LogEntries): LogMessage {
+    const message = new LogMessage();
+    message.formats = entries.formats;
+    message.starts = entries.starts;
+    message.separators = entries.separators;
+    message.args = entries.args;
+    message.numEntries = entries.formats.length;
+    message.numArgs = entries.args.length;
+    message.formatted = null;
+    return message;
+  }
+
+  get text(): string {
+    return this.toString();
   }
 
   toString() {
-    return this.text;
+    if (this.formatted == null) {
+      let text = "";
+      for (let i = 0; i < this.numEntries; i++) {
+        // The separator is added if and when there is a next entry.
+        if (i > 0 && this.separators[i-1]) {
+          text += ", ";
+        }
+        const format = this.formats[i];
+        text += format == LITERAL_LOG_FORMAT ?
+          this.args[this.starts[i]] as string :
+          formatDeferredLog(format, this.args, this.starts[i]);
+      }
+      this.formatted = text;
+    }
+    return this.formatted;
+  }
+}
+
+// Ring buffer of the most recent log messages. Once full, the oldest message
+// is evicted in O(1), and its object is reused by `next`.
+export class LogRing implements Iterable<LogMessage> {
+  private messages: LogMessage[] = [];
+  private first = 0;
+  length = 0;
+
+  constructor(readonly capacity: number) {}
+
+  // Appends a message, evicting the oldest one if the ring is full.
+  push(message: LogMessage) {
+    this.messages[this.claimSlot()] = message;
+  }
+
+  // Appends an empty message and returns it. Message objects are recycled
+  // once the ring is full.
+  next(): LogMessage {
+    const slot = this.claimSlot();
+    let message = this.messages[slot];
+    if (message == undefined) {
+      message = new LogMessage();
+      this.messages[slot] = message;
+    } else {
+      message.clear();
+    }
+    return message;
+  }
+
+  get(i: number): LogMessage {
+    return this.messages[(this.first + i) % this.capacity];
+  }
+
+  clear() {
+    this.first = 0;
+    this.length = 0;
+  }
+
+  *[Symbol.iterator](): Iterator<LogMessage> {
+    for (let i = 0; i < this.length; i++) {
+      yield this.get(i);
+    }
+  }
+
+  private claimSlot(): number {
+    if (this.length < this.capacity) {
+      return (this.first + this.length++) % this.capacity;
+    }
+    const slot = this.first;
+    this.first = (this.first + 1) % this.capacity;
+    return slot;
   }
 }
 
 // Maximum number of log messages. We limit it for performance reasons.
 const MAX_LOG_SIZE = 1000;
 
+// Other networks kept per station, and the number of past PS of each.
+export const MAX_OTHER_NETWORKS = 64;
+const OTHER_NETWORK_HISTORY_SIZE = 8;
+
 // Group type constants.
 const GROUP_0A = 0b00000;
 const GROUP_0B = 0b00001;
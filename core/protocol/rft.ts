@@ -1,74 +1,179 @@
 const MAX_SIZE = 163_840;
 const MAX_CHUNKS = 512;
 const GROUP_SIZE = 5;    // 5 bytes per group.
+const MAX_GROUPS = MAX_SIZE / GROUP_SIZE;
 
-enum ByteState {
-  ABSENT,
-  PRESENT,
+// Number of groups per CRC chunk, by CRC mode. In mode 0, the CRC covers the
+// whole file; in mode 7, chunks are as small as possible with at most
+// MAX_CHUNKS of them. Other modes are reserved: their CRCs are not checked.
+const CRC_CHUNK_GROUPS: ReadonlyArray<number | null> = [null, 16, 32, 64, 128, 256, null, null];
+const CRC_MODE_WHOLE_FILE = 0;
+const CRC_MODE_AUTO = 7;
+
+enum ChunkState {
+  INCOMPLETE,
+  // All the groups of the chunk are present, and its CRC is unknown.
+  COMPLETE,
   CRC_OK,
-  CRC_NOK,
 }
 
-enum CrcState {
-  ABSENT,
-  PRESENT,
+// CRC-16-CCITT, as used by RDS2 and DAB: polynomial x^16 + x^12 + x^5 + 1,
+// initial value 0xFFFF, result inverted.
+const CRC_TABLE = (() => {
+  const table = new Uint16Array(256);
+  for (let b = 0; b < 256; b++) {
+    let crc = b << 8;
+    for (let i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) != 0 ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+    table[b] = crc;
+  }
+  return table;
+})();
+
+export function crc16(data: Uint8Array): number {
+  let crc = 0xFFFF;
+  for (let i = 0; i < data.length; i++) {
+    crc = ((crc << 8) ^ CRC_TABLE[(crc >> 8) ^ data[i]]) & 0xFFFF;
+  }
+  return crc ^ 0xFFFF;
 }
 
+// Reassembles a file transmitted with RFT (RDS2 file transfer), e.g. a
+// station logo, from groups received in any order and possibly several
+// times.
+//
+// State is updated incrementally, so that adding a group costs O(1), except
+// when it completes a CRC chunk: the chunk is then checked, and its groups
+// are dropped, to be received again, if its CRC does not match.
 export class RftPipe {
   data = new Uint8Array(MAX_SIZE);
-  dataState = new Array<ByteState>(MAX_SIZE);
+  // Bit set of the groups received, by address.
+  private groupPresent = new Uint32Array(MAX_GROUPS / 32);
+  // Number of groups received within the file.
+  private groupsPresent = 0;
   crc = new Uint16Array(MAX_CHUNKS);
-  crcState = new Array<CrcState>(MAX_CHUNKS);
+  private crcKnown = new Uint8Array(MAX_CHUNKS);
+  private crcMode = -1;
+  // Per CRC chunk, the number of groups received and the state.
+  private chunkGroupsPresent = new Uint16Array(MAX_CHUNKS);
+  private chunkState = new Uint8Array(MAX_CHUNKS);
   size: number = 0;
   bytesPresent: number = 0;
   fileId: number = 0;
   fileVersion: number = 0;
   crcPresent: boolean = false;
+  // Number of chunks whose CRC did not match, since the last reset.
+  crcErrors: number = 0;
 
   reset() {
-    this.dataState.fill(ByteState.ABSENT);
-    this.crcState.fill(CrcState.ABSENT);
+    this.groupPresent.fill(0);
+    this.groupsPresent = 0;
+    this.crcKnown.fill(0);
+    this.crcMode = -1;
+    this.chunkGroupsPresent.fill(0);
+    this.chunkState.fill(ChunkState.INCOMPLETE);
     this.size = 0;
+    this.bytesPresent = 0;
     this.fileId = 0;
     this.fileVersion = 0;
     this.crcPresent = false;
+    this.crcErrors = 0;
   }
 
   constructor() {
     this.reset();
   }
 
+  // Number of groups of the file, 0 if its size is unknown.
+  private get groupCount(): number {
+    return Math.ceil(this.size / GROUP_SIZE);
+  }
+
+  // Number of groups per CRC chunk, or 0 if CRCs are not checked.
+  private get chunkGroups(): number {
+    if (this.crcMode == CRC_MODE_WHOLE_FILE) {
+      return this.groupCount;
+    }
+    if (this.crcMode == CRC_MODE_AUTO) {
+      let groups = 1;
+      while (groups * MAX_CHUNKS < this.groupCount) groups *= 2;
+      return this.groupCount > 0 ? groups : 0;
+    }
+    return CRC_CHUNK_GROUPS[this.crcMode] ?? 0;
+  }
+
+  private hasGroup(addr: number): boolean {
+    return (this.groupPresent[addr >>> 5] & (1 << (addr & 31))) != 0;
+  }
+
   addGroup(addr: number, groupData: Uint8Array): boolean {
     if (groupData.length != GROUP_SIZE) {
       // TODO: Handle data with missing bytes.
       throw new Error(`RFT: Invalid group size (${groupData.length}`);
     }
-    for (let i=0; i<GROUP_SIZE; i++) {
-      this.data[GROUP_SIZE * addr + i] = groupData[i];
-      this.dataState[GROUP_SIZE * addr + i] = ByteState.PRESENT;
+    if (addr >= MAX_GROUPS || (this.size > 0 && addr >= this.groupCount)) {
+      return this.isComplete();
+    }
+    const chunkGroups = this.chunkGroups;
+    const chunk = chunkGroups > 0 ? Math.floor(addr / chunkGroups) : -1;
+    if (this.hasGroup(addr)) {
+      // Repeated group: keep verified data.
+      if (chunk < 0 || this.chunkState[chunk] != ChunkState.CRC_OK) {
+        this.data.set(groupData, GROUP_SIZE * addr);
+      }
+      return this.isComplete();
+    }
+    this.data.set(groupData, GROUP_SIZE * addr);
+    this.groupPresent[addr >>> 5] |= 1 << (addr & 31);
+    if (this.size > 0) {
+      this.groupsPresent++;
+      this.updateBytesPresent();
+    }
+    if (chunk >= 0) {
+      this.chunkGroupsPresent[chunk]++;
+      this.checkChunk(chunk);
     }
-
     return this.isComplete();
   }
 
   addCrc(mode: number, chunkAddr: number, crc: number) {
-    // TODO: Handle mode.
+    if (mode != this.crcMode) {
+      // Chunks change: recount their groups.
+      this.crcMode = mode;
+      this.crcKnown.fill(0);
+      this.countGroups();
+    }
+    if (chunkAddr >= MAX_CHUNKS || (this.crcKnown[chunkAddr] == 1 && this.crc[chunkAddr] == crc)) {
+      return;
+    }
     this.crc[chunkAddr] = crc;
-    this.crcState[chunkAddr] = CrcState.PRESENT;
+    this.crcKnown[chunkAddr] = 1;
+    if (this.chunkState[chunkAddr] == ChunkState.CRC_OK) {
+      this.chunkState[chunkAddr] = ChunkState.COMPLETE;
+    }
+    this.checkChunk(chunkAddr);
   }
 
-  isComplete(): boolean {
-    if (this.size > 0) {
-      let presentCount = 0;
-      for (let a=0; a<this.size; a++) {
-        if (this.dataState[a] != ByteState.ABSENT) {
-          presentCount++;
-        }
-      }
-      this.bytesPresent = presentCount;
-      return presentCount == this.size;
+  // Sets the file metadata. A different file restarts reassembly.
+  // Files larger than MAX_SIZE are truncated.
+  setMetadata(size: number, fileId: number, fileVersion: number, crcPresent: boolean) {
+    size = Math.min(size, MAX_SIZE);
+    if (this.size > 0 && (size != this.size || fileId != this.fileId || fileVersion != this.fileVersion)) {
+      this.reset();
+    }
+    const sizeChanged = size != this.size;
+    this.size = size;
+    this.fileId = fileId;
+    this.fileVersion = fileVersion;
+    this.crcPresent = crcPresent;
+    if (sizeChanged) {
+      this.countGroups();
     }
-    return false;
+  }
+
+  isComplete(): boolean {
+    return this.size > 0 && this.groupsPresent == this.groupCount;
   }
 
   getData(): Blob | null {
@@ -78,4 +183,73 @@ export class RftPipe {
       return null;
     }
   }
+
+  // Recounts the groups present in the file and in each chunk, after the
+  // size or the chunks changed, and checks the complete chunks. Groups beyond
+  // the end of the file are dropped.
+  private countGroups() {
+    const groupCount = this.size > 0 ? this.groupCount : MAX_GROUPS;
+    for (let addr = groupCount; addr < MAX_GROUPS; addr++) {
+      this.groupPresent[addr >>> 5] &= ~(1 << (addr & 31));
+    }
+    this.groupsPresent = 0;
+    this.chunkGroupsPresent.fill(0);
+    this.chunkState.fill(ChunkState.INCOMPLETE);
+    const chunkGroups = this.chunkGroups;
+    for (let addr = 0; addr < groupCount; addr++) {
+      if (this.hasGroup(addr)) {
+        this.groupsPresent++;
+        if (chunkGroups > 0) this.chunkGroupsPresent[Math.floor(addr / chunkGroups)]++;
+      }
+    }
+    if (this.size == 0) {
+      this.groupsPresent = 0;
+    }
+    this.updateBytesPresent();
+    if (chunkGroups > 0) {
+      for (let chunk = 0; chunk * chunkGroups < groupCount && chunk < MAX_CHUNKS; chunk++) {
+        this.checkChunk(chunk);
+      }
+    }
+  }
+
+  private updateBytesPresent() {
+    const last = this.groupCount - 1;
+    // The last group may extend beyond the end of the file.
+    this.bytesPresent = GROUP_SIZE * this.groupsPresent -
+      (last >= 0 && this.hasGroup(last) ? GROUP_SIZE * this.groupCount - this.size : 0);
+  }
+
+  // Checks the CRC of `chunk` if all its groups and its CRC are known. If the
+  // CRC does not match, drops the groups of the chunk.
+  private checkChunk(chunk: number) {
+    const chunkGroups = this.chunkGroups;
+    if (this.size == 0 || chunkGroups == 0 || chunk >= MAX_CHUNKS || this.chunkState[chunk] == ChunkState.CRC_OK) {
+      return;
+    }
+    const first = chunk * chunkGroups;
+    const end = Math.min(first + chunkGroups, this.groupCount);
+    if (this.chunkGroupsPresent[chunk] < end - first) {
+      this.chunkState[chunk] = ChunkState.INCOMPLETE;
+      return;
+    }
+    this.chunkState[chunk] = ChunkState.COMPLETE;
+    if (this.crcKnown[chunk] == 0) {
+      return;
+    }
+    const bytes = this.data.subarray(GROUP_SIZE * first, Math.min(GROUP_SIZE * end, this.size));
+    if (crc16(bytes) == this.crc[chunk]) {
+      this.chunkState[chunk] = ChunkState.CRC_OK;
+      return;
+    }
+    // Corrupted chunk: receive it again.
+    this.crcErrors++;
+    for (let addr = first; addr < end; addr++) {
+      this.groupPresent[addr >>> 5] &= ~(1 << (addr & 31));
+    }
+    this.groupsPresent -= end - first;
+    this.chunkGroupsPresent[chunk] = 0;
+    this.chunkState[chunk] = ChunkState.INCOMPLETE;
+    this.updateBytesPresent();
+  }
 }
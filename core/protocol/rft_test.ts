@@ -0,0 +1,100 @@
+import { crc16, RftPipe } from "./rft";
+
+// A 100-byte file: 20 groups, in 2 chunks of 16 groups in CRC mode 1.
+const FILE = Uint8Array.from({length: 100}, (_, i) => i);
+const CRC_MODE = 1;
+const CRC_CHUNK_0 = 0xB155;
+const CRC_CHUNK_1 = 0x3EC1;
+
+function group(addr: number, file = FILE): Uint8Array {
+  const g = new Uint8Array(5);
+  g.set(file.subarray(5 * addr, 5 * addr + 5));
+  return g;
+}
+
+function newPipe(size: number, crcs: boolean): RftPipe {
+  const p = new RftPipe();
+  p.setMetadata(size, 1, 0, crcs);
+  if (crcs) {
+    p.addCrc(CRC_MODE, 0, CRC_CHUNK_0);
+    p.addCrc(CRC_MODE, 1, CRC_CHUNK_1);
+  }
+  return p;
+}
+
+describe('RFT CRC', () => {
+  it('should be CRC-16-CCITT', () => {
+    expect(crc16(new TextEncoder().encode("123456789"))).toBe(0xD64E);
+  });
+});
+
+describe('RFT reassembly', () => {
+  it('should count bytes and complete the file', () => {
+    const p = newPipe(100, true);
+    // Out of order, with repetitions.
+    const order = [19, 3, 3, 0, ...Array.from({length: 18}, (_, i) => i + 1)];
+    for (const addr of order.slice(0, -1)) {
+      expect(p.addGroup(addr, group(addr))).toBeFalse();
+    }
+    expect(p.bytesPresent).toBe(95);
+    expect(p.addGroup(18, group(18))).toBeTrue();
+    expect(p.bytesPresent).toBe(100);
+    expect(p.crcErrors).toBe(0);
+  });
+
+  it('should receive corrupted chunks again', () => {
+    const p = newPipe(100, true);
+    const corrupted = FILE.slice();
+    corrupted[17] ^= 0x40;
+    for (let addr = 0; addr < 16; addr++) {
+      p.addGroup(addr, group(addr, corrupted));
+    }
+    expect(p.crcErrors).toBe(1);
+    expect(p.bytesPresent).toBe(0);
+    for (let addr = 0; addr < 20; addr++) {
+      p.addGroup(addr, group(addr));
+    }
+    expect(p.isComplete()).toBeTrue();
+  });
+
+  it('should check chunks whose CRC comes last', () => {
+    const p = newPipe(100, false);
+    const corrupted = FILE.slice();
+    corrupted[90] = 0;
+    for (let addr = 16; addr < 20; addr++) {
+      p.addGroup(addr, group(addr, corrupted));
+    }
+    expect(p.bytesPresent).toBe(20);
+    p.addCrc(CRC_MODE, 1, CRC_CHUNK_1);
+    expect(p.crcErrors).toBe(1);
+    expect(p.bytesPresent).toBe(0);
+  });
+
+  it('should count the last group up to the end of the file', () => {
+    const p = newPipe(98, false);
+    p.addGroup(19, group(19));
+    expect(p.bytesPresent).toBe(3);
+    // Groups beyond the end of the file are ignored.
+    p.addGroup(20, group(0));
+    expect(p.bytesPresent).toBe(3);
+  });
+
+  it('should keep groups received before the metadata', () => {
+    const p = new RftPipe();
+    for (let addr = 0; addr < 20; addr++) {
+      expect(p.addGroup(addr, group(addr))).toBeFalse();
+    }
+    p.setMetadata(100, 1, 0, false);
+    expect(p.isComplete()).toBeTrue();
+  });
+
+  it('should keep the groups of files larger than the maximum size', () => {
+    const p = new RftPipe();
+    p.setMetadata(200_000, 1, 0, false);
+    p.addGroup(0, group(0));
+    expect(p.bytesPresent).toBe(5);
+    // Repeated metadata is the same file.
+    p.setMetadata(200_000, 1, 0, false);
+    expect(p.bytesPresent).toBe(5);
+  });
+});
@@ -0,0 +1,130 @@
+// Compact binary encoding of decoder state, used by the generated
+// `serialize_<struct>` and `deserialize_<struct>` functions.
+//
+// Numbers are zigzag LEB128 varints, so small values take a single byte and
+// negative values (e.g. the -1 PI of a reset station) survive a round trip.
+// Consecutive flags are packed 8 per byte. A snapshot starts with a format
+// identifier, which changes whenever the layout does: snapshots are only
+// meant to be restored by the decoder build that took them.
+
+const TEXT_ENCODER = new TextEncoder();
+const TEXT_DECODER = new TextDecoder();
+
+export class SnapshotWriter {
+  private buffer = new Uint8Array(1024);
+  private length = 0;
+  // Position of the byte holding the current flags, and number of flags in it.
+  private flagByte = 0;
+  private flagCount = 8;
+
+  public constructor(format: number) {
+    this.varint(format);
+  }
+
+  public flag(f: boolean) {
+    if (this.flagCount == 8) {
+      this.reserve(1);
+      this.flagByte = this.length;
+      this.buffer[this.length++] = 0;
+      this.flagCount = 0;
+    }
+    if (f) {
+      this.buffer[this.flagByte] |= 1 << this.flagCount;
+    }
+    this.flagCount++;
+  }
+
+  public varint(n: number) {
+    this.flagCount = 8;
+    this.reserve(10);
+    let z = n >= 0 ? 2 * n : -2 * n - 1;
+    while (z >= 0x80) {
+      this.buffer[this.length++] = (z % 0x80) | 0x80;
+      z = Math.floor(z / 0x80);
+    }
+    this.buffer[this.length++] = z;
+  }
+
+  public bytes(b: Uint8Array) {
+    this.varint(b.length);
+    this.reserve(b.length);
+    this.buffer.set(b, this.length);
+    this.length += b.length;
+  }
+
+  public string(s: string) {
+    this.bytes(TEXT_ENCODER.encode(s));
+  }
+
+  // Returns the snapshot. The writer must not be used afterwards.
+  public toBytes(): Uint8Array {
+    return this.buffer.subarray(0, this.length);
+  }
+
+  private reserve(n: number) {
+    if (this.length + n > this.buffer.length) {
+      const b = new Uint8Array(Math.max(2 * this.buffer.length, this.length + n));
+      b.set(this.buffer);
+      this.buffer = b;
+    }
+  }
+}
+
+export class SnapshotReader {
+  private position = 0;
+  private flagByte = 0;
+  private flagCount = 8;
+
+  public constructor(private readonly buffer: Uint8Array, format: number) {
+    const f = this.varint();
+    if (f != format) {
+      throw new Error(`Snapshot format ${f} does not match this decoder (${format})`);
+    }
+  }
+
+  public flag(): boolean {
+    if (this.flagCount == 8) {
+      this.flagByte = this.byte();
+      this.flagCount = 0;
+    }
+    return (this.flagByte & (1 << this.flagCount++)) != 0;
+  }
+
+  public varint(): number {
+    this.flagCount = 8;
+    let z = 0;
+    let scale = 1;
+    let b: number;
+    do {
+      b = this.byte();
+      z += (b & 0x7f) * scale;
+      scale *= 0x80;
+    } while (b >= 0x80);
+    return z % 2 == 0 ? z / 2 : -(z + 1) / 2;
+  }
+
+  public bytes(): Uint8Array {
+    const n = this.varint();
+    if (this.position + n > this.buffer.length) {
+      throw new RangeError('Truncated snapshot');
+    }
+    this.position += n;
+    return this.buffer.subarray(this.position - n, this.position);
+  }
+
+  public string(): string {
+    return TEXT_DECODER.decode(this.bytes());
+  }
+
+  // Whether the whole snapshot has been read.
+  public get done(): boolean {
+    return this.position == this.buffer.length;
+  }
+
+  private byte(): number {
+    if (this.position >= this.buffer.length) {
+      throw new RangeError('Truncated snapshot');
+    }
+    return this.buffer[this.position++];
+  }
+}
@@ -0,0 +1,85 @@
+import { Group } from "../drivers/input";
+import { LruMap } from "./lru_map";
+import { parse_group, StationImpl } from "./rds_types";
+import { GroupEvent } from "./station_change";
+
+// Stations decoded from a stream of groups that interleaves several
+// transmitters, e.g. a seek scan, a band scan log, or an archive merging
+// captures: each group is parsed into the station of its PI.
+//
+// At most `capacity` stations are kept, the least recently received being
+// evicted first. If `spillCapacity` is positive, evicted stations are kept as
+// snapshots (see StationImpl.snapshot), which are restored when their PI is
+// received again. Snapshots only hold the fields declared in the protocol
+// description.
+export class StationRegistry {
+  readonly stations: LruMap<number, StationImpl>;
+  // Snapshots of evicted stations, by PI.
+  readonly spilled: LruMap<number, Uint8Array> | null;
+  // Station of the last group that had a PI. Groups without a valid PI, and
+  // those of streams 1-3, which carry none, are parsed into it.
+  current: StationImpl | null = null;
+  // Called with each evicted station, after it has been spilled.
+  onEvict: ((pi: number, station: StationImpl) => void) | null = null;
+
+  public constructor(capacity: number, spillCapacity = 0) {
+    this.stations = new LruMap<number, StationImpl>(capacity);
+    this.spilled = spillCapacity > 0 ? new LruMap<number, Uint8Array>(spillCapacity) : null;
+    this.stations.onEvict = (pi, station) => {
+      this.spilled?.set(pi, station.snapshot());
+      this.onEvict?.(pi, station);
+    };
+  }
+
+  // Returns the station of `pi`, restoring it from its snapshot or creating
+  // it if needed.
+  public station(pi: number): StationImpl {
+    let station = this.stations.get(pi);
+    if (station == undefined) {
+      station = new StationImpl(pi);
+      const snapshot = this.spilled?.get(pi);
+      if (snapshot != undefined) {
+        this.spilled?.delete(pi);
+        station.restore(snapshot);
+      }
+      this.stations.set(pi, station);
+    }
+    return station;
+  }
+
+  // Parses a group into the station of its PI, logging it along with its
+  // blocks like the UI. Returns the station, or null if the group has no PI
+  // and no group had one before.
+  public parseGroup(stream: number, group: Group, maxErrors: number): StationImpl | null {
+    const pi = stream == 0 ? groupPi(group, maxErrors) : null;
+    const station = pi == null ? this.current : this.station(pi);
+    if (station == null) {
+      return null;
+    }
+    this.current = station;
+    const log = station.log.next();
+    log.add(stream + ':[' + new GroupEvent(stream, group, maxErrors).hexDump() + '] ', false);
+    parse_group(stream, group, maxErrors, log, station);
+    station.tickGroupDuration();
+    return station;
+  }
+
+  public clear() {
+    this.stations.clear();
+    this.spilled?.clear();
+    this.current = null;
+  }
+}
+
+// Returns the PI of a type A/B group, from block A, or from block C' of type
+// B groups, or null if neither is valid.
+export function groupPi(group: Group, maxErrors: number): number | null {
+  const [a, b, c] = group.blocks;
+  if (a.errorCount <= maxErrors) {
+    return a.value;
+  }
+  if (b.errorCount <= maxErrors && (b.value & 0x800) != 0 && c.errorCount <= maxErrors) {
+    return c.value;
+  }
+  return null;
+}
@@ -0,0 +1,115 @@
+// Groups are decoded synchronously: load the decoders of EON, etc. upfront
+// rather than on demand.
+import './base_eager';
+import { parseHexGroup } from '../drivers/input';
+import { LruMap } from './lru_map';
+import { PARSE_MEMO } from './base';
+import { OtherNetworkImpl, StationImpl } from './rds_types';
+import { groupPi, StationRegistry } from './station_registry';
+
+const MAX_ERRORS = 0;
+
+function send(s: string, registry: StationRegistry): Array<StationImpl | null> {
+  const stations: Array<StationImpl | null> = [];
+  for (const l of s.split('\n')) {
+    const evt = parseHexGroup(l);
+    if (evt?.group != undefined) {
+      stations.push(registry.parseGroup(evt.stream ?? 0, evt.group, MAX_ERRORS));
+    }
+  }
+  return stations;
+}
+
+// PS "  INTER " of France Inter, and "RADIO  1" of another station.
+const FRANCE_INTER = `F201 0408 2037 2020
+                      F201 0409 383B 494E
+                      F201 040A 3D45 5445
+                      F201 040F 474E 5220`;
+const RADIO_1 = `F202 0408 2037 5241
+                 F202 0409 383B 4449
+                 F202 040A 3D45 4F20
+                 F202 040F 474E 2031`;
+
+describe('LruMap', () => {
+  it('should evict the least recently used entry', () => {
+    const map = new LruMap<string, number>(2);
+    const evicted: string[] = [];
+    map.onEvict = (k) => evicted.push(k);
+    map.set('a', 1);
+    map.set('b', 2);
+    map.get('a');
+    map.set('c', 3);
+    expect(evicted).toEqual(['b']);
+    expect(Array.from(map.keys())).toEqual(['a', 'c']);
+  });
+
+  it('should reject invalid capacities', () => {
+    expect(() => new LruMap<number, number>(0)).toThrowError(RangeError);
+  });
+});
+
+describe('StationRegistry', () => {
+  it('should decode interleaved stations separately', () => {
+    const registry = new StationRegistry(4);
+    const a = FRANCE_INTER.split('\n');
+    const b = RADIO_1.split('\n');
+    send(a.map((l, i) => l + '\n' + b[i]).join('\n'), registry);
+    expect(registry.station(0xF201).getPS()).toBe('  INTER ');
+    expect(registry.station(0xF202).getPS()).toBe('RADIO  1');
+  });
+
+  it('should parse groups without a PI into the current station', () => {
+    const registry = new StationRegistry(4);
+    const stations = send(`---- 0408 2037 2020
+                           F201 0409 383B 494E
+                           ---- 040A 3D45 5445`, registry);
+    expect(stations[0]).toBeNull();
+    expect(stations[2]).toBe(stations[1]);
+  });
+
+  it('should evict the least recently received station', () => {
+    const registry = new StationRegistry(2);
+    const evicted: number[] = [];
+    registry.onEvict = (pi) => evicted.push(pi);
+    send('F201 0408 2037 2020\nF202 0408 2037 2020\nF201 0409 383B 494E\nF203 0408 2037 2020', registry);
+    expect(evicted).toEqual([0xF202]);
+    expect(Array.from(registry.stations.keys())).toEqual([0xF201, 0xF203]);
+  });
+
+  it('should restore spilled stations', () => {
+    const registry = new StationRegistry(1, 8);
+    send(FRANCE_INTER, registry);
+    send(RADIO_1, registry);
+    expect(registry.spilled?.has(0xF201)).toBeTrue();
+    expect(registry.station(0xF201).getPS()).toBe('  INTER ');
+    expect(registry.spilled?.has(0xF201)).toBeFalse();
+    expect(registry.spilled?.has(0xF202)).toBeTrue();
+  });
+
+  it('should take the PI of type B groups from block C\'', () => {
+    const group = parseHexGroup('---- 0808 F201 2020')?.group;
+    expect(group != undefined && groupPi(group, MAX_ERRORS)).toBe(0xF201);
+  });
+});
+
+describe('Other networks', () => {
+  it('should be bounded', () => {
+    const station = new StationImpl();
+    for (let pi = 0; pi < station.other_networks.capacity + 10; pi++) {
+      station.other_networks.set(pi, new OtherNetworkImpl(pi));
+    }
+    expect(station.other_networks.size).toBe(station.other_networks.capacity);
+    expect(station.other_networks.has(0)).toBeFalse();
+  });
+
+  it('should invalidate memoized groups when evicted', () => {
+    const station = new StationImpl();
+    const clear = spyOn(PARSE_MEMO, 'clear');
+    for (let pi = 0; pi < station.other_networks.capacity; pi++) {
+      station.other_networks.set(pi, new OtherNetworkImpl(pi));
+    }
+    expect(clear).not.toHaveBeenCalled();
+    station.other_networks.set(0xF201, new OtherNetworkImpl(0xF201));
+    expect(clear).toHaveBeenCalled();
+  });
+});
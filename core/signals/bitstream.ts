@@ -1,4 +1,5 @@
 import { Block, Group, RdsPipeline, RdsReportEventType, UNCORRECTABLE_ERRORS } from "../drivers/input";
+import { BLOCK_INDEX_BY_SYNDROME, ERROR_COUNTS, ERROR_PATTERNS, GEN, GEN_DEGREE, ROLL_IN, ROLL_OUT, SYNDROME_BYTE0, SYNDROME_BYTE1, SYNDROME_BYTE2, SYNDROME_BYTE3 } from "./syndrome_tables";
 
 // Number of good blocks needed after initial block to confirm synchronization.
 const SYNC_THRESHOLD = 2;
@@ -13,27 +14,14 @@ const BLOCK_SIZE = 26;
 const BLOCKS_PER_GROUP = 4;
 const GROUP_SIZE = BLOCKS_PER_GROUP * BLOCK_SIZE;
 
-const SYNDROMES = new Map<number, number>(
-  [[0x3D8, 0], [0x3D4, 1], [0x25C, 2], [0x3CC, 2], [0x258, 3]]);
-
 // Reverse lookup: for a given block position (A/B/C/D), the syndrome
 // value(s) expected of an error-free block at that position.
 const SYNDROMES_BY_BLOCK: number[][] = [[], [], [], []];
-for (const [synd, blockIndex] of SYNDROMES) {
-  SYNDROMES_BY_BLOCK[blockIndex].push(synd);
-}
-
-// Generator polynomial: x^10+x^8+x^7+x^5+x^4+x^3+1.
-const GEN = 0x5B9;
-const GEN_DEGREE = 10;
-
-// x^325 mod gen: x^9+x^8+x^4+x^3+x+1. Used as the initial multiplier to
-// turn a raw block into its syndrome.
-const INITIAL_MULTIPLIER = 0x31B;
-
-// A 5-bit "trap": once the shifted syndrome falls in this window, the
-// remaining bits identify a correctable burst error.
-const TRAP = 0x1F;
+BLOCK_INDEX_BY_SYNDROME.forEach((blockIndex, synd) => {
+  if (blockIndex >= 0) {
+    SYNDROMES_BY_BLOCK[blockIndex].push(synd);
+  }
+});
 
 class SyncEntry {
   public constructor(public bitTime: number, public block: number) {}
@@ -43,59 +31,46 @@ class SyncEntry {
   }
 }
 
-function calcSyndrome(block: number, ini: number): number {
-  let rem = 0;
-  for (let i = BLOCK_SIZE; i > 0; i--) {
-    if ((block >> (i - 1)) & 0x01) rem = (rem << 1) ^ ini;
-    else rem = rem << 1;
-    if (rem & (0x01 << GEN_DEGREE)) rem = rem ^ GEN;
-  }
-  return rem;
+// Returns the syndrome of a 26-bit block, byte by byte.
+export function calcSyndrome(block: number): number {
+  return SYNDROME_BYTE0[block & 0xFF] ^ SYNDROME_BYTE1[(block >> 8) & 0xFF] ^
+    SYNDROME_BYTE2[(block >> 16) & 0xFF] ^ SYNDROME_BYTE3[(block >> 24) & 0x03];
 }
 
-// Counts the number of 1 bits in `x`.
-function popcount(x: number): number {
-  let count = 0;
-  while (x != 0) {
-    x &= x - 1;
-    count++;
-  }
-  return count;
+// Returns the syndrome of the 26-bit block window after shifting `bit` in,
+// given the syndrome `synd` of the window `block` before the shift.
+function rollSyndrome(synd: number, block: number, bit: boolean): number {
+  synd <<= 1;
+  if (synd & (1 << GEN_DEGREE)) synd ^= GEN;
+  if (block & (1 << (BLOCK_SIZE - 1))) synd ^= ROLL_OUT;
+  if (bit) synd ^= ROLL_IN;
+  return synd;
 }
 
-// Tries to correct a burst error in `block`, given the syndrome expected
-// of an error-free block at this position. Returns the corrected block
-// with the number of bits that were flipped, or UNCORRECTABLE_ERRORS.
-function correctBlock(block: number, expectedSyndrome: number): Block {
-  let rem = calcSyndrome(block, INITIAL_MULTIPLIER) ^ expectedSyndrome;
-  let shift = 16;
-  let trapped = false;
-  for (; shift > 0; shift--) {     // Calculate successive syndromes.
-    rem = calcSyndrome(rem, 1);
-    if ((rem & TRAP) == 0) {
-      trapped = true;
-      break;
+// Tries to correct `block`, known to be at position `blockIndex` within
+// the group, against every syndrome value that is valid for that position.
+// `synd` is the syndrome of `block`. Returns the corrected block with the
+// number of bits that were flipped, or UNCORRECTABLE_ERRORS.
+function correctBlockAtPosition(block: number, synd: number, blockIndex: number): Block {
+  // Burst error patterns are looked up by syndrome difference.
+  let bestPattern = -1;
+  let bestErrors: number = UNCORRECTABLE_ERRORS;
+  for (const expectedSyndrome of SYNDROMES_BY_BLOCK[blockIndex]) {
+    const diff = synd ^ expectedSyndrome;
+    if (ERROR_PATTERNS[diff] >= 0 && ERROR_COUNTS[diff] < bestErrors) {
+      bestPattern = ERROR_PATTERNS[diff];
+      bestErrors = ERROR_COUNTS[diff];
     }
-    rem = rem << 1;
   }
-  if (!trapped) {
+  if (bestPattern < 0) {
     return new Block((block >> GEN_DEGREE) & 0xFFFF, UNCORRECTABLE_ERRORS);
   }
-
-  rem = rem << shift;
-  return new Block(((block ^ rem) >> GEN_DEGREE) & 0xFFFF, popcount(rem));
-}
-
-// Tries to correct `block`, known to be at position `blockIndex` within
-// the group, against every syndrome value that is valid for that position.
-function correctBlockAtPosition(block: number, blockIndex: number): Block {
-  return SYNDROMES_BY_BLOCK[blockIndex]
-    .map(expectedSyndrome => correctBlock(block, expectedSyndrome))
-    .reduce((best, other) => other.errorCount < best.errorCount ? other : best);
+  return new Block(((block ^ bestPattern) >> GEN_DEGREE) & 0xFFFF, bestErrors);
 }
 
 export class BitStreamSynchronizer {
 	private block = 0;        // block contents
+	private syndrome = 0;     // syndrome of the block contents
 	private blockCount = 0;   // block counter within group
 	private bitCount = 0;     // bit count within block
 	private group: [Block, Block, Block, Block] = [
@@ -132,6 +107,7 @@ export class BitStreamSynchronizer {
 	}
 
   public addBit(bit: boolean) {
+    this.syndrome = rollSyndrome(this.syndrome, this.block, bit);
     this.block = (this.block << 1) & 0x3FFFFFF;
     if (bit) this.block |= 1;
     this.bitCount++;
@@ -139,10 +115,8 @@ export class BitStreamSynchronizer {
     
     try_sync:
     if (!this.synced) {
-      const synd = calcSyndrome(this.block, INITIAL_MULTIPLIER);
-
-      const blockIndex = SYNDROMES.get(synd);
-      if (blockIndex == undefined) {    // The syndrome does not match one of the offset syndromes.
+      const blockIndex = BLOCK_INDEX_BY_SYNDROME[this.syndrome];
+      if (blockIndex < 0) {    // The syndrome does not match one of the offset syndromes.
         break try_sync;
       }
 
@@ -231,13 +205,13 @@ export class BitStreamSynchronizer {
       }
     } else {   // If synced.
       if (this.bitCount == BLOCK_SIZE) {
-        const synd = calcSyndrome(this.block, INITIAL_MULTIPLIER);
+        const synd = this.syndrome;
 
-        if (SYNDROMES.get(synd) == this.blockCount) {
+        if (BLOCK_INDEX_BY_SYNDROME[synd] == this.blockCount) {
           this.nbOk++;
           this.group[this.blockCount] = new Block((this.block>>10) & 0xFFFF, 0);
         } else {
-          const corrected = correctBlockAtPosition(this.block, this.blockCount);
+          const corrected = correctBlockAtPosition(this.block, synd, this.blockCount);
           this.group[this.blockCount] = corrected;
           if (corrected.errorCount != UNCORRECTABLE_ERRORS) {
             this.nbOk++;
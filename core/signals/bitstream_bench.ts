@@ -0,0 +1,138 @@
+import { benchArgs, logLines, measure, printResults, readText, silenceConsole } from "../bench/bench_util";
+import { RdsPipeline, RdsReportEvent, RdsReportEventType, UNCORRECTABLE_ERRORS, parseHexGroup } from "../drivers/input";
+import { BitStreamSynchronizer } from "./bitstream";
+import { GEN, GEN_DEGREE } from "./syndrome_tables";
+
+// Benchmark of BitStreamSynchronizer. The groups of the type A/B stream of
+// recorded group logs are encoded to a bit stream, with check words, then
+// decoded by a new synchronizer in each run, with and without bit errors.
+// Prints bits_per_second and the number of groups decoded per run, as JSON.
+//
+// Usage: bitstream_bench [--min-seconds=S] corpus.spy...
+//
+// run_benchmarks.py runs it, and checks the results against thresholds.
+
+// Offset words of blocks A, B, C, C' and D.
+const OFFSET_A = 0x0FC;
+const OFFSET_B = 0x198;
+const OFFSET_C = 0x168;
+const OFFSET_C_PRIME = 0x350;
+const OFFSET_D = 0x1B4;
+
+// The stream is made of at least that many groups, repeating the corpora.
+const MIN_GROUPS = 2000;
+
+// Bit error rate of the noisy stream.
+const BIT_ERROR_RATE = 1e-3;
+
+// Returns the check word of a block: the remainder of data * x^10 by the
+// generator polynomial, plus the offset word.
+function checkWord(data: number, offset: number): number {
+  let r = 0;
+  for (let i = 15; i >= 0; i--) {
+    const bit = ((data >> i) & 1) ^ ((r >> (GEN_DEGREE - 1)) & 1);
+    r = (r << 1) & ((1 << GEN_DEGREE) - 1);
+    if (bit) r ^= GEN & ((1 << GEN_DEGREE) - 1);
+  }
+  return r ^ offset;
+}
+
+// Encodes groups of 4 blocks to a bit stream, most significant bit first.
+// Invalid blocks get a wrong check word.
+function encode(groups: Array<Array<number | null>>): Uint8Array {
+  const bytes = new Uint8Array(Math.ceil(groups.length * 104 / 8));
+  let bit = 0;
+  const push = (value: number, width: number) => {
+    for (let i = width - 1; i >= 0; i--, bit++) {
+      if ((value >> i) & 1) bytes[bit >> 3] |= 0x80 >> (bit & 7);
+    }
+  };
+  for (const g of groups) {
+    // Version B groups have C' as third offset word.
+    const block1 = g[1];
+    const versionB = block1 != null && (block1 & 0x0800) != 0;
+    const offsets = [OFFSET_A, OFFSET_B, versionB ? OFFSET_C_PRIME : OFFSET_C, OFFSET_D];
+    g.forEach((data, i) => {
+      push(data ?? 0, 16);
+      push(checkWord(data ?? 0, offsets[i]) ^ (data == null ? 1 : 0), GEN_DEGREE);
+    });
+  }
+  return bytes;
+}
+
+// Flips bits at random, with a fixed seed, at `rate`.
+function addErrors(bytes: Uint8Array, rate: number): Uint8Array {
+  const noisy = bytes.slice();
+  // xorshift32.
+  let state = 0x12345678;
+  for (let bit = 0; bit < noisy.length * 8; bit++) {
+    state ^= state << 13;
+    state ^= state >>> 17;
+    state ^= state << 5;
+    if ((state >>> 0) / 0x100000000 < rate) {
+      noisy[bit >> 3] ^= 0x80 >> (bit & 7);
+    }
+  }
+  return noisy;
+}
+
+class GroupCounter implements RdsPipeline {
+  groups = 0;
+
+  processMpxSamples(_samples: Float32Array, _length?: number): void {}
+  processBits(_bytes: Uint8Array): void {}
+  reportFrequency(_frequencyKhz: number): void {}
+  reportSourceEnd(): void {}
+
+  processRdsReportEvent(event: RdsReportEvent): void {
+    if (event.type == RdsReportEventType.GROUP) this.groups++;
+  }
+}
+
+function benchStream(bytes: Uint8Array, minSeconds: number) {
+  let groups = 0;
+  const timing = measure(() => {
+    const counter = new GroupCounter();
+    new BitStreamSynchronizer(0, counter).addBits(bytes);
+    groups = counter.groups;
+  }, minSeconds);
+  return {
+    bits: bytes.length * 8,
+    bits_per_second: bytes.length * 8 * timing.runs / timing.seconds,
+    groups_decoded: groups,
+  };
+}
+
+function main() {
+  silenceConsole();
+  let minSeconds = 0.5;
+  const groups: Array<Array<number | null>> = [];
+  for (const arg of benchArgs()) {
+    if (arg.startsWith("--min-seconds=")) {
+      minSeconds = Number.parseFloat(arg.substring(14));
+      continue;
+    }
+    for (const line of logLines(readText(arg))) {
+      const evt = parseHexGroup(line);
+      if (evt?.group != undefined && evt.stream == 0) {
+        groups.push(evt.group.blocks.map((b) => b.errorCount == UNCORRECTABLE_ERRORS ? null : b.value));
+      }
+    }
+  }
+  if (groups.length == 0) {
+    throw new RangeError("No type A/B groups in the corpora");
+  }
+  const stream: Array<Array<number | null>> = [];
+  while (stream.length < MIN_GROUPS) {
+    stream.push(...groups);
+  }
+  const bytes = encode(stream);
+  printResults({
+    bitstream: {
+      error_free: benchStream(bytes, minSeconds),
+      noisy: benchStream(addErrors(bytes, BIT_ERROR_RATE), minSeconds),
+    },
+  });
+}
+
+main();
@@ -1,5 +1,5 @@
 import { Block, Group, RdsReportEvent, RdsPipeline, RdsReportEventType } from "../drivers/input";
-import { BitStreamSynchronizer } from "./bitstream";
+import { BitStreamSynchronizer, calcSyndrome } from "./bitstream";
 
 class RdsListener implements RdsPipeline {
   processMpxSamples(samples: Float32Array, length?: number): void {
@@ -18,6 +18,17 @@ class RdsListener implements RdsPipeline {
   }
 }
 
+describe('Syndrome', () => {
+  it('should be the offset syndrome for offset words', () => {
+    // Offset words A, B, C, C' and D.
+    expect(calcSyndrome(0x0FC)).toBe(0x3D8);
+    expect(calcSyndrome(0x198)).toBe(0x3D4);
+    expect(calcSyndrome(0x168)).toBe(0x25C);
+    expect(calcSyndrome(0x350)).toBe(0x3CC);
+    expect(calcSyndrome(0x1B4)).toBe(0x258);
+  });
+});
+
 describe('Error-free bit stream', () => {
   const data = new Uint8Array(
     [0xf9, 0x03, 0x6b, 0xe0, 0x80, 0x61, 0x1f, 0x2d, 
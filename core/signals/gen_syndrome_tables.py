@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""Generates syndrome_tables.ts, the lookup tables of the RDS block decoder.
+
+The syndrome of a 26-bit block (16 data bits, 10 check bits) is linear in the
+block bits, so it is the XOR of the syndromes of its bytes, looked up in
+tables. Burst error correction by error trapping only depends on the
+difference between the syndrome of a block and the one expected at its
+position, so its outcome is precomputed for all 1024 differences.
+
+The bit-by-bit reference implementations below are those bitstream.ts used
+before the tables.
+"""
+
+import argparse
+
+BLOCK_SIZE = 26
+
+# Generator polynomial: x^10+x^8+x^7+x^5+x^4+x^3+1.
+GEN = 0x5B9
+GEN_DEGREE = 10
+
+# x^325 mod gen: x^9+x^8+x^4+x^3+x+1. Used as the initial multiplier to turn
+# a raw block into its syndrome.
+INITIAL_MULTIPLIER = 0x31B
+
+# A 5-bit "trap": once the shifted syndrome falls in this window, the
+# remaining bits identify a correctable burst error.
+TRAP = 0x1F
+
+# Offset words: syndromes of error-free blocks, and their block index (C'
+# is at the position of C).
+SYNDROMES = {0x3D8: 0, 0x3D4: 1, 0x25C: 2, 0x3CC: 2, 0x258: 3}
+
+
+def calc_syndrome(block, ini):
+    rem = 0
+    for i in range(BLOCK_SIZE, 0, -1):
+        if (block >> (i - 1)) & 0x01:
+            rem = (rem << 1) ^ ini
+        else:
+            rem = rem << 1
+        if rem & (0x01 << GEN_DEGREE):
+            rem = rem ^ GEN
+    return rem
+
+
+def error_pattern(syndrome_difference):
+    """Returns the burst error pattern trapped from a syndrome difference, or -1 if none is."""
+    rem = syndrome_difference
+    for shift in range(16, 0, -1):
+        rem = calc_syndrome(rem, 1)
+        if (rem & TRAP) == 0:
+            return rem << shift
+        rem = rem << 1
+    return -1
+
+
+def rolling_constant():
+    """Returns the syndrome change caused by the MSB leaving the 26-bit window when shifting."""
+    # The syndrome of block(x) is block(x) * INITIAL_MULTIPLIER mod GEN. The
+    # leaving bit weighs x^26 after the shift, i.e. x times the MSB syndrome.
+    s = calc_syndrome(1 << (BLOCK_SIZE - 1), INITIAL_MULTIPLIER) << 1
+    return s ^ GEN if s & (1 << GEN_DEGREE) else s
+
+
+def ts_array(codegen_lines, name, typ, values, comment):
+    codegen_lines.append(f'// {comment}')
+    codegen_lines.append(f'export const {name} = new {typ}([')
+    for i in range(0, len(values), 16):
+        codegen_lines.append('  ' + ' '.join(f'{v},' for v in values[i:i + 16]))
+    codegen_lines.append(']);')
+    codegen_lines.append('')
+
+
+def generate():
+    lines = [
+        '// Generated file. DO NOT EDIT.',
+        '// Generated by gen_syndrome_tables.py.',
+        '',
+        f'export const GEN = {GEN:#x};',
+        f'export const GEN_DEGREE = {GEN_DEGREE};',
+        f'export const INITIAL_MULTIPLIER = {INITIAL_MULTIPLIER:#x};',
+        '',
+        '// Rolling syndrome update, when the 26-bit block window shifts by one bit:',
+        '//   s = (s << 1) ^ (s & 0x200 ? GEN : 0) ^ (msb ? ROLL_OUT : 0) ^ (bit ? ROLL_IN : 0)',
+        '// where msb is the bit leaving the window, and bit the one entering it.',
+        f'export const ROLL_OUT = {rolling_constant():#x};',
+        f'export const ROLL_IN = {INITIAL_MULTIPLIER:#x};',
+        '',
+    ]
+    for b in range(4):
+        n = 256 if b < 3 else 1 << (BLOCK_SIZE - 24)
+        ts_array(lines, f'SYNDROME_BYTE{b}', 'Uint16Array',
+                 [calc_syndrome(v << (8 * b), INITIAL_MULTIPLIER) for v in range(n)],
+                 f'Syndromes of bits {8 * b} to {min(8 * b + 7, BLOCK_SIZE - 1)} of a block.')
+    ts_array(lines, 'BLOCK_INDEX_BY_SYNDROME', 'Int8Array',
+             [SYNDROMES.get(s, -1) for s in range(1 << GEN_DEGREE)],
+             'Block index (A=0, B=1, C/C\'=2, D=3) of error-free blocks by syndrome, -1 if none.')
+    patterns = [error_pattern(d) for d in range(1 << GEN_DEGREE)]
+    ts_array(lines, 'ERROR_PATTERNS', 'Int32Array', patterns,
+             'Burst error pattern to XOR with a 26-bit block, by difference between its syndrome\n'
+             '// and the expected one, -1 if uncorrectable.')
+    ts_array(lines, 'ERROR_COUNTS', 'Uint8Array', [bin(p).count('1') if p >= 0 else 0 for p in patterns],
+             'Number of bits set in ERROR_PATTERNS.')
+    return '\n'.join(lines)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description='Generates the syndrome tables of the RDS block decoder.')
+    argparser.add_argument('outfile')
+    args = argparser.parse_args()
+    with open(args.outfile, 'w', encoding='utf8') as f:
+        f.write(generate())
+
+
+if __name__ == '__main__':
+    main()
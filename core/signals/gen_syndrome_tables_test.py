@@ -0,0 +1,66 @@
+"""Tests for the syndrome tables of the RDS block decoder."""
+
+import os
+import random
+import unittest
+
+import gen_syndrome_tables as g
+
+
+def table_syndrome(block):
+    return (g.calc_syndrome(block & 0xFF, g.INITIAL_MULTIPLIER)
+            ^ g.calc_syndrome(block & 0xFF00, g.INITIAL_MULTIPLIER)
+            ^ g.calc_syndrome(block & 0xFF0000, g.INITIAL_MULTIPLIER)
+            ^ g.calc_syndrome(block & 0x3000000, g.INITIAL_MULTIPLIER))
+
+
+class SyndromeTablesTest(unittest.TestCase):
+    def test_checked_in_tables_are_up_to_date(self):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'syndrome_tables.ts')
+        with open(path, encoding='utf8') as f:
+            self.assertEqual(f.read(), g.generate())
+
+    def test_byte_syndromes(self):
+        rnd = random.Random(1)
+        for _ in range(1000):
+            block = rnd.getrandbits(g.BLOCK_SIZE)
+            self.assertEqual(table_syndrome(block), g.calc_syndrome(block, g.INITIAL_MULTIPLIER))
+
+    def test_offset_words(self):
+        data = 0x1234 << g.GEN_DEGREE
+        # Check bits making `data` a codeword.
+        check = next(c for c in range(1 << g.GEN_DEGREE)
+                     if g.calc_syndrome(data | c, g.INITIAL_MULTIPLIER) == 0)
+        # Offset words A, B, C, C' and D.
+        for (offset, block_index) in [(0x0FC, 0), (0x198, 1), (0x168, 2), (0x350, 2), (0x1B4, 3)]:
+            syndrome = g.calc_syndrome(data | (check ^ offset), g.INITIAL_MULTIPLIER)
+            self.assertEqual(g.SYNDROMES[syndrome], block_index)
+
+    def test_rolling_syndrome(self):
+        rnd = random.Random(2)
+        roll_out = g.rolling_constant()
+        (block, synd) = (0, 0)
+        for _ in range(10000):
+            bit = rnd.getrandbits(1)
+            synd <<= 1
+            if synd & (1 << g.GEN_DEGREE):
+                synd ^= g.GEN
+            if block & (1 << (g.BLOCK_SIZE - 1)):
+                synd ^= roll_out
+            if bit:
+                synd ^= g.INITIAL_MULTIPLIER
+            block = ((block << 1) | bit) & ((1 << g.BLOCK_SIZE) - 1)
+            self.assertEqual(synd, g.calc_syndrome(block, g.INITIAL_MULTIPLIER))
+
+    def test_burst_errors_are_corrected(self):
+        rnd = random.Random(3)
+        for _ in range(200):
+            block = rnd.getrandbits(g.BLOCK_SIZE)
+            # A burst of up to 5 bits within the 16 data bits.
+            burst = rnd.randint(1, 0x1F) << rnd.randint(g.GEN_DEGREE, g.BLOCK_SIZE - 5)
+            diff = g.calc_syndrome(block ^ burst, g.INITIAL_MULTIPLIER) ^ g.calc_syndrome(block, g.INITIAL_MULTIPLIER)
+            self.assertEqual(g.error_pattern(diff), burst)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,9 +25,65 @@ const PLL_BETA = 5;    // Reduced 50 -> 5 to make the PLL more stable.
 // Number of out symbols kept (for drawing the constellation diagram).
 const SYNC_OUT_LENGTH = 100;
 
+// TODO: Make this a parameter.
+const SAMPLE_RATE = 250000;
+
+// Receives the demodulated bits.
+export type BitSink = Pick<BitStreamSynchronizer, "addBit">;
+
+// Numerically controlled oscillator: a table of one period of the sine,
+// shared by all demodulators, interpolated linearly (the error is below
+// 1e-6, far below the noise of the subcarriers).
+const NCO_SIZE = 4096;
+const NCO_MASK = NCO_SIZE - 1;
+const NCO_QUARTER = NCO_SIZE / 4;
+const NCO_SCALE = NCO_SIZE / (2 * Math.PI);
+const NCO_TABLE = (() => {
+  const table = new Float64Array(NCO_SIZE + 1);
+  for (let i = 0; i <= NCO_SIZE; i++) {
+    table[i] = Math.sin(2 * Math.PI * i / NCO_SIZE);
+  }
+  return table;
+})();
+
+// Automatic Gain Control: divides samples by their envelope, which follows
+// peaks quickly and decays slowly.
+export class Agc {
+  private envelope = 0;
+  private attack: number;
+  private release: number;
+
+  constructor(sampleRate: number) {
+    this.attack = Math.exp(-1.0 / (sampleRate * AGC_ATTACK_TIME));
+    this.release = Math.exp(-1.0 / (sampleRate * AGC_RELEASE_TIME));
+  }
+
+  step(sample: number): number {
+    const sampleAbs = Math.abs(sample);
+    const alpha = sampleAbs > this.envelope ? this.attack : this.release;
+    this.envelope = (1.0 - alpha) * sampleAbs + alpha * this.envelope;
+    return sample / (this.envelope + 1e-6);
+  }
+
+  // Normalizes the first `length` samples of `input` into `output`.
+  process(input: Float32Array, output: Float64Array, length: number) {
+    let envelope = this.envelope;
+    for (let i = 0; i < length; i++) {
+      const sample = input[i];
+      const sampleAbs = Math.abs(sample);
+      const alpha = sampleAbs > envelope ? this.attack : this.release;
+      envelope = (1.0 - alpha) * sampleAbs + alpha * envelope;
+      output[i] = sample / (envelope + 1e-6);
+    }
+    this.envelope = envelope;
+  }
+}
+
 export class Demodulator {
-  // Automatic Gain Control.
-  private agcEnvelope = 0;
+  // Automatic Gain Control, when samples are not normalized by a
+  // MultiStreamDemodulator.
+  private agc: Agc;
+  private normalized = new Float64Array(0);
 
   // Subcarrier frequency.
   fSub: number;
@@ -38,8 +94,12 @@ export class Demodulator {
   // Oscillator frequency.
   fsc: number;
 
-  // Subcarrier phase.
+  // Subcarrier phase, kept below phaseWrap.
   subcarr_phi = 0;
+
+  // The subcarrier phase wraps around after that many radians, a whole number
+  // of bit clock periods, so that the clock phase is not affected.
+  private phaseWrap: number;
   
   // Clock phase offset.
   clock_offset = 0;
@@ -55,8 +115,7 @@ export class Demodulator {
 	// Demodulated sample from RDS data stream (NRZ-M encoded).
 	private dbit = 0;
 
-  // TODO: Make this a parameter.
-  sampleRate = 250000;
+  sampleRate = SAMPLE_RATE;
   decimate = Math.floor(this.sampleRate / 7125);
   private decimPhase = 0;
 
@@ -78,83 +137,128 @@ export class Demodulator {
   sumDistQ = 0;
   locked = false;
 
-  bitstreamSynchronizer: BitStreamSynchronizer;
+  bitstreamSynchronizer: BitSink;
 
-  constructor(subcarrierFreq: number, bitstreamSynchronizer: BitStreamSynchronizer) {
+  constructor(subcarrierFreq: number, bitstreamSynchronizer: BitSink) {
     this.fSub = subcarrierFreq;
     this.subcarrierBitrateRatio = subcarrierFreq / BIT_RATE;
     this.fsc = subcarrierFreq;
     this.bitstreamSynchronizer = bitstreamSynchronizer;
+    this.agc = new Agc(this.sampleRate);
+    // The RDS and RDS2 subcarriers are whole multiples of the bit rate.
+    this.phaseWrap = Number.isInteger(this.subcarrierBitrateRatio) ?
+      2 * Math.PI * this.subcarrierBitrateRatio : Infinity;
   }
 
   addSample(sample: number) {
-    // Automatic Gain Control (AGC).
-    const sampleAbs = Math.abs(sample);
-    const coef = sampleAbs > this.agcEnvelope ? AGC_ATTACK_TIME : AGC_RELEASE_TIME;
-    const alpha = Math.exp(-1.0 / (this.sampleRate * coef));
-    this.agcEnvelope = (1.0 - alpha) * sampleAbs + alpha * this.agcEnvelope;
-    const normSample = sample / (this.agcEnvelope + 1e-6);
-
-    // Subcarrier downmix & phase recovery.
-    this.subcarr_phi += 2 * Math.PI * this.fsc / this.sampleRate;
-    const subcarr_bb_i = this.lp2400iFilter.step(normSample * Math.cos(this.subcarr_phi));
-    const subcarr_bb_q = this.lp2400qFilter.step(normSample * Math.sin(this.subcarr_phi));
-
-    const d_phi_sc = this.lpPllFilter.step(subcarr_bb_i * subcarr_bb_q);   // Subcarrier phase error.
-    const err = Math.max(-0.05, Math.min(0.05, d_phi_sc));   // Clamp error to prevent jumps.
-    this.subcarr_phi -= PLL_BETA * err;
-    this.fsc -= 0.1 * PLL_BETA * err;    // Reduced 0.5 -> 0.1.
-
-    // Decimate band-limited signal.
-    if (this.decimPhase >= this.decimate) {
-      this.decimPhase -= this.decimate;
-      // Reset subcarrier frequency if it is outside tolerance range.
-      if ((this.fsc > this.fSub + FC_TOLERANCE) || (this.fsc < this.fSub - FC_TOLERANCE)) {
-        this.fsc = this.fSub;
-      }
+    if (this.normalized.length == 0) {
+      this.normalized = new Float64Array(1);
+    }
+    this.normalized[0] = this.agc.step(sample);
+    this.demodulate(this.normalized, 1);
+  }
 
-      // 1187.5 Hz clock.
-      const clock_phi = this.subcarr_phi / this.subcarrierBitrateRatio + this.clock_offset;   // Clock phase.
-      const lo_clock  = (clock_phi % (2 * Math.PI)) < Math.PI ? 1 : -1;
+  // Demodulates the first `length` samples of `samples`.
+  addSamples(samples: Float32Array, length: number = samples.length) {
+    if (this.normalized.length < length) {
+      this.normalized = new Float64Array(length);
+    }
+    this.agc.process(samples, this.normalized, length);
+    this.demodulate(this.normalized, length);
+  }
 
-      // Clock phase recovery.
-      if (sign(this.prev_bb) != sign(subcarr_bb_i)) {
-        let d_cphi = clock_phi % Math.PI;   // Clock phase error.
-        if (d_cphi >= (Math.PI / 2)) d_cphi -= Math.PI;
-        this.clock_offset -= 0.005 * d_cphi;
+  // Demodulates `length` samples normalized by an AGC.
+  demodulate(normalized: Float64Array, length: number) {
+    // The subcarrier loop runs on locals: the PLL feeds back on every sample.
+    let phi = this.subcarr_phi;
+    let fsc = this.fsc;
+    let decimPhase = this.decimPhase;
+    const phiPerHz = 2 * Math.PI / this.sampleRate;
+    const lpI = this.lp2400iFilter;
+    const lpQ = this.lp2400qFilter;
+    const lpPll = this.lpPllFilter;
+
+    for (let n = 0; n < length; n++) {
+      const normSample = normalized[n];
+
+      // Subcarrier downmix & phase recovery.
+      phi += phiPerHz * fsc;
+      const t = phi * NCO_SCALE;
+      const k = Math.floor(t);
+      const frac = t - k;
+      const ks = k & NCO_MASK;
+      const kc = (k + NCO_QUARTER) & NCO_MASK;
+      const sin = NCO_TABLE[ks] + frac * (NCO_TABLE[ks + 1] - NCO_TABLE[ks]);
+      const cos = NCO_TABLE[kc] + frac * (NCO_TABLE[kc + 1] - NCO_TABLE[kc]);
+      const subcarr_bb_i = lpI.step(normSample * cos);
+      const subcarr_bb_q = lpQ.step(normSample * sin);
+
+      const d_phi_sc = lpPll.step(subcarr_bb_i * subcarr_bb_q);   // Subcarrier phase error.
+      const err = Math.max(-0.05, Math.min(0.05, d_phi_sc));   // Clamp error to prevent jumps.
+      phi -= PLL_BETA * err;
+      fsc -= 0.1 * PLL_BETA * err;    // Reduced 0.5 -> 0.1.
+      if (phi >= this.phaseWrap) phi -= this.phaseWrap;
+
+      // Decimate band-limited signal.
+      if (decimPhase >= this.decimate) {
+        decimPhase -= this.decimate;
+        // Reset subcarrier frequency if it is outside tolerance range.
+        if ((fsc > this.fSub + FC_TOLERANCE) || (fsc < this.fSub - FC_TOLERANCE)) {
+          fsc = this.fSub;
+        }
+        this.subcarr_phi = phi;
+        this.decimated(subcarr_bb_i, subcarr_bb_q);
       }
 
-      // Correct I value: phase aligned projection instead of using subcarr_bb_i directly.
-      const phase_err = Math.atan2(subcarr_bb_q, subcarr_bb_i);
-      const i_corr = Math.cos(phase_err);
-
-      // Biphase symbol integrate & dump.
-      this.acc += i_corr * lo_clock;
-
-      if (sign(lo_clock) != sign(this.prevclock)) {
-        this.biphase(this.acc);
-        this.acc = 0;
-
-        this.syncOutI.push(subcarr_bb_i);
-        this.syncOutQ.push(subcarr_bb_q);
-        this.sumDistI += Math.abs(subcarr_bb_i);
-        this.sumDistQ += Math.abs(subcarr_bb_q);
-        if (this.syncOutI.length > SYNC_OUT_LENGTH) {
-          const i = this.syncOutI.shift();
-          const q = this.syncOutQ.shift();
-          if (i != undefined && q != undefined) {
-            this.sumDistI -= Math.abs(i);
-            this.sumDistQ -= Math.abs(q);
-          }
-        }
-        this.locked = (this.sumDistI - this.sumDistQ) / this.sumDistI >= 0.5;
+      decimPhase++;
+    }
+
+    this.subcarr_phi = phi;
+    this.fsc = fsc;
+    this.decimPhase = decimPhase;
+  }
+
+  // Clock recovery and symbol decoding, at the decimated rate.
+  private decimated(subcarr_bb_i: number, subcarr_bb_q: number) {
+    // 1187.5 Hz clock.
+    const clock_phi = this.subcarr_phi / this.subcarrierBitrateRatio + this.clock_offset;   // Clock phase.
+    const lo_clock  = mod(clock_phi, 2 * Math.PI) < Math.PI ? 1 : -1;
+
+    // Clock phase recovery.
+    if (sign(this.prev_bb) != sign(subcarr_bb_i)) {
+      let d_cphi = mod(clock_phi, Math.PI);   // Clock phase error.
+      if (d_cphi >= (Math.PI / 2)) d_cphi -= Math.PI;
+      this.clock_offset -= 0.005 * d_cphi;
     }
 
-      this.prevclock = lo_clock;
-      this.prev_bb = subcarr_bb_i;
+    // Correct I value: phase aligned projection instead of using subcarr_bb_i directly.
+    const phase_err = Math.atan2(subcarr_bb_q, subcarr_bb_i);
+    const i_corr = Math.cos(phase_err);
+
+    // Biphase symbol integrate & dump.
+    this.acc += i_corr * lo_clock;
+
+    if (sign(lo_clock) != sign(this.prevclock)) {
+      this.biphase(this.acc);
+      this.acc = 0;
+
+      this.syncOutI.push(subcarr_bb_i);
+      this.syncOutQ.push(subcarr_bb_q);
+      this.sumDistI += Math.abs(subcarr_bb_i);
+      this.sumDistQ += Math.abs(subcarr_bb_q);
+      if (this.syncOutI.length > SYNC_OUT_LENGTH) {
+        const i = this.syncOutI.shift();
+        const q = this.syncOutQ.shift();
+        if (i != undefined && q != undefined) {
+          this.sumDistI -= Math.abs(i);
+          this.sumDistQ -= Math.abs(q);
+        }
+      }
+      this.locked = (this.sumDistI - this.sumDistQ) / this.sumDistI >= 0.5;
     }
-    
-    this.decimPhase++;
+
+    this.prevclock = lo_clock;
+    this.prev_bb = subcarr_bb_i;
   }
 
 	/**
@@ -193,67 +297,91 @@ export class Demodulator {
 // https://github.com/chdh/dsp-collection-java/blob/master/src/main/java/biz/source_code/dsp/filter/IirFilter.java
 // Original code copyright 2013 Christian d'Heureuse, Inventec Informatik AG, Zurich, Switzerland.
 // Used under the GNU Lesser General Public License, V2.1 or later.
-class IirFilter {
+export class IirFilter {
   n1: number;   // Size of input delay line.
   n2: number;   // Size of output delay line.
-  a: Array<number>;   // A coefficients, applied to output values (negative).
-  b: Array<number>;   // B coefficients, applied to input values.
-  
-  buf1: Array<number>;   // Input signal delay line (ring buffer).
-  buf2: Array<number>;   // Output signal delay line (ring buffer).
-  pos1 = 0;   // Current ring buffer position in buf1.
-  pos2 = 0;   // Current ring buffer position in buf2.
-  
+  a: Float64Array;   // A coefficients, applied to output values (negative).
+  b: Float64Array;   // B coefficients, applied to input values.
+
+  // Delay lines, most recent value first: buf1[j - 1] is the input j steps
+  // ago, buf2[j - 1] the output.
+  buf1: Float64Array;
+  buf2: Float64Array;
+
   /**
   * Creates an IIR filter.
   *
   * @param coeffs
   *    The A and B coefficients. a[0] must be 1.
   **/
-  constructor(coeffsA: Array<number>, coeffsB: Array<number>) {
+  constructor(coeffsA: ArrayLike<number>, coeffsB: ArrayLike<number>) {
     if (coeffsA.length < 1 || coeffsB.length < 1 || coeffsA[0] != 1.0) {
       throw "Invalid coefficients.";
     }
-    this.a = coeffsA;
-    this.b = coeffsB;
+    this.a = Float64Array.from(coeffsA);
+    this.b = Float64Array.from(coeffsB);
     this.n1 = coeffsB.length - 1;
     this.n2 = coeffsA.length - 1;
-    this.buf1 = new Array<number>(this.n1);
-    this.buf1.fill(0);
-    this.buf2 = new Array<number>(this.n2);
-    this.buf2.fill(0);
+    this.buf1 = new Float64Array(this.n1);
+    this.buf2 = new Float64Array(this.n2);
   }
-  
+
   public step(inputValue: number): number {
-    let acc = this.b[0] * inputValue;
+    const a = this.a;
+    const b = this.b;
+    const buf1 = this.buf1;
+    const buf2 = this.buf2;
+    let acc = b[0] * inputValue;
     for (let j = 1; j <= this.n1; j++) {
-      let p = this.pos1 + this.n1 - j;
-      // Efficient modulo.
-      while (p >= this.n1) {
-        p -= this.n1;
-      }
-      acc += this.b[j] * this.buf1[p];
+      acc += b[j] * buf1[j - 1];
     }
-
     for (let j = 1; j <= this.n2; j++) {
-      let p = this.pos2 + this.n2 - j;
-      // Efficient modulo.
-      while (p >= this. n2) {
-        p -= this.n2;
-      }
-      acc -= this.a[j] * this.buf2[p];
+      acc -= a[j] * buf2[j - 1];
     }
-    
-    if (this.n1 > 0) {
-      this.buf1[this.pos1] = inputValue;
-      this.pos1 = (this.pos1 + 1) % this.n1;
+
+    for (let j = this.n1 - 1; j > 0; j--) {
+      buf1[j] = buf1[j - 1];
     }
-    if (this.n2 > 0) {
-      this.buf2[this.pos2] = acc;
-      this.pos2 = (this.pos2 + 1) % this.n2;
+    if (this.n1 > 0) buf1[0] = inputValue;
+    for (let j = this.n2 - 1; j > 0; j--) {
+      buf2[j] = buf2[j - 1];
     }
+    if (this.n2 > 0) buf2[0] = acc;
     return acc;
   }
+
+  // Filters the first `length` values of `input` into `output`, which may be
+  // the same array.
+  public process(input: Float32Array | Float64Array, output: Float32Array | Float64Array, length: number = input.length) {
+    for (let i = 0; i < length; i++) {
+      output[i] = this.step(input[i]);
+    }
+  }
+}
+
+// Demodulates the RDS and RDS2 streams of MPX samples, sharing the AGC
+// between them. Its demodulators each track the phase of their subcarrier
+// with a PLL, and read the shared NCO table.
+export class MultiStreamDemodulator {
+  readonly demodulators: Demodulator[];
+  private agc = new Agc(SAMPLE_RATE);
+  private normalized = new Float64Array(0);
+
+  // `sinks[i]` receives the bits of the subcarrier at `frequencies[i]`.
+  constructor(sinks: BitSink[], frequencies: number[] = FREQ_STREAMS) {
+    this.demodulators = sinks.map((sink, i) => new Demodulator(frequencies[i], sink));
+  }
+
+  // Demodulates the first `length` samples of `samples` on every stream.
+  addSamples(samples: Float32Array, length: number = samples.length) {
+    if (this.normalized.length < length) {
+      this.normalized = new Float64Array(length);
+    }
+    this.agc.process(samples, this.normalized, length);
+    for (const dem of this.demodulators) {
+      dem.demodulate(this.normalized, length);
+    }
+  }
 }
 
 // RDS carrier frequencies.
@@ -281,3 +409,8 @@ const BIT_RATE = 1187.5;
 function sign(a: number) {
   return (a >= 0 ? 1 : 0);
 }
+
+// Modulo with a result in [0, m), unlike %, for negative values of a.
+function mod(a: number, m: number) {
+  return a - m * Math.floor(a / m);
+}
@@ -0,0 +1,156 @@
+import { RdsPipeline, RdsReportEvent, RdsReportEventType } from "../drivers/input";
+import { BitStreamSynchronizer } from "./bitstream";
+import { BitSink, Demodulator, FREQ_STREAM_0, FREQ_STREAM_2, IirFilter, MultiStreamDemodulator } from "./mpx";
+import { GEN, GEN_DEGREE } from "./syndrome_tables";
+
+const SAMPLE_RATE = 250000;
+const BIT_RATE = 1187.5;
+
+// France Inter sample from 2011, as in decoder_test.ts.
+const FRANCE_INTER = [
+  [0xF201, 0x0408, 0x2037, 0x2020],
+  [0xF201, 0x0409, 0x383B, 0x494E],
+  [0xF201, 0x040A, 0x3D45, 0x5445],
+  [0xF201, 0x040F, 0x474E, 0x5220],
+];
+
+// Offset words of blocks A, B, C and D.
+const OFFSETS = [0x0FC, 0x198, 0x168, 0x1B4];
+
+function repeat(groups: number[][], times: number): number[][] {
+  const repeated: number[][] = [];
+  for (let i = 0; i < times; i++) repeated.push(...groups);
+  return repeated;
+}
+
+// Returns the bits of type A groups, with check words.
+function encode(groups: number[][]): number[] {
+  const bits: number[] = [];
+  for (const g of groups) {
+    g.forEach((data, i) => {
+      let r = 0;
+      for (let b = 15; b >= 0; b--) {
+        const bit = ((data >> b) & 1) ^ ((r >> (GEN_DEGREE - 1)) & 1);
+        r = (r << 1) & ((1 << GEN_DEGREE) - 1);
+        if (bit) r ^= GEN & ((1 << GEN_DEGREE) - 1);
+      }
+      const block = (data << GEN_DEGREE) | (r ^ OFFSETS[i]);
+      for (let b = 15 + GEN_DEGREE; b >= 0; b--) bits.push((block >> b) & 1);
+    });
+  }
+  return bits;
+}
+
+// Returns MPX samples with mono audio, the pilot tone, and the bits
+// modulated on subcarriers, differentially and biphase encoded.
+function modulate(streams: Array<{frequency: number, bits: number[]}>): Float32Array {
+  const bitCount = Math.min(...streams.map((s) => s.bits.length));
+  const samples = new Float32Array(Math.floor(bitCount / BIT_RATE * SAMPLE_RATE));
+  const symbols = streams.map((s) => {
+    let d = 0;
+    return s.bits.map((b) => (d ^= b) == 1 ? 1 : -1);
+  });
+  for (let n = 0; n < samples.length; n++) {
+    const t = n / SAMPLE_RATE;
+    const k = Math.floor(t * BIT_RATE);
+    const half = t * BIT_RATE - k < 0.5 ? 1 : -1;
+    let s = 0.4 * Math.sin(2 * Math.PI * 1000 * t) + 0.08 * Math.sin(2 * Math.PI * 19000 * t);
+    streams.forEach((stream, i) => {
+      s += 0.05 * symbols[i][k] * half * Math.sin(2 * Math.PI * stream.frequency * t + i + 0.3);
+    });
+    samples[n] = s;
+  }
+  return samples;
+}
+
+class BitRecorder implements BitSink {
+  bits: boolean[] = [];
+
+  addBit(bit: boolean) {
+    this.bits.push(bit);
+  }
+}
+
+class GroupRecorder implements RdsPipeline {
+  groups: string[] = [];
+
+  processMpxSamples(samples: Float32Array, length?: number): void {}
+  processBits(bytes: Uint8Array): void {}
+  reportFrequency(frequencyKhz: number): void {}
+  reportSourceEnd(): void {}
+
+  processRdsReportEvent(event: RdsReportEvent): void {
+    if (event.type == RdsReportEventType.GROUP && event.group != undefined) {
+      this.groups.push(`${event.stream}:${event.group}`);
+    }
+  }
+}
+
+describe("IirFilter", () => {
+  it("should filter blocks like single samples", () => {
+    const input = new Float32Array(1000).map((_, i) => Math.sin(i * i / 100));
+    const single = new IirFilter([1.0, -0.9461821078275034], [0.026908946086248272, 0.026908946086248272]);
+    const expected = Array.from(input, (x) => single.step(x));
+    const block = new IirFilter([1.0, -0.9461821078275034], [0.026908946086248272, 0.026908946086248272]);
+    const output = new Float64Array(input.length);
+    block.process(input.subarray(0, 300), output);
+    block.process(input.subarray(300), output.subarray(300));
+    expect(Array.from(output)).toEqual(expected);
+  });
+
+  it("should reject invalid coefficients", () => {
+    expect(() => new IirFilter([0.5], [1])).toThrow();
+  });
+});
+
+describe("Demodulator", () => {
+  const samples = modulate([{frequency: FREQ_STREAM_0, bits: encode(repeat(FRANCE_INTER, 8))}]);
+
+  it("should demodulate blocks of any size like single samples", () => {
+    const single = new BitRecorder();
+    const dem = new Demodulator(FREQ_STREAM_0, single);
+    samples.forEach((s) => dem.addSample(s));
+
+    const blocks = new BitRecorder();
+    const blockDem = new Demodulator(FREQ_STREAM_0, blocks);
+    const buffer = new Float32Array(20000);
+    for (let i = 0, size = 1; i < samples.length; i += size, size = (size * 7) % 19997) {
+      const block = samples.subarray(i, i + size);
+      buffer.set(block);
+      blockDem.addSamples(buffer, block.length);
+    }
+
+    expect(single.bits.length).toBeGreaterThan(3000);
+    expect(blocks.bits).toEqual(single.bits);
+  });
+
+  it("should keep the subcarrier phase bounded", () => {
+    const dem = new Demodulator(FREQ_STREAM_0, new BitRecorder());
+    dem.addSamples(samples);
+    expect(dem.subcarr_phi).toBeLessThan(2 * Math.PI * FREQ_STREAM_0 / BIT_RATE);
+  });
+});
+
+describe("MultiStreamDemodulator", () => {
+  it("should decode groups on several streams", () => {
+    const stream2 = FRANCE_INTER.map((g) => [0xF202, g[1], g[2], g[3]]);
+    const samples = modulate([
+      {frequency: FREQ_STREAM_0, bits: encode(repeat(FRANCE_INTER, 6))},
+      {frequency: FREQ_STREAM_2, bits: encode(repeat(stream2, 6))},
+    ]);
+    const recorder = new GroupRecorder();
+    const synchronizers = [0, 1, 2, 3].map((i) => new BitStreamSynchronizer(i, recorder));
+    const demodulator = new MultiStreamDemodulator(synchronizers);
+    for (let i = 0; i < samples.length; i += 16384) {
+      demodulator.addSamples(samples.subarray(i, i + 16384));
+    }
+
+    const expected = (stream: number, groups: number[][]) => groups.map((g) =>
+      `${stream}:` + g.map((b) => `${b.toString(16).toUpperCase().padStart(4, "0")}/0`).join(" "));
+    const decoded = (stream: number) => recorder.groups.filter((g) => g.startsWith(`${stream}:`));
+    for (const [stream, groups] of [[0, FRANCE_INTER], [2, stream2]] as Array<[number, number[][]]>) {
+      const valid = decoded(stream).filter((g) => expected(stream, groups).includes(g));
+      expect(valid.length).toBeGreaterThanOrEqual(12);
+    }
+  });
+});
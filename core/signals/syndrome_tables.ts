@@ -0,0 +1,282 @@
+// Generated file. DO NOT EDIT.
+// Generated by gen_syndrome_tables.py.
+
+export const GEN = 0x5b9;
+export const GEN_DEGREE = 10;
+export const INITIAL_MULTIPLIER = 0x31b;
+
+// Rolling syndrome update, when the 26-bit block window shifts by one bit:
+//   s = (s << 1) ^ (s & 0x200 ? GEN : 0) ^ (msb ? ROLL_OUT : 0) ^ (bit ? ROLL_IN : 0)
+// where msb is the bit leaving the window, and bit the one entering it.
+export const ROLL_OUT = 0x1b9;
+export const ROLL_IN = 0x31b;
+
+// Syndromes of bits 0 to 7 of a block.
+export const SYNDROME_BYTE0 = new Uint16Array([
+  0, 795, 911, 148, 679, 444, 296, 563, 247, 1004, 888, 99, 592, 331, 479, 708,
+  494, 757, 609, 378, 841, 82, 198, 989, 281, 514, 662, 397, 958, 165, 49, 810,
+  988, 199, 83, 840, 379, 608, 756, 495, 811, 48, 164, 959, 396, 663, 515, 280,
+  562, 297, 445, 678, 149, 910, 794, 1, 709, 478, 330, 593, 98, 889, 1005, 246,
+  513, 282, 398, 661, 166, 957, 809, 50, 758, 493, 377, 610, 81, 842, 990, 197,
+  1007, 244, 96, 891, 328, 595, 711, 476, 792, 3, 151, 908, 447, 676, 560, 299,
+  477, 710, 594, 329, 890, 97, 245, 1006, 298, 561, 677, 446, 909, 150, 2, 793,
+  51, 808, 956, 167, 660, 399, 283, 512, 196, 991, 843, 80, 611, 376, 492, 759,
+  443, 672, 564, 303, 796, 7, 147, 904, 332, 599, 707, 472, 1003, 240, 100, 895,
+  85, 846, 986, 193, 754, 489, 381, 614, 162, 953, 813, 54, 517, 286, 394, 657,
+  615, 380, 488, 755, 192, 987, 847, 84, 656, 395, 287, 516, 55, 812, 952, 163,
+  905, 146, 6, 797, 302, 565, 673, 442, 894, 101, 241, 1002, 473, 706, 598, 333,
+  954, 161, 53, 814, 285, 518, 658, 393, 845, 86, 194, 985, 490, 753, 613, 382,
+  596, 335, 475, 704, 243, 1000, 892, 103, 675, 440, 300, 567, 4, 799, 907, 144,
+  102, 893, 1001, 242, 705, 474, 334, 597, 145, 906, 798, 5, 566, 301, 441, 674,
+  392, 659, 519, 284, 815, 52, 160, 955, 383, 612, 752, 491, 984, 195, 87, 844,
+]);
+
+// Syndromes of bits 8 to 15 of a block.
+export const SYNDROME_BYTE1 = new Uint16Array([
+  0, 886, 853, 35, 787, 101, 70, 816, 927, 233, 202, 956, 140, 1018, 985, 175,
+  647, 497, 466, 676, 404, 738, 705, 439, 280, 622, 589, 315, 523, 381, 350, 552,
+  183, 961, 994, 148, 932, 210, 241, 903, 808, 94, 125, 779, 59, 845, 878, 24,
+  560, 326, 357, 531, 291, 597, 630, 256, 431, 729, 762, 396, 700, 458, 489, 671,
+  366, 536, 571, 333, 637, 267, 296, 606, 753, 391, 420, 722, 482, 660, 695, 449,
+  1001, 159, 188, 970, 250, 908, 943, 217, 118, 768, 803, 85, 869, 19, 48, 838,
+  473, 687, 652, 506, 714, 444, 415, 745, 582, 304, 275, 613, 341, 547, 512, 374,
+  862, 40, 11, 893, 77, 827, 792, 110, 193, 951, 916, 226, 978, 164, 135, 1009,
+  732, 426, 393, 767, 463, 697, 666, 492, 323, 565, 534, 352, 592, 294, 261, 627,
+  91, 813, 782, 120, 840, 62, 29, 875, 964, 178, 145, 999, 215, 929, 898, 244,
+  619, 285, 318, 584, 376, 526, 557, 347, 500, 642, 673, 471, 743, 401, 434, 708,
+  236, 922, 953, 207, 1023, 137, 170, 988, 883, 5, 38, 848, 96, 790, 821, 67,
+  946, 196, 231, 913, 161, 983, 1012, 130, 45, 859, 888, 14, 830, 72, 107, 797,
+  309, 579, 608, 278, 550, 336, 371, 517, 682, 476, 511, 649, 441, 719, 748, 410,
+  773, 115, 80, 806, 22, 864, 835, 53, 154, 1004, 975, 185, 905, 255, 220, 938,
+  386, 756, 727, 417, 657, 487, 452, 690, 541, 363, 328, 574, 270, 632, 603, 301,
+]);
+
+// Syndromes of bits 16 to 23 of a block.
+export const SYNDROME_BYTE2 = new Uint16Array([
+  0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+  16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31,
+  32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43, 44, 45, 46, 47,
+  48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 58, 59, 60, 61, 62, 63,
+  64, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 76, 77, 78, 79,
+  80, 81, 82, 83, 84, 85, 86, 87, 88, 89, 90, 91, 92, 93, 94, 95,
+  96, 97, 98, 99, 100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111,
+  112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124, 125, 126, 127,
+  128, 129, 130, 131, 132, 133, 134, 135, 136, 137, 138, 139, 140, 141, 142, 143,
+  144, 145, 146, 147, 148, 149, 150, 151, 152, 153, 154, 155, 156, 157, 158, 159,
+  160, 161, 162, 163, 164, 165, 166, 167, 168, 169, 170, 171, 172, 173, 174, 175,
+  176, 177, 178, 179, 180, 181, 182, 183, 184, 185, 186, 187, 188, 189, 190, 191,
+  192, 193, 194, 195, 196, 197, 198, 199, 200, 201, 202, 203, 204, 205, 206, 207,
+  208, 209, 210, 211, 212, 213, 214, 215, 216, 217, 218, 219, 220, 221, 222, 223,
+  224, 225, 226, 227, 228, 229, 230, 231, 232, 233, 234, 235, 236, 237, 238, 239,
+  240, 241, 242, 243, 244, 245, 246, 247, 248, 249, 250, 251, 252, 253, 254, 255,
+]);
+
+// Syndromes of bits 24 to 25 of a block.
+export const SYNDROME_BYTE3 = new Uint16Array([
+  0, 256, 512, 768,
+]);
+
+// Block index (A=0, B=1, C/C'=2, D=3) of error-free blocks by syndrome, -1 if none.
+export const BLOCK_INDEX_BY_SYNDROME = new Int8Array([
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, 3, -1, -1, -1, 2, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 2, -1, -1, -1,
+  -1, -1, -1, -1, 1, -1, -1, -1, 0, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+]);
+
+// Burst error pattern to XOR with a 26-bit block, by difference between its syndrome
+// and the expected one, -1 if uncorrectable.
+export const ERROR_PATTERNS = new Int32Array([
+  0, 65536, 131072, 196608, 262144, 327680, 393216, 458752, 524288, 589824, 655360, 720896, 786432, 851968, 917504, 983040,
+  1048576, 1114112, 1179648, 1245184, 1310720, 1376256, 1441792, 1507328, 1572864, 1638400, 1703936, 1769472, 1835008, 1900544, 1966080, 2031616,
+  2097152, -1, 2228224, 768, 2359296, -1, 2490368, -1, 2621440, -1, 2752512, -1, 2883584, 51200, 3014656, -1,
+  3145728, -1, 3276800, -1, 3407872, -1, 3538944, -1, 3670016, -1, 3801088, 11264, 3932160, -1, 4063232, -1,
+  4194304, -1, -1, -1, 4456448, -1, 1536, -1, 4718592, -1, -1, -1, 4980736, 29696, -1, -1,
+  5242880, -1, -1, -1, 5505024, -1, -1, -1, 5767168, -1, 102400, 36864, 6029312, -1, -1, -1,
+  6291456, -1, -1, -1, 6553600, 1280, -1, -1, 6815744, -1, -1, -1, 7077888, -1, -1, -1,
+  7340032, -1, -1, -1, 7602176, -1, 22528, -1, 7864320, -1, -1, -1, 8126464, 10752, -1, -1,
+  8388608, -1, -1, -1, -1, -1, -1, -1, 8912896, -1, 1984, -1, 3072, -1, -1, -1,
+  9437184, -1, -1, -1, -1, -1, -1, -1, 9961472, -1, 59392, -1, -1, -1, -1, -1,
+  10485760, -1, -1, -1, -1, -1, -1, -1, 11010048, 1216, -1, -1, -1, -1, -1, 3840,
+  11534336, -1, -1, -1, 204800, 139264, 73728, 8192, 12058624, -1, -1, -1, -1, -1, -1, -1,
+  12582912, 30720, -1, -1, -1, -1, -1, -1, 13107200, -1, 2560, -1, 448, -1, -1, -1,
+  13631488, -1, -1, -1, -1, -1, -1, -1, 14155776, -1, -1, -1, -1, -1, -1, -1,
+  14680064, -1, -1, -1, -1, -1, -1, -1, 15204352, 2304, -1, -1, 45056, 110592, -1, 704,
+  15728640, 9728, -1, -1, -1, -1, -1, -1, 16252928, -1, 21504, -1, -1, -1, -1, -1,
+  16777216, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  17825792, -1, 1088, -1, 3968, -1, -1, -1, 6144, -1, -1, -1, -1, -1, -1, -1,
+  18874368, -1, -1, 13312, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  19922944, 1856, -1, -1, 118784, 53248, -1, 3200, -1, -1, -1, 6912, -1, -1, -1, -1,
+  20971520, -1, -1, 34816, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  22020096, -1, 2432, -1, 576, 27648, -1, -1, -1, -1, -1, -1, -1, -1, 7680, -1,
+  23068672, -1, -1, -1, -1, 12800, -1, -1, 409600, 475136, 278528, 344064, 147456, 212992, 16384, 81920,
+  24117248, 2688, -1, -1, -1, -1, -1, 320, -1, -1, -1, -1, -1, 7424, -1, -1,
+  25165824, -1, 61440, 126976, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  26214400, -1, -1, -1, 5120, -1, -1, -1, 896, -1, -1, -1, -1, -1, -1, -1,
+  27262976, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 14336,
+  28311552, -1, -1, -1, -1, -1, -1, 5888, -1, -1, -1, 128, -1, -1, -1, -1,
+  29360128, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  30408704, -1, 4608, -1, -1, -1, -1, -1, 90112, 24576, 221184, 155648, -1, -1, 1408, -1,
+  31457280, -1, 19456, -1, -1, -1, -1, -1, -1, 15872, -1, -1, -1, -1, -1, -1,
+  32505856, 4352, -1, -1, 43008, -1, -1, -1, -1, -1, -1, -1, -1, 1664, -1, -1,
+  33554432, 64, -1, -1, -1, -1, -1, 2944, -1, -1, -1, 7168, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 63488, -1, -1,
+  35651584, -1, 832, -1, 2176, -1, -1, -1, 7936, -1, -1, -1, -1, -1, -1, -1,
+  12288, 77824, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  37748736, 3456, -1, -1, -1, -1, 26624, 1600, -1, -1, -1, -1, -1, 6656, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  39845888, -1, 3712, -1, 1344, -1, -1, -1, 237568, 172032, 106496, 40960, -1, -1, 6400, -1,
+  -1, -1, -1, -1, -1, -1, 13824, -1, -1, -1, -1, -1, -1, 17408, -1, -1,
+  41943040, -1, -1, -1, -1, -1, 69632, 4096, -1, -1, -1, 1920, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  44040192, -1, -1, -1, 4864, -1, -1, -1, 1152, -1, 55296, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 15360, -1, -1, -1,
+  46137344, 5632, -1, -1, -1, -1, -1, -1, -1, -1, 25600, -1, -1, 384, -1, -1,
+  819200, 884736, 950272, 1015808, 557056, 622592, 688128, 753664, 294912, 360448, 425984, 491520, 32768, 98304, 163840, 229376,
+  48234496, -1, 5376, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 640, -1,
+  -1, 18432, -1, -1, -1, -1, -1, -1, -1, -1, 14848, -1, -1, -1, -1, -1,
+  50331648, -1, -1, -1, 122880, 57344, 253952, 188416, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, 1024, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  52428800, -1, -1, -1, -1, -1, -1, -1, 10240, -1, -1, -1, -1, -1, -1, -1,
+  1792, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  54525952, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, 512, -1, -1, -1, -1, -1, -1, -1, -1, 28672, 94208,
+  56623104, -1, -1, -1, -1, 23552, -1, -1, -1, -1, -1, -1, -1, -1, 11776, -1,
+  -1, -1, -1, 47104, -1, -1, 256, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  58720256, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, 960, -1, -1, -1, -1, -1, 2048,
+  60817408, -1, -1, -1, 9216, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  180224, 245760, 49152, 114688, 442368, 507904, 311296, 376832, -1, -1, 192, -1, 2816, -1, -1, -1,
+  62914560, -1, -1, -1, 38912, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1,
+  -1, -1, 31744, -1, -1, -1, -1, -1, -1, 3584, -1, -1, -1, -1, -1, 1472,
+  65011712, -1, 8704, -1, -1, -1, -1, -1, 86016, 20480, -1, -1, -1, -1, -1, -1,
+  -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 3328, -1, 1728, -1, -1, -1,
+]);
+
+// Number of bits set in ERROR_PATTERNS.
+export const ERROR_COUNTS = new Uint8Array([
+  0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4,
+  1, 2, 2, 3, 2, 3, 3, 4, 2, 3, 3, 4, 3, 4, 4, 5,
+  1, 0, 2, 2, 2, 0, 3, 0, 2, 0, 3, 0, 3, 3, 4, 0,
+  2, 0, 3, 0, 3, 0, 4, 0, 3, 0, 4, 3, 4, 0, 5, 0,
+  1, 0, 0, 0, 2, 0, 2, 0, 2, 0, 0, 0, 3, 4, 0, 0,
+  2, 0, 0, 0, 3, 0, 0, 0, 3, 0, 3, 2, 4, 0, 0, 0,
+  2, 0, 0, 0, 3, 2, 0, 0, 3, 0, 0, 0, 4, 0, 0, 0,
+  3, 0, 0, 0, 4, 0, 3, 0, 4, 0, 0, 0, 5, 3, 0, 0,
+  1, 0, 0, 0, 0, 0, 0, 0, 2, 0, 5, 0, 2, 0, 0, 0,
+  2, 0, 0, 0, 0, 0, 0, 0, 3, 0, 4, 0, 0, 0, 0, 0,
+  2, 0, 0, 0, 0, 0, 0, 0, 3, 3, 0, 0, 0, 0, 0, 4,
+  3, 0, 0, 0, 3, 2, 2, 1, 4, 0, 0, 0, 0, 0, 0, 0,
+  2, 4, 0, 0, 0, 0, 0, 0, 3, 0, 2, 0, 3, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 4, 2, 0, 0, 3, 4, 0, 3,
+  4, 3, 0, 0, 0, 0, 0, 0, 5, 0, 3, 0, 0, 0, 0, 0,
+  1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  2, 0, 2, 0, 5, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0,
+  2, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 4, 0, 0, 4, 3, 0, 3, 0, 0, 0, 4, 0, 0, 0, 0,
+  2, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 3, 0, 2, 4, 0, 0, 0, 0, 0, 0, 0, 0, 4, 0,
+  3, 0, 0, 0, 0, 3, 0, 0, 3, 4, 2, 3, 2, 3, 1, 2,
+  4, 3, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 4, 0, 0,
+  2, 0, 4, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 2, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3,
+  4, 0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 1, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  4, 0, 2, 0, 0, 0, 0, 0, 3, 2, 4, 3, 0, 0, 3, 0,
+  4, 0, 3, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0,
+  5, 2, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 3, 0, 0,
+  1, 1, 0, 0, 0, 0, 0, 4, 0, 0, 0, 3, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0,
+  2, 0, 3, 0, 2, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0,
+  2, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  2, 4, 0, 0, 0, 0, 3, 3, 0, 0, 0, 0, 0, 3, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 4, 0, 3, 0, 0, 0, 4, 3, 3, 2, 0, 0, 3, 0,
+  0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 0, 0, 0, 2, 0, 0,
+  2, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 4, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 3, 0, 0, 0, 2, 0, 4, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4, 0, 0, 0,
+  3, 3, 0, 0, 0, 0, 0, 0, 0, 0, 3, 0, 0, 2, 0, 0,
+  3, 4, 4, 5, 2, 3, 3, 4, 2, 3, 3, 4, 1, 2, 2, 3,
+  4, 0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0,
+  0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 0, 0,
+  2, 0, 0, 0, 4, 3, 5, 4, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 3, 4,
+  4, 0, 0, 0, 0, 4, 0, 0, 0, 0, 0, 0, 0, 0, 4, 0,
+  0, 0, 0, 4, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 0, 0, 1,
+  4, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  3, 4, 2, 3, 4, 5, 3, 4, 0, 0, 2, 0, 3, 0, 0, 0,
+  4, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 5, 0, 0, 0, 0, 0, 0, 3, 0, 0, 0, 0, 0, 4,
+  5, 0, 2, 0, 0, 0, 0, 0, 3, 2, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 0, 4, 0, 0, 0,
+]);
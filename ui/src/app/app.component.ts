@@ -1,8 +1,8 @@
-import { Component } from '@angular/core';
+import { Component, ViewChild } from '@angular/core';
 import { RouterOutlet } from '@angular/router';
 import { InputPaneComponent } from './input-pane/input-pane.component';
 import { StationInfoComponent } from './station-info/station-info.component';
-import { LogMessage, parse_group, StationImpl } from '../../../core/protocol/rds_types';
+import { parse_group, StationImpl } from '../../../core/protocol/rds_types';
 import { ReceiverEvent, ReceiverEventKind } from "../../../core/protocol/station_change";
 
 @Component({
@@ -16,20 +16,23 @@ export class AppComponent {
   title = 'rds-surveyor';
 
   station: StationImpl;
+  @ViewChild(StationInfoComponent) stationInfo?: StationInfoComponent;
 
   receiveGroup(evt: ReceiverEvent) {
     switch (evt.kind) {
       case ReceiverEventKind.GroupEvent:
-        const log = new LogMessage();
+        const log = this.station.log.next();
         log.add(evt.stream + ':[' + evt.hexDump() + '] ', false);
         parse_group(evt.stream, evt.group, evt.maxErrors, log, this.station);
-        this.station.addLogMessage(log);
         this.station.tickGroupDuration();
         break;
       case ReceiverEventKind.NewStationEvent:
         this.station.reset();
         break;
     }
+    // The station view only refreshes what depends on the changed fields.
+    this.stationInfo?.update(this.station.changes);
+    this.station.changes.clear();
   }
 
   constructor() {
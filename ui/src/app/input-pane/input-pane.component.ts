@@ -17,7 +17,7 @@ import { Si470x } from "../../../../core/drivers/si470x";
 import { RtlSdr } from "../../../../core/drivers/rtlsdr";
 import { FileSource } from "../../../../core/drivers/file";
 import { BitStreamSynchronizer } from "../../../../core/signals/bitstream";
-import { Demodulator, FREQ_STREAMS } from "../../../../core/signals/mpx";
+import { Demodulator, FREQ_STREAMS, MultiStreamDemodulator } from "../../../../core/signals/mpx";
 import { GroupEvent, ReceiverEvent, ReceiverEventKind, StationChangeDetector } from "../../../../core/protocol/station_change";
 import { Pref } from '../prefs';
 import { catchError } from 'rxjs';
@@ -42,11 +42,14 @@ export class InputPaneComponent implements RdsPipeline  {
   radioSources = [new Si470x(this), new RtlSdr(this)];
   selectedRadioSource?: RdsSource;
   fileSource = new FileSource(this);
+  // Fraction of the file played by fileSource.
+  playbackProgress = 0;
   frequency: number = -1;
   logDirHandle: FileSystemDirectoryHandle | null = null;
   logFileStream: FileSystemWritableFileStream | null = null;
   synchronizer = new Array<BitStreamSynchronizer>(FREQ_STREAMS.length);
-  demodulator = new Array<Demodulator>(FREQ_STREAMS.length);
+  private mpxDemodulator: MultiStreamDemodulator;
+  demodulator: Demodulator[];
 
   prefPlaybackSpeed = new Pref<string>("pref.playback_speed", "fast");
   prefTunedFrequency = new Pref<number>("pref.tuned_frequency", 100000);
@@ -57,8 +60,10 @@ export class InputPaneComponent implements RdsPipeline  {
   constructor(private httpClient: HttpClient, private route: ActivatedRoute) {
     for (let i=0; i<FREQ_STREAMS.length; i++) {
       this.synchronizer[i] = new BitStreamSynchronizer(i, this);
-      this.demodulator[i] = new Demodulator(FREQ_STREAMS[i], this.synchronizer[i]);
     }
+    this.mpxDemodulator = new MultiStreamDemodulator(this.synchronizer);
+    this.demodulator = this.mpxDemodulator.demodulators;
+    this.fileSource.onProgress = (progress) => this.playbackProgress = progress;
   }
 
   private async handleHttpError(error: HttpErrorResponse) {
@@ -100,6 +105,7 @@ export class InputPaneComponent implements RdsPipeline  {
 
   private setSource(source: RdsSource) {
     this.currentSource = source;
+    this.playbackProgress = 0;
     // Clear constellation diagram.
     this.constellationDiagram.updateConstellationDiagram([], []);
   }
@@ -112,6 +118,10 @@ export class InputPaneComponent implements RdsPipeline  {
     return this.currentSource != undefined;
   }
 
+  get playingFile(): boolean {
+    return this.currentSource == this.fileSource;
+  }
+
   async emitGroup(stream: number, group: Group, maxErrors: number) {
     this.blerGraph.get(stream)?.updateBlerGraph(true, group, maxErrors);
 
@@ -131,16 +141,7 @@ export class InputPaneComponent implements RdsPipeline  {
   }
 
   async processMpxSamples(samples: Float32Array, length?: number) {
-    if (length == undefined) {
-      length = samples.length;
-    }
-    for (let demIndex = 0; demIndex<FREQ_STREAMS.length; demIndex++) {
-      const dem = this.demodulator[demIndex];
-      for (let i=0; i<length; i++) {
-        dem.addSample(samples[i]);
-        
-      }
-    }
+    this.mpxDemodulator.addSamples(samples, length);
     // TODO: allow selection of stream(s).
     this.constellationDiagram.updateConstellationDiagram(this.demodulator[0].syncOutI, this.demodulator[0].syncOutQ);
   }
@@ -1,4 +1,4 @@
-import { Component, Input, inject } from '@angular/core';
+import { ChangeDetectionStrategy, ChangeDetectorRef, Component, Input, inject } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import {MatButtonToggleModule} from '@angular/material/button-toggle';
 import {MatListModule} from '@angular/material/list';
@@ -6,7 +6,9 @@ import {MatTabsModule} from '@angular/material/tabs';
 import {MatDialog, MatDialogModule} from '@angular/material/dialog';
 import { HexPipe } from '../hex.pipe';
 import { Pref } from '../prefs';
-import { StationImpl } from '../../../../core/protocol/rds_types';
+import { StationField, STATION_FIELD_COUNT } from '../../../../core/protocol/base';
+import { ChangeMask } from '../../../../core/protocol/change_mask';
+import { OtherNetworkImpl, StationImpl } from '../../../../core/protocol/rds_types';
 import { AboutComponent } from '../about/about.component';
 import { humanReadableUrl } from '../../../../core/protocol/internet_connection';
 
@@ -15,7 +17,9 @@ import { humanReadableUrl } from '../../../../core/protocol/internet_connection'
   standalone: true,
   imports: [CommonModule, HexPipe, MatButtonToggleModule, MatDialogModule, MatListModule, MatTabsModule],
   templateUrl: './station-info.component.html',
-  styleUrl: './station-info.component.scss'
+  styleUrl: './station-info.component.scss',
+  // Only refreshed by `update`, when groups were received.
+  changeDetection: ChangeDetectionStrategy.OnPush,
 })
 export class StationInfoComponent {
   @Input() station!: StationImpl;
@@ -23,15 +27,66 @@ export class StationInfoComponent {
 	rdsVariant: RdsVariant = RdsVariant.RDS;
 	prefRdsVariant = new Pref<string>("pref.rds_variant", "rds");
 	readonly aboutDialog = inject(MatDialog);
+	private readonly changeDetector = inject(ChangeDetectorRef);
+
+	// Fields changed since the view was last refreshed, and whether a refresh
+	// is scheduled.
+	private pendingChanges = new ChangeMask(STATION_FIELD_COUNT);
+	private refreshScheduled = false;
+
+	// Values derived from the station, recomputed when their fields change.
+	dynamicPs = "";
+	ptyString = "";
+	trafficString = "";
+	rtHistory: RtEntry[] = [];
 
 	ngOnInit() {
 		this.prefRdsVariant.init();
 		this.rdsVariant = this.prefRdsVariant.value == "rds" ? RdsVariant.RDS : RdsVariant.RBDS;
+		for (let f = 0; f < STATION_FIELD_COUNT; f++) {
+			this.pendingChanges.mark(f);
+		}
+		this.refresh();
+	}
+
+	// Records the fields changed by a group (see Station.changes). The view is
+	// refreshed at most once per frame, however many groups are received.
+	update(changes: ChangeMask) {
+		const pending = this.pendingChanges.words;
+		changes.words.forEach((w, i) => pending[i] |= w);
+		if (!this.refreshScheduled) {
+			this.refreshScheduled = true;
+			requestAnimationFrame(() => this.refresh());
+		}
+	}
+
+	private refresh() {
+		this.refreshScheduled = false;
+		const changes = this.pendingChanges;
+		if (this.station == undefined) {
+			return;
+		}
+		if (changes.has(StationField.ps)) {
+			this.dynamicPs = this.station.getDynamicPSmessage();
+		}
+		if (changes.has(StationField.pty)) {
+			this.ptyString = this.getPtyString(this.station);
+		}
+		if (changes.has(StationField.tp) || changes.has(StationField.ta)) {
+			this.trafficString = this.getTrafficString(this.station);
+		}
+		if (changes.has(StationField.rt) || changes.has(StationField.rt_plus_app)) {
+			this.rtHistory = this.getRThistory();
+		}
+		changes.clear();
+		// Other parts of the view, such as the log, change with every group.
+		this.changeDetector.markForCheck();
 	}
 
 	setRdsVariant(event: any) {
     this.rdsVariant = event.value == "rds" ? RdsVariant.RDS : RdsVariant.RBDS;
 		this.prefRdsVariant.setValue(event.value);
+		this.ptyString = this.getPtyString(this.station);
 	}
 
 	rdsPtyLabels = new Array<string>(
@@ -102,7 +157,7 @@ export class StationInfoComponent {
 		"Emergency Test",
 		"Emergency");
   
-  getTrafficString(station: StationImpl): string {
+  getTrafficString(station: StationImpl | OtherNetworkImpl): string {
     const flags: string[] = [];
     if (station.tp) {
       flags.push("TP");
@@ -113,7 +168,7 @@ export class StationInfoComponent {
     return flags.join(" + ");
   }
 
-	getPtyString(station: StationImpl): string {
+	getPtyString(station: StationImpl | OtherNetworkImpl): string {
 		if (station.pty == undefined) {
 			return "";
 		}
@@ -130,8 +185,7 @@ export class StationInfoComponent {
 
 	getRThistory(): Array<RtEntry> {
 		const res = Array<RtEntry>();
-		const messages = this.station.rt.getPastMessages(true);
-		for (let m of messages) {
+		for (let m of this.station.rt.pastMessages(true)) {
 			res.push(
 				new RtEntry(
 					m.message,